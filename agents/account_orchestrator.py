@@ -8,15 +8,22 @@ Handles autonomous multi-contact campaigns with:
 - Autonomous scheduling and trigger logic
 """
 
+import asyncio
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from agents.base_agent import SelfOptimizingAgent, AgentRules
+from core.campaign_store import CampaignStore, SupabaseCampaignBackend
+from core.metrics import get_metrics_registry
 from enum import Enum
 import json
 
 logger = logging.getLogger(__name__)
 
+campaign_steps = get_metrics_registry().counter(
+    "campaign_steps", "ABM campaign steps run by due-touchpoint sweeps", ("outcome",))
+
 
 class CampaignChannel(Enum):
     """Communication channels for campaign touchpoints"""
@@ -53,7 +60,8 @@ class AccountOrchestrator(SelfOptimizingAgent):
     - Colleague reference messaging
     """
     
-    def __init__(self, supabase_client=None, config: Optional[Dict] = None):
+    def __init__(self, supabase_client=None, config: Optional[Dict] = None,
+                 store: Optional[CampaignStore] = None):
         # Define agent rules for SelfOptimizingAgent
         rules = AgentRules(
             allowed_models=["llama-3.1-70b", "mixtral-8x7b"],
@@ -74,11 +82,16 @@ class AccountOrchestrator(SelfOptimizingAgent):
         
         Args:
             supabase_client: Supabase client for data persistence
-            config: Configuration dictionary with campaign parameters
+            config: Configuration overrides (missing keys use the defaults)
+            store: Campaign store (default: one backed by supabase_client)
         """
         self.supabase = supabase_client
-        self.config = config or self._default_config()
-        self.active_campaigns: Dict[str, Dict] = {}
+        self.config = {**self._default_config(), **(config or {})}
+        self.store = store or CampaignStore(
+            SupabaseCampaignBackend(supabase_client) if supabase_client else None
+        )
+        # Campaign documents by ID (the store's in-memory view)
+        self.active_campaigns: Dict[str, Dict] = self.store.campaigns
         
         logger.info("AccountOrchestrator initialized")
     
@@ -93,6 +106,9 @@ class AccountOrchestrator(SelfOptimizingAgent):
             "max_concurrent_contacts": 3,  # Max contacts to engage simultaneously
             "conflict_check_enabled": True,
             "auto_pause_on_response": True,
+            "max_concurrent_steps": 8,  # Due steps executed at once by run_due_steps
+            "max_due_per_sweep": 500,
+            "step_retry_minutes": 60,  # Retry delay after a failed step
         }
     
     async def process_new_lead(self, lead_data: Dict) -> Dict:
@@ -128,21 +144,19 @@ class AccountOrchestrator(SelfOptimizingAgent):
                 "touchpoints": [],
                 "created_at": datetime.utcnow().isoformat(),
                 "last_updated": datetime.utcnow().isoformat(),
+                "next_touchpoint_at": None,
                 "metadata": lead_data.get("metadata", {})
             }
             
-            # Store campaign
-            self.active_campaigns[campaign["campaign_id"]] = campaign
-            
-            # Persist to database
-            if self.supabase:
-                await self._persist_campaign(campaign)
+            # Store and persist campaign (full row, once)
+            await self.store.create(campaign)
             
-            # Schedule first touchpoint
+            # Schedule first touchpoint (due now: picked up by the next sweep)
             first_touchpoint = await self.schedule_next_touchpoint(
                 campaign["campaign_id"],
                 immediate=True
             )
+            await self.store.save(campaign["campaign_id"])
             
             logger.info(f"Campaign initiated: {campaign['campaign_id']} with {len(contacts)} contacts")
             
@@ -225,12 +239,14 @@ class AccountOrchestrator(SelfOptimizingAgent):
         # Sort by priority score (descending)
         return sorted(contacts, key=lambda x: x.get("priority_score", 0), reverse=True)
     
-    async def execute_campaign_step(self, campaign_id: str) -> Dict:
+    async def execute_campaign_step(self, campaign_id: str,
+                                    responses: Optional[Dict[str, Dict]] = None) -> Dict:
         """
         Execute next step in campaign workflow.
         
         Args:
             campaign_id: Campaign identifier
+            responses: Latest response per contact ID, prefetched by run_due_steps
             
         Returns:
             Execution result with next actions
@@ -239,7 +255,7 @@ class AccountOrchestrator(SelfOptimizingAgent):
             campaign = self.active_campaigns.get(campaign_id)
             if not campaign:
                 # Try loading from database
-                campaign = await self._load_campaign(campaign_id)
+                campaign = await self.store.load(campaign_id)
                 if not campaign:
                     raise ValueError(f"Campaign not found: {campaign_id}")
             
@@ -252,7 +268,7 @@ class AccountOrchestrator(SelfOptimizingAgent):
             
             # Check for conflicts (primary responded)
             if self.config["conflict_check_enabled"]:
-                conflict = await self.check_conflicts(campaign_id)
+                conflict = await self.check_conflicts(campaign_id, responses)
                 if conflict["has_conflict"]:
                     return await self._handle_conflict(campaign_id, conflict)
             
@@ -278,17 +294,19 @@ class AccountOrchestrator(SelfOptimizingAgent):
             # Update campaign state
             campaign["current_step"] += 1
             campaign["last_updated"] = datetime.utcnow().isoformat()
+            self.store.touch(campaign_id, "current_step", "last_updated")
             
             # Schedule next touchpoint
             if campaign["current_step"] < self.config["max_touchpoints"]:
                 next_touchpoint = await self.schedule_next_touchpoint(campaign_id)
             else:
                 campaign["status"] = CampaignStatus.COMPLETED.value
+                self.store.touch(campaign_id, "status")
+                self.store.unschedule(campaign_id)
                 next_touchpoint = None
             
-            # Persist updates
-            if self.supabase:
-                await self._persist_campaign(campaign)
+            # Persist updates (touched fields only)
+            await self.store.save(campaign_id)
             
             return {
                 "success": True,
@@ -479,7 +497,8 @@ class AccountOrchestrator(SelfOptimizingAgent):
         else:
             return f"Hi {name}, reaching out about {company}."
     
-    async def check_conflicts(self, campaign_id: str) -> Dict:
+    async def check_conflicts(self, campaign_id: str,
+                              responses: Optional[Dict[str, Dict]] = None) -> Dict:
         """
         Check for conflicts that should pause campaign.
         
@@ -491,6 +510,7 @@ class AccountOrchestrator(SelfOptimizingAgent):
         
         Args:
             campaign_id: Campaign identifier
+            responses: Latest response per contact ID (None: query for this campaign)
             
         Returns:
             Conflict detection result
@@ -508,9 +528,12 @@ class AccountOrchestrator(SelfOptimizingAgent):
                 None
             )
             
-            if primary_contact and self.supabase:
-                # Query for responses from primary contact
-                response = await self._check_contact_response(primary_contact["contact_id"])
+            if primary_contact and (responses is not None or self.supabase):
+                # Prefetched by the sweep, else query for responses from primary contact
+                if responses is not None:
+                    response = responses.get(primary_contact["contact_id"])
+                else:
+                    response = await self._check_contact_response(primary_contact["contact_id"])
                 if response:
                     conflicts.append({
                         "type": "primary_responded",
@@ -553,9 +576,10 @@ class AccountOrchestrator(SelfOptimizingAgent):
         if conflict.get("should_pause"):
             campaign["status"] = CampaignStatus.PAUSED.value
             campaign["pause_reason"] = conflict["conflicts"][0]["type"]
+            self.store.touch(campaign_id, "status", "pause_reason")
+            self.store.unschedule(campaign_id)
             
-            if self.supabase:
-                await self._persist_campaign(campaign)
+            await self.store.save(campaign_id)
             
             logger.info(f"Campaign {campaign_id} paused due to: {campaign['pause_reason']}")
         
@@ -603,10 +627,12 @@ class AccountOrchestrator(SelfOptimizingAgent):
                 "status": "scheduled"
             }
             
-            # Store in campaign
+            # Store in campaign and the due-time index
             if "scheduled_touchpoints" not in campaign:
                 campaign["scheduled_touchpoints"] = []
             campaign["scheduled_touchpoints"].append(touchpoint)
+            self.store.touch(campaign_id, "scheduled_touchpoints")
+            self.store.schedule(campaign_id, scheduled_time)
             
             # Persist
             if self.supabase:
@@ -642,6 +668,7 @@ class AccountOrchestrator(SelfOptimizingAgent):
         if "touchpoints" not in campaign:
             campaign["touchpoints"] = []
         campaign["touchpoints"].append(touchpoint)
+        self.store.touch(campaign_id, "touchpoints")
         
         # Persist
         if self.supabase:
@@ -651,17 +678,6 @@ class AccountOrchestrator(SelfOptimizingAgent):
         
         return touchpoint
     
-    async def _persist_campaign(self, campaign: Dict):
-        """Persist campaign to database"""
-        if not self.supabase:
-            return
-        
-        try:
-            # Upsert campaign
-            self.supabase.table("campaigns").upsert(campaign).execute()
-        except Exception as e:
-            logger.error(f"Error persisting campaign: {str(e)}")
-    
     async def _persist_touchpoint(self, touchpoint: Dict):
         """Persist touchpoint to database"""
         if not self.supabase:
@@ -672,22 +688,6 @@ class AccountOrchestrator(SelfOptimizingAgent):
         except Exception as e:
             logger.error(f"Error persisting touchpoint: {str(e)}")
     
-    async def _load_campaign(self, campaign_id: str) -> Optional[Dict]:
-        """Load campaign from database"""
-        if not self.supabase:
-            return None
-        
-        try:
-            result = self.supabase.table("campaigns").select("*").eq("campaign_id", campaign_id).execute()
-            if result.data:
-                campaign = result.data[0]
-                self.active_campaigns[campaign_id] = campaign
-                return campaign
-        except Exception as e:
-            logger.error(f"Error loading campaign: {str(e)}")
-        
-        return None
-    
     async def _check_contact_response(self, contact_id: str) -> Optional[Dict]:
         """Check if contact has responded"""
         if not self.supabase:
@@ -703,6 +703,96 @@ class AccountOrchestrator(SelfOptimizingAgent):
         
         return None
     
+    async def _check_contact_responses(self, contact_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """Latest response per contact, for many contacts in one query (None on error)"""
+        if not self.supabase or not contact_ids:
+            return {}
+        
+        def query():
+            return self.supabase.table("responses").select("*").in_(
+                "contact_id", contact_ids
+            ).order("timestamp", desc=True).execute()
+        
+        responses = {}
+        try:
+            result = await asyncio.to_thread(query)
+            for row in result.data or []:
+                responses.setdefault(row["contact_id"], row)  # Newest first
+        except Exception as e:
+            logger.error(f"Error checking contact responses: {str(e)}")
+            return None  # Fall back to per-campaign checks
+        
+        return responses
+    
+    async def run_due_steps(self,
+                            now: Optional[datetime] = None,
+                            limit: Optional[int] = None,
+                            concurrency: Optional[int] = None) -> Dict:
+        """
+        Execute every due touchpoint across campaigns (the campaign scheduler's sweep).
+        
+        Only campaigns popped from the store's due-time index are touched, so
+        the cost follows the number of due steps, not of active campaigns.
+        Primary-contact responses for all of them are fetched in one query,
+        and steps run concurrently, at most `concurrency` at a time.
+        
+        Args:
+            now: Sweep time (default: utcnow)
+            limit: Max steps this sweep (default: config max_due_per_sweep)
+            concurrency: Max steps at once (default: config max_concurrent_steps)
+            
+        Returns:
+            Campaign IDs by outcome: executed, paused, failed (with errors)
+        """
+        now = now or datetime.utcnow()
+        summary = {"executed": [], "paused": [], "failed": {}}
+        campaigns = await self.store.pop_due(now, limit or self.config["max_due_per_sweep"])
+        if not campaigns:
+            return summary
+        
+        responses = None
+        if self.config["conflict_check_enabled"] and self.supabase:
+            primary_ids = [
+                contact["contact_id"]
+                for campaign in campaigns
+                for contact in campaign.get("contacts", [])
+                if contact.get("role") == ContactRole.PRIMARY.value
+            ]
+            responses = await self._check_contact_responses(primary_ids)
+        
+        semaphore = asyncio.Semaphore(concurrency or self.config["max_concurrent_steps"])
+        
+        async def run_step(campaign: Dict):
+            campaign_id = campaign["campaign_id"]
+            async with semaphore:
+                result = await self.execute_campaign_step(campaign_id, responses)
+            
+            if result.get("action") == "paused":
+                summary["paused"].append(campaign_id)
+            elif result.get("success"):
+                summary["executed"].append(campaign_id)
+            else:
+                summary["failed"][campaign_id] = result.get("error")
+            
+            # Still active but nothing scheduled (failed step, conflict without pausing):
+            # retry later rather than dropping the campaign from the index
+            if (campaign.get("status") == CampaignStatus.ACTIVE.value
+                    and self.store.due_at(campaign_id) is None):
+                retry_at = now + timedelta(minutes=self.config["step_retry_minutes"])
+                self.store.schedule(campaign_id, retry_at)
+                await self.store.save(campaign_id)
+        
+        await asyncio.gather(*(run_step(campaign) for campaign in campaigns))
+        
+        for outcome in ("executed", "paused", "failed"):
+            if summary[outcome]:
+                campaign_steps.inc(len(summary[outcome]), outcome=outcome)
+        logger.info(
+            f"Campaign sweep: {len(summary['executed'])} steps executed, "
+            f"{len(summary['paused'])} paused, {len(summary['failed'])} failed"
+        )
+        return summary
+    
     def get_campaign_status(self, campaign_id: str) -> Optional[Dict]:
         """Get current campaign status and metrics"""
         campaign = self.active_campaigns.get(campaign_id)
@@ -721,3 +811,35 @@ class AccountOrchestrator(SelfOptimizingAgent):
             "created_at": campaign["created_at"],
             "last_updated": campaign["last_updated"]
         }
+
+
+# Shared instance
+_account_orchestrator: Optional[AccountOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_account_orchestrator() -> AccountOrchestrator:
+    """Get or create the process-wide, Supabase-backed AccountOrchestrator.
+
+    InboundAgent and FollowUpAgent start and advance campaigns through it and
+    the scheduler's campaign sweep (scheduler.run_due_campaign_steps) runs
+    their due steps, so all of them share one store and due-time index.
+    Without Supabase credentials campaigns are kept in memory.
+    """
+    global _account_orchestrator
+    if _account_orchestrator is None:
+        with _orchestrator_lock:
+            if _account_orchestrator is None:
+                supabase = None
+                try:
+                    from config.settings import settings
+                    from supabase import create_client
+
+                    if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+                        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+                    else:
+                        logger.warning("⚠️ No Supabase credentials, ABM campaigns kept in memory")
+                except Exception as e:
+                    logger.error(f"❌ Campaign store Supabase init failed, campaigns kept in memory: {e}")
+                _account_orchestrator = AccountOrchestrator(supabase_client=supabase)
+    return _account_orchestrator
@@ -2,7 +2,7 @@
 
 This agent:
 - Queries Supabase for lead data
-- Pulls GMass campaign metrics via API
+- Pulls GMass campaign metrics via API (through a locally synced stats cache)
 - Provides REAL data, never hallucinates
 - Returns structured audit reports
 
@@ -12,11 +12,12 @@ NOT a conversational agent - it's a data retrieval agent.
 import os
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import httpx
+from datetime import datetime
 from supabase import create_client, Client
 import dspy
 from agents.base_agent import SelfOptimizingAgent, AgentRules
+from core.campaign_stats import get_campaign_stats_cache
+from core.lead_analytics import get_lead_analytics
 
 logger = logging.getLogger(__name__)
 
@@ -144,51 +145,19 @@ class AuditAgent(SelfOptimizingAgent):
     
     async def _get_leads_from_supabase(self, hours: int) -> Dict[str, Any]:
         """Query Supabase for lead data."""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        
         try:
-            # Query all leads in timeframe (Phase 0 Fix: removed non-existent submitted_at column)
-            response = self.supabase.table('leads').select(
-                'id, email, first_name, last_name, company, qualification_tier, qualification_score, '
-                'status, created_at, updated_at'
-            ).gte('created_at', cutoff_time.isoformat()).execute()
-            
-            leads = response.data
+            leads = await get_lead_analytics().window(self.supabase, hours=hours)
             
-            # Count by tier
-            tier_counts = {}
-            for lead in leads:
-                tier = lead.get('qualification_tier', 'UNQUALIFIED')
-                tier_counts[tier] = tier_counts.get(tier, 0) + 1
-            
-            # Calculate processing time (created_at to updated_at as proxy for speed-to-lead)
+            # Processing time (created_at to updated_at as proxy for speed-to-lead)
             # Note: submitted_at column doesn't exist, using updated_at as alternative
-            speed_to_lead_times = []
-            for lead in leads:
-                if lead.get('created_at') and lead.get('updated_at'):
-                    try:
-                        created = datetime.fromisoformat(lead['created_at'].replace('Z', '+00:00'))
-                        updated = datetime.fromisoformat(lead['updated_at'].replace('Z', '+00:00'))
-                        diff_seconds = (updated - created).total_seconds()
-                        if diff_seconds > 0:  # Only count if updated after created
-                            speed_to_lead_times.append(diff_seconds)
-                    except:
-                        pass  # Skip invalid timestamps
-            
-            avg_speed_to_lead = (
-                sum(speed_to_lead_times) / len(speed_to_lead_times)
-                if speed_to_lead_times else 0
-            )
+            speed_to_lead = leads['updated_at'] - leads['created_at']
+            speed_to_lead = speed_to_lead[speed_to_lead > 0]  # Only count if updated after created
             
             return {
                 "total_leads": len(leads),
-                "tier_distribution": tier_counts,
-                "average_speed_to_lead_seconds": round(avg_speed_to_lead, 2),
-                "average_qualification_score": round(
-                    sum(l.get('qualification_score', 0) for l in leads) / len(leads)
-                    if leads else 0,
-                    2
-                ),
+                "tier_distribution": leads.count_by('tier'),
+                "average_speed_to_lead_seconds": round(float(speed_to_lead.mean()) if len(speed_to_lead) else 0, 2),
+                "average_qualification_score": round(leads.mean('score'), 2),
                 "leads_detail": [
                     {
                         "name": f"{l.get('first_name', 'Unknown')} {l.get('last_name', '')}".strip(),
@@ -199,7 +168,7 @@ class AuditAgent(SelfOptimizingAgent):
                         "status": l.get('status'),
                         "created_at": l.get('created_at')
                     }
-                    for l in leads
+                    for l in leads.rows
                 ]
             }
         
@@ -208,94 +177,11 @@ class AuditAgent(SelfOptimizingAgent):
             raise
     
     async def _get_email_data_from_gmass(self, hours: int) -> Dict[str, Any]:
-        """Query GMass API for campaign data."""
+        """Campaign metrics for the window, answered from the synced GMass stats cache."""
         try:
-            async with httpx.AsyncClient() as client:
-                # Get recent campaigns
-                response = await client.get(
-                    "https://api.gmass.co/api/campaigns",
-                    headers={"X-apikey": self.gmass_api_key},
-                    timeout=30.0
-                )
-                
-                if response.status_code != 200:
-                    raise Exception(f"GMass API returned {response.status_code}: {response.text}")
-                
-                campaigns = response.json()
-                
-                # Filter to recent campaigns (within timeframe)
-                cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-                recent_campaigns = []
-                
-                for campaign in campaigns:
-                    # GMass returns creationTime in format like "2019-08-24T14:15:22Z"
-                    creation_time_str = campaign.get('creationTime', '')
-                    if creation_time_str:
-                        try:
-                            creation_time = datetime.fromisoformat(creation_time_str.replace('Z', '+00:00'))
-                            if creation_time >= cutoff_time:
-                                recent_campaigns.append(campaign)
-                        except:
-                            # If no valid creationTime, include campaign anyway (better to have data)
-                            recent_campaigns.append(campaign)
-                    else:
-                        # If no creationTime field, include campaign (better to have data)
-                        recent_campaigns.append(campaign)
-                
-                # Calculate aggregate metrics from statistics object
-                # GMass nests stats in a 'statistics' object per campaign
-                total_recipients = sum(c.get('statistics', {}).get('recipients', 0) for c in recent_campaigns)
-                total_opens = sum(c.get('statistics', {}).get('opens', 0) for c in recent_campaigns)
-                total_clicks = sum(c.get('statistics', {}).get('clicks', 0) for c in recent_campaigns)
-                total_replies = sum(c.get('statistics', {}).get('replies', 0) for c in recent_campaigns)
-                total_bounces = sum(c.get('statistics', {}).get('bounces', 0) for c in recent_campaigns)
-                total_blocks = sum(c.get('statistics', {}).get('blocks', 0) for c in recent_campaigns)
-                
-                # Calculate delivered as recipients minus bounces and blocks
-                total_delivered = total_recipients - total_bounces - total_blocks
-                
-                return {
-                    "total_campaigns": len(recent_campaigns),
-                    "total_emails_sent": total_recipients,
-                    "deliverability_rate": round(
-                        (total_delivered / total_recipients * 100) if total_recipients > 0 else 0,
-                        2
-                    ),
-                    "open_rate": round(
-                        (total_opens / total_delivered * 100) if total_delivered > 0 else 0,
-                        2
-                    ),
-                    "click_rate": round(
-                        (total_clicks / total_delivered * 100) if total_delivered > 0 else 0,
-                        2
-                    ),
-                    "reply_rate": round(
-                        (total_replies / total_delivered * 100) if total_delivered > 0 else 0,
-                        2
-                    ),
-                    "bounce_rate": round(
-                        (total_bounces / total_recipients * 100) if total_recipients > 0 else 0,
-                        2
-                    ),
-                    "campaigns_detail": [
-                        {
-                            "campaign_id": c.get('campaignId'),
-                            "name": c.get('friendlyName', c.get('subject')),
-                            "sent": c.get('statistics', {}).get('recipients', 0),
-                            "delivered": c.get('statistics', {}).get('recipients', 0) - c.get('statistics', {}).get('bounces', 0) - c.get('statistics', {}).get('blocks', 0),
-                            "opens": c.get('statistics', {}).get('opens', 0),
-                            "clicks": c.get('statistics', {}).get('clicks', 0),
-                            "replies": c.get('statistics', {}).get('replies', 0),
-                            "bounces": c.get('statistics', {}).get('bounces', 0),
-                            "blocks": c.get('statistics', {}).get('blocks', 0),
-                            "unsubscribes": c.get('statistics', {}).get('unsubscribes', 0),
-                            "creation_time": c.get('creationTime'),
-                            "status": c.get('status'),
-                            "stage": c.get('stage')
-                        }
-                        for c in recent_campaigns
-                    ]
-                }
+            cache = get_campaign_stats_cache(self.gmass_api_key)
+            await cache.ensure_fresh()
+            return cache.window(hours)
         
         except Exception as e:
             logger.error(f"GMass API query error: {e}")
@@ -12,17 +12,21 @@ Provides:
 - MCP tool exposure
 - Extension system (Agent Zero pattern)
 - Error recovery (RepairableException pattern)
+- Compiled-program loading (optimized-program registry)
 """
 
 import dspy
 import logging
 import asyncio
+import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 from abc import ABC, abstractmethod
 from uuid import uuid4
 
+from core.metrics import instrument_agent_call
+
 logger = logging.getLogger(__name__)
 
 # ===== EXTENSION SYSTEM (Agent Zero Pattern) =====
@@ -300,7 +304,16 @@ class PermissionManager:
 
 # ===== SELF-OPTIMIZING AGENT BASE CLASS =====
 
-class SelfOptimizingAgent(dspy.Module):
+class _SelfOptimizingAgentMeta(type(dspy.Module)):
+    """Loads the active compiled program once a subclass __init__ has built its modules."""
+
+    def __call__(cls, *args, **kwargs):
+        agent = super().__call__(*args, **kwargs)
+        agent.load_optimized_program()
+        return agent
+
+
+class SelfOptimizingAgent(dspy.Module, metaclass=_SelfOptimizingAgentMeta):
     """Base class for ALL agents with extension system and error recovery."""
 
     def __init__(self, agent_name: str, rules: AgentRules):
@@ -328,8 +341,31 @@ class SelfOptimizingAgent(dspy.Module):
         # Agent ID for state persistence
         self.agent_id = str(uuid4())
 
+        # Compiled program loaded from the registry (set by load_optimized_program)
+        self.optimized_version = None
+
         logger.info(f"✅ {agent_name} initialized with {rules.optimizer} optimizer")
 
+    def load_optimized_program(self) -> None:
+        """Load the active compiled program for this agent, if one is registered.
+
+        Runs automatically after construction. Disable with
+        LOAD_OPTIMIZED_PROGRAMS=false. Failures are logged and the agent keeps
+        its un-optimized program.
+        """
+        if os.getenv("LOAD_OPTIMIZED_PROGRAMS", "true").lower() != "true":
+            return
+
+        try:
+            from optimization.program_registry import get_program_registry
+
+            version = get_program_registry().load_active(self.agent_name, self)
+            if version:
+                self.optimized_version = version
+                logger.info(f"✅ {self.agent_name}: loaded compiled program v{version.version} ({version.optimizer})")
+        except Exception as e:
+            logger.warning(f"⚠️ {self.agent_name}: could not load compiled program: {e}")
+
     def register_extension(self, hook_name: str, extension: AgentExtension) -> None:
         """Register an extension for a specific hook."""
         if hook_name not in self.extensions:
@@ -363,6 +399,7 @@ class SelfOptimizingAgent(dspy.Module):
 
         return results
 
+    @instrument_agent_call("execute")
     async def execute_with_monitoring(
         self,
         task: str,
@@ -559,10 +596,16 @@ Analyze the error and suggest a fix. Then retry the task with the fix applied.""
                 optimizer = BootstrapFewShot(metric=metric, max_bootstrapped_demos=4)
                 optimized = optimizer.compile(student=self, trainset=trainset)
 
-                save_path = f"optimized_{self.agent_name.lower()}_bootstrap.json"
-                optimized.save(save_path)
+                from optimization.program_registry import get_program_registry, trainset_hash
+
+                version = get_program_registry().register(
+                    self.agent_name,
+                    optimized,
+                    optimizer="bootstrap",
+                    trainset_hash=trainset_hash(trainset)
+                )
 
-                logger.info(f"✅ BootstrapFewShot optimization complete!")
+                logger.info(f"✅ BootstrapFewShot optimization complete! (program v{version.version})")
 
         except Exception as e:
             logger.error(f"❌ Optimization failed for {self.agent_name}: {e}")
@@ -15,20 +15,32 @@ import logging
 import asyncio
 
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.types import Command
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from models import Lead, LeadTier, LeadStatus
-from utils.slack_client import SlackClient
 from utils.email_client import EmailClient
 from config.settings import settings
-from agents.account_orchestrator import AccountOrchestrator
+from agents.account_orchestrator import get_account_orchestrator
 from core.company_graph import CompanyGraph
+from core.slack_outbox import get_slack_outbox
+from core.journey_checkpoints import (
+    aget_journey_checkpointer,
+    get_journey_checkpointer,
+    grouped_writes,
+    load_journey_states,
+)
+from core.metrics import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SWEEP_CONCURRENCY = 8
+TERMINAL_STATUSES = {LeadStatus.RESPONDED.value, LeadStatus.COLD.value, LeadStatus.CONVERTED.value}
+
+journeys_advanced = get_metrics_registry().counter(
+    "follow_up_journeys", "Lead journeys handled by follow-up sweeps", ("outcome",))
+
 
 # Define the agent state
 
@@ -74,7 +86,7 @@ class FollowUpAgent(SelfOptimizingAgent):
         # Initialize base class
         super().__init__(agent_name="FollowUpAgent", rules=rules)
         
-        self.slack = SlackClient()
+        self.slack = get_slack_outbox()
         self.email_client = EmailClient()
 
         # Initialize LLM with OpenRouter Sonnet 4.5 (fallback to Anthropic direct)
@@ -98,14 +110,15 @@ class FollowUpAgent(SelfOptimizingAgent):
             self.llm = None
             logger.warning("⚠️ No LLM configured for follow-up agent")
 
-        # Build the state graph
+        # Build the state graph (sync); the async one is compiled on first use
         self.graph = self._build_graph()
+        self._async_graph = None
 
         # ABM Campaign Integration
-        self.orchestrator = AccountOrchestrator()
+        self.orchestrator = get_account_orchestrator()  # Shared with InboundAgent and the campaign sweep
         self.company_graph = CompanyGraph()
 
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self, checkpointer=None) -> StateGraph:
         """Build the LangGraph state machine for lead journey."""
 
         workflow = StateGraph(LeadJourneyState)
@@ -152,49 +165,20 @@ class FollowUpAgent(SelfOptimizingAgent):
 
         # Compile with PostgreSQL persistence (survives restarts)
         # Falls back to in-memory if no DATABASE_URL configured
-        checkpointer = self._get_checkpointer()
+        if checkpointer is None:
+            checkpointer = self._get_checkpointer()
         return workflow.compile(checkpointer=checkpointer)
-    
+
     def _get_checkpointer(self):
-        """Get PostgreSQL checkpointer or fallback to in-memory.
-        
-        Returns:
-            PostgresSaver if DATABASE_URL is set, otherwise MemorySaver
-        """
-        database_url = os.getenv("DATABASE_URL")
-        
-        if database_url:
-            try:
-                # PostgresSaver.from_conn_string() returns a context manager
-                # We need to use it with setup() for sync usage
-                import psycopg
-                from psycopg_pool import ConnectionPool
-                
-                # Create connection pool with faster timeout settings
-                conn_pool = ConnectionPool(
-                    database_url,
-                    min_size=1,
-                    max_size=5,
-                    timeout=5.0,  # 5 second timeout
-                    open=False  # Don't pre-connect, lazy connect
-                )
-                
-                # Open the pool (this actually establishes connections)
-                conn_pool.open()
-                
-                checkpointer = PostgresSaver(conn_pool)
-                
-                # Setup the checkpointer (creates tables if needed)
-                checkpointer.setup()
-                
-                logger.info("✅ Follow-up agent: Using PostgreSQL checkpointer")
-                return checkpointer
-            except Exception as e:
-                logger.warning(f"⚠️ PostgreSQL checkpointer failed, using in-memory: {e}")
-                return MemorySaver()
-        else:
-            logger.warning("⚠️ No DATABASE_URL set, using in-memory checkpointer (state lost on restart)")
-            return MemorySaver()
+        """Get the shared sync checkpointer (PostgresSaver, or MemorySaver without a database)."""
+        return get_journey_checkpointer()
+
+    async def _get_async_graph(self):
+        """Graph compiled against the shared async checkpointer (for ainvoke)."""
+        checkpointer = await aget_journey_checkpointer()
+        if self._async_graph is None or self._async_graph.checkpointer is not checkpointer:
+            self._async_graph = self._build_graph(checkpointer)
+        return self._async_graph
 
     # ===== NODES (Actions) =====
 
@@ -333,13 +317,14 @@ class FollowUpAgent(SelfOptimizingAgent):
             else:
                 message = f"👀 Lead {state['first_name']} is being monitored"
 
-            # Post as thread reply
-            self.slack.post_thread_reply(
-                channel=state['slack_channel'],
-                thread_ts=state['slack_thread_ts'],
-                text=message
+            # Queue as thread reply (progress updates in one window are coalesced)
+            self.slack.notify(
+                state['slack_channel'],
+                message,
+                key="journey_progress",
+                thread_ts=state['slack_thread_ts']
             )
-            logger.info(f"Slack updated for lead {state['lead_id']}")
+            logger.info(f"Slack update queued for lead {state['lead_id']}")
 
         except Exception as e:
             state['error'] = f"Slack update error: {str(e)}"
@@ -361,11 +346,13 @@ Follow-ups sent: {state['follow_up_count']}
 @channel - Someone should reach out ASAP!
 """
 
-            self.slack.post_thread_reply(
-                channel=state['slack_channel'],
-                thread_ts=state['slack_thread_ts'],
-                text=message
-            )
+            if state.get('slack_thread_ts'):
+                self.slack.post(
+                    state['slack_channel'],
+                    message,
+                    thread_ts=state['slack_thread_ts'],
+                    kind="journey_status"
+                )
 
             state['status'] = LeadStatus.RESPONDED.value
             state['escalated'] = True
@@ -389,11 +376,13 @@ No response received after {state['follow_up_count']} attempts.
 Moving to nurture campaign.
 """
 
-            self.slack.post_thread_reply(
-                channel=state['slack_channel'],
-                thread_ts=state['slack_thread_ts'],
-                text=message
-            )
+            if state.get('slack_thread_ts'):
+                self.slack.post(
+                    state['slack_channel'],
+                    message,
+                    thread_ts=state['slack_thread_ts'],
+                    kind="journey_status"
+                )
 
             state['status'] = LeadStatus.COLD.value
             logger.info(f"Lead marked cold: {state['lead_id']}")
@@ -431,25 +420,21 @@ Moving to nurture campaign.
 
     # ===== PUBLIC API =====
 
-    def start_lead_journey(
+    def _initial_state(
         self,
         lead: Lead = None,
         tier: LeadTier = None,
         slack_thread_ts: str = None,
         slack_channel: str = "C09FZT6T1A5",  # ai-test channel ID
-        # Alternative parameter names for direct invocation
         lead_id: str = None,
         email: str = None,
         first_name: str = None,
         company: str = None,
         tier_value: str = None
-    ) -> dict:
-        """Start the autonomous journey for a new lead.
-        
-        Can be called with either:
-        - lead object: start_lead_journey(lead=lead, tier=tier, ...)
-        - individual params: start_lead_journey(lead_id=..., email=..., ...)
-        """
+    ) -> LeadJourneyState:
+        """Initial journey state from either calling convention of start_lead_journey."""
+        # Callers pass a LeadTier or its string value
+        tier_name = getattr(tier, "value", tier)
 
         # Handle both calling conventions
         if lead:
@@ -457,18 +442,18 @@ Moving to nurture campaign.
             actual_lead_id = lead.id
             actual_email = lead.email
             actual_first_name = lead.first_name or "there"
-            actual_tier = tier.value if tier else "UNQUALIFIED"
+            actual_tier = tier_name or "UNQUALIFIED"
             actual_company = lead.company or "your company"
         else:
             # New signature (individual parameters)
             actual_lead_id = lead_id
             actual_email = email
             actual_first_name = first_name or "there"
-            actual_tier = tier_value or (tier.value if tier else "UNQUALIFIED")
+            actual_tier = tier_value or tier_name or "UNQUALIFIED"
             actual_company = company or "your company"
 
-        initial_state: LeadJourneyState = {
-            "lead_id": actual_lead_id,
+        return {
+            "lead_id": str(actual_lead_id) if actual_lead_id is not None else None,
             "email": actual_email,
             "first_name": actual_first_name,
             "company": actual_company,
@@ -486,26 +471,145 @@ Moving to nurture campaign.
             "error": None,
         }
 
-        config = {"configurable": {"thread_id": actual_lead_id}}
-        result = self.graph.invoke(initial_state, config)
+    def start_lead_journey(self, lead: Lead = None, tier: LeadTier = None, **kwargs) -> dict:
+        """Start the autonomous journey for a new lead (blocking; prefer astart_lead_journey).
+
+        Can be called with either:
+        - lead object: start_lead_journey(lead=lead, tier=tier, ...)
+        - individual params: start_lead_journey(lead_id=..., email=..., ...)
+        """
+        initial_state = self._initial_state(lead, tier, **kwargs)
+        config = {"configurable": {"thread_id": initial_state["lead_id"]}}
+        return self.graph.invoke(initial_state, config)
+
+    async def astart_lead_journey(self, lead: Lead = None, tier: LeadTier = None, **kwargs) -> dict:
+        """Start the autonomous journey for a new lead without blocking the event loop.
+
+        Same arguments as start_lead_journey. Nodes run in worker threads and
+        the journey is checkpointed once, when the run ends.
+        """
+        initial_state = self._initial_state(lead, tier, **kwargs)
+        config = {"configurable": {"thread_id": initial_state["lead_id"]}}
+        graph = await self._get_async_graph()
+        return await graph.ainvoke(initial_state, config, durability="exit")
 
-        return result
+    @staticmethod
+    def _continue_command(response_received: bool) -> Command:
+        # The journey ENDs after each step; resume it at the follow-up decision
+        update = {"response_received": True} if response_received else None
+        return Command(goto="wait_for_response", update=update)
 
     def continue_lead_journey(
         self,
         lead_id: str,
         response_received: bool = False
     ) -> dict:
-        """Continue the journey for an existing lead (called by scheduled task)."""
+        """Continue the journey for an existing lead (blocking; prefer acontinue_lead_journey)."""
 
         config = {"configurable": {"thread_id": lead_id}}
         current_state = self.graph.get_state(config)
+        if not current_state.values:
+            logger.warning(f"⚠️ No journey found for lead {lead_id}")
+            return {}
+        if current_state.values.get("status") in TERMINAL_STATUSES:
+            return current_state.values
+
+        return self.graph.invoke(self._continue_command(response_received), config)
+
+    async def acontinue_lead_journey(
+        self,
+        lead_id: str,
+        response_received: bool = False
+    ) -> dict:
+        """Continue the journey for an existing lead (called by scheduled task)."""
+        summary = await self.advance_journeys(
+            [lead_id], responded=[lead_id] if response_received else (), due_only=False
+        )
+        return summary["states"].get(lead_id, {})
+
+    def is_follow_up_due(self, state: dict, now: datetime = None) -> bool:
+        """Whether a paused journey should be advanced now (response, or its cadence elapsed)."""
+        if state.get("status") in TERMINAL_STATUSES or state.get("escalated"):
+            return False
+        if state.get("response_received"):
+            return True
+        if not state.get("email_sent"):
+            return False
+        last_contact = state.get("last_follow_up_at") or state.get("email_sent_at")
+        if last_contact is None:
+            return True
+        now = now or datetime.utcnow()
+        return (now - last_contact).total_seconds() >= state.get("next_follow_up_hours", 24) * 3600
+
+    async def advance_journeys(
+        self,
+        lead_ids,
+        responded=(),
+        concurrency: int = None,
+        due_only: bool = True,
+        now: datetime = None
+    ) -> dict:
+        """Advance many lead journeys in one sweep (the hourly follow-up job).
 
-        if response_received:
-            current_state.values['response_received'] = True
+        Journey states are read in one grouped query; journeys that are due
+        (or in `responded`) are resumed concurrently, at most `concurrency`
+        at a time (FOLLOWUP_SWEEP_CONCURRENCY, default 8), and their
+        checkpoints are committed in grouped transactions.
 
-        result = self.graph.invoke(None, config)
-        return result
+        Returns:
+            {"advanced": [...], "skipped": [...], "missing": [...],
+             "failed": {lead_id: error}, "states": {lead_id: final state}}
+        """
+        lead_ids = list(dict.fromkeys(str(lead_id) for lead_id in lead_ids))
+        responded = {str(lead_id) for lead_id in responded}
+        concurrency = concurrency or int(os.getenv("FOLLOWUP_SWEEP_CONCURRENCY", str(DEFAULT_SWEEP_CONCURRENCY)))
+        summary = {"advanced": [], "skipped": [], "missing": [], "failed": {}, "states": {}}
+        if not lead_ids:
+            return summary
+
+        graph = await self._get_async_graph()
+        checkpointer = graph.checkpointer
+        try:
+            states = await load_journey_states(checkpointer, lead_ids)
+            due = []
+            for lead_id in lead_ids:
+                state = states.get(lead_id)
+                if not state:
+                    summary["missing"].append(lead_id)
+                elif state.get("status") in TERMINAL_STATUSES:
+                    summary["skipped"].append(lead_id)
+                    summary["states"][lead_id] = state
+                elif lead_id in responded or not due_only or self.is_follow_up_due(state, now):
+                    due.append(lead_id)
+                else:
+                    summary["skipped"].append(lead_id)
+                    summary["states"][lead_id] = state
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def advance(lead_id: str):
+                async with semaphore:
+                    try:
+                        summary["states"][lead_id] = await graph.ainvoke(
+                            self._continue_command(lead_id in responded),
+                            {"configurable": {"thread_id": lead_id}},
+                            durability="exit"
+                        )
+                        summary["advanced"].append(lead_id)
+                    except Exception as e:
+                        summary["failed"][lead_id] = str(e)
+                        logger.error(f"❌ Failed to advance journey for lead {lead_id}: {e}")
+
+            async with grouped_writes(checkpointer):
+                await asyncio.gather(*(advance(lead_id) for lead_id in due))
+        finally:
+            if hasattr(checkpointer, "discard_prefetched"):
+                checkpointer.discard_prefetched(lead_ids)
+
+        for outcome in ("advanced", "skipped", "missing", "failed"):
+            if summary[outcome]:
+                journeys_advanced.inc(len(summary[outcome]), outcome=outcome)
+        return summary
 
     async def respond(self, message: str) -> str:
         """A2A endpoint - respond to inter-agent messages about lead follow-up.
@@ -573,7 +677,7 @@ Moving to nurture campaign.
             # Execute action
             if action == 'start':
                 # Start new follow-up journey
-                journey_result = self.start_lead_journey(
+                journey_result = await self.astart_lead_journey(
                     lead_id=lead_id,
                     email=lead_data.get('email') or data.get('email'),
                     first_name=data.get('name', lead_data.get('first_name', 'there')).split()[0] if data.get('name') or lead_data.get('first_name') else 'there',
@@ -597,7 +701,7 @@ Moving to nurture campaign.
                 
             elif action == 'continue':
                 # Continue existing journey
-                journey_result = self.continue_lead_journey(lead_id=lead_id)
+                journey_result = await self.acontinue_lead_journey(lead_id=lead_id)
                 
                 response_parts = [
                     f"📧 **Follow-up Journey Continued: {lead_data.get('name')}**",
@@ -28,8 +28,10 @@ from dspy_modules import (
 )
 # from core import settings as core_settings  # Not needed - using config.settings
 from core.company_context import get_company_context_for_qualification
+from core.metrics import instrument_agent_call
+from core.prequalification import get_prequalifier
 from config.settings import settings
-from agents.account_orchestrator import AccountOrchestrator
+from agents.account_orchestrator import get_account_orchestrator
 import logging
 
 # Configure logging for debugging
@@ -100,13 +102,192 @@ class InboundAgent(SelfOptimizingAgent):
         # Agent Zero Memory System
         self.memory = get_agent_memory("inbound_agent")
 
-        # ABM Campaign Orchestrator
-        self.orchestrator = AccountOrchestrator()
+        # ABM Campaign Orchestrator (shared with FollowUpAgent and the campaign sweep)
+        self.orchestrator = get_account_orchestrator()
 
 
+    @instrument_agent_call("qualify")
     def forward(self, lead: Lead) -> QualificationResult:
         """Process and qualify a lead.
 
+        Qualifies with qualify(), then saves the lead to memory, starts an
+        ABM campaign for WARM+ leads and records agent state.
+
+        Args:
+            lead: Lead object to qualify
+
+        Returns:
+            QualificationResult with score, reasoning, and next actions
+        """
+        result = self.qualify(lead)
+        self._record_outcome(lead, result)
+
+        # Save agent state to database (async, non-blocking)
+        try:
+            import asyncio
+
+            # Check if we're in an async context (event loop running)
+            try:
+                loop = asyncio.get_running_loop()
+                # Create task to save state without blocking
+                loop.create_task(self._save_state(lead, result))
+            except RuntimeError:
+                # No event loop - we're in sync context, skip state saving
+                logger.warning("⚠️ InboundAgent running in sync context, skipping state save")
+        except Exception as e:
+            # Non-critical - log but don't fail qualification
+            logger.warning(f"⚠️ Failed to save InboundAgent state (non-critical): {e}")
+
+        return result
+
+    @instrument_agent_call("qualify")
+    async def aforward(self, lead: Lead) -> QualificationResult:
+        """forward() for callers on the event loop.
+
+        qualify() makes blocking LM calls, so it runs in a worker thread; the
+        memory save, campaign and agent-state write are started from the loop
+        (in the thread there is no running loop and the state save is skipped).
+
+        Args:
+            lead: Lead object to qualify
+
+        Returns:
+            QualificationResult with score, reasoning, and next actions
+        """
+        result = await asyncio.to_thread(self.qualify, lead)
+        self._record_outcome(lead, result)
+        try:
+            await self._save_state(lead, result)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save InboundAgent state (non-critical): {e}")
+        return result
+
+    def _record_outcome(self, lead: Lead, result: QualificationResult):
+        """Save the lead to memory and start an ABM campaign for WARM+ leads."""
+        tier = result.tier
+        total_score = result.score
+        is_qualified = result.is_qualified
+        reasoning = result.reasoning
+        next_actions = result.next_actions
+
+        # AGENT ZERO MEMORY: Save this lead for future learning
+        try:
+            # Convert LeadTier to MemoryLeadTier
+            memory_tier_map = {
+                LeadTier.SCORCHING: MemoryLeadTier.SCORCHING,
+                LeadTier.HOT: MemoryLeadTier.HOT,
+                LeadTier.WARM: MemoryLeadTier.WARM,
+                LeadTier.COOL: MemoryLeadTier.COOL,
+                LeadTier.COLD: MemoryLeadTier.COLD,
+                LeadTier.UNQUALIFIED: MemoryLeadTier.UNQUALIFIED,
+            }
+
+            lead_memory = LeadMemory(
+                lead_id=lead.id,
+                email=lead.email,
+                company=lead.get_field('company'),
+                qualification_score=total_score,
+                tier=memory_tier_map.get(tier, MemoryLeadTier.UNQUALIFIED),
+                practice_size=lead.get_field('business_size'),
+                patient_volume=lead.get_field('patient_volume'),
+                industry=lead.get_field('industry') or 'Healthcare',
+                strategy_used=str(next_actions[0].value) if (next_actions and len(next_actions) > 0 and hasattr(next_actions[0], 'value')) else (str(next_actions[0]) if (next_actions and len(next_actions) > 0) else None),
+                converted=None,  # Will be updated later when we know conversion
+                key_insights=reasoning[:500] if reasoning else None,
+            )
+
+            # Save to memory (async)
+            # Check if we're in an async context
+            try:
+                # Ensure asyncio is available - import at function level to avoid scope issues
+                import asyncio
+                loop = asyncio.get_running_loop()
+                # We're in async context - create task
+                loop.create_task(self.memory.save_lead_memory(lead_memory))
+                print(f"💾 Queued lead save to memory: {lead.email}")
+            except RuntimeError:
+                # No event loop - we're in sync context
+                import asyncio
+                memory_id = asyncio.run(self.memory.save_lead_memory(lead_memory))
+                print(f"💾 Saved lead to memory: {lead.email} (ID: {memory_id})")
+        except Exception as e:
+            # Graceful degradation - continue even if memory save fails
+            print(f"⚠️ Memory save failed (non-critical): {e}")
+
+        
+        # ABM CAMPAIGN: Initiate multi-contact campaign for qualified leads
+        campaign_id = None
+        if is_qualified and tier in [LeadTier.SCORCHING, LeadTier.HOT, LeadTier.WARM]:
+            try:
+                # Shape expected by AccountOrchestrator.process_new_lead (primary contact + metadata)
+                campaign_data = {
+                    'account_id': str(lead.id),
+                    'id': str(lead.id),
+                    'name': f"{lead.get_field('first_name', '')} {lead.get_field('last_name', '')}".strip() or 'Unknown',
+                    'email': lead.email,
+                    'phone': lead.get_field('phone'),
+                    'title': lead.get_field('title') or 'Unknown',
+                    'metadata': {
+                        'company_name': lead.get_field('company') or 'Unknown Company',
+                        'inquiry_topic': lead.get_field('ai_summary') or lead.get_field('use_case') or 'our platform',
+                        'qualification_tier': tier.value,
+                        'qualification_score': total_score,
+                        'business_size': lead.get_field('business_size'),
+                        'patient_volume': lead.get_field('patient_volume'),
+                    },
+                }
+                # Check if we're in an async context
+                try:
+                    # Ensure asyncio is available - import at function level to avoid scope issues
+                    import asyncio
+                    loop = asyncio.get_running_loop()
+                    # We're in async context - create task
+                    task = loop.create_task(self.orchestrator.process_new_lead(campaign_data))
+                    # Don't await - run in background
+                    print(f"🎯 ABM Campaign queued for {lead.email} (tier: {tier.value})")
+                    # Optionally store task for later retrieval
+                    campaign_id = None  # Will be None since we're not awaiting
+                except RuntimeError:
+                    # No event loop - we're in sync context
+                    import asyncio
+                    campaign_result = asyncio.run(self.orchestrator.process_new_lead(campaign_data))
+                    campaign_id = campaign_result.get('campaign_id')
+                    print(f"🎯 ABM Campaign initiated: {campaign_id} for {lead.email} (tier: {tier.value})")
+            except Exception as e:
+                print(f"⚠️ ABM campaign initiation failed (non-critical): {e}")
+                campaign_id = None
+        if campaign_id:
+            result.campaign_id = campaign_id
+
+        logger.info(f"✅ Qualification complete - Tier: {result.tier if 'result' in locals() else 'unknown'}, Score: {result.score if 'result' in locals() else 0}")
+
+    async def _save_state(self, lead: Lead, result: QualificationResult):
+        """Record this qualification in agent_state."""
+        from core.async_supabase_client import save_agent_state
+
+        next_actions = result.next_actions
+        await save_agent_state(
+            agent_name='InboundAgent',
+            lead_id=str(lead.id),
+            state_data={
+                'qualification_tier': result.tier.value,
+                'qualification_score': result.score,
+                'reasoning': result.reasoning[:500] if result.reasoning else None,
+                'next_actions': [str(action.value) if hasattr(action, 'value') else str(action) for action in next_actions] if next_actions else [],
+                'processing_time_ms': result.processing_time_ms,
+                'model_used': settings.PRIMARY_MODEL
+            },
+            status='completed'
+        )
+
+    def qualify(self, lead: Lead) -> QualificationResult:
+        """Score and tier a lead without side effects.
+
+        No memory, campaign or agent-state writes - batch re-scoring
+        (core/batch_qualification.py) uses this directly. Clearly
+        unqualified leads are decided by the pre-qualifier
+        (core/prequalification.py) without any LLM call.
+
         Args:
             lead: Lead object to qualify
 
@@ -115,9 +296,14 @@ class InboundAgent(SelfOptimizingAgent):
         """
         start_time = time.time()
 
+        prequalification = get_prequalifier().evaluate(lead)
+        if prequalification.rejected:
+            logger.info(f"⏭️ Pre-qualified lead {lead.id} as UNQUALIFIED ({', '.join(prequalification.reasons)}) - skipping LLM")
+            return prequalification.to_result()
+
         # COMPATIBILITY FIX: Extract semantic fields from old Typeform field IDs
         # Old database records have raw field IDs, new ones have semantic names
-        semantic_data = lead.extract_semantic_fields()
+        semantic_data = prequalification.semantic
         if semantic_data:
             # Enrich lead with extracted semantic data for qualification
             lead._semantic_enrichment = semantic_data
@@ -235,123 +421,6 @@ class InboundAgent(SelfOptimizingAgent):
             processing_time_ms=processing_time,
         )
 
-        # AGENT ZERO MEMORY: Save this lead for future learning
-        try:
-            # Convert LeadTier to MemoryLeadTier
-            memory_tier_map = {
-                LeadTier.SCORCHING: MemoryLeadTier.SCORCHING,
-                LeadTier.HOT: MemoryLeadTier.HOT,
-                LeadTier.WARM: MemoryLeadTier.WARM,
-                LeadTier.COOL: MemoryLeadTier.COOL,
-                LeadTier.COLD: MemoryLeadTier.COLD,
-                LeadTier.UNQUALIFIED: MemoryLeadTier.UNQUALIFIED,
-            }
-
-            lead_memory = LeadMemory(
-                lead_id=lead.id,
-                email=lead.email,
-                company=lead.get_field('company'),
-                qualification_score=total_score,
-                tier=memory_tier_map.get(tier, MemoryLeadTier.UNQUALIFIED),
-                practice_size=lead.get_field('business_size'),
-                patient_volume=lead.get_field('patient_volume'),
-                industry=lead.get_field('industry') or 'Healthcare',
-                strategy_used=str(actions_result.next_actions[0].value) if (actions_result.next_actions and len(actions_result.next_actions) > 0 and hasattr(actions_result.next_actions[0], 'value')) else (str(actions_result.next_actions[0]) if (actions_result.next_actions and len(actions_result.next_actions) > 0) else None),
-                converted=None,  # Will be updated later when we know conversion
-                key_insights=reasoning[:500] if reasoning else None,
-            )
-
-            # Save to memory (async)
-            # Check if we're in an async context
-            try:
-                # Ensure asyncio is available - import at function level to avoid scope issues
-                import asyncio
-                loop = asyncio.get_running_loop()
-                # We're in async context - create task
-                loop.create_task(self.memory.save_lead_memory(lead_memory))
-                print(f"💾 Queued lead save to memory: {lead.email}")
-            except RuntimeError:
-                # No event loop - we're in sync context
-                import asyncio
-                memory_id = asyncio.run(self.memory.save_lead_memory(lead_memory))
-                print(f"💾 Saved lead to memory: {lead.email} (ID: {memory_id})")
-        except Exception as e:
-            # Graceful degradation - continue even if memory save fails
-            print(f"⚠️ Memory save failed (non-critical): {e}")
-
-        
-        # ABM CAMPAIGN: Initiate multi-contact campaign for qualified leads
-        campaign_id = None
-        if is_qualified and tier in [LeadTier.SCORCHING, LeadTier.HOT, LeadTier.WARM]:
-            try:
-                campaign_data = {
-                    'company_name': lead.get_field('company') or 'Unknown Company',
-                    'contact_name': f"{lead.get_field('first_name', '')} {lead.get_field('last_name', '')}".strip() or 'Unknown',
-                    'contact_email': lead.email,
-                    'contact_phone': lead.get_field('phone'),
-                    'contact_title': lead.get_field('title') or 'Unknown',
-                    'inquiry_topic': lead.get_field('ai_summary') or lead.get_field('use_case') or 'our platform',
-                    'qualification_tier': tier.value,
-                    'qualification_score': total_score,
-                    'business_size': lead.get_field('business_size'),
-                    'patient_volume': lead.get_field('patient_volume'),
-                }
-                # Check if we're in an async context
-                try:
-                    # Ensure asyncio is available - import at function level to avoid scope issues
-                    import asyncio
-                    loop = asyncio.get_running_loop()
-                    # We're in async context - create task
-                    task = loop.create_task(self.orchestrator.process_new_lead(campaign_data))
-                    # Don't await - run in background
-                    print(f"🎯 ABM Campaign queued for {lead.email} (tier: {tier.value})")
-                    # Optionally store task for later retrieval
-                    campaign_id = None  # Will be None since we're not awaiting
-                except RuntimeError:
-                    # No event loop - we're in sync context
-                    import asyncio
-                    campaign_result = asyncio.run(self.orchestrator.process_new_lead(campaign_data))
-                    campaign_id = campaign_result.get('campaign_id')
-                    print(f"🎯 ABM Campaign initiated: {campaign_id} for {lead.email} (tier: {tier.value})")
-            except Exception as e:
-                print(f"⚠️ ABM campaign initiation failed (non-critical): {e}")
-                campaign_id = None
-        if campaign_id:
-            result.campaign_id = campaign_id
-
-        logger.info(f"✅ Qualification complete - Tier: {result.tier if 'result' in locals() else 'unknown'}, Score: {result.score if 'result' in locals() else 0}")
-
-        # Save agent state to database (async, non-blocking)
-        try:
-            import asyncio
-            from core.async_supabase_client import save_agent_state
-
-            # Check if we're in an async context (event loop running)
-            try:
-                loop = asyncio.get_running_loop()
-                # Create task to save state without blocking
-                loop.create_task(
-                    save_agent_state(
-                        agent_name='InboundAgent',
-                        lead_id=str(lead.id),
-                        state_data={
-                            'qualification_tier': tier.value,
-                            'qualification_score': total_score,
-                            'reasoning': reasoning[:500] if reasoning else None,
-                            'next_actions': [str(action.value) if hasattr(action, 'value') else str(action) for action in actions_result.next_actions] if actions_result.next_actions else [],
-                            'processing_time_ms': processing_time,
-                            'model_used': settings.PRIMARY_MODEL
-                        },
-                        status='completed'
-                    )
-                )
-            except RuntimeError:
-                # No event loop - we're in sync context, skip state saving
-                logger.warning("⚠️ InboundAgent running in sync context, skipping state save")
-        except Exception as e:
-            # Non-critical - log but don't fail qualification
-            logger.warning(f"⚠️ Failed to save InboundAgent state (non-critical): {e}")
-
         return result
 
     def _analyze_business_fit(self, lead: Lead) -> Dict[str, Any]:
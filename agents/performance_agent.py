@@ -3,23 +3,27 @@
 PerformanceAgent - Autonomous Performance Monitoring and Optimization
 
 The 8th agent in the system. Runs every 30 minutes to:
-- Collect performance data from Phoenix, Railway, and Supabase
-- Analyze metrics using DSPy ChainOfThought
-- Detect anomalies and performance degradations
+- Collect agent-call spans (core.metrics) and Supabase agent_state rows
+- Compute per-agent statistics numerically (monitoring/performance_metrics.py)
+- Detect anomalies as z-scores against per-agent EWMA baselines
 - Automatically trigger optimizations (GEPA for StrategyAgent, BootstrapFewShot for others)
 - Send Slack notifications for anomalies and daily summaries
 
+The LLM is only used to write the daily summary narrative; every number in
+it comes from the metrics pipeline.
+
 Architecture:
 - Inherits from SelfOptimizingAgent
 - Uses LangGraph StateGraph for workflow orchestration
-- Uses DSPy modules for intelligent analysis
-- Integrates with Phoenix MCP, Railway, and Supabase
+- Uses DSPy for the daily report narrative
+- Integrates with core.metrics, Railway, and Supabase
 """
 
 import dspy
 import logging
 import json
 import asyncio
+import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
@@ -33,17 +37,34 @@ from agents.base_agent import SelfOptimizingAgent, AgentRules
 
 # DSPy signatures
 from dspy_modules.performance_signatures import (
-    PerformanceAnalysis,
-    AnomalyDetection,
-    OptimizationRecommendation,
     PerformanceReport,
     AgentMetrics,
     PerformanceAnomaly,
     OptimizationRecommendationModel
 )
 
+# Numeric metrics pipeline
+from core.async_supabase_client import get_agent_states_since
+from core.metrics import SpanRecord, recent_spans
+from core.slack_outbox import get_slack_outbox
+from monitoring.performance_metrics import (
+    AgentStats,
+    BaselineStore,
+    compute_agent_stats,
+    detect_anomalies,
+    performance_score,
+    trend,
+)
+
 logger = logging.getLogger(__name__)
 
+# Tasks in the window before an optimizer has enough examples to train on
+GEPA_MIN_TASKS = 20
+BOOTSTRAP_MIN_TASKS = 10
+
+# Rough optimizer run costs (USD) for approval requests
+OPTIMIZER_COST_ESTIMATES = {"gepa": 5.00, "bootstrap": 0.50}
+
 
 # ===== STATE DEFINITION =====
 
@@ -54,11 +75,13 @@ class PerformanceState(TypedDict):
     last_check_time: datetime
 
     # Data collection
-    phoenix_spans: List[Dict[str, Any]]
+    spans: List[SpanRecord]
+    agent_state_rows: List[Dict[str, Any]]
     railway_logs: List[Dict[str, Any]]
     supabase_tasks: Dict[str, int]  # agent_name -> task_count
 
     # Analysis
+    agent_stats: Dict[str, AgentStats]
     agent_metrics: Dict[str, AgentMetrics]
     anomalies: List[PerformanceAnomaly]
     optimization_recommendations: List[OptimizationRecommendationModel]
@@ -95,15 +118,18 @@ class PerformanceAgent(SelfOptimizingAgent):
 
         super().__init__(agent_name="PerformanceAgent", rules=rules)
 
-        # DSPy modules with ChainOfThought
-        self.performance_analyzer = dspy.ChainOfThought(PerformanceAnalysis)
-        self.anomaly_detector = dspy.ChainOfThought(AnomalyDetection)
-        self.optimization_recommender = dspy.ChainOfThought(OptimizationRecommendation)
+        # Only the daily summary narrative uses the LLM
         self.report_generator = dspy.ChainOfThought(PerformanceReport)
 
+        # Per-agent EWMA baselines (persisted between runs)
+        self.baselines = BaselineStore()
+
         # Build LangGraph workflow
         self.workflow = self._build_workflow()
 
+        # Alerts and summaries go to the error channel unless overridden
+        self.slack_channel = os.getenv("SLACK_PERFORMANCE_CHANNEL") or os.getenv("SLACK_ERROR_CHANNEL", "agent-errors")
+
         # Configuration
         self.monitored_agents = [
             "StrategyAgent",
@@ -151,18 +177,20 @@ class PerformanceAgent(SelfOptimizingAgent):
             end_time = state["trigger_time"]
             start_time = state["last_check_time"]
 
-            # Collect Phoenix spans
-            phoenix_spans = await self._collect_phoenix_spans(start_time, end_time)
-            state["phoenix_spans"] = phoenix_spans
-            logger.info(f"  ✅ Collected {len(phoenix_spans)} Phoenix spans")
+            # Collect agent-call spans recorded by core.metrics
+            spans = self._collect_local_spans(start_time, end_time)
+            state["spans"] = spans
+            logger.info(f"  ✅ Collected {len(spans)} agent-call spans")
 
             # Collect Railway logs
             railway_logs = await self._collect_railway_logs(start_time, end_time)
             state["railway_logs"] = railway_logs
             logger.info(f"  ✅ Collected {len(railway_logs)} Railway log entries")
 
-            # Collect Supabase task counts
-            supabase_tasks = await self._collect_supabase_tasks()
+            # Collect Supabase agent_state rows and task counts
+            rows = await get_agent_states_since(start_time)
+            state["agent_state_rows"] = rows
+            supabase_tasks = self._collect_supabase_tasks(rows)
             state["supabase_tasks"] = supabase_tasks
             logger.info(f"  ✅ Collected task counts for {len(supabase_tasks)} agents")
 
@@ -173,117 +201,61 @@ class PerformanceAgent(SelfOptimizingAgent):
         return state
 
     async def _analyze_performance(self, state: PerformanceState) -> PerformanceState:
-        """Node 2: Analyze performance metrics using DSPy."""
+        """Node 2: Compute per-agent statistics from spans and agent_state rows."""
         logger.info("🔍 Analyzing performance metrics...")
 
         agent_metrics = {}
 
-        for agent_name in self.monitored_agents:
-            try:
-                # Extract agent-specific metrics
-                agent_spans = [
-                    s for s in state["phoenix_spans"]
-                    if s.get("attributes", {}).get("agent_name") == agent_name
-                ]
-
-                agent_logs = [
-                    l for l in state["railway_logs"]
-                    if agent_name.lower() in l.get("message", "").lower()
-                ]
-
-                # Prepare metrics for DSPy analysis
-                raw_metrics = json.dumps({
-                    "spans": agent_spans,
-                    "logs": agent_logs,
-                    "task_count": state["supabase_tasks"].get(agent_name, 0)
-                })
-
-                # Get historical baseline (simplified - would query DB in production)
-                historical_baseline = json.dumps({
-                    "avg_success_rate": 85.0,
-                    "avg_latency_ms": 500.0,
-                    "avg_error_count": 2
-                })
-
-                # Run DSPy analysis
-                analysis = self.performance_analyzer(
-                    agent_name=agent_name,
-                    raw_metrics=raw_metrics,
-                    historical_baseline=historical_baseline,
-                    time_period="last 30 minutes"
-                )
+        try:
+            stats = compute_agent_stats(
+                state["spans"], state["agent_state_rows"], agents=self.monitored_agents
+            )
+            state["agent_stats"] = stats
 
-                # Create AgentMetrics object
+            for agent_name, agent_stats in stats.items():
+                baseline = self.baselines.get(agent_name)
                 metrics = AgentMetrics(
                     agent_name=agent_name,
-                    success_rate=float(analysis.success_rate),
-                    avg_latency_ms=float(analysis.avg_latency_ms),
-                    error_count=int(analysis.error_count),
-                    task_count=state["supabase_tasks"].get(agent_name, 0),
-                    performance_score=float(analysis.performance_score),
-                    trend=analysis.trend_analysis
+                    success_rate=agent_stats.success_rate,
+                    avg_latency_ms=agent_stats.avg_latency_ms,
+                    p95_latency_ms=agent_stats.p95_latency_ms,
+                    error_count=agent_stats.error_count,
+                    task_count=agent_stats.task_count,
+                    cost_usd=agent_stats.cost_usd,
+                    performance_score=performance_score(agent_stats, baseline),
+                    trend=trend(agent_stats, baseline)
                 )
-
                 agent_metrics[agent_name] = metrics
-                logger.info(f"  ✅ {agent_name}: {metrics.performance_score:.1f}/100")
+                logger.info(
+                    f"  ✅ {agent_name}: {metrics.performance_score:.1f}/100 "
+                    f"({agent_stats.task_count} tasks, p95 {agent_stats.p95_latency_ms:.0f}ms)"
+                )
 
-            except Exception as e:
-                logger.error(f"❌ Error analyzing {agent_name}: {e}")
-                state["errors"].append(f"Analysis error for {agent_name}: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Error analyzing performance: {e}")
+            state["errors"].append(f"Analysis error: {str(e)}")
 
         state["agent_metrics"] = agent_metrics
         return state
 
     async def _detect_anomalies(self, state: PerformanceState) -> PerformanceState:
-        """Node 3: Detect anomalies using DSPy."""
+        """Node 3: Detect anomalies against EWMA baselines, then fold this window in."""
         logger.info("🚨 Detecting anomalies...")
 
         anomalies = []
 
-        for agent_name, metrics in state["agent_metrics"].items():
-            try:
-                # Prepare current metrics
-                current_metrics = json.dumps({
-                    "success_rate": metrics.success_rate,
-                    "avg_latency_ms": metrics.avg_latency_ms,
-                    "error_count": metrics.error_count,
-                    "performance_score": metrics.performance_score
-                })
-
-                # Historical baseline
-                historical_baseline = json.dumps({
-                    "success_rate": 85.0,
-                    "avg_latency_ms": 500.0,
-                    "error_count": 2
-                })
-
-                # Recent changes (would query git/deployment logs in production)
-                recent_changes = "No recent deployments"
-
-                # Run DSPy anomaly detection
-                detection = self.anomaly_detector(
-                    agent_name=agent_name,
-                    current_metrics=current_metrics,
-                    historical_baseline=historical_baseline,
-                    recent_changes=recent_changes
-                )
+        try:
+            for detected in detect_anomalies(state["agent_stats"], self.baselines.all()):
+                anomaly = PerformanceAnomaly(**detected)
+                anomalies.append(anomaly)
+                logger.warning(f"  ⚠️ {anomaly.agent_name}: {anomaly.severity} - {anomaly.anomaly_type}")
 
-                # If anomaly detected, create record
-                if detection.anomalies_detected:
-                    anomaly = PerformanceAnomaly(
-                        agent_name=agent_name,
-                        anomaly_type=detection.anomaly_type,
-                        severity=detection.severity,
-                        root_cause=detection.root_cause_hypothesis,
-                        recommended_action=detection.recommended_action,
-                        details=detection.details
-                    )
-                    anomalies.append(anomaly)
-                    logger.warning(f"  ⚠️ {agent_name}: {detection.severity} - {detection.anomaly_type}")
+            # Update after detection so a regression is scored against the old baseline
+            self.baselines.update(state["agent_stats"])
 
-            except Exception as e:
-                logger.error(f"❌ Error detecting anomalies for {agent_name}: {e}")
-                state["errors"].append(f"Anomaly detection error for {agent_name}: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Error detecting anomalies: {e}")
+            state["errors"].append(f"Anomaly detection error: {str(e)}")
 
         state["anomalies"] = anomalies
         logger.info(f"  Found {len(anomalies)} anomalies")
@@ -297,39 +269,7 @@ class PerformanceAgent(SelfOptimizingAgent):
 
         for agent_name, metrics in state["agent_metrics"].items():
             try:
-                # Determine agent type
-                agent_type = "strategy" if agent_name == "StrategyAgent" else "execution"
-
-                # Prepare current performance
-                current_performance = json.dumps({
-                    "success_rate": metrics.success_rate,
-                    "performance_score": metrics.performance_score,
-                    "trend": metrics.trend
-                })
-
-                # Last optimization (would query DB in production)
-                last_optimization = "Never optimized"
-
-                # Run DSPy optimization recommendation
-                recommendation = self.optimization_recommender(
-                    agent_name=agent_name,
-                    agent_type=agent_type,
-                    task_count=metrics.task_count,
-                    current_performance=current_performance,
-                    last_optimization=last_optimization
-                )
-
-                # Create recommendation model
-                rec_model = OptimizationRecommendationModel(
-                    agent_name=agent_name,
-                    should_optimize=recommendation.should_optimize,
-                    optimizer_type=recommendation.optimizer_type,
-                    requires_approval=recommendation.requires_approval,
-                    estimated_cost=float(recommendation.estimated_cost),
-                    expected_improvement=recommendation.expected_improvement,
-                    reasoning=recommendation.reasoning
-                )
-
+                rec_model = self._recommend_optimization(metrics)
                 recommendations.append(rec_model)
 
                 # Trigger optimization if recommended
@@ -391,31 +331,10 @@ class PerformanceAgent(SelfOptimizingAgent):
 
     # ===== HELPER METHODS =====
 
-    async def _collect_phoenix_spans(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
-        """Collect spans from Phoenix MCP."""
-        try:
-            logger.info(f"  Collecting Phoenix spans from {start_time} to {end_time}...")
-            
-            # Use Phoenix MCP tool to get recent spans
-            # Note: This requires Phoenix MCP to be available
-            # In production, this will query the actual Phoenix project
-            
-            # For now, return empty list (will be populated when Phoenix MCP is configured)
-            # TODO: Uncomment when Phoenix MCP is available in production
-            # spans_result = await phoenix.get_spans(
-            #     projectName="hume-dspy-agent",
-            #     startTime=start_time.isoformat(),
-            #     endTime=end_time.isoformat(),
-            #     limit=100
-            # )
-            # return spans_result.get('spans', [])
-            
-            logger.info("  Phoenix MCP integration ready (awaiting production configuration)")
-            return []
-            
-        except Exception as e:
-            logger.error(f"  Phoenix span collection failed: {e}")
-            return []
+    def _collect_local_spans(self, start_time: datetime, end_time: datetime) -> List[SpanRecord]:
+        """Agent-call spans recorded in this process by core.metrics.agent_call."""
+        start, end = start_time.timestamp(), end_time.timestamp()
+        return [s for s in recent_spans(since=start) if s.started_at <= end]
 
     async def _collect_railway_logs(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """Collect logs from Railway."""
@@ -423,19 +342,55 @@ class PerformanceAgent(SelfOptimizingAgent):
         logger.info("  Collecting Railway logs (mock data)...")
         return []
 
-    async def _collect_supabase_tasks(self) -> Dict[str, int]:
-        """Collect task counts from Supabase agent_state table."""
-        # TODO: Implement actual Supabase query
-        logger.info("  Collecting Supabase task counts (mock data)...")
-        return {
-            "StrategyAgent": 15,
-            "InboundAgent": 8,
-            "FollowUpAgent": 12,
-            "ResearchAgent": 5,
-            "AuditAgent": 3,
-            "AccountOrchestrator": 7,
-            "Introspection": 2
-        }
+    def _collect_supabase_tasks(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Task counts per agent from agent_state rows."""
+        counts: Dict[str, int] = {}
+        for row in rows:
+            name = row.get("agent_name") or "unknown"
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def _recommend_optimization(self, metrics: AgentMetrics) -> OptimizationRecommendationModel:
+        """Rule-based optimizer choice (see OptimizationRecommendation's guidance).
+
+        Optimize when the score falls below auto_optimize_threshold and the
+        window has enough tasks to train on: GEPA for StrategyAgent (requires
+        approval), BootstrapFewShot for execution agents.
+        """
+        threshold = self.rules.auto_optimize_threshold * 100
+        is_strategy = metrics.agent_name == "StrategyAgent"
+        optimizer = "gepa" if is_strategy else "bootstrap"
+        min_tasks = GEPA_MIN_TASKS if is_strategy else BOOTSTRAP_MIN_TASKS
+
+        if metrics.performance_score >= threshold:
+            reasoning = f"Score {metrics.performance_score:.1f} meets threshold {threshold:.0f}"
+            optimizer = "none"
+        elif metrics.task_count < min_tasks:
+            reasoning = (
+                f"Score {metrics.performance_score:.1f} below threshold {threshold:.0f}, "
+                f"but only {metrics.task_count}/{min_tasks} tasks to train on"
+            )
+            optimizer = "none"
+        else:
+            reasoning = (
+                f"Score {metrics.performance_score:.1f} below threshold {threshold:.0f} "
+                f"({metrics.success_rate:.1f}% success, trend {metrics.trend}) "
+                f"with {metrics.task_count} tasks"
+            )
+
+        should_optimize = optimizer != "none"
+        return OptimizationRecommendationModel(
+            agent_name=metrics.agent_name,
+            should_optimize=should_optimize,
+            optimizer_type=optimizer,
+            requires_approval=optimizer == "gepa",
+            estimated_cost=OPTIMIZER_COST_ESTIMATES.get(optimizer, 0.0),
+            expected_improvement=(
+                f"Success rate from {metrics.success_rate:.1f}% toward {threshold:.0f}%"
+                if should_optimize else "n/a"
+            ),
+            reasoning=reasoning
+        )
 
     async def _execute_optimization(self, recommendation: OptimizationRecommendationModel):
         """Execute optimization based on recommendation."""
@@ -486,8 +441,12 @@ Recommended Action: {anomaly.recommended_action}
 
 Details: {anomaly.details}
         """
-        # TODO: Implement actual Slack message
-        logger.info(f"📤 Sent anomaly alert for {anomaly.agent_name}")
+        if not os.getenv("SLACK_BOT_TOKEN"):
+            logger.warning("⚠️ Slack not configured - anomaly alert not sent")
+            return
+        # Alerts raised in the same run are coalesced into one message
+        get_slack_outbox().notify(self.slack_channel, message.strip(), key="performance_alerts")
+        logger.info(f"📤 Queued anomaly alert for {anomaly.agent_name}")
 
     async def _send_daily_summary(self, state: PerformanceState):
         """Send daily performance summary to Slack."""
@@ -495,6 +454,10 @@ Details: {anomaly.details}
         agent_metrics_str = json.dumps({
             name: {
                 "success_rate": metrics.success_rate,
+                "avg_latency_ms": metrics.avg_latency_ms,
+                "p95_latency_ms": metrics.p95_latency_ms,
+                "task_count": metrics.task_count,
+                "cost_usd": metrics.cost_usd,
                 "performance_score": metrics.performance_score,
                 "trend": metrics.trend
             }
@@ -538,8 +501,11 @@ Details: {anomaly.details}
 {report.action_items}
         """
 
-        # TODO: Implement actual Slack message
-        logger.info("📤 Sent daily summary to Slack")
+        if not os.getenv("SLACK_BOT_TOKEN"):
+            logger.warning("⚠️ Slack not configured - daily summary not sent")
+            return
+        get_slack_outbox().post(self.slack_channel, message.strip(), kind="performance_summary")
+        logger.info("📤 Queued daily summary for Slack")
 
     # ===== PUBLIC API =====
 
@@ -551,9 +517,11 @@ Details: {anomaly.details}
         initial_state = PerformanceState(
             trigger_time=datetime.now(),
             last_check_time=datetime.now() - timedelta(minutes=30),
-            phoenix_spans=[],
+            spans=[],
+            agent_state_rows=[],
             railway_logs=[],
             supabase_tasks={},
+            agent_stats={},
             agent_metrics={},
             anomalies=[],
             optimization_recommendations=[],
@@ -21,6 +21,7 @@ import httpx
 import os
 import dspy
 import json
+import numpy as np
 
 from agents.inbound_agent import InboundAgent
 from agents.base_agent import SelfOptimizingAgent, AgentRules
@@ -31,11 +32,17 @@ from dspy_modules.conversation_signatures import (
     PipelineAnalysis as PipelineAnalysisSignature,
     GenerateRecommendations,
     QuickPipelineStatus,
+    SummarizeConversation,
 )
 
 logger = logging.getLogger(__name__)
 
 # Phoenix optimization imports
+from core.agent_dispatch import FOLLOWUP_A2A, INBOUND_QUALIFY, RESEARCH_A2A, get_agent_dispatcher
+from core.lead_analytics import TIERS, LeadFrame, get_lead_analytics
+from core.metrics import agent_call
+from core.slack_outbox import get_slack_outbox
+from core.conversation_store import ConversationTurn, get_conversation_store
 from core.model_selector import get_model_selector
 from core.message_classifier import classify_message
 from core.context_builder import build_context
@@ -293,6 +300,7 @@ class StrategyAgent(SelfOptimizingAgent):
             self.pipeline_analyzer = dspy.ChainOfThought(PipelineAnalysisSignature)
             self.recommendation_generator = dspy.ChainOfThought(GenerateRecommendations)
             self.quick_status = dspy.Predict(QuickPipelineStatus)  # Status check is simple
+            self.conversation_summarizer = dspy.Predict(SummarizeConversation)
             
             # Initialize ReAct for tool calling (action queries)
             self.tools = self._init_tools()
@@ -321,9 +329,12 @@ class StrategyAgent(SelfOptimizingAgent):
             self.pipeline_analyzer = None
             self.recommendation_generator = None
             self.quick_status = None
+            self.conversation_summarizer = None
         
-        # Conversation history (per-user, in-memory for now)
-        self.conversation_history: Dict[str, List[Dict[str, str]]] = {}
+        # Conversation history: shared by every StrategyAgent in the process, persisted
+        self.conversations = get_conversation_store()
+        if os.getenv("CONVERSATION_SUMMARIES", "false").lower() == "true" and self.conversations.summarizer is None:
+            self.conversations.summarizer = self._summarize_turns
         
         # Phase 0.5: Initialize FAISS vector memory
         self.memory = None
@@ -435,28 +446,12 @@ class StrategyAgent(SelfOptimizingAgent):
                 if metadata:
                     notification += "\n" + json.dumps(metadata, indent=2)
 
-                # Send to Slack (async, don't block)
-                asyncio.create_task(self._send_slack_notification(notification))
+                # Queue for Slack (bursts of state changes are coalesced into one message)
+                get_slack_outbox(self.slack_bot_token).notify(
+                    self.josh_slack_dm_channel, notification, key="strategy_state")
             except Exception as e:
                 logger.error(f"Failed to broadcast state: {e}")
 
-    async def _send_slack_notification(self, message: str):
-        """Send state notification to Slack."""
-        try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    "https://slack.com/api/chat.postMessage",
-                    headers={"Authorization": f"Bearer {self.slack_bot_token}"},
-                    json={
-                        "channel": self.josh_slack_dm_channel,
-                        "text": message
-                    }
-                )
-        except Exception as e:
-            logger.error(f"Failed to send Slack notification: {e}")
-
-
     def detect_action_intent(self, message: str) -> bool:
         """Detect if message requires tool execution (ReAct).
 
@@ -480,59 +475,64 @@ class StrategyAgent(SelfOptimizingAgent):
 
     async def respond_optimized(self, message: str, user_id: str = "josh", force_complex: bool = False) -> str:
         """Optimized response with ReAct routing (Phoenix: 3-6x faster, 12x cheaper)."""
-        import time
-        start = time.time()
-        try:
-            # State: Receiving message
-            await self.set_state(AgentState.RECEIVING_MESSAGE)
-
-            # NEW: Check for action intent FIRST (enables tool calling via ReAct)
-            if self.detect_action_intent(message):
-                logger.info("🎯 Action intent detected - using ReAct for tool calling")
-                await self.set_state(AgentState.REASONING)
-                context = build_context(message, self.supabase, True)  # Force complex context for actions
-                history_str = self._format_conversation_history(self.conversation_history.get(user_id, []))
-
-                with dspy.context(lm=self.sonnet_lm):  # ReAct needs powerful model
-                    # Explicitly call .forward() for better Phoenix tracing
-                    result = self.action_agent.forward(
-                        context=context,
-                        user_message=message,
-                        conversation_history=history_str
-                    )
-                model, cost = "Sonnet+ReAct", 0.0072
-                response = result.response
-            else:
-                # Existing simple/complex routing for conversational queries
-                complexity = "complex" if force_complex else classify_message(message)
-                context = build_context(message, self.supabase, force_complex)
-                history_str = self._format_conversation_history(self.conversation_history.get(user_id, []))
-
-                if complexity == "simple":
-                    with dspy.context(lm=self.haiku_lm):
-                        # Explicitly call .forward() for better Phoenix tracing
-                        result = self.simple_conversation.forward(context=context, user_message=message, conversation_history=history_str)
-                    model, cost = "Haiku", 0.0006
+        with agent_call(self.agent_name, "respond") as call:
+            try:
+                # State: Receiving message
+                await self.set_state(AgentState.RECEIVING_MESSAGE)
+
+                # NEW: Check for action intent FIRST (enables tool calling via ReAct)
+                if self.detect_action_intent(message):
+                    logger.info("🎯 Action intent detected - using ReAct for tool calling")
+                    await self.set_state(AgentState.REASONING)
+                    context = build_context(message, self.supabase, True)  # Force complex context for actions
+                    history_str = self.conversations.render(user_id)
+
+                    def _run_react():
+                        with dspy.context(lm=self.sonnet_lm):  # ReAct needs powerful model
+                            # Explicitly call .forward() for better Phoenix tracing
+                            return self.action_agent.forward(
+                                context=context,
+                                user_message=message,
+                                conversation_history=history_str
+                            )
+
+                    # Run ReAct off the event loop so its sync tools can schedule
+                    # coroutines back onto the main loop via the tool bridge
+                    result = await asyncio.to_thread(_run_react)
+                    model = "Sonnet+ReAct"
+                    response = result.response
                 else:
-                    with dspy.context(lm=self.sonnet_lm):
-                        # Explicitly call .forward() for better Phoenix tracing
-                        result = self.complex_conversation.forward(context=context, user_message=message, conversation_history=history_str)
-                    model, cost = "Sonnet", 0.0072
-                response = result.response
-            if user_id not in self.conversation_history:
-                self.conversation_history[user_id] = []
-            self.conversation_history[user_id].append({"role": "user", "content": message})
-            self.conversation_history[user_id].append({"role": "assistant", "content": response})
-            if len(self.conversation_history[user_id]) > 20:
-                self.conversation_history[user_id] = self.conversation_history[user_id][-20:]
-            await self.set_state(AgentState.RESPONDING)
-            logger.info(f"⚡ {time.time()-start:.2f}s | {model} | ${cost:.4f}")
-            await self.set_state(AgentState.IDLE)
-            return response
-        except Exception as e:
-            await self.set_state(AgentState.ERROR, {'error': str(e)})
-            logger.error(f"❌ respond_optimized: {e}")
-            return f"Error: {str(e)}"
+                    # Existing simple/complex routing for conversational queries
+                    complexity = "complex" if force_complex else classify_message(message)
+                    context = build_context(message, self.supabase, force_complex)
+                    history_str = self.conversations.render(user_id)
+
+                    if complexity == "simple":
+                        with dspy.context(lm=self.haiku_lm):
+                            # Explicitly call .forward() for better Phoenix tracing
+                            result = self.simple_conversation.forward(context=context, user_message=message, conversation_history=history_str)
+                        model = "Haiku"
+                    else:
+                        with dspy.context(lm=self.sonnet_lm):
+                            # Explicitly call .forward() for better Phoenix tracing
+                            result = self.complex_conversation.forward(context=context, user_message=message, conversation_history=history_str)
+                        model = "Sonnet"
+                    response = result.response
+                await asyncio.to_thread(self.conversations.append_exchange, user_id, message, response)
+                if self.conversations.needs_summary(user_id):
+                    asyncio.create_task(asyncio.to_thread(self.conversations.summarize_pending, user_id))
+                await self.set_state(AgentState.RESPONDING)
+                logger.info(
+                    f"⚡ {call.elapsed:.2f}s | {model} | ${call.usage.cost:.4f} | "
+                    f"{call.usage.total_tokens} tokens"
+                )
+                await self.set_state(AgentState.IDLE)
+                return response
+            except Exception as e:
+                call.fail(e)
+                await self.set_state(AgentState.ERROR, {'error': str(e)})
+                logger.error(f"❌ respond_optimized: {e}")
+                return f"Error: {str(e)}"
 
     def _init_tools(self) -> List:
         """Initialize tools that ReAct can call.
@@ -544,31 +544,14 @@ class StrategyAgent(SelfOptimizingAgent):
             List of callable tools
         """
         import json
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
+        from core.tool_bridge import get_tool_bridge
         
         # Use the MCP client initialized in __init__
         mcp = self.mcp_client
         
-        # Thread pool for running async functions in sync context
-        executor = ThreadPoolExecutor(max_workers=3)
-        
-        def run_async_in_thread(coro):
-            """Run async coroutine in a new thread with its own event loop.
-            
-            This avoids 'asyncio.run() cannot be called from a running event loop' errors
-            that happen when DSPy ReAct tries to call async functions.
-            """
-            def run_in_thread():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(coro)
-                finally:
-                    loop.close()
-            
-            future = executor.submit(run_in_thread)
-            return future.result(timeout=60)  # 60 second timeout
+        # Shared bridge: runs tool coroutines on a long-lived event loop so
+        # async clients and connection pools are reused across tool calls
+        run_tool = get_tool_bridge().run
         
         def audit_lead_flow(timeframe_hours: int = 24) -> str:
             """
@@ -587,9 +570,9 @@ class StrategyAgent(SelfOptimizingAgent):
                 JSON string with complete audit results
             """
             try:
-                # Execute async audit in separate thread to avoid event loop conflicts
+                # Execute async audit on the shared tool bridge loop
                 logger.info(f"🔧 ReAct tool: audit_lead_flow(timeframe_hours={timeframe_hours})")
-                result = run_async_in_thread(
+                result = run_tool(
                     self.audit_agent.audit_lead_flow(timeframe_hours)
                 )
                 logger.info(f"✅ ReAct tool: audit_lead_flow returned {len(str(result))} chars")
@@ -709,7 +692,7 @@ class StrategyAgent(SelfOptimizingAgent):
             """
             try:
                 logger.info(f"🔧 ReAct MCP tool: create_close_lead(name={name})")
-                result = run_async_in_thread(
+                result = run_tool(
                     mcp.close_create_lead(
                         name=name,
                         email=email,
@@ -739,7 +722,7 @@ class StrategyAgent(SelfOptimizingAgent):
             """
             try:
                 logger.info(f"🔧 ReAct MCP tool: research_with_perplexity(query={query[:50]}...)")
-                result = run_async_in_thread(
+                result = run_tool(
                     mcp.perplexity_research(query)
                 )
                 logger.info(f"✅ ReAct MCP tool: research_with_perplexity succeeded")
@@ -763,7 +746,7 @@ class StrategyAgent(SelfOptimizingAgent):
             """
             try:
                 logger.info(f"🔧 ReAct MCP tool: scrape_website(url={url})")
-                result = run_async_in_thread(
+                result = run_tool(
                     mcp.scrape_url(url)
                 )
                 logger.info(f"✅ ReAct MCP tool: scrape_website succeeded")
@@ -790,7 +773,7 @@ class StrategyAgent(SelfOptimizingAgent):
                         "tool": "list_mcp_tools"
                     })
                 
-                result = run_async_in_thread(mcp.list_tools())
+                result = run_tool(mcp.list_tools())
                 
                 # Format into readable structure
                 tools_summary = {
@@ -847,7 +830,7 @@ class StrategyAgent(SelfOptimizingAgent):
                 if not self.delegation:
                     return json.dumps({"error": "Delegation not available"})
                 
-                result = run_async_in_thread(
+                result = run_tool(
                     self.delegation.call_subordinate(profile, task)
                 )
                 
@@ -858,6 +841,46 @@ class StrategyAgent(SelfOptimizingAgent):
                 logger.error(f"❌ Delegation to {profile} failed: {e}")
                 return json.dumps({"error": str(e), "profile": profile})
         
+        def delegate_to_subordinates(assignments: list) -> str:
+            """
+            Delegate several independent subtasks to subordinates in parallel.
+            
+            Use this instead of repeated delegate_to_subordinate calls when the
+            subtasks don't depend on each other (e.g. research three competitors).
+            
+            Args:
+                assignments: List of {"profile": ..., "task": ...} objects
+                
+            Returns:
+                JSON list of {"profile", "task", "result"} in the same order
+            
+            Example:
+                delegate_to_subordinates([
+                    {"profile": "competitor_analyst", "task": "Analyze InBody pricing"},
+                    {"profile": "market_researcher", "task": "Size the metabolic clinic market"}
+                ])
+            """
+            try:
+                if not self.delegation:
+                    return json.dumps({"error": "Delegation not available"})
+                
+                pairs = [(a["profile"], a["task"]) for a in assignments]
+                logger.info(f"🎯 ReAct delegating {len(pairs)} tasks in parallel")
+                
+                results = run_tool(
+                    self.delegation.call_subordinates(pairs),
+                    timeout=get_tool_bridge().default_timeout * max(1, len(pairs))
+                )
+                
+                return json.dumps([
+                    {"profile": p, "task": t, "result": r}
+                    for (p, t), r in zip(pairs, results)
+                ], indent=2)
+                
+            except Exception as e:
+                logger.error(f"❌ Parallel delegation failed: {e}")
+                return json.dumps({"error": str(e), "tool": "delegate_to_subordinates"})
+        
         # Phase 1.5: Inter-agent communication tool
         def ask_other_agent(agent_name: str, question: str) -> str:
             """
@@ -900,7 +923,7 @@ class StrategyAgent(SelfOptimizingAgent):
                         "available": list(agent_map.keys())
                     })
                 
-                result = run_async_in_thread(
+                result = run_tool(
                     self.communication.ask_agent(target_agent, question)
                 )
                 
@@ -939,7 +962,7 @@ class StrategyAgent(SelfOptimizingAgent):
                 if not self.delegation:
                     return json.dumps({"error": "Delegation not available"})
                 
-                result = run_async_in_thread(
+                result = run_tool(
                     self.delegation.refine_subordinate_work(profile, feedback)
                 )
                 
@@ -974,7 +997,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import search_knowledge_base as _search
                 logger.info(f"🔍 RAG search: {query}")
-                result = run_async_in_thread(_search(query, limit))
+                result = run_tool(_search(query, limit))
                 logger.info(f"✅ RAG search complete")
                 return result
             except Exception as e:
@@ -993,7 +1016,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import list_indexed_documents as _list
                 logger.info("📚 Listing knowledge base...")
-                result = run_async_in_thread(_list())
+                result = run_tool(_list())
                 logger.info("✅ Knowledge base listed")
                 return result
             except Exception as e:
@@ -1019,7 +1042,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import query_spreadsheet_data as _query
                 logger.info(f"📊 Querying spreadsheet: {file_name}")
-                result = run_async_in_thread(_query(file_name, query_description))
+                result = run_tool(_query(file_name, query_description))
                 logger.info("✅ Spreadsheet query complete")
                 return result
             except Exception as e:
@@ -1046,7 +1069,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import wolfram_strategic_query as _wolfram
                 logger.info(f"🔬 Wolfram strategic query: {query}")
-                result = run_async_in_thread(_wolfram(query, category))
+                result = run_tool(_wolfram(query, category))
                 logger.info("✅ Wolfram query complete")
                 return result
             except Exception as e:
@@ -1073,7 +1096,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import wolfram_market_analysis as _market
                 logger.info(f"🔬 Wolfram market analysis: {market} - {metric}")
-                result = run_async_in_thread(_market(market, metric, comparison_regions))
+                result = run_tool(_market(market, metric, comparison_regions))
                 logger.info("✅ Market analysis complete")
                 return result
             except Exception as e:
@@ -1097,7 +1120,7 @@ class StrategyAgent(SelfOptimizingAgent):
             try:
                 from tools.strategy_tools import wolfram_demographic_insight as _demo
                 logger.info(f"🔬 Wolfram demographic query: {region} - {demographic_query}")
-                result = run_async_in_thread(_demo(region, demographic_query))
+                result = run_tool(_demo(region, demographic_query))
                 logger.info("✅ Demographic analysis complete")
                 return result
             except Exception as e:
@@ -1117,6 +1140,7 @@ class StrategyAgent(SelfOptimizingAgent):
             list_mcp_tools,  # List available Zapier integrations
             # NEW: Phase 1.5 - Agent collaboration tools
             delegate_to_subordinate,  # Spawn specialized subordinates
+            delegate_to_subordinates,  # Parallel independent subtasks
             ask_other_agent,  # Ask other agents for help
             refine_subordinate_work,  # Iterative refinement
             # NEW: Phase 2.0 - RAG Knowledge Base (87 docs, 11,325 chunks)
@@ -1131,7 +1155,7 @@ class StrategyAgent(SelfOptimizingAgent):
         logger.info(f"   Initialized {len(tools)} ReAct tools (RAG + Wolfram Alpha fully integrated!)")
         logger.info(f"   - 3 core tools (audit, query, stats)")
         logger.info(f"   - 4 MCP tools (Close CRM, Perplexity, Apify, List)")
-        logger.info(f"   - 3 Phase 1.5 tools (delegate, ask_agent, refine)")
+        logger.info(f"   - 4 Phase 1.5 tools (delegate, delegate parallel, ask_agent, refine)")
         logger.info(f"   - 3 RAG tools (search KB, list docs, query sheets)")
         logger.info(f"   - 3 Wolfram tools (strategic query, market analysis, demographics)")
         logger.info(f"   📚 Knowledge Base: 87 indexed docs, 11,325 chunks")
@@ -1290,59 +1314,24 @@ class StrategyAgent(SelfOptimizingAgent):
         if len(chunks) > 1:
             logger.info(f"📝 Chunking long message into {len(chunks)} parts")
         
-        first_ts = None
-        parent_ts = thread_ts
-        
-        async with httpx.AsyncClient() as client:
-            for i, chunk in enumerate(chunks):
-                # Add part indicator for multi-part messages
-                if len(chunks) > 1:
-                    header = f"*[Part {i+1}/{len(chunks)}]*\n\n"
-                    chunk_with_header = header + chunk
-                else:
-                    chunk_with_header = chunk
-                
-                try:
-                    response = await client.post(
-                        "https://slack.com/api/chat.postMessage",
-                        headers={
-                            "Authorization": f"Bearer {self.slack_bot_token}",
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "channel": target_channel,
-                            "text": chunk_with_header,
-                            "thread_ts": parent_ts
-                        },
-                        timeout=10.0
-                    )
-                    
-                    data = response.json()
-                    if data.get("ok"):
-                        ts = data.get("ts")
-                        if i == 0:
-                            first_ts = ts
-                            # Thread subsequent messages to the first one
-                            if not parent_ts:
-                                parent_ts = ts
-                    else:
-                        logger.error(f"Slack send failed for chunk {i+1}: {data.get('error')}")
-                        if i == 0:
-                            return None
-                    
-                    # Rate limit: 0.5 second between chunks to avoid API limits
-                    if i < len(chunks) - 1:
-                        await asyncio.sleep(0.5)
-                
-                except Exception as e:
-                    # Only critical if first chunk fails (Phase 0 Fix: improved logging)
-                    if i == 0:
-                        logger.error(f"❌ CRITICAL: Failed to send first chunk: {e}")
-                        return None
-                    else:
-                        # Non-critical for subsequent chunks (message partially delivered)
-                        logger.warning(f"⚠️ Failed to send chunk {i+1}/{len(chunks)} (non-critical): {e}")
-                        # Continue with remaining chunks
+        outbox = get_slack_outbox(self.slack_bot_token)
+        headers = [f"*[Part {i+1}/{len(chunks)}]*\n\n" if len(chunks) > 1 else "" for i in range(len(chunks))]
+
+        # The first chunk is awaited for its ts; the rest are threaded under it and
+        # queued behind it on the channel (the outbox spaces and retries them)
+        try:
+            data = await outbox.send(target_channel, headers[0] + chunks[0], thread_ts=thread_ts)
+        except Exception as e:
+            logger.error(f"❌ CRITICAL: Failed to send first chunk: {e}")
+            return None
+        if not data.get("ok"):
+            logger.error(f"Slack send failed for chunk 1: {data.get('error')}")
+            return None
+
+        first_ts = data.get("ts")
+        parent_ts = thread_ts or first_ts
+        for i in range(1, len(chunks)):
+            outbox.post(target_channel, headers[i] + chunks[i], thread_ts=parent_ts)
         
         return first_ts
     
@@ -1452,96 +1441,26 @@ class StrategyAgent(SelfOptimizingAgent):
                 insights=["❌ Supabase not configured - set SUPABASE_URL and SUPABASE_KEY environment variables"]
             )
 
-        # Query Supabase for REAL pipeline data from the 'leads' table
-        from datetime import datetime, timedelta
-
+        # Load REAL pipeline data from the 'leads' table (columnar, shared cache)
         try:
-            # Calculate start date for query
-            start_date = (datetime.now() - timedelta(days=days)).isoformat()
-
-            # Query the 'leads' table for all leads within the date range
-            logger.info(f"🔍 Querying 'leads' table from {start_date}")
-            result = self.supabase.table('leads') \
-                .select('*') \
-                .gte('created_at', start_date) \
-                .execute()
-
-            # Initialize tier counts with all possible tiers
-            tier_counts = {
-                'SCORCHING': 0,
-                'HOT': 0,
-                'WARM': 0,
-                'COOL': 0,
-                'COLD': 0,
-                'UNQUALIFIED': 0
-            }
+            logger.info(f"🔍 Loading 'leads' for the last {days} days")
+            leads = await get_lead_analytics().window(self.supabase, days=days)
 
-            source_counts = {}
-            industries = {}
-            total_score = 0
-            scored_leads_count = 0
-            qualified_leads = 0  # Leads that are not UNQUALIFIED
-            meetings_booked = 0
-
-            # Process each lead
-            for lead in result.data:
-                # Count by tier (check multiple possible field names)
-                tier = (
-                    lead.get('qualification_tier') or
-                    lead.get('tier') or
-                    lead.get('lead_tier') or
-                    'UNQUALIFIED'
-                ).upper()
-
-                # Ensure tier is valid, otherwise mark as UNQUALIFIED
-                if tier not in tier_counts:
-                    tier = 'UNQUALIFIED'
-
-                tier_counts[tier] = tier_counts.get(tier, 0) + 1
-
-                # Count qualified leads (not UNQUALIFIED)
-                if tier != 'UNQUALIFIED':
-                    qualified_leads += 1
-
-                # Count by source
-                source = lead.get('source') or lead.get('lead_source') or 'unknown'
-                source_counts[source] = source_counts.get(source, 0) + 1
-
-                # Track industries
-                industry = lead.get('industry') or lead.get('company_industry')
-                if industry:
-                    industries[industry] = industries.get(industry, 0) + 1
-
-                # Calculate average qualification score
-                score = lead.get('qualification_score') or lead.get('score')
-                if score is not None:
-                    try:
-                        total_score += float(score)
-                        scored_leads_count += 1
-                    except (ValueError, TypeError):
-                        pass
-
-                # Count meetings booked (check multiple possible indicators)
-                if (lead.get('meeting_booked') or
-                    lead.get('appointment_scheduled') or
-                    lead.get('demo_scheduled') or
-                    lead.get('status') == 'meeting_scheduled'):
-                    meetings_booked += 1
-
-            total_leads = len(result.data)
+            tier_counts = leads.count_by('tier', include=TIERS)
+            source_counts = leads.count_by('source')
+            total_leads = len(leads)
+            qualified_leads = total_leads - tier_counts['UNQUALIFIED']
+            meetings_booked = int(leads['meeting_booked'].sum())
 
             # Calculate conversion rate (meetings booked / qualified leads)
             conversion_rate = 0.0
             if qualified_leads > 0:
                 conversion_rate = meetings_booked / qualified_leads
 
-            # Calculate average qualification score
-            avg_score = 0.0
-            if scored_leads_count > 0:
-                avg_score = total_score / scored_leads_count
+            avg_score = leads.mean('score')
 
             # Get top 3 industries
-            top_industries = sorted(industries.items(), key=lambda x: x[1], reverse=True)[:3]
+            top_industries = leads.top('industry', 3)
             top_industries_list = [industry for industry, count in top_industries]
 
             # Generate REAL insights based on actual data
@@ -1723,52 +1642,24 @@ class StrategyAgent(SelfOptimizingAgent):
             Dictionary of identified patterns
         """
         try:
-            # Extract key attributes
-            industries = []
-            company_sizes = []
-            tech_stacks = []
-            revenues = []
-            locations = []
-
-            for lead in leads:
-                # Extract from metadata or direct fields
-                metadata = lead.get('metadata', {})
-
-                if lead.get('company'):
-                    industries.append(metadata.get('industry', 'unknown'))
-
-                if metadata.get('company_size'):
-                    company_sizes.append(metadata.get('company_size'))
-
-                if metadata.get('tech_stack'):
-                    tech_stacks.extend(metadata.get('tech_stack', []))
-
-                if metadata.get('revenue'):
-                    revenues.append(metadata.get('revenue'))
-
-                if metadata.get('location'):
-                    locations.append(metadata.get('location'))
-
-            # Calculate frequencies
-            from collections import Counter
-            industry_counts = Counter(industries)
-            size_counts = Counter(company_sizes)
-            tech_counts = Counter(tech_stacks)
-            location_counts = Counter(locations)
-
-            # Calculate average qualification score
-            scores = [lead.get('qualification_score', 0) for lead in leads if lead.get('qualification_score')]
-            avg_score = sum(scores) / len(scores) if scores else 0
+            frame = LeadFrame.from_rows(leads)
+            # Industry of leads with a company (metadata/industry fields, else 'unknown')
+            with_company = frame.filter(frame['has_company'])
+            industry_counts = with_company.count_by('industry')
+            unknown = len(with_company) - sum(industry_counts.values())
+            if unknown:
+                industry_counts['unknown'] = industry_counts.get('unknown', 0) + unknown
+            industries = sorted(industry_counts.items(), key=lambda kv: -kv[1])
 
             patterns = {
-                'total_analyzed': len(leads),
-                'avg_score': avg_score,
-                'top_industry': industry_counts.most_common(1)[0][0] if industry_counts else 'healthcare',
-                'common_industries': [ind for ind, count in industry_counts.most_common(3)],
-                'common_sizes': [size for size, count in size_counts.most_common(3)],
-                'common_tech': [tech for tech, count in tech_counts.most_common(5)],
-                'top_locations': [loc for loc, count in location_counts.most_common(5)],
-                'success_factors': self._identify_success_factors(leads)
+                'total_analyzed': len(frame),
+                'avg_score': frame.mean('score'),
+                'top_industry': industries[0][0] if industries else 'healthcare',
+                'common_industries': [ind for ind, count in industries[:3]],
+                'common_sizes': [size for size, count in frame.top('company_size', 3)],
+                'common_tech': [tech for tech, count in frame.top('tech_stack', 5)],
+                'top_locations': [loc for loc, count in frame.top('location', 5)],
+                'success_factors': self._identify_success_factors(frame)
             }
 
             logger.info(f"📊 Pattern analysis: {patterns}")
@@ -1788,41 +1679,24 @@ class StrategyAgent(SelfOptimizingAgent):
                 'success_factors': ['Active engagement', 'Clear need identified']
             }
 
-    def _identify_success_factors(self, leads: List[Dict[str, Any]]) -> List[str]:
+    def _identify_success_factors(self, leads: LeadFrame) -> List[str]:
         """Identify common success factors from lead data.
 
         Args:
-            leads: List of successful leads
+            leads: Successful leads as a LeadFrame
 
         Returns:
-            List of success factors
+            Up to five factors, most common first
         """
-        factors = []
-
-        # Analyze metadata for common patterns
-        for lead in leads:
-            metadata = lead.get('metadata', {})
-
-            # Check for specific indicators
-            if metadata.get('has_budget'):
-                factors.append('Budget confirmed')
-
-            if metadata.get('decision_maker'):
-                factors.append('Direct decision maker contact')
-
-            if metadata.get('pain_points'):
-                factors.append('Clear pain points identified')
-
-            if lead.get('engagement_score', 0) > 40:
-                factors.append('High engagement score')
-
-            if lead.get('business_fit_score', 0) > 40:
-                factors.append('Strong business fit')
-
-        # Return unique factors
-        from collections import Counter
-        factor_counts = Counter(factors)
-        return [factor for factor, count in factor_counts.most_common(5)]
+        factor_counts = {
+            'Budget confirmed': int(leads['has_budget'].sum()),
+            'Direct decision maker contact': int(leads['decision_maker'].sum()),
+            'Clear pain points identified': int(leads['pain_points'].sum()),
+            'High engagement score': int(np.sum(leads['engagement_score'] > 40)),
+            'Strong business fit': int(np.sum(leads['business_fit_score'] > 40)),
+        }
+        ranked = sorted(factor_counts.items(), key=lambda kv: -kv[1])
+        return [factor for factor, count in ranked if count > 0][:5]
 
     async def _generate_target_recommendations(
         self,
@@ -2356,28 +2230,12 @@ _Reply with "details" for full analysis_
                 "status": "operational"
             })
     
-    def _format_conversation_history(self, history: List[Dict[str, str]]) -> str:
-        """Format conversation history for DSPy input.
-        
-        Args:
-            history: List of conversation exchanges
-        
-        Returns:
-            Formatted history string
-        """
-        if not history:
-            return "No previous conversation"
-        
-        # Take last 3 exchanges (6 messages)
-        recent = history[-6:]
-        formatted = []
-        
-        for msg in recent:
-            role = "Josh" if msg["role"] == "user" else "Strategy Agent"
-            content = msg["content"][:200]  # Truncate long messages
-            formatted.append(f"{role}: {content}")
-        
-        return "\n".join(formatted)
+    def _summarize_turns(self, previous_summary: str, turns: List[ConversationTurn]) -> str:
+        """Conversation store summarizer: fold evicted turns into the running summary."""
+        text = "\n".join(f"{t.role}: {t.content[:1000]}" for t in turns)
+        with dspy.context(lm=getattr(self, "haiku_lm", None) or dspy.settings.lm):
+            result = self.conversation_summarizer(previous_summary=previous_summary or "(none)", turns=text)
+        return result.summary
     
     async def _handle_fix_approval(self, message: str) -> str:
         """Handle fix approval command from Josh (Phase 0.6).
@@ -2735,36 +2593,28 @@ _Processed via StrategyAgent orchestration_"""
         return {"status": "success", "delegations": results}
     
     async def _delegate_to_inbound(self, lead):
-        """Delegate to InboundAgent via HTTP endpoint."""
-        import httpx
+        """Delegate to InboundAgent (in-process when co-located, HTTP otherwise)."""
         try:
-            # Use the correct base URL (localhost:8080 for Railway)
-            base_url = self.communication.base_url if self.communication else "http://localhost:8080"
-            url = f"{base_url}/agents/inbound/qualify"
+            logger.info(f"🔗 Delegating to InboundAgent")
 
-            logger.info(f"🔗 Delegating to InboundAgent: {url}")
+            r = await get_agent_dispatcher().dispatch(INBOUND_QUALIFY, {"lead": lead}, timeout=30.0)
+
+            if r.status_code == 200:
+                qualification = r.json().get('result', {})
+                return {
+                    "status": "success",
+                    "tier": qualification.get('tier'),
+                    "score": qualification.get('score')
+                }
+            else:
+                return {"status": "error", "error": f"HTTP {r.status_code}"}
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                r = await client.post(url, json={"lead": lead.model_dump(mode='json')})
-                
-                if r.status_code == 200:
-                    result = r.json()
-                    qualification = result.get('result', {})
-                    return {
-                        "status": "success",
-                        "tier": qualification.get('tier'),
-                        "score": qualification.get('score')
-                    }
-                else:
-                    return {"status": "error", "error": f"HTTP {r.status_code}"}
-                    
         except Exception as e:
             logger.error(f"InboundAgent delegation failed: {e}")
             return {"status": "error", "error": str(e)}
 
     async def _delegate_to_research(self, lead):
         """Delegate to ResearchAgent."""
-        import httpx
         import json
         try:
             # ResearchAgent.respond() expects JSON-encoded lead data
@@ -2777,20 +2627,14 @@ _Processed via StrategyAgent orchestration_"""
             }
             message = json.dumps(lead_data)
 
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    f"{self.communication.base_url if self.communication else 'http://localhost:8080'}/agents/research/a2a",
-                    json={"message": message},
-                    timeout=30.0
-                )
-                return {"status": "success", "data": r.json()} if r.status_code == 200 else {"status": "error", "http_status": r.status_code}
+            r = await get_agent_dispatcher().dispatch(RESEARCH_A2A, {"message": message}, timeout=30.0)
+            return {"status": "success", "data": r.json()} if r.status_code == 200 else {"status": "error", "http_status": r.status_code}
         except Exception as e:
             logger.error(f"❌ ResearchAgent delegation failed: {e}")
             return {"status": "error", "error": str(e)}
 
     async def _delegate_to_followup(self, lead, strategy, research_data=None, slack_thread_ts=None, slack_channel=None):
         """Delegate to FollowUpAgent."""
-        import httpx
         import json
         try:
             # FollowUpAgent.respond() expects JSON-encoded lead data with action
@@ -2810,13 +2654,8 @@ _Processed via StrategyAgent orchestration_"""
 
             message = json.dumps(lead_data)
 
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    f"{self.communication.base_url if self.communication else 'http://localhost:8080'}/agents/followup/a2a",
-                    json={"message": message},
-                    timeout=30.0
-                )
-                return {"status": "success", "data": r.json()} if r.status_code == 200 else {"status": "error", "http_status": r.status_code}
+            r = await get_agent_dispatcher().dispatch(FOLLOWUP_A2A, {"message": message}, timeout=30.0)
+            return {"status": "success", "data": r.json()} if r.status_code == 200 else {"status": "error", "http_status": r.status_code}
         except Exception as e:
             logger.error(f"❌ FollowUpAgent delegation failed: {e}")
             return {"status": "error", "error": str(e)}
@@ -2834,9 +2673,7 @@ _Processed via StrategyAgent orchestration_"""
     async def _save_lead_to_db(self, lead):
         """Persist lead to leads table in Supabase."""
         try:
-            from core.async_supabase_client import get_async_supabase_client
-
-            supabase = await get_async_supabase_client()
+            from core.persistence_writer import get_persistence_writer
 
             # Prepare lead data for database
             lead_record = {
@@ -2856,8 +2693,9 @@ _Processed via StrategyAgent orchestration_"""
                 "raw_metadata": lead.raw_metadata or {}
             }
 
-            # Upsert to handle duplicate lead IDs gracefully
-            await supabase.table('leads').upsert(lead_record).execute()
+            # Upsert to handle duplicate lead IDs gracefully; batched with concurrent saves.
+            # Waits for the commit: the qualification update that follows needs the row.
+            await get_persistence_writer().upsert_lead(lead_record)
             logger.info(f"✅ Lead {lead.email} saved to database (ID: {lead.id})")
 
         except Exception as e:
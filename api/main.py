@@ -15,7 +15,8 @@ load_dotenv()  # Load .env file BEFORE any other imports
 
 
 from fastapi import FastAPI, Request, BackgroundTasks, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+import asyncio
 import logging
 import sys
 import os
@@ -33,60 +34,122 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ============================================================================
-# PHOENIX OBSERVABILITY (MUST BE FIRST!)
+# COLD START
 # ============================================================================
-# Initialize Phoenix tracing BEFORE any DSPy/agent code runs
-# This gives us complete visibility into all LLM calls and agent behavior
+# Railway health-checks /health as soon as the process starts, so importing this
+# module must stay cheap. Heavy subsystems (Phoenix, Supabase client, the
+# FollowUpAgent's Postgres pool + LangGraph, the StrategyAgent graph with
+# LangChain/FAISS/sentence-transformers) are built on first use via the get_*()
+# accessors below, or by warm_up() in a background task once uvicorn is
+# listening. Profile imports with: python -m tests.benchmarks.bench_cold_start
+
+import threading
+
+from core.agent_dispatch import (
+    FOLLOWUP_A2A,
+    INBOUND_A2A,
+    INBOUND_QUALIFY,
+    RESEARCH_A2A,
+    get_agent_dispatcher,
+)
 
-from core.observability import setup_observability
+# One lock per component: a slow build (e.g. FollowUpAgent) must never make a
+# request wait on an unrelated, already-built one
+_init_lock = threading.Lock()
+_supabase_lock = threading.Lock()
+_follow_up_agent_lock = threading.Lock()
+_observability_configured = False
+_dspy_configured = False
 
-logger.info("🔭 Initializing Phoenix observability...")
-tracer_provider = setup_observability()
-if tracer_provider:
-    logger.info("✅ Phoenix tracing active - all DSPy calls will be traced")
-    logger.info("   View traces at: https://app.phoenix.arize.com/")
-else:
-    logger.info("⚠️ Phoenix tracing disabled - set PHOENIX_API_KEY to enable")
+# Warm-up progress, reported by /health
+warmup_status: Dict[str, Any] = {"state": "pending", "components": {}}
 
-logger.info("🚀 Deployment: Phase 1 + 1.3 - Async agent_state + FastAPI BackgroundTasks")
 
-# ============================================================================
-# DSPY GLOBAL CONFIGURATION (CRITICAL!)
-# ============================================================================
-# This must happen AFTER Phoenix but BEFORE any agents are imported!
+def setup_tracing():
+    """Initialize Phoenix tracing (once).
 
-import dspy
+    Instrumentation patches DSPy/LangChain classes, so agents built before this
+    runs are traced from this point on.
+    """
+    global _observability_configured
+    with _init_lock:
+        if _observability_configured:
+            return
+        _observability_configured = True
+
+        from core.observability import setup_metrics_export, setup_observability
+
+        logger.info("🔭 Initializing Phoenix observability...")
+        tracer_provider = setup_observability()
+        if tracer_provider:
+            logger.info("✅ Phoenix tracing active - all DSPy calls will be traced")
+            logger.info("   View traces at: https://app.phoenix.arize.com/")
+        else:
+            logger.info("⚠️ Phoenix tracing disabled - set PHOENIX_API_KEY to enable")
+        setup_metrics_export()
 
-try:
-    openrouter_key = os.getenv("OPENROUTER_API_KEY")
-    if openrouter_key:
-        # Two-tier paid model system:
-        # - Haiku 4.5: Fast, cheap for routine low-level agentic work (DEFAULT)
-        # - Sonnet 4.5: Premium for complex high-level reasoning
-        # Configure with Haiku 4.5 as default (most tasks are standard customer-facing)
-        lm = dspy.LM(
-            model="openrouter/anthropic/claude-haiku-4.5",
-            api_key=openrouter_key,
-            max_tokens=2000,
-            temperature=0.7
-        )
-        dspy.configure(lm=lm)
-        logger.info("✅ DSPy configured globally with Claude Haiku 4.5 via OpenRouter")
-        logger.info("   Low-tier: claude-haiku-4.5 (default for standard tasks)")
-        logger.info("   High-tier: claude-sonnet-4.5 (for complex reasoning)")
-        logger.info("   Use core.model_selector for dynamic model selection")
-    else:
-        logger.error("❌ OPENROUTER_API_KEY not found - DSPy will not work!")
-        logger.error("   Set OPENROUTER_API_KEY in Railway environment variables")
-except Exception as e:
-    logger.error(f"❌ Failed to configure DSPy: {e}")
-    import traceback
-    logger.error(traceback.format_exc())
+
+def configure_dspy_globally():
+    """Configure the global DSPy LM (once). Must run before any agent is built."""
+    global _dspy_configured
+    with _init_lock:
+        if _dspy_configured:
+            return
+        _dspy_configured = True
+
+        import dspy
+        from core.metrics import install_dspy_metrics
+
+        try:
+            openrouter_key = os.getenv("OPENROUTER_API_KEY")
+            if openrouter_key:
+                # Two-tier paid model system:
+                # - Haiku 4.5: Fast, cheap for routine low-level agentic work (DEFAULT)
+                # - Sonnet 4.5: Premium for complex high-level reasoning
+                # Configure with Haiku 4.5 as default (most tasks are standard customer-facing)
+                lm = dspy.LM(
+                    model="openrouter/anthropic/claude-haiku-4.5",
+                    api_key=openrouter_key,
+                    max_tokens=2000,
+                    temperature=0.7
+                )
+                dspy.configure(lm=lm)
+                logger.info("✅ DSPy configured globally with Claude Haiku 4.5 via OpenRouter")
+                logger.info("   Low-tier: claude-haiku-4.5 (default for standard tasks)")
+                logger.info("   High-tier: claude-sonnet-4.5 (for complex reasoning)")
+                logger.info("   Use core.model_selector for dynamic model selection")
+            else:
+                logger.error("❌ OPENROUTER_API_KEY not found - DSPy will not work!")
+                logger.error("   Set OPENROUTER_API_KEY in Railway environment variables")
+
+            # Latency/token/cost metrics for every DSPy module, LM and tool call (/metrics)
+            install_dspy_metrics()
+        except Exception as e:
+            logger.error(f"❌ Failed to configure DSPy: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+
+
+logger.info("🚀 Deployment: Phase 1 + 1.3 - Async agent_state + FastAPI BackgroundTasks")
+
+# DSPy config is cheap (no network) and agents read dspy.settings when they are
+# built, so do it now rather than racing the first request.
+configure_dspy_globally()
 
 # Autonomous execution scheduler
-from scheduler import get_scheduler, check_leads_needing_followup, autonomous_monitoring, run_performance_monitoring
+from scheduler import (
+    get_scheduler, check_leads_needing_followup, autonomous_monitoring, run_performance_monitoring,
+    run_due_campaign_steps,
+)
 from apscheduler.triggers.interval import IntervalTrigger
 
+# Latency / token / queue / error metrics (served on /metrics)
+from core.metrics import get_metrics_registry, queued, record_error
+from core.slack_outbox import get_slack_outbox
+
+# Provider event-ID dedupe for webhook retries
+from core.idempotency import get_idempotency_index, get_idempotency_index_async, typeform_event_key, vapi_event_key
+
 app = FastAPI(
     title="Hume DSPy Agent - Event Sourced",
     description="Event sourcing webhook system with async processing",
@@ -108,7 +171,19 @@ async def start_background_tasks():
     - Post to Slack for approval
     """
     import asyncio
-    
+
+    # Let ReAct tool calls from worker threads reuse this loop's clients
+    from core.tool_bridge import get_tool_bridge
+    get_tool_bridge().attach_loop(asyncio.get_running_loop())
+    # Let LangGraph nodes in worker threads queue Slack updates on this loop
+    get_slack_outbox().attach_loop(asyncio.get_running_loop())
+
+    # Build heavy subsystems after uvicorn starts listening (see warm_up)
+    if os.getenv("STARTUP_WARMUP", "true").lower() == "true":
+        app.state.warmup_task = asyncio.create_task(warm_up())
+    else:
+        warmup_status["state"] = "disabled"
+
     try:
         # from monitoring.proactive_monitor import start_monitoring  # Disabled: Railway CLI not available in container
         
@@ -144,10 +219,20 @@ async def start_background_tasks():
                 id="performance_monitoring",
                 replace_existing=True
             )
+
+            # Run due ABM campaign steps (only due campaigns are read)
+            campaign_sweep_minutes = int(os.getenv("CAMPAIGN_SWEEP_MINUTES", "5"))
+            get_scheduler().add_job(
+                run_due_campaign_steps,
+                trigger=IntervalTrigger(minutes=campaign_sweep_minutes),
+                id="campaign_steps",
+                replace_existing=True
+            )
             get_scheduler().start()
             logger.info("✅ Autonomous scheduler started")
             logger.info("   - Follow-up checks: Every hour")
             logger.info("   - Pipeline monitoring: Every 30 minutes")
+            logger.info(f"   - Campaign steps: Every {campaign_sweep_minutes} minutes")
         except Exception as e:
             logger.error(f"❌ Scheduler failed to start: {e}")
             import traceback
@@ -157,6 +242,24 @@ async def start_background_tasks():
         logger.warning(f"⚠️ Proactive monitoring failed to start: {e}")
         logger.info("   System will continue without proactive monitoring")
 
+
+@app.on_event("shutdown")
+async def flush_pending_writes():
+    """Write out leads/agent_state rows and Slack messages still buffered at shutdown."""
+    from core.persistence_writer import close_persistence_writer
+    try:
+        await get_agent_dispatcher().aclose()  # Let timed-out local handlers finish their writes
+    except Exception as e:
+        logger.error(f"❌ Failed to drain agent dispatcher on shutdown: {e}")
+    try:
+        await get_slack_outbox().aclose()  # Post queued and coalesced notifications
+    except Exception as e:
+        logger.error(f"❌ Failed to flush Slack outbox on shutdown: {e}")
+    try:
+        await close_persistence_writer()
+    except Exception as e:
+        logger.error(f"❌ Failed to flush persistence writer on shutdown: {e}")
+
 # Include Slack bot router
 from api.slack_bot import router as slack_router
 app.include_router(slack_router)
@@ -178,30 +281,52 @@ if not SUPABASE_KEY:
 
 
 
-# Initialize Supabase client
+# Supabase client and global FollowUpAgent, built lazily (see COLD START above)
 supabase = None
-try:
-    from supabase import create_client, Client
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    logger.info(f"✅ Supabase client initialized")
-    logger.info(f"   URL: {SUPABASE_URL}")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Supabase: {str(e)}")
-    import traceback
-    logger.error(traceback.format_exc())
-
-# Initialize global FollowUpAgent (singleton to prevent duplicate email sequences)
 follow_up_agent = None
-try:
-    from agents.follow_up_agent import FollowUpAgent
-    follow_up_agent = FollowUpAgent()
-    logger.info("✅ Global Follow-Up Agent initialized (singleton)")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Follow-Up Agent: {str(e)}")
-    import traceback
-    logger.error(traceback.format_exc())
 
-# Import processors and inject Supabase client
+
+def get_supabase():
+    """Get or create the Supabase client (None if it cannot be created)."""
+    global supabase
+    if supabase is None:
+        with _supabase_lock:
+            if supabase is None:
+                try:
+                    from supabase import create_client
+                    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+                    logger.info(f"✅ Supabase client initialized")
+                    logger.info(f"   URL: {SUPABASE_URL}")
+                    set_supabase_client(supabase)
+                except Exception as e:
+                    logger.error(f"❌ Failed to initialize Supabase: {str(e)}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+    return supabase
+
+
+def get_follow_up_agent():
+    """Get or create the global FollowUpAgent (singleton to prevent duplicate email sequences).
+
+    Blocking (opens the Postgres checkpointer pool); call via asyncio.to_thread
+    from async code.
+    """
+    global follow_up_agent
+    if follow_up_agent is None:
+        with _follow_up_agent_lock:
+            if follow_up_agent is None:
+                try:
+                    from agents.follow_up_agent import FollowUpAgent
+                    follow_up_agent = FollowUpAgent()
+                    logger.info("✅ Global Follow-Up Agent initialized (singleton)")
+                except Exception as e:
+                    logger.error(f"❌ Failed to initialize Follow-Up Agent: {str(e)}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+    return follow_up_agent
+
+
+# Import processors (lightweight - the Supabase client is injected by get_supabase())
 try:
     from api.processors import (
         process_typeform_event,
@@ -210,14 +335,58 @@ try:
         process_a2a_event,
         set_supabase_client
     )
-    set_supabase_client(supabase)
-    logger.info("✅ Processors imported and configured")
+    logger.info("✅ Processors imported")
 except Exception as e:
     logger.error(f"❌ Failed to import processors: {str(e)}")
     import traceback
     logger.error(traceback.format_exc())
 
 
+async def warm_up():
+    """Build heavy subsystems in the background once the server is listening.
+
+    Each component is built in a worker thread so the event loop keeps serving
+    health checks and webhooks; requests that arrive first build what they need
+    on demand through the same get_*() accessors.
+    """
+    import asyncio
+    from api.slack_bot import get_strategy_agent
+
+    warmup_status["state"] = "running"
+    started = datetime.utcnow()
+    components = [
+        ("observability", setup_tracing),
+        ("supabase", get_supabase),
+        ("idempotency_index", get_idempotency_index),
+        ("follow_up_agent", get_follow_up_agent),
+        ("strategy_agent", get_strategy_agent),
+    ]
+    for name, build in components:
+        component_started = datetime.utcnow()
+        try:
+            built = await asyncio.to_thread(build)
+            ok = built is not None or name == "observability"
+            warmup_status["components"][name] = "ready" if ok else "failed"
+        except Exception as e:
+            logger.error(f"❌ Warm-up of {name} failed: {e}")
+            warmup_status["components"][name] = "failed"
+        seconds = (datetime.utcnow() - component_started).total_seconds()
+        logger.info(f"🔥 Warm-up: {name} {warmup_status['components'][name]} ({seconds:.1f}s)")
+
+    # Pre-warm subordinate agents (SUBORDINATE_PREWARM_PROFILES)
+    try:
+        strategy_agent = get_strategy_agent()
+        if strategy_agent.delegation:
+            await strategy_agent.delegation.prewarm()
+    except Exception as e:
+        logger.warning(f"⚠️ Subordinate pre-warm skipped: {e}")
+
+    failed = [n for n, state in warmup_status["components"].items() if state != "ready"]
+    warmup_status["state"] = "degraded" if failed else "ready"
+    warmup_status["seconds"] = round((datetime.utcnow() - started).total_seconds(), 2)
+    logger.info(f"✅ Warm-up {warmup_status['state']} in {warmup_status['seconds']}s")
+
+
 # ============================================================================
 # FAST PATH: Webhook Reception (< 50ms)
 # ============================================================================
@@ -231,6 +400,7 @@ async def store_raw_event(
     event_id = str(uuid.uuid4())
     
     try:
+        supabase = get_supabase()
         if not supabase:
             # Fallback: Store to file
             os.makedirs('/tmp/raw_events', exist_ok=True)
@@ -281,10 +451,20 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "2.1.0-full-pipeline",
-        "supabase": "connected" if supabase else "disconnected"
+        "supabase": "connected" if supabase else "disconnected",
+        "warmup": warmup_status
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: agent/signature/LM/tool latency, tokens, cost, queue depths, errors."""
+    return PlainTextResponse(
+        get_metrics_registry().render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -447,14 +627,9 @@ async def a2a_conversation(request: Request):
 
         logger.info(f"📨 A2A Message received: {message_content[:100]}...")
 
-        # Import StrategyAgent for conversational processing
-        from agents.strategy_agent import StrategyAgent
-
-        # Initialize StrategyAgent (singleton pattern)
-        if not hasattr(app.state, 'strategy_agent'):
-            app.state.strategy_agent = StrategyAgent()
-
-        strategy_agent = app.state.strategy_agent
+        # Shared StrategyAgent (built on first use / by warm-up)
+        from api.slack_bot import get_strategy_agent_async
+        strategy_agent = await get_strategy_agent_async()
 
         # Process message through StrategyAgent
         import asyncio
@@ -492,86 +667,83 @@ async def a2a_conversation(request: Request):
 # Inter-Agent Communication Endpoints (A2A Protocol)
 # ============================================================================
 
-@app.post("/agents/inbound/a2a")
-async def inbound_agent_a2a(request: Request):
-    """A2A endpoint for InboundAgent - lead qualification."""
+# Handlers are shared by the HTTP endpoints below and in-process dispatch
+# (core/agent_dispatch.py), so co-located agents never POST to this server.
+
+def _get_state_agent(attr: str, factory):
+    """Agent cached on app.state (created on first use)."""
+    if not hasattr(app.state, attr):
+        setattr(app.state, attr, factory())
+    return getattr(app.state, attr)
+
+
+async def _handle_agent_message(agent_name: str, attr: str, factory, payload: Dict[str, Any]):
+    """Run an A2A text message through an agent's respond()."""
     try:
-        payload = await request.json()
         message_content = payload.get("message", "")
-        
+
         if not message_content:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "No message provided"}
-            )
-            
-        logger.info(f"📨 InboundAgent A2A Message: {message_content[:100]}...")
-        
-        # Import and initialize InboundAgent
-        from agents.inbound_agent import InboundAgent
-        
-        if not hasattr(app.state, 'inbound_agent'):
-            app.state.inbound_agent = InboundAgent()
-            
-        inbound_agent = app.state.inbound_agent
-        
-        # Process message
-        response = await inbound_agent.respond(message_content)
-        
-        logger.info(f"✅ InboundAgent A2A Response: {str(response)[:100]}...")
-        
-        return JSONResponse(content={
+            return 400, {"error": "No message provided"}
+
+        logger.info(f"📨 {agent_name} A2A Message: {message_content[:100]}...")
+
+        agent = _get_state_agent(attr, factory)
+        response = await agent.respond(message_content)
+
+        logger.info(f"✅ {agent_name} A2A Response: {str(response)[:100]}...")
+        return 200, {
             "status": "success",
             "response": str(response),
-            "agent": "InboundAgent"
-        })
-        
+            "agent": agent_name
+        }
+
     except Exception as e:
-        logger.error(f"❌ InboundAgent A2A failed: {str(e)}")
+        logger.error(f"❌ {agent_name} A2A failed: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "error": str(e)}
-        )
+        return 500, {"status": "error", "error": str(e)}
 
 
+def _inbound_agent_factory():
+    from agents.inbound_agent import InboundAgent
+    return InboundAgent()
 
-@app.post("/agents/inbound/qualify")
-async def inbound_agent_qualify(request: Request):
-    """Dedicated endpoint for InboundAgent lead qualification.
-    
-    Expects: {"lead": {...}}  # Lead object as JSON
-    Returns: {"status": "success", "result": {...}}  # QualificationResult
-    """
+
+def _research_agent_factory():
+    from agents.research_agent import ResearchAgent
+    return ResearchAgent()
+
+
+def _followup_agent_factory():
+    from agents.follow_up_agent import FollowUpAgent
+    return FollowUpAgent()
+
+
+async def handle_inbound_a2a(payload: Dict[str, Any]):
+    return await _handle_agent_message("InboundAgent", "inbound_agent", _inbound_agent_factory, payload)
+
+
+async def handle_inbound_qualify(payload: Dict[str, Any]):
+    """Qualify a lead: payload {"lead": Lead | dict} -> QualificationResult."""
     try:
-        payload = await request.json()
         lead_data = payload.get("lead")
-        
+
         if not lead_data:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "No lead data provided"}
-            )
-        
-        logger.info(f"📨 InboundAgent Qualification Request")
-        logger.info(f"   Lead ID: {lead_data.get('id')}")
-        logger.info(f"   Email: {lead_data.get('email')}")
-        
-        # Import and initialize InboundAgent (reuse if exists)
-        from agents.inbound_agent import InboundAgent
+            return 400, {"error": "No lead data provided"}
+
         from models.lead import Lead
-        
-        if not hasattr(app.state, 'inbound_agent'):
-            app.state.inbound_agent = InboundAgent()
-        
-        inbound_agent = app.state.inbound_agent
-        
-        # Create Lead object from data
-        lead = Lead(**lead_data)
-        
-        # Qualify the lead using forward()
-        result = inbound_agent.forward(lead)
+
+        # In-process callers pass the Lead itself; HTTP callers send JSON
+        lead = lead_data if isinstance(lead_data, Lead) else Lead(**lead_data)
+
+        logger.info(f"📨 InboundAgent Qualification Request")
+        logger.info(f"   Lead ID: {lead.id}")
+        logger.info(f"   Email: {lead.email}")
+
+        inbound_agent = _get_state_agent("inbound_agent", _inbound_agent_factory)
+
+        # LM calls run in a thread; memory/campaign/agent_state writes stay on this loop
+        result = await inbound_agent.aforward(lead)
 
         logger.info(f"✅ InboundAgent Qualification Complete")
         logger.info(f"   Score: {result.score}")
@@ -595,132 +767,87 @@ async def inbound_agent_qualify(request: Request):
             logger.error(f"⚠️ Failed to update lead in database: {db_error}")
             # Continue - this is non-critical
 
-        # Return QualificationResult as JSON
-        return JSONResponse(content={
+        return 200, {
             "status": "success",
-            "result": result.model_dump(),  # Use model_dump() for Pydantic v2
+            "result": result.model_dump(mode="json"),
             "agent": "InboundAgent"
-        })
-        
+        }
+
     except Exception as e:
         logger.error(f"❌ InboundAgent Qualification failed: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "error": str(e)}
-        )
-
+        return 500, {"status": "error", "error": str(e)}
 
-@app.post("/agents/research/a2a")
-async def research_agent_a2a(request: Request):
-    """A2A endpoint for ResearchAgent - deep lead research."""
-    try:
-        payload = await request.json()
-        message_content = payload.get("message", "")
-        
-        if not message_content:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "No message provided"}
-            )
-            
-        logger.info(f"📨 ResearchAgent A2A Message: {message_content[:100]}...")
-        
-        # Import and initialize ResearchAgent
-        from agents.research_agent import ResearchAgent
-        
-        if not hasattr(app.state, 'research_agent'):
-            app.state.research_agent = ResearchAgent()
-            
-        research_agent = app.state.research_agent
-        
-        # Process message
-        response = await research_agent.respond(message_content)
-        
-        logger.info(f"✅ ResearchAgent A2A Response: {str(response)[:100]}...")
 
-        # Trigger FollowUpAgent after successful research
-        try:
-            logger.info(f"🔗 Triggering FollowUpAgent after research completion")
-
-            import httpx
-            async with httpx.AsyncClient() as client:
-                followup_response = await client.post(
-                    "http://localhost:8000/agents/followup/a2a",
-                    json={
-                        "message": f"Research completed for lead. Start follow-up sequence. Research insights: {str(response)[:500]}"
-                    },
-                    timeout=30.0
-                )
+async def handle_research_a2a(payload: Dict[str, Any]):
+    status_code, body = await _handle_agent_message(
+        "ResearchAgent", "research_agent", _research_agent_factory, payload
+    )
+    if status_code != 200:
+        return status_code, body
 
-                if followup_response.status_code == 200:
-                    logger.info(f"✅ FollowUpAgent triggered successfully")
-                else:
-                    logger.error(f"❌ FollowUpAgent trigger failed: {followup_response.status_code}")
-        except Exception as e:
-            logger.error(f"❌ Failed to trigger FollowUpAgent: {e}")
-            # Don't fail the whole process if follow-up trigger fails
+    # Trigger FollowUpAgent after successful research
+    try:
+        logger.info(f"🔗 Triggering FollowUpAgent after research completion")
 
-        
-        return JSONResponse(content={
-            "status": "success",
-            "response": str(response),
-            "agent": "ResearchAgent"
+        followup_response = await get_agent_dispatcher().dispatch(FOLLOWUP_A2A, {
+            "message": f"Research completed for lead. Start follow-up sequence. Research insights: {body['response'][:500]}"
         })
-        
+
+        if followup_response.ok:
+            logger.info(f"✅ FollowUpAgent triggered successfully")
+        else:
+            logger.error(f"❌ FollowUpAgent trigger failed: {followup_response.status_code}")
     except Exception as e:
-        logger.error(f"❌ ResearchAgent A2A failed: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "error": str(e)}
-        )
+        logger.error(f"❌ Failed to trigger FollowUpAgent: {e}")
+        # Don't fail the whole process if follow-up trigger fails
+
+    return status_code, body
+
+
+async def handle_followup_a2a(payload: Dict[str, Any]):
+    return await _handle_agent_message("FollowUpAgent", "followup_agent", _followup_agent_factory, payload)
+
+
+_dispatcher = get_agent_dispatcher()
+_dispatcher.register(INBOUND_A2A, handle_inbound_a2a)
+_dispatcher.register(INBOUND_QUALIFY, handle_inbound_qualify)
+_dispatcher.register(RESEARCH_A2A, handle_research_a2a)
+_dispatcher.register(FOLLOWUP_A2A, handle_followup_a2a)
+
+
+@app.post(INBOUND_A2A)
+async def inbound_agent_a2a(request: Request):
+    """A2A endpoint for InboundAgent - lead qualification."""
+    status_code, body = await handle_inbound_a2a(await request.json())
+    return JSONResponse(status_code=status_code, content=body)
+
+
+@app.post(INBOUND_QUALIFY)
+async def inbound_agent_qualify(request: Request):
+    """Dedicated endpoint for InboundAgent lead qualification.
+    
+    Expects: {"lead": {...}}  # Lead object as JSON
+    Returns: {"status": "success", "result": {...}}  # QualificationResult
+    """
+    status_code, body = await handle_inbound_qualify(await request.json())
+    return JSONResponse(status_code=status_code, content=body)
+
+
+@app.post(RESEARCH_A2A)
+async def research_agent_a2a(request: Request):
+    """A2A endpoint for ResearchAgent - deep lead research."""
+    status_code, body = await handle_research_a2a(await request.json())
+    return JSONResponse(status_code=status_code, content=body)
 
 
-@app.post("/agents/followup/a2a")
+@app.post(FOLLOWUP_A2A)
 async def followup_agent_a2a(request: Request):
     """A2A endpoint for FollowUpAgent - lead journey management."""
-    try:
-        payload = await request.json()
-        message_content = payload.get("message", "")
-        
-        if not message_content:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "No message provided"}
-            )
-            
-        logger.info(f"📨 FollowUpAgent A2A Message: {message_content[:100]}...")
-        
-        # Import and initialize FollowUpAgent
-        from agents.follow_up_agent import FollowUpAgent
-        
-        if not hasattr(app.state, 'followup_agent'):
-            app.state.followup_agent = FollowUpAgent()
-            
-        followup_agent = app.state.followup_agent
-        
-        # Process message
-        response = await followup_agent.respond(message_content)
-        
-        logger.info(f"✅ FollowUpAgent A2A Response: {str(response)[:100]}...")
-        
-        return JSONResponse(content={
-            "status": "success",
-            "response": str(response),
-            "agent": "FollowUpAgent"
-        })
-        
-    except Exception as e:
-        logger.error(f"❌ FollowUpAgent A2A failed: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "error": str(e)}
-        )
+    status_code, body = await handle_followup_a2a(await request.json())
+    return JSONResponse(status_code=status_code, content=body)
+
 
 # FastA2A Protocol Endpoints
 # ============================================================================
@@ -767,9 +894,6 @@ async def _send_error_to_slack(processor: str, error_msg: str, traceback_str: st
         payload: The webhook payload that failed (for debugging)
     """
     try:
-        from utils.slack_client import SlackClient
-        slack = SlackClient()
-
         # Extract lead info if available
         lead_info = ""
         try:
@@ -803,15 +927,11 @@ async def _send_error_to_slack(processor: str, error_msg: str, traceback_str: st
 _Check Railway logs for full details_
 """
 
-        # Send to Slack
-        if slack.client:
+        # Queue for Slack (an error storm is coalesced into one message per window)
+        if os.getenv("SLACK_BOT_TOKEN"):
             channel = os.getenv("SLACK_ERROR_CHANNEL", "agent-errors")
-            slack.client.chat_postMessage(
-                channel=channel,
-                text=error_notification,
-                mrkdwn=True
-            )
-            logger.info(f"✅ Error notification sent to Slack #{channel}")
+            get_slack_outbox().notify(channel, error_notification, key="webhook_errors")
+            logger.info(f"✅ Error notification queued for Slack #{channel}")
         else:
             logger.warning("⚠️ Slack client not configured - cannot send error notification")
 
@@ -827,9 +947,9 @@ async def _process_webhook_background(raw_payload: dict, processor: str):
     """
     try:
         if processor == "StrategyAgent":
-            from agents.strategy_agent import StrategyAgent
+            from api.slack_bot import get_strategy_agent_async
             logger.info("🔄 Background: StrategyAgent processing started")
-            strategy_agent = StrategyAgent()
+            strategy_agent = await get_strategy_agent_async()
             result = await strategy_agent.process_lead_webhook(raw_payload)
             logger.info(f"✅ Background: StrategyAgent complete - {result.get('status')}")
             return result
@@ -842,6 +962,7 @@ async def _process_webhook_background(raw_payload: dict, processor: str):
             return result
     except Exception as e:
         logger.error(f"❌ Background processing failed: {e}")
+        record_error(f"{processor}_webhook", e)
         import traceback
         error_traceback = traceback.format_exc()
         logger.error(error_traceback)
@@ -869,13 +990,22 @@ async def typeform_webhook_receiver(
     raw_body = await request.body()
     raw_payload = json.loads(raw_body.decode('utf-8'))
 
+    # Typeform redelivers on slow acks - run the pipeline once per delivery
+    idempotency = await get_idempotency_index_async()
+    if not await idempotency.claim(source, typeform_event_key(raw_payload)):
+        return {
+            "status": "duplicate",
+            "processing": "skipped",
+            "message": "Webhook already received"
+        }
+
     # Feature flag routing: StrategyAgent vs. InboundAgent
     USE_STRATEGY_AGENT_ENTRY = os.getenv("USE_STRATEGY_AGENT_ENTRY", "false").lower() == "true"
 
     if USE_STRATEGY_AGENT_ENTRY:
         # Route to StrategyAgent - Process in BACKGROUND
         logger.info("🎯 Webhook accepted - Routing to StrategyAgent (background)")
-        background_tasks.add_task(_process_webhook_background, raw_payload, "StrategyAgent")
+        background_tasks.add_task(queued("webhooks", _process_webhook_background, raw_payload, "StrategyAgent"))
 
         # Return IMMEDIATELY (Typeform gets instant 200 OK)
         return {
@@ -887,7 +1017,7 @@ async def typeform_webhook_receiver(
 
     # Route to InboundAgent - Process in BACKGROUND
     logger.info("📥 Webhook accepted - Routing to InboundAgent (background)")
-    background_tasks.add_task(_process_webhook_background, raw_payload, "InboundAgent")
+    background_tasks.add_task(queued("webhooks", _process_webhook_background, raw_payload, "InboundAgent"))
 
     # Return IMMEDIATELY (Typeform gets instant 200 OK)
     return {
@@ -926,12 +1056,22 @@ async def vapi_webhook_receiver(
                 status_code=400,
                 content={"ok": False, "error": "Invalid JSON"}
             )
+
+        # Drop redeliveries of once-per-call messages
+        event_key = vapi_event_key(payload)
+        idempotency = await get_idempotency_index_async()
+        if not await idempotency.claim(source, event_key):
+            return {"ok": True, "duplicate": True, "message": "Webhook already received"}
         
         # Store raw event
-        event_id = await store_raw_event(source, payload, headers)
+        try:
+            event_id = await store_raw_event(source, payload, headers)
+        except Exception:
+            await idempotency.release(source, event_key)  # Let VAPI's retry through
+            raise
         
         # Queue for async processing
-        background_tasks.add_task(process_event_async, event_id, source)
+        background_tasks.add_task(queued("webhooks", process_event_async, event_id, source))
         
         # Calculate response time
         response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -964,6 +1104,7 @@ async def vapi_webhook_receiver(
 async def process_event_async(event_id: str, source: str):
     """Process event asynchronously."""
     event = None
+    supabase = get_supabase()
     try:
         logger.info("")
         logger.info("="*80)
@@ -1012,6 +1153,7 @@ async def process_event_async(event_id: str, source: str):
     except Exception as e:
         logger.error(f"❌ Event processing failed: {event_id}")
         logger.error(f"   Error: {str(e)}")
+        record_error(f"{source}_processor", e)
         import traceback
         error_traceback = traceback.format_exc()
         logger.error(error_traceback)
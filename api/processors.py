@@ -12,6 +12,8 @@ from datetime import datetime
 from typing import Any
 
 from config.settings import settings
+from core.agent_dispatch import RESEARCH_A2A, get_agent_dispatcher
+from core.persistence_writer import get_persistence_writer
 from utils.retry import async_retry
 from utils.slack_helpers import get_channel_id
 
@@ -24,6 +26,13 @@ def set_supabase_client(client):
     global supabase
     supabase = client
 
+
+def _ensure_supabase_client():
+    """Create the shared client (api.main builds it lazily) if none was injected yet."""
+    if supabase is None:
+        from api.main import get_supabase
+        get_supabase()  # injects itself via set_supabase_client
+
 # DSPy configuration (lazy initialization)
 dspy_configured = False
 
@@ -77,6 +86,7 @@ async def process_typeform_event(event: dict):
     """Process Typeform event with Pydantic + DSPy."""
     try:
         logger.info("🔄 Processing Typeform event with Pydantic + DSPy...")
+        _ensure_supabase_client()
         
         # Step 1: Parse with Pydantic
         try:
@@ -136,56 +146,52 @@ async def process_typeform_event(event: dict):
         except Exception as e:
             logger.error(f"❌ DSPy failed: {str(e)}")
             import traceback
-            
-        logger.error(f"❌ DSPy failed: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-
-        # Track failure for observability
-        if supabase:
-            try:
-                supabase.table('processing_failures').insert({
-                    'event_id': event.get('id'),
-                    'stage': 'dspy_qualification',
-                    'error': str(e),
-                    'traceback': traceback.format_exc(),
-                    'lead_email': lead.email if hasattr(lead, 'email') else None,
-                    'lead_company': lead.company if hasattr(lead, 'company') else None,
-                    'timestamp': datetime.utcnow().isoformat()
-                }).execute()
-            except:
-                pass  # Don't fail if error tracking fails
-
-        # Create fallback qualification result
-        from models.qualification import QualificationResult, QualificationCriteria
-        from models.lead import LeadTier, NextAction
-
-        result = QualificationResult(
-            is_qualified=False,
-            score=0,
-            tier=LeadTier.UNQUALIFIED,
-            reasoning=f"Qualification failed due to error: {str(e)[:200]}",
-            key_factors=[],
-            concerns=["DSPy qualification error - requires manual review"],
-            criteria=QualificationCriteria(
-                business_size_score=0,
-                patient_volume_score=0,
-                industry_fit_score=0,
-                response_quality_score=0,
-                calendly_booking_score=0,
-                response_complete_score=0,
-                company_data_score=0
-            ),
-            next_actions=[NextAction.MANUAL_REVIEW],
-            priority="low",
-            suggested_email_template=None,
-            suggested_sms_message=None,
-            agent_version="1.0.0",
-            model_used="error_fallback",
-            processing_time_ms=0
-        )
+            logger.error(traceback.format_exc())
+
+            # Track failure for observability
+            if supabase:
+                try:
+                    supabase.table('processing_failures').insert({
+                        'event_id': event.get('id'),
+                        'stage': 'dspy_qualification',
+                        'error': str(e),
+                        'traceback': traceback.format_exc(),
+                        'lead_email': lead.email if hasattr(lead, 'email') else None,
+                        'lead_company': lead.company if hasattr(lead, 'company') else None,
+                        'timestamp': datetime.utcnow().isoformat()
+                    }).execute()
+                except:
+                    pass  # Don't fail if error tracking fails
+
+            # Create fallback qualification result
+            from models import QualificationResult, QualificationCriteria, LeadTier, NextAction
+
+            result = QualificationResult(
+                is_qualified=False,
+                score=0,
+                tier=LeadTier.UNQUALIFIED,
+                reasoning=f"Qualification failed due to error: {str(e)[:200]}",
+                key_factors=[],
+                concerns=["DSPy qualification error - requires manual review"],
+                criteria=QualificationCriteria(
+                    business_size_score=0,
+                    patient_volume_score=0,
+                    industry_fit_score=0,
+                    response_quality_score=0,
+                    calendly_booking_score=0,
+                    response_completeness_score=0,
+                    company_data_score=0
+                ),
+                next_actions=[NextAction.FLAG_FOR_REVIEW],
+                priority=5,
+                suggested_email_template=None,
+                suggested_sms_message=None,
+                agent_version="1.0.0",
+                model_used="error_fallback",
+                processing_time_ms=0
+            )
 
-        logger.warning(f"⚠️ Created fallback UNQUALIFIED result for lead {lead.email}")
+            logger.warning(f"⚠️ Created fallback UNQUALIFIED result for lead {lead.email}")
         
         # Step 4: Extract transcript (deep_dive conversation)
         transcript_text = ""
@@ -216,23 +222,17 @@ async def process_typeform_event(event: dict):
             try:
                 logger.info(f"🔗 Triggering ResearchAgent for {result.tier.upper()} lead: {lead.email}")
 
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    research_response = await client.post(
-                        "http://localhost:8000/agents/research/a2a",
-                        json={
-                            "lead_id": str(lead.id),
-                            "tier": result.tier,
-                            "email": lead.email,
-                            "company": lead.company
-                        },
-                        timeout=30.0
-                    )
+                research_response = await get_agent_dispatcher().dispatch(RESEARCH_A2A, {
+                    "lead_id": str(lead.id),
+                    "tier": result.tier,
+                    "email": lead.email,
+                    "company": lead.company
+                }, timeout=30.0)
 
-                    if research_response.status_code == 200:
-                        logger.info(f"✅ ResearchAgent triggered successfully")
-                    else:
-                        logger.error(f"❌ ResearchAgent trigger failed: {research_response.status_code}")
+                if research_response.ok:
+                    logger.info(f"✅ ResearchAgent triggered successfully")
+                else:
+                    logger.error(f"❌ ResearchAgent trigger failed: {research_response.status_code}")
             except Exception as e:
                 logger.error(f"❌ Failed to trigger ResearchAgent: {e}")
                 # Don't fail the whole process if research trigger fails
@@ -240,11 +240,14 @@ async def process_typeform_event(event: dict):
         # Step 6: Start autonomous follow-up agent (LangGraph)
         if result and slack_thread_ts:
             try:
-                from api.main import follow_up_agent
+                import asyncio
+                from api.main import get_follow_up_agent
 
+                # Built on first use (Postgres pool + LangGraph compile) - keep it off the loop
+                follow_up_agent = await asyncio.to_thread(get_follow_up_agent)
                 if follow_up_agent:
                     # Start the autonomous lead journey (using global singleton)
-                    journey_state = follow_up_agent.start_lead_journey(
+                    journey_state = await follow_up_agent.astart_lead_journey(
                         lead=lead,
                         tier=result.tier,
                         slack_thread_ts=slack_thread_ts,
@@ -268,15 +271,37 @@ async def process_typeform_event(event: dict):
             await save_lead_to_database(lead, result)
         
         logger.info("✅ Typeform event processed")
+        return {
+            "lead_id": str(lead.id),
+            "tier": str(result.tier) if result else None,
+            "score": result.score if result else None
+        }
         
     except Exception as e:
         logger.error(f"❌ Processing failed: {str(e)}")
 
 
+async def process_typeform_submission(raw_payload: dict) -> dict:
+    """Process a Typeform webhook payload directly (no raw_events round-trip).
+
+    Used by the /webhooks/typeform background task.
+
+    Returns:
+        dict with lead_id/tier/score (empty if processing stopped early)
+    """
+    event = {
+        "id": raw_payload.get("event_id"),
+        "source": "typeform",
+        "raw_payload": raw_payload
+    }
+    return await process_typeform_event(event) or {}
+
+
 async def save_lead_to_database(lead: Any, result: Any):
     """Save lead to Supabase."""
     try:
-        supabase.table('leads').insert({
+        # Buffered: concurrent saves share one bulk upsert (core/persistence_writer.py)
+        await get_persistence_writer().upsert_lead({
             'id': str(lead.id),
             'typeform_id': lead.typeform_id,
             'form_id': getattr(lead, 'form_id', 'unknown'),
@@ -289,7 +314,7 @@ async def save_lead_to_database(lead: Any, result: Any):
             'qualification_tier': result.tier,
             'recommended_actions': result.next_actions,
             'raw_answers': lead.raw_answers
-        }).execute()
+        })
         logger.info(f"✅ Lead saved: {lead.id}")
     except Exception as e:
         logger.error(f"❌ Save failed: {str(e)}")
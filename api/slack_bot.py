@@ -10,17 +10,17 @@ This bot allows Josh to interact with all agents via Slack DM:
 import logging
 import os
 import dspy
-import time
 import asyncio
+import threading
 from typing import Dict, Any, Optional
 from datetime import datetime
-from collections import OrderedDict
 
 from fastapi import APIRouter, Request, HTTPException
 import httpx
 
-from agents.strategy_agent import StrategyAgent
-from agents.introspection import get_introspection_service
+from core.idempotency import get_idempotency_index_async, slack_event_key
+from core.metrics import queued
+
 from dspy_modules.conversation_signatures import (
     GenerateHelpMessage,
     GenerateAgentMenu,
@@ -34,14 +34,32 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/slack", tags=["slack"])
 
-# Initialize Strategy Agent (handles all agent coordination)
-strategy_agent = StrategyAgent()
+# Strategy Agent (handles all agent coordination). Built on first use or by the
+# startup warm-up in api.main - importing it pulls in LangChain, FAISS,
+# sentence-transformers and every subordinate agent, which is too slow to do
+# before the server starts listening.
+_strategy_agent = None
+_strategy_agent_lock = threading.Lock()
+
+
+def get_strategy_agent():
+    """Get or create the shared StrategyAgent (blocking, thread-safe)."""
+    global _strategy_agent
+    if _strategy_agent is None:
+        with _strategy_agent_lock:
+            if _strategy_agent is None:
+                from agents.strategy_agent import StrategyAgent
+                _strategy_agent = StrategyAgent()
+                logger.info("✅ Strategy Agent initialized")
+    return _strategy_agent
+
+
+async def get_strategy_agent_async():
+    """Get the shared StrategyAgent without blocking the event loop while it builds."""
+    if _strategy_agent is not None:
+        return _strategy_agent
+    return await asyncio.to_thread(get_strategy_agent)
 
-# Event deduplication cache (prevents duplicate responses from Slack retries)
-# Phase 0 Fix #3: Enhanced with time-based expiration
-processed_events: OrderedDict[str, float] = OrderedDict()
-MAX_CACHE_SIZE = 100
-EVENT_EXPIRY_SECONDS = 300  # Remove events older than 5 minutes
 
 # Initialize DSPy modules for Slack interface
 try:
@@ -87,32 +105,15 @@ async def slack_events(request: Request):
             
             # Handle app mentions and DMs
             if event.get("type") in ["app_mention", "message"]:
-                # Create unique event ID
-                event_id = f"{event.get('ts')}_{event.get('user')}_{event.get('channel')}"
-                
-                # Phase 0 Fix #3: Clean up old events first (time-based expiration)
-                current_time = time.time()
-                expired_events = [
-                    eid for eid, timestamp in processed_events.items()
-                    if current_time - timestamp > EVENT_EXPIRY_SECONDS
-                ]
-                for eid in expired_events:
-                    del processed_events[eid]
-                
-                # Check for duplicate (Slack retries if we don't respond in 3 seconds)
-                if event_id in processed_events:
-                    logger.warning(f"⚠️ Duplicate Slack event (retry detected): {event_id}")
+                # Slack retries if we don't respond in 3 seconds - claim the event ID
+                # (survives restarts and is shared across instances, see core/idempotency.py)
+                event_id = slack_event_key(payload)
+                idempotency = await get_idempotency_index_async()
+                if not await idempotency.claim("slack", event_id):
                     return {"ok": True}  # Return 200 but don't process
                 
-                # Mark as processing immediately
-                processed_events[event_id] = current_time
-                
-                # Limit cache size (backup to time-based cleanup)
-                if len(processed_events) > MAX_CACHE_SIZE:
-                    processed_events.popitem(last=False)  # Remove oldest
-                
                 # Process in background (don't block Slack webhook response)
-                asyncio.create_task(handle_message_async(event, event_id))
+                asyncio.create_task(queued("slack_messages", handle_message_async, event, event_id)())
             
             return {"ok": True}  # Return immediately to prevent Slack retries
         
@@ -148,6 +149,7 @@ async def handle_message_async(event: Dict[str, Any], event_id: str):
         response = await route_command(text, user)
         
         # Send response to Slack
+        strategy_agent = await get_strategy_agent_async()
         await strategy_agent.send_slack_message(
             message=response,
             channel=channel,
@@ -161,6 +163,7 @@ async def handle_message_async(event: Dict[str, Any], event_id: str):
         import traceback
         logger.error(traceback.format_exc())
         try:
+            strategy_agent = await get_strategy_agent_async()
             await strategy_agent.send_slack_message(
                 message=f"❌ Error: {str(e)}",
                 channel=event.get("channel")
@@ -239,6 +242,7 @@ async def route_command(text: str, user: str) -> str:
     # ===== STRATEGY AGENT (ALL MESSAGES) =====
     # All messages go to StrategyAgent for intelligent routing
     # StrategyAgent will decide if it needs to delegate to other agents
+    strategy_agent = await get_strategy_agent_async()
     return await strategy_agent.chat_with_josh(text, user_id=user)
 
 
@@ -295,6 +299,7 @@ async def quick_research_lead(text: str) -> str:
         lead_id = lead_id_match.group(0)
         
         # Trigger research via A2A
+        strategy_agent = await get_strategy_agent_async()
         response = await strategy_agent._a2a_command(
             agent_type="research",
             action="research_lead_deeply",
@@ -402,4 +407,4 @@ list agents, show recent leads, natural language questions"""
 # EXPORT
 # ============================================================================
 
-__all__ = ['router', 'handle_message', 'route_command']
+__all__ = ['router', 'handle_message', 'route_command', 'get_strategy_agent', 'get_strategy_agent_async']
@@ -12,10 +12,13 @@ Enables:
 
 import logging
 import dspy
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Deque, Tuple
 import asyncio
+import itertools
+import json
+import threading
+from collections import deque
 from datetime import datetime
-import httpx
 import os
 
 from dspy_modules.a2a_signatures import (
@@ -29,6 +32,7 @@ from dspy_modules.a2a_signatures import (
     A2ARequest,
     A2AResponse
 )
+from core.agent_dispatch import get_agent_dispatcher
 from models.pydantic_models import Lead, QualificationResult
 
 logger = logging.getLogger(__name__)
@@ -37,54 +41,294 @@ logger = logging.getLogger(__name__)
 class AgentMessage:
     """A message sent between agents."""
 
+    _ids = itertools.count(1)
+
     def __init__(
         self,
         from_agent: str,
         to_agent: str,
         message: str,
         message_type: str = "request",
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        timestamp: Optional[datetime] = None,
+        id: Optional[str] = None
     ):
         self.from_agent = from_agent
         self.to_agent = to_agent
         self.message = message
         self.message_type = message_type
         self.metadata = metadata or {}
-        self.timestamp = datetime.utcnow()
-        self.id = f"{from_agent}→{to_agent}_{self.timestamp.timestamp()}"
+        self.timestamp = timestamp or datetime.utcnow()
+        # Counter suffix keeps ids unique when two messages share a timestamp
+        self.id = id or f"{from_agent}→{to_agent}_{self.timestamp.timestamp()}_{next(self._ids)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the persistent message store."""
+        return {
+            "id": self.id,
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "message": self.message,
+            "message_type": self.message_type,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgentMessage":
+        """Rebuild a message from the persistent message store."""
+        return cls(
+            from_agent=data["from_agent"],
+            to_agent=data["to_agent"],
+            message=data["message"],
+            message_type=data.get("message_type", "request"),
+            metadata=data.get("metadata") or {},
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            id=data.get("id")
+        )
 
     def __repr__(self):
         return f"AgentMessage({self.from_agent} → {self.to_agent}: {self.message[:50]}...)"
 
 
+class MessageStore:
+    """Append-only JSONL store for inter-agent messages.
+
+    Each message is written as one JSON line, so the file can be tailed,
+    grepped and replayed. Only the tail is read back on startup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, message: AgentMessage):
+        """Append one message (one line)."""
+        line = json.dumps(message.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load_recent(self, limit: int) -> List[AgentMessage]:
+        """Load the last `limit` messages (skips corrupt lines)."""
+        if not os.path.exists(self.path):
+            return []
+
+        with self._lock:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = deque(f, maxlen=limit)
+
+        messages = []
+        for line in lines:
+            try:
+                messages.append(AgentMessage.from_dict(json.loads(line)))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"⚠️ Skipping corrupt message log line: {e}")
+        return messages
+
+
+class MessageSubscription:
+    """Async stream of messages addressed to one agent.
+
+    Usage:
+        async with channel.subscribe("ResearchAgent") as inbox:
+            message = await inbox.get(timeout=30)
+    """
+
+    def __init__(self, channel: "CommunicationChannel", agent_name: str, maxsize: int = 100):
+        self.channel = channel
+        self.agent_name = agent_name
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _deliver(self, message: AgentMessage):
+        """Called by the channel (any thread)."""
+        def _put():
+            try:
+                self.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"⚠️ Inbox full for {self.agent_name}, dropping {message.id}")
+
+        self.loop.call_soon_threadsafe(_put)
+
+    async def get(self, timeout: Optional[float] = None) -> AgentMessage:
+        """Wait for the next message (raises asyncio.TimeoutError on timeout)."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.channel._unsubscribe(self)
+
+    async def __aenter__(self) -> "MessageSubscription":
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> AgentMessage:
+        return await self.queue.get()
+
+
 class CommunicationChannel:
-    """Communication channel for inter-agent messages."""
+    """Communication channel for inter-agent messages.
 
-    def __init__(self):
-        self.messages: List[AgentMessage] = []
-        self.max_history = 1000
+    Storage:
+    - Global ring buffer of the last max_history messages (O(1) append/evict)
+    - Per-agent-pair and per-agent ring buffers, so conversation lookups are
+      O(limit) and a busy pair never pushes a quiet pair's history out
+    - Optional append-only MessageStore (AGENT_MESSAGE_LOG_PATH) that is
+      replayed into the buffers on startup
 
-    def send(self, message: AgentMessage):
-        """Record a sent message."""
+    Agents can await replies (wait_for_reply) or subscribe to their inbox
+    instead of polling.
+    """
+
+    def __init__(
+        self,
+        max_history: int = 1000,
+        max_pair_history: int = 200,
+        store: Optional[MessageStore] = None
+    ):
+        self.max_history = max_history
+        self.max_pair_history = max_pair_history
+        self.messages: Deque[AgentMessage] = deque(maxlen=max_history)
+        self._by_pair: Dict[Tuple[str, str], Deque[AgentMessage]] = {}
+        self._by_agent: Dict[str, Deque[AgentMessage]] = {}
+        self._subscriptions: Dict[str, List[MessageSubscription]] = {}
+        self._reply_waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._lock = threading.RLock()
+        self.store = store
+
+        if store:
+            for message in store.load_recent(max_history):
+                self._index(message)
+            logger.info(f"📜 Loaded {len(self.messages)} messages from {store.path}")
+
+    @staticmethod
+    def _pair_key(agent1: str, agent2: str) -> Tuple[str, str]:
+        return (agent1, agent2) if agent1 <= agent2 else (agent2, agent1)
+
+    def _index(self, message: AgentMessage):
+        """Add message to the ring buffers (caller holds lock or is __init__)."""
         self.messages.append(message)
 
-        if len(self.messages) > self.max_history:
-            self.messages = self.messages[-self.max_history:]
+        pair_key = self._pair_key(message.from_agent, message.to_agent)
+        if pair_key not in self._by_pair:
+            self._by_pair[pair_key] = deque(maxlen=self.max_pair_history)
+        self._by_pair[pair_key].append(message)
+
+        for agent in {message.from_agent, message.to_agent}:
+            if agent not in self._by_agent:
+                self._by_agent[agent] = deque(maxlen=self.max_pair_history)
+            self._by_agent[agent].append(message)
+
+    def send(self, message: AgentMessage):
+        """Record a sent message and wake anyone waiting for it."""
+        with self._lock:
+            self._index(message)
+            subscribers = list(self._subscriptions.get(message.to_agent, []))
+            reply_to = message.metadata.get("in_response_to")
+            waiters = self._reply_waiters.pop(reply_to, []) if reply_to else []
+
+        if self.store:
+            try:
+                self.store.append(message)
+            except OSError as e:
+                logger.error(f"❌ Failed to persist agent message: {e}")
+
+        for subscription in subscribers:
+            subscription._deliver(message)
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve_future, future, message)
 
         logger.info(f"📨 {message.from_agent} → {message.to_agent}: {message.message[:80]}...")
 
     def get_conversation(self, agent1: str, agent2: str, limit: int = 10) -> List[AgentMessage]:
-        """Get conversation between two agents."""
-        conversation = [
-            msg for msg in self.messages[-limit*2:]
-            if (msg.from_agent == agent1 and msg.to_agent == agent2) or
-               (msg.from_agent == agent2 and msg.to_agent == agent1)
-        ]
-        return conversation[-limit:]
+        """Get conversation between two agents (most recent `limit`, oldest first)."""
+        with self._lock:
+            history = self._by_pair.get(self._pair_key(agent1, agent2))
+            if not history:
+                return []
+            return _tail(history, limit)
+
+    def get_agent_activity(self, agent_name: str, limit: int = 20) -> List[AgentMessage]:
+        """Get messages sent or received by an agent (most recent `limit`)."""
+        with self._lock:
+            history = self._by_agent.get(agent_name)
+            if not history:
+                return []
+            return _tail(history, limit)
+
+    def subscribe(self, agent_name: str, maxsize: int = 100) -> MessageSubscription:
+        """Subscribe to messages addressed to agent_name (call from a running loop)."""
+        subscription = MessageSubscription(self, agent_name, maxsize=maxsize)
+        with self._lock:
+            self._subscriptions.setdefault(agent_name, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: MessageSubscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.agent_name, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+
+    async def wait_for_reply(self, message_id: str, timeout: Optional[float] = 30.0) -> AgentMessage:
+        """Wait for a message whose metadata.in_response_to == message_id.
+
+        Raises:
+            asyncio.TimeoutError: If no reply arrives in time
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            # Reply may already have arrived
+            for message in reversed(self.messages):
+                if message.metadata.get("in_response_to") == message_id:
+                    return message
+            self._reply_waiters.setdefault(message_id, []).append((loop, future))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            with self._lock:
+                waiters = self._reply_waiters.get(message_id, [])
+                waiters[:] = [w for w in waiters if w[1] is not future]
+                if not waiters:
+                    self._reply_waiters.pop(message_id, None)
+
+
+def _tail(history: Deque[AgentMessage], limit: int) -> List[AgentMessage]:
+    """Last `limit` items of a deque in O(limit)."""
+    tail = list(itertools.islice(reversed(history), limit))
+    tail.reverse()
+    return tail
+
+
+def _resolve_future(future: asyncio.Future, message: AgentMessage):
+    if not future.done():
+        future.set_result(message)
+
+
+def _create_global_channel() -> CommunicationChannel:
+    """Create the process-wide channel (persistent if AGENT_MESSAGE_LOG_PATH is set)."""
+    store = None
+    log_path = os.getenv("AGENT_MESSAGE_LOG_PATH")
+    if log_path:
+        try:
+            store = MessageStore(log_path)
+        except OSError as e:
+            logger.error(f"❌ Agent message log disabled ({log_path}): {e}")
+    return CommunicationChannel(store=store)
 
 
 # Global communication channel
-_global_channel = CommunicationChannel()
+_global_channel = _create_global_channel()
 
 
 # Agent name to A2A endpoint mapping
@@ -331,36 +575,33 @@ class AgentCommunication:
             # FIRST: Try A2A HTTP endpoint (new method)
             if target_name in AGENT_A2A_ENDPOINTS:
                 endpoint = AGENT_A2A_ENDPOINTS[target_name]
-                url = f"{self.base_url}{endpoint}"
-                
-                logger.info(f"🔗 Using A2A endpoint: {url}")
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(
-                        url,
-                        json={"message": full_message}
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    
-                    # Extract response text from A2A protocol response
-                    if isinstance(result, dict) and "response" in result:
-                        response_text = result["response"]
-                    else:
-                        response_text = str(result)
-                    
-                    # Record incoming response
-                    incoming = AgentMessage(
-                        from_agent=target_name,
-                        to_agent=self.agent_name,
-                        message=response_text,
-                        message_type="response",
-                        metadata={"in_response_to": outgoing.id, "via": "a2a_http"}
-                    )
-                    self.channel.send(incoming)
-                    
-                    logger.info(f"✅ {target_name} responded via A2A to {self.agent_name}")
-                    return response_text
+
+                logger.info(f"🔗 Using A2A endpoint: {endpoint}")
+
+                # In-process when the endpoint is served by this process, HTTP otherwise
+                response = await get_agent_dispatcher().dispatch(endpoint, {"message": full_message}, timeout=30.0)
+                if not response.ok:
+                    raise RuntimeError(f"{endpoint} returned {response.status_code}: {response.body.get('error')}")
+                result = response.json()
+
+                # Extract response text from A2A protocol response
+                if isinstance(result, dict) and "response" in result:
+                    response_text = result["response"]
+                else:
+                    response_text = str(result)
+
+                # Record incoming response
+                incoming = AgentMessage(
+                    from_agent=target_name,
+                    to_agent=self.agent_name,
+                    message=response_text,
+                    message_type="response",
+                    metadata={"in_response_to": outgoing.id, "via": f"a2a_{response.via}"}
+                )
+                self.channel.send(incoming)
+
+                logger.info(f"✅ {target_name} responded via A2A to {self.agent_name}")
+                return response_text
             
             # FALLBACK: Try legacy direct method calls
             logger.warning(f"⚠️ No A2A endpoint for {target_name}, trying legacy methods")
@@ -483,6 +724,21 @@ class AgentCommunication:
                 await self.notify_agent(agent, message)
             return None
     
+    async def wait_for_reply(self, message: AgentMessage, timeout: Optional[float] = 30.0) -> AgentMessage:
+        """
+        Await the reply to a message this agent sent (instead of polling).
+        
+        Example:
+            request = AgentMessage(self.agent_name, "ResearchAgent", "Research Acme")
+            self.channel.send(request)
+            reply = await self.communication.wait_for_reply(request, timeout=60)
+        """
+        return await self.channel.wait_for_reply(message.id, timeout=timeout)
+    
+    def subscribe(self, maxsize: int = 100) -> MessageSubscription:
+        """Subscribe to messages addressed to this agent."""
+        return self.channel.subscribe(self.agent_name, maxsize=maxsize)
+    
     def get_conversation_with(self, other_agent_name: str, limit: int = 10) -> List[AgentMessage]:
         """Get conversation history with another agent."""
         return self.channel.get_conversation(self.agent_name, other_agent_name, limit)
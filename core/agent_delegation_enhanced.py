@@ -12,7 +12,11 @@ Based on Agent Zero's call_subordinate pattern + our production infrastructure.
 
 import logging
 import json
-from typing import Dict, Any, Optional, List, Callable, TYPE_CHECKING
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Tuple, TYPE_CHECKING
 import asyncio
 import dspy
 
@@ -111,7 +115,7 @@ class SubordinateAgent:
         # Metadata
         self.data["_superior"] = superior_agent
         self.data["_profile"] = profile
-        self.data["_created_at"] = asyncio.get_event_loop().time()
+        self.data["_created_at"] = time.monotonic()
         
         logger.info(f"👶 Creating enhanced subordinate: {profile}")
         
@@ -168,32 +172,10 @@ class SubordinateAgent:
             logger.warning(f"   No MCP client available for tool loading")
             return tools
         
-        # Helper for async execution in sync context
-        def run_async(coro):
-            """Run async coroutine in new thread with event loop"""
-            import concurrent.futures
-            import threading
-            
-            result = [None]
-            exception = [None]
-            
-            def _run():
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    result[0] = loop.run_until_complete(coro)
-                    loop.close()
-                except Exception as e:
-                    exception[0] = e
-            
-            thread = threading.Thread(target=_run)
-            thread.start()
-            thread.join()
-            
-            if exception[0]:
-                raise exception[0]
-            
-            return result[0]
+        # Shared bridge: MCP calls reuse one long-lived loop instead of a
+        # new thread + event loop per call
+        from core.tool_bridge import get_tool_bridge
+        run_async = get_tool_bridge().run
         
         # Create tool functions for each MCP tool
         for tool_name in tool_names:
@@ -354,6 +336,151 @@ class SubordinateAgent:
             return f"Processing error: {str(e)}"
 
 
+# ===== Subordinate Pool =====
+
+class SubordinatePool:
+    """
+    Bounded pool of warm subordinate agents for one superior.
+    
+    Building a subordinate is expensive (ReAct module, tool wrappers, FAISS
+    memory), so subordinates are kept warm and reused. Subordinates hold a
+    back-reference to their superior and its conversation history, so each
+    AgentDelegation owns its pool; keys are "<SuperiorClass>.<profile>" (the
+    same namespace as subordinate memory).
+    
+    Eviction:
+    - LRU when more than max_size subordinates are alive
+    - Idle subordinates unused for idle_ttl_seconds are dropped on next access
+    
+    Configuration (environment variables):
+    - SUBORDINATE_POOL_MAX_SIZE (default 6)
+    - SUBORDINATE_IDLE_TTL_SECONDS (default 1800)
+    """
+    
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None
+    ):
+        self.max_size = max_size or int(os.getenv("SUBORDINATE_POOL_MAX_SIZE", 6))
+        self.idle_ttl_seconds = idle_ttl_seconds or float(
+            os.getenv("SUBORDINATE_IDLE_TTL_SECONDS", 1800)
+        )
+        self._entries: "OrderedDict[str, SubordinateAgent]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._usage: Counter = Counter()  # Lifetime requests per key (drives pre-warming)
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    @staticmethod
+    def make_key(superior: Any, profile: str) -> str:
+        """Pool key for a superior/profile pair."""
+        return f"{superior.__class__.__name__}.{profile}"
+    
+    def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], "SubordinateAgent"],
+        reset: bool = False
+    ) -> "SubordinateAgent":
+        """Return a warm subordinate, building it with factory() on a miss.
+        
+        Built under the lock, so concurrent callers for a key get one instance.
+        """
+        with self._lock:
+            self.evict_idle()
+            self._usage[key] += 1
+            
+            subordinate = None if reset else self._entries.get(key)
+            if subordinate is not None:
+                self.stats["hits"] += 1
+                self._touch(key)
+                return subordinate
+            
+            self.stats["misses"] += 1
+            subordinate = factory()
+            self._entries[key] = subordinate
+            self._touch(key)
+            self._evict_overflow()
+            return subordinate
+    
+    def get(self, key: str) -> Optional["SubordinateAgent"]:
+        """Get a subordinate if it is still warm (does not create)."""
+        with self._lock:
+            self.evict_idle()
+            subordinate = self._entries.get(key)
+            if subordinate is not None:
+                self._touch(key)
+            return subordinate
+    
+    def put(self, key: str, subordinate: "SubordinateAgent"):
+        """Insert a pre-built subordinate (used by pre-warming)."""
+        with self._lock:
+            self._entries[key] = subordinate
+            self._touch(key)
+            self._evict_overflow()
+    
+    def _touch(self, key: str):
+        self._entries.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+    
+    def _evict_overflow(self):
+        while len(self._entries) > self.max_size:
+            key, _ = self._entries.popitem(last=False)
+            self._last_used.pop(key, None)
+            self.stats["evictions"] += 1
+            logger.info(f"🗑️ Evicted least-recently-used subordinate: {key}")
+    
+    def evict_idle(self) -> int:
+        """Drop subordinates idle for longer than idle_ttl_seconds.
+        
+        Returns:
+            Number of evicted subordinates
+        """
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        with self._lock:
+            expired = [k for k in self._entries if self._last_used.get(k, 0) < cutoff]
+            for key in expired:
+                del self._entries[key]
+                self._last_used.pop(key, None)
+                self.stats["evictions"] += 1
+                logger.info(f"🗑️ Evicted idle subordinate: {key}")
+            return len(expired)
+    
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            self._last_used.pop(key, None)
+            return self._entries.pop(key, None) is not None
+    
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+    
+    def clear(self, prefix: str = "") -> int:
+        """Remove all subordinates (optionally only keys starting with prefix)."""
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+                self._last_used.pop(key, None)
+            return len(keys)
+    
+    def most_used(self, n: int, prefix: str = "") -> List[str]:
+        """Most frequently requested keys (for pre-warming)."""
+        with self._lock:
+            return [k for k, _ in self._usage.most_common() if k.startswith(prefix)][:n]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "warm": list(self._entries.keys()),
+            }
+
+
 # ===== Enhanced Delegation Manager =====
 
 class AgentDelegation:
@@ -364,12 +491,28 @@ class AgentDelegation:
     - Dynamic tool loading
     - Memory persistence
     - Iterative refinement
+    - Warm reuse via a bounded SubordinatePool (one per superior)
+    - Parallel execution of independent subordinate tasks
     """
     
-    def __init__(self, parent_agent: Any):
-        """Initialize enhanced delegation manager"""
+    def __init__(
+        self,
+        parent_agent: Any,
+        pool: Optional[SubordinatePool] = None,
+        max_parallel: Optional[int] = None
+    ):
+        """
+        Initialize enhanced delegation manager.
+        
+        Args:
+            parent_agent: Superior agent that owns this delegation manager
+            pool: Subordinate pool (defaults to a new pool for this superior)
+            max_parallel: Max subordinate tasks run concurrently by
+                call_subordinates (env: SUBORDINATE_MAX_PARALLEL, default 3)
+        """
         self.parent_agent = parent_agent
-        self.subordinates: Dict[str, SubordinateAgent] = {}
+        self.pool = pool or SubordinatePool()
+        self.max_parallel = max_parallel or int(os.getenv("SUBORDINATE_MAX_PARALLEL", 3))
         
         # Enhanced profile templates with document_analyst
         self.profile_templates = {
@@ -501,27 +644,15 @@ You are a marketing campaign analyst.
         logger.info(f"🎯 Delegating to subordinate: {profile}")
         logger.info(f"   Task: {message[:100]}...")
         
-        # Create or reuse subordinate
-        if profile not in self.subordinates or reset:
-            instructions = self.profile_templates.get(
-                profile,
-                f"You are a specialized {profile} subordinate agent."
-            )
-            
-            subordinate = SubordinateAgent(
-                profile=profile,
-                superior_agent=self.parent_agent,
-                specialized_instructions=instructions
-            )
-            
-            self.subordinates[profile] = subordinate
-            
-            if reset:
-                logger.info(f"🔄 Reset subordinate: {profile}")
-            else:
-                logger.info(f"👶 Created new subordinate: {profile}")
+        # Create or reuse (warm) subordinate from the pool
+        subordinate = self.pool.get_or_create(
+            self._pool_key(profile),
+            lambda: self._create_subordinate(profile),
+            reset=reset
+        )
         
-        subordinate = self.subordinates[profile]
+        if reset:
+            logger.info(f"🔄 Reset subordinate: {profile}")
         
         # Delegate task
         try:
@@ -533,6 +664,103 @@ You are a marketing campaign analyst.
             logger.error(f"❌ Subordinate {profile} failed: {e}")
             return f"Delegation failed: {str(e)}"
     
+    def _pool_key(self, profile: str) -> str:
+        return SubordinatePool.make_key(self.parent_agent, profile)
+    
+    def _create_subordinate(self, profile: str) -> SubordinateAgent:
+        """Build a new subordinate for a profile."""
+        instructions = self.profile_templates.get(
+            profile,
+            f"You are a specialized {profile} subordinate agent."
+        )
+        
+        logger.info(f"👶 Created new subordinate: {profile}")
+        return SubordinateAgent(
+            profile=profile,
+            superior_agent=self.parent_agent,
+            specialized_instructions=instructions
+        )
+    
+    async def call_subordinates(
+        self,
+        assignments: List[Tuple[str, str]],
+        max_parallel: Optional[int] = None
+    ) -> List[str]:
+        """
+        Run independent subordinate tasks concurrently.
+        
+        Tasks for different profiles run in parallel (up to max_parallel);
+        tasks for the same profile run in order on that profile's subordinate,
+        so its conversation history stays coherent.
+        
+        Args:
+            assignments: List of (profile, task) pairs
+            max_parallel: Override for the parallelism cap
+            
+        Returns:
+            Results in the same order as assignments
+        """
+        semaphore = asyncio.Semaphore(max_parallel or self.max_parallel)
+        results: List[str] = [""] * len(assignments)
+        
+        # Group by profile, preserving order within each profile
+        by_profile: Dict[str, List[int]] = {}
+        for index, (profile, _) in enumerate(assignments):
+            by_profile.setdefault(profile, []).append(index)
+        
+        async def run_profile(profile: str, indexes: List[int]):
+            for index in indexes:
+                async with semaphore:
+                    results[index] = await self.call_subordinate(profile, assignments[index][1])
+        
+        logger.info(
+            f"🎯 Delegating {len(assignments)} tasks across {len(by_profile)} subordinates "
+            f"(max parallel: {max_parallel or self.max_parallel})"
+        )
+        await asyncio.gather(*(run_profile(p, idx) for p, idx in by_profile.items()))
+        return results
+    
+    async def prewarm(
+        self,
+        profiles: Optional[List[str]] = None,
+        top_n: int = 2
+    ) -> List[str]:
+        """
+        Build subordinates ahead of time so the first delegation is fast.
+        
+        Args:
+            profiles: Profiles to warm (defaults to SUBORDINATE_PREWARM_PROFILES,
+                then to the top_n most-used profiles)
+            top_n: How many frequently used profiles to warm when profiles is None
+            
+        Returns:
+            Profiles that were newly warmed
+        """
+        if profiles is None and os.getenv("SUBORDINATE_PREWARM_PROFILES"):
+            profiles = [
+                p.strip() for p in os.getenv("SUBORDINATE_PREWARM_PROFILES").split(",") if p.strip()
+            ]
+        if profiles is None:
+            prefix = SubordinatePool.make_key(self.parent_agent, "")
+            profiles = [k[len(prefix):] for k in self.pool.most_used(top_n, prefix=prefix)]
+        
+        warmed = []
+        for profile in profiles:
+            key = self._pool_key(profile)
+            if self.pool.get(key) is not None:
+                continue
+            try:
+                # Construction is sync and heavy (FAISS load) - keep it off the loop
+                subordinate = await asyncio.to_thread(self._create_subordinate, profile)
+                self.pool.put(key, subordinate)
+                warmed.append(profile)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to pre-warm subordinate {profile}: {e}")
+        
+        if warmed:
+            logger.info(f"🔥 Pre-warmed subordinates: {', '.join(warmed)}")
+        return warmed
+    
     async def refine_subordinate_work(
         self,
         profile: str,
@@ -552,7 +780,7 @@ You are a marketing campaign analyst.
         """
         logger.info(f"🔄 Refining {profile} work with feedback")
         
-        subordinate = self.subordinates.get(profile)
+        subordinate = self.pool.get(self._pool_key(profile))
         if not subordinate:
             return f"Subordinate {profile} not found. Create it first with call_subordinate."
         
@@ -560,24 +788,35 @@ You are a marketing campaign analyst.
         
         return await subordinate.process(refinement_task)
     
+    @property
+    def subordinates(self) -> Dict[str, SubordinateAgent]:
+        """Warm subordinates for this superior, keyed by profile"""
+        return {
+            profile: self.pool.get(self._pool_key(profile))
+            for profile in self.list_subordinates()
+        }
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Pool statistics (hits, misses, evictions, warm subordinates)"""
+        return self.pool.get_stats()
+    
     def get_subordinate(self, profile: str) -> Optional[SubordinateAgent]:
         """Get subordinate by profile"""
-        return self.subordinates.get(profile)
+        return self.pool.get(self._pool_key(profile))
     
     def list_subordinates(self) -> List[str]:
-        """List all active subordinates"""
-        return list(self.subordinates.keys())
+        """List all active (warm) subordinates for this superior"""
+        prefix = SubordinatePool.make_key(self.parent_agent, "")
+        return [k[len(prefix):] for k in self.pool.keys() if k.startswith(prefix)]
     
     def remove_subordinate(self, profile: str):
         """Remove subordinate (cleanup)"""
-        if profile in self.subordinates:
-            del self.subordinates[profile]
+        if self.pool.remove(self._pool_key(profile)):
             logger.info(f"🗑️ Removed subordinate: {profile}")
     
     def clear_all_subordinates(self):
-        """Clear all subordinates (cleanup)"""
-        count = len(self.subordinates)
-        self.subordinates.clear()
+        """Clear all subordinates for this superior (cleanup)"""
+        count = self.pool.clear(prefix=SubordinatePool.make_key(self.parent_agent, ""))
         logger.info(f"🗑️ Cleared {count} subordinates")
 
 
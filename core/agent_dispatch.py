@@ -0,0 +1,203 @@
+"""
+In-Process Agent Dispatch
+
+StrategyAgent delegation, the Typeform processor, the research endpoint and
+the follow-up scheduler used to reach InboundAgent / ResearchAgent /
+FollowUpAgent by POSTing to this same server (`/agents/.../a2a`). Every hop
+re-serialized the Lead, went through the web stack and held a second
+request slot, so a saturated worker could end up waiting on itself.
+
+AgentDispatcher routes those calls by endpoint path:
+
+- Local: the API process registers each endpoint's handler at import
+  (api/main.py), and dispatch() awaits it directly. Pydantic models in the
+  payload (e.g. the Lead) are passed as-is, the caller's contextvars (trace
+  span, metrics attribution) carry over, and the timeout is enforced with
+  asyncio.wait_for on a shielded task: a caller that times out gets
+  TimeoutException while the handler still finishes its DB writes and
+  downstream triggers, as it would behind the old loopback HTTP call.
+- HTTP: when no handler is registered in this process (the agent runs in
+  another service) or AGENT_DISPATCH_MODE=http, the payload is serialized
+  and POSTed to AGENT_DISPATCH_BASE_URL / API_BASE_URL over one shared
+  client, with W3C trace headers injected when OpenTelemetry is installed.
+
+Both paths return a DispatchResponse with the endpoint's status code and
+JSON body, and raise core.exceptions.TimeoutException on timeout.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from core.exceptions import TimeoutException
+
+try:
+    from opentelemetry import propagate as otel_propagate
+except ImportError:  # tracing is optional
+    otel_propagate = None
+
+logger = logging.getLogger(__name__)
+
+# Endpoint paths (also the dispatch routes)
+INBOUND_QUALIFY = "/agents/inbound/qualify"
+INBOUND_A2A = "/agents/inbound/a2a"
+RESEARCH_A2A = "/agents/research/a2a"
+FOLLOWUP_A2A = "/agents/followup/a2a"
+
+DEFAULT_TIMEOUT = 30.0
+
+# Endpoint handler: JSON-like payload -> (status code, JSON body)
+Handler = Callable[[Dict[str, Any]], Awaitable[Tuple[int, Dict[str, Any]]]]
+
+
+def default_base_url() -> str:
+    """Base URL of the API for remote dispatch."""
+    if base_url := os.getenv("AGENT_DISPATCH_BASE_URL") or os.getenv("API_BASE_URL"):
+        return base_url
+    # Railway serves on 8080, local development on 8000
+    return "http://localhost:8080" if os.getenv("RAILWAY_ENVIRONMENT") else "http://localhost:8000"
+
+
+def _to_json(value: Any) -> Any:
+    """Serialize Pydantic models (at any depth) for the HTTP path."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+
+@dataclass
+class DispatchResponse:
+    """Endpoint result, whichever path served it."""
+    status_code: int
+    body: Dict[str, Any] = field(default_factory=dict)
+    via: str = "local"  # local | http
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def json(self) -> Dict[str, Any]:
+        return self.body
+
+
+class AgentDispatcher:
+    """Routes agent endpoint calls in-process when co-located, over HTTP otherwise."""
+
+    def __init__(self, base_url: Optional[str] = None, mode: Optional[str] = None):
+        self.base_url = base_url or default_base_url()
+        # auto: local when a handler is registered; http: always remote
+        self.mode = (mode or os.getenv("AGENT_DISPATCH_MODE", "auto")).lower()
+        self._handlers: Dict[str, Handler] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        # Local handler runs still in flight after their caller timed out
+        self._orphaned: Set[asyncio.Task] = set()
+
+    # ----- Registration -----
+
+    def register(self, route: str, handler: Handler):
+        """Serve `route` in-process with `handler`."""
+        self._handlers[route] = handler
+
+    def unregister(self, route: str):
+        self._handlers.pop(route, None)
+
+    def is_local(self, route: str) -> bool:
+        return self.mode != "http" and route in self._handlers
+
+    # ----- Dispatch -----
+
+    async def dispatch(
+        self,
+        route: str,
+        payload: Dict[str, Any],
+        timeout: float = DEFAULT_TIMEOUT
+    ) -> DispatchResponse:
+        """Call the agent endpoint at `route`.
+
+        Args:
+            route: Endpoint path, e.g. INBOUND_QUALIFY
+            payload: Request body; Pydantic models are serialized only for HTTP
+            timeout: Seconds before TimeoutException
+
+        Returns:
+            DispatchResponse with the endpoint's status code and JSON body
+        """
+        started = time.perf_counter()
+        if self.is_local(route):
+            task = asyncio.ensure_future(self._handlers[route](payload))
+            try:
+                status_code, body = await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                self._orphan(route, task)
+                raise TimeoutException(f"Agent dispatch to {route} timed out", timeout_seconds=timeout)
+            except asyncio.CancelledError:
+                self._orphan(route, task)
+                raise
+            via = "local"
+        else:
+            status_code, body = await self._post(route, payload, timeout)
+            via = "http"
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"🔗 Dispatched {route} ({via}) → {status_code} in {duration_ms:.0f}ms")
+        return DispatchResponse(status_code, body, via, duration_ms)
+
+    def _orphan(self, route: str, task: asyncio.Task):
+        """Keep a handler the caller stopped waiting for alive until it completes."""
+        if task.done():
+            return
+        self._orphaned.add(task)
+
+        def finished(done: asyncio.Task):
+            self._orphaned.discard(done)
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"❌ {route} failed after its caller timed out: {done.exception()}")
+
+        task.add_done_callback(finished)
+
+    async def _post(self, route: str, payload: Dict[str, Any], timeout: float) -> Tuple[int, Dict[str, Any]]:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        headers: Dict[str, str] = {}
+        if otel_propagate is not None:
+            otel_propagate.inject(headers)
+        try:
+            response = await self._client.post(
+                f"{self.base_url}{route}", json=_to_json(payload), headers=headers, timeout=timeout
+            )
+        except httpx.TimeoutException:
+            raise TimeoutException(f"Agent dispatch to {route} timed out", timeout_seconds=timeout)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"status": "error", "error": response.text}
+        return response.status_code, body if isinstance(body, dict) else {"response": body}
+
+    async def aclose(self):
+        if self._orphaned:
+            await asyncio.gather(*self._orphaned, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_dispatcher: Optional[AgentDispatcher] = None
+
+
+def get_agent_dispatcher() -> AgentDispatcher:
+    """Get or create the process-wide agent dispatcher."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = AgentDispatcher()
+    return _dispatcher
@@ -6,6 +6,7 @@ that was causing agent_state inserts to fail silently.
 """
 import os
 import logging
+from datetime import datetime
 from typing import Optional
 from supabase import create_client, Client
 from supabase._async.client import AsyncClient, create_client as create_async_client
@@ -90,21 +91,26 @@ async def save_agent_state(
     agent_name: str,
     lead_id: str,
     state_data: dict,
-    status: str = "completed"
+    status: str = "completed",
+    wait: bool = True
 ) -> dict:
     """Save agent execution state to database.
 
+    Rows go through the shared PersistenceWriter (core/persistence_writer.py),
+    so concurrent saves are written in one bulk insert.
+
     Args:
         agent_name: Name of the agent (e.g., 'StrategyAgent', 'InboundAgent')
         lead_id: UUID of the lead being processed
         state_data: Dictionary of state data (will be stored as JSONB)
         status: Execution status ('active', 'completed', 'failed')
+        wait: Wait until the row is committed (False: queue and return)
 
     Returns:
-        dict: Inserted record from database
+        dict: Inserted record
 
     Raises:
-        Exception: If database insert fails
+        Exception: If database insert fails (with wait)
 
     Example:
         await save_agent_state(
@@ -119,17 +125,14 @@ async def save_agent_state(
         )
     """
     try:
-        supabase = await get_async_supabase_client()
+        from core.persistence_writer import get_persistence_writer
 
-        result = await supabase.table('agent_state').insert({
-            'agent_name': agent_name,
-            'lead_id': lead_id,
-            'state_data': state_data,
-            'status': status
-        }).execute()
+        record = await get_persistence_writer().insert_agent_state(
+            agent_name, lead_id, state_data, status=status, wait=wait
+        )
 
-        logger.info(f"✅ Saved {agent_name} state for lead {lead_id[:8]}... (status: {status})")
-        return result.data[0] if result.data else {}
+        logger.info(f"✅ Saved {agent_name} state for lead {(lead_id or '')[:8]}... (status: {status})")
+        return record
 
     except Exception as e:
         logger.error(f"❌ Failed to save {agent_name} state for lead {lead_id}: {e}")
@@ -188,3 +191,30 @@ async def get_all_agent_states(lead_id: str) -> list[dict]:
     except Exception as e:
         logger.error(f"❌ Failed to get all agent states for lead {lead_id}: {e}")
         return []
+
+
+async def get_agent_states_since(since: datetime, limit: int = 10000) -> list[dict]:
+    """Retrieve agent_state rows created since a point in time (all agents).
+
+    Args:
+        since: Lower bound on created_at
+        limit: Maximum rows returned
+
+    Returns:
+        list: agent_name, status, state_data and created_at of each row
+    """
+    try:
+        supabase = await get_async_supabase_client()
+
+        result = await supabase.table('agent_state') \
+            .select('agent_name,status,state_data,created_at') \
+            .gte('created_at', since.isoformat()) \
+            .order('created_at', desc=False) \
+            .limit(limit) \
+            .execute()
+
+        return result.data
+
+    except Exception as e:
+        logger.error(f"❌ Failed to get agent states since {since.isoformat()}: {e}")
+        return []
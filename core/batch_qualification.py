@@ -0,0 +1,476 @@
+"""
+Batch Lead Qualification
+
+Qualification used to run one lead at a time (process_typeform_event,
+/agents/inbound/qualify, introspection). BatchQualifier re-scores a whole
+stream of leads - backfills, or re-scoring history after an ICP or tier
+threshold change:
+
+- Sources: the Supabase `leads` table (keyset-paginated by id) or a JSONL
+  file of lead rows / Typeform webhook payloads.
+- Concurrency: up to QUALIFY_BATCH_CONCURRENCY leads in flight (default 8).
+  InboundAgent.qualify() makes blocking LM calls, so each lead runs on a
+  worker thread. qualify() has no side effects: no memory saves, ABM
+  campaigns or agent-state rows for historical leads.
+- Per-model rate limits: every LM request waits on its model's token bucket.
+  QUALIFY_MODEL_RPM sets requests/minute per model
+  ("openrouter/anthropic/claude-haiku-4.5=600,openai/gpt-4o=300"), and
+  QUALIFY_DEFAULT_RPM covers the rest (default 0 = unlimited).
+- Bulk writes: results are upserted into `leads` QUALIFY_BATCH_WRITE_SIZE
+  rows at a time (default 200) and/or appended to a JSONL file. Lead rows
+  are matched on id; Typeform payloads (whose Lead gets a fresh id) are
+  matched on the UNIQUE typeform_id.
+- Checkpoints: after each write the source cursor and running report are
+  saved, in source order, so a resumed run continues after the last batch
+  that was written. Leads in flight when a run stops are simply re-scored.
+- Report: throughput, LM calls, tokens and cost (core.metrics usage
+  scopes), tier distribution and tier changes.
+
+Usage (CLI: scripts/requalify_leads.py):
+    qualifier = BatchQualifier(supabase_client=supabase, checkpoint_path="data/requalify.json")
+    report = await qualifier.run(SupabaseLeadSource(supabase, since="2025-06-01"))
+    print(report.summary())
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from copy import copy
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from core.metrics import agent_call, get_metrics_registry
+from utils.atomic_file import atomic_write_json
+from utils.retry import async_retry
+
+logger = logging.getLogger(__name__)
+
+LEADS_TABLE = "leads"
+PAGE_SIZE = 1000  # PostgREST response cap
+
+# Qualification outputs are what we re-score; don't feed stale ones back in
+_OUTPUT_FIELDS = {"status", "tier", "qualification_score", "updated_at"}
+
+_metrics = get_metrics_registry()
+batch_qualified_leads = _metrics.counter(
+    "batch_qualified_leads", "Leads processed by batch qualification", ("outcome",))
+batch_rate_limit_wait = _metrics.counter(
+    "batch_rate_limit_wait_seconds", "Time LM calls waited on batch qualification rate limits", ("model",))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def parse_model_rates(spec: Optional[str]) -> Dict[str, float]:
+    """'model=rpm,model=rpm' -> {model: requests per minute}."""
+    rates = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            model, rpm = item.rsplit("=", 1)
+            rates[model.strip()] = float(rpm)
+    return rates
+
+
+# ============================================================================
+# Leads
+# ============================================================================
+
+def lead_from_row(row: Dict[str, Any]):
+    """Lead from a `leads` row or a Typeform webhook payload."""
+    from models.lead import Lead, ResponseType
+
+    if "form_response" in row:
+        from utils.typeform_transform import transform_typeform_webhook
+        return transform_typeform_webhook(row)
+
+    fields = {
+        name: value for name, value in row.items()
+        if name in Lead.model_fields and name not in _OUTPUT_FIELDS and value is not None
+    }
+    if "id" in fields:
+        fields["id"] = str(fields["id"])
+    if "response_type" not in fields and row.get("submitted_at"):
+        fields["response_type"] = ResponseType.COMPLETE
+    return Lead(**fields)
+
+
+def _tier_value(tier: Any) -> Optional[str]:
+    if tier is None:
+        return None
+    return str(getattr(tier, "value", tier)).lower()
+
+
+def result_row(lead, result) -> Dict[str, Any]:
+    """Qualification columns for a lead (same fields as /agents/inbound/qualify writes)."""
+    return {
+        "id": str(lead.id),
+        "typeform_id": lead.typeform_id,
+        "form_id": lead.form_id,
+        "qualification_score": result.score,
+        "qualification_tier": _tier_value(result.tier),
+        "qualification_reasoning": result.reasoning[:1000] if result.reasoning else "",
+        "recommended_actions": [str(getattr(a, "value", a)) for a in result.next_actions][:10]
+        if result.next_actions else [],
+    }
+
+
+class SupabaseLeadSource:
+    """Leads from Supabase in id order; the cursor is the last id read."""
+
+    def __init__(self, client, since: Optional[str] = None, page_size: int = PAGE_SIZE):
+        self.client = client
+        self.since = since
+        self.page_size = page_size
+
+    @property
+    def name(self) -> str:
+        return f"supabase:{LEADS_TABLE}" + (f":since={self.since}" if self.since else "")
+
+    def _page(self, after: Optional[str]) -> List[Dict[str, Any]]:
+        query = self.client.table(LEADS_TABLE).select("*")
+        if after is not None:
+            query = query.gt("id", after)
+        if self.since:
+            query = query.gte("created_at", self.since)
+        return query.order("id").limit(self.page_size).execute().data or []
+
+    async def rows(self, cursor: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        while True:
+            page = await asyncio.to_thread(self._page, cursor)
+            for row in page:
+                cursor = str(row["id"])
+                yield cursor, row
+            if len(page) < self.page_size:
+                return
+
+
+class JsonlLeadSource:
+    """Leads from a JSONL file; the cursor is the line number."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    @property
+    def name(self) -> str:
+        return f"jsonl:{self.path}"
+
+    async def rows(self, cursor: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        start = cursor or 0
+        with self.path.open() as f:
+            for line_number, line in enumerate(f, 1):
+                if line_number <= start or not line.strip():
+                    continue
+                yield line_number, json.loads(line)
+
+
+# ============================================================================
+# Per-model rate limits
+# ============================================================================
+
+class ModelRateLimiter:
+    """Token bucket per model (requests/minute), shared by all worker threads."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rpm: float = 0.0, burst: int = 5):
+        self.rates = rates or {}
+        self.default_rpm = default_rpm
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # model -> (tokens, monotonic refill time)
+        self._lock = threading.Lock()
+
+    def _rate(self, model: str) -> float:
+        """Requests per second (0 = unlimited)."""
+        return self.rates.get(model, self.default_rpm) / 60.0
+
+    def acquire(self, model: str) -> float:
+        """Block until `model` may be called; returns the seconds waited."""
+        rate = self._rate(model)
+        if rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, refilled_at = self._buckets.get(model, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - refilled_at) * rate) - 1
+            self._buckets[model] = (tokens, now)  # Reserved: later callers queue behind
+        wait = 0.0 if tokens >= 0 else -tokens / rate
+        if wait:
+            time.sleep(wait)
+            batch_rate_limit_wait.inc(wait, model=model)
+        return wait
+
+
+def _make_limiter_callback(limiter: ModelRateLimiter, report: "BatchReport"):
+    from dspy.utils.callback import BaseCallback
+
+    class RateLimitCallback(BaseCallback):
+        """Waits on the model's token bucket before every LM request."""
+
+        def on_lm_start(self, call_id, instance, inputs):
+            model = getattr(instance, "model", type(instance).__name__)
+            waited = limiter.acquire(model)
+            with report.lock:
+                report.lm_calls[model] = report.lm_calls.get(model, 0) + 1
+                report.rate_limit_wait_s += waited
+
+    return RateLimitCallback()
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+@dataclass
+class BatchReport:
+    """Running totals for a batch qualification run (checkpointed with the cursor)."""
+    processed: int = 0
+    failed: int = 0
+    written: int = 0
+    tiers: Dict[str, int] = field(default_factory=dict)
+    tier_changes: Dict[str, int] = field(default_factory=dict)  # "warm->hot" -> count
+    lm_calls: Dict[str, int] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    rate_limit_wait_s: float = 0.0
+    elapsed_s: float = 0.0
+    failed_ids: List[str] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    MAX_FAILED_IDS = 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:  # Workers update it concurrently
+            return {
+                name: copy(getattr(self, name))
+                for name in self.__dataclass_fields__ if name != "lock"
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchReport":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__ and k != "lock"})
+
+    @property
+    def leads_per_second(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> str:
+        changed = sum(self.tier_changes.values())
+        lines = [
+            f"📊 Batch qualification: {self.processed} leads ({self.failed} failed, {self.written} written)",
+            f"   Throughput: {self.leads_per_second:.2f} leads/s over {self.elapsed_s:.0f}s",
+            f"   LM calls: {sum(self.lm_calls.values())} "
+            + (f"({', '.join(f'{m}: {n}' for m, n in sorted(self.lm_calls.items()))})" if self.lm_calls else ""),
+            f"   Tokens: {self.prompt_tokens} prompt + {self.completion_tokens} completion",
+            f"   Cost: ${self.cost:.4f}" + (f" (${self.cost / self.processed:.5f}/lead)" if self.processed else ""),
+            f"   Rate limit waits: {self.rate_limit_wait_s:.1f}s",
+            f"   Tiers: {', '.join(f'{t}: {n}' for t, n in sorted(self.tiers.items())) or 'none'}",
+            f"   Tier changes: {changed}"
+            + (f" ({', '.join(f'{c}: {n}' for c, n in sorted(self.tier_changes.items()))})" if changed else ""),
+        ]
+        return "\n".join(lines)
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+def _default_qualify() -> Callable:
+    from agents.inbound_agent import InboundAgent
+    return InboundAgent().qualify
+
+
+class BatchQualifier:
+    """Qualifies a stream of leads with bounded concurrency, bulk writes and checkpoints."""
+
+    def __init__(
+        self,
+        qualify: Optional[Callable] = None,
+        supabase_client=None,
+        output_path: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        write_size: Optional[int] = None,
+        rate_limiter: Optional[ModelRateLimiter] = None,
+    ):
+        """
+        Args:
+            qualify: Lead -> QualificationResult (default: InboundAgent().qualify)
+            supabase_client: Write results back to `leads` (None: don't)
+            output_path: Also append results to this JSONL file
+            checkpoint_path: Save/resume progress here (None: no checkpoints)
+            concurrency: Leads in flight (default QUALIFY_BATCH_CONCURRENCY, 8)
+            write_size: Rows per bulk upsert (default QUALIFY_BATCH_WRITE_SIZE, 200)
+            rate_limiter: Per-model limits (default from QUALIFY_MODEL_RPM / QUALIFY_DEFAULT_RPM)
+        """
+        self._qualify = qualify
+        self.supabase = supabase_client
+        self.output_path = Path(output_path) if output_path else None
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.concurrency = concurrency or _env_int("QUALIFY_BATCH_CONCURRENCY", 8)
+        self.write_size = write_size or _env_int("QUALIFY_BATCH_WRITE_SIZE", 200)
+        self.rate_limiter = rate_limiter or ModelRateLimiter(
+            parse_model_rates(os.getenv("QUALIFY_MODEL_RPM")),
+            default_rpm=float(os.getenv("QUALIFY_DEFAULT_RPM", "0")),
+        )
+
+    # ----- Checkpoints -----
+
+    def load_checkpoint(self, source_name: str) -> Tuple[Any, BatchReport]:
+        """(cursor, report) to resume `source_name` from; (None, empty report) if none."""
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return None, BatchReport()
+        checkpoint = json.loads(self.checkpoint_path.read_text())
+        if checkpoint.get("source") != source_name:
+            logger.warning(f"⚠️ Checkpoint is for {checkpoint.get('source')}, starting {source_name} from the beginning")
+            return None, BatchReport()
+        logger.info(f"🔄 Resuming {source_name} after {checkpoint['cursor']} ({checkpoint['report']['processed']} done)")
+        return checkpoint["cursor"], BatchReport.from_dict(checkpoint["report"])
+
+    def _save_checkpoint(self, source_name: str, cursor: Any, report: BatchReport):
+        if not self.checkpoint_path:
+            return
+        atomic_write_json(self.checkpoint_path, {
+            "source": source_name,
+            "cursor": cursor,
+            "updated_at": time.time(),
+            "report": report.to_dict(),
+        })
+
+    # ----- Qualification -----
+
+    def _qualify_row(self, row: Dict[str, Any], callback, report: BatchReport) -> Optional[Dict[str, Any]]:
+        """Qualify one lead (worker thread). Returns its result row, None on failure."""
+        import dspy
+
+        lead_id = str(row.get("id") or row.get("form_response", {}).get("token", "?"))
+        try:
+            lead = lead_from_row(row)
+            lead_id = str(lead.id)
+            with dspy.context(callbacks=list(dspy.settings.get("callbacks") or []) + [callback]):
+                with agent_call("InboundAgent", "batch_qualify") as call:
+                    result = self._qualify(lead)
+            usage = call.usage
+        except Exception as e:
+            logger.error(f"❌ Qualification failed for lead {lead_id}: {e}")
+            batch_qualified_leads.inc(outcome="failed")
+            with report.lock:
+                report.failed += 1
+                if len(report.failed_ids) < report.MAX_FAILED_IDS:
+                    report.failed_ids.append(lead_id)
+            return None
+
+        new_row = result_row(lead, result)
+        if "form_response" in row:
+            del new_row["id"]  # Minted by the transform; the stored lead is matched on typeform_id
+        old_tier = _tier_value(row.get("qualification_tier") or row.get("tier"))
+        new_tier = new_row["qualification_tier"]
+        batch_qualified_leads.inc(outcome="qualified")
+        with report.lock:
+            report.processed += 1
+            report.tiers[new_tier] = report.tiers.get(new_tier, 0) + 1
+            if old_tier and old_tier != new_tier:
+                change = f"{old_tier}->{new_tier}"
+                report.tier_changes[change] = report.tier_changes.get(change, 0) + 1
+            report.prompt_tokens += usage.prompt_tokens
+            report.completion_tokens += usage.completion_tokens
+            report.cost += usage.cost
+        return {**new_row, "previous_tier": old_tier}
+
+    # ----- Writes -----
+
+    @async_retry(max_attempts=3)
+    async def _write(self, rows: List[Dict[str, Any]]):
+        """Bulk upsert (retried; a failure stops the run before the checkpoint moves)."""
+        if self.supabase is not None:
+            records = [{k: v for k, v in row.items() if k != "previous_tier"} for row in rows]
+            for key in ("id", "typeform_id"):
+                batch = [r for r in records if ("id" in r) == (key == "id")]
+                if batch:
+                    await asyncio.to_thread(
+                        lambda: self.supabase.table(LEADS_TABLE).upsert(batch, on_conflict=key).execute()
+                    )
+        if self.output_path is not None:
+            def append():
+                with self.output_path.open("a") as f:
+                    f.writelines(json.dumps(row) + "\n" for row in rows)
+            await asyncio.to_thread(append)
+
+    async def _flush(self, source_name: str, rows: List[Dict[str, Any]], cursor: Any, report: BatchReport):
+        if rows:
+            await self._write(rows)
+        report.written += len(rows)
+        self._save_checkpoint(source_name, cursor, report)
+        logger.info(f"💾 Batch qualification: {report.written} written, {report.failed} failed, cursor {cursor}")
+
+    async def run(self, source, limit: Optional[int] = None, resume: bool = True) -> BatchReport:
+        """
+        Qualify every lead from `source` (SupabaseLeadSource / JsonlLeadSource).
+
+        Args:
+            source: Lead source
+            limit: Stop after this many leads (this run)
+            resume: Continue from the checkpoint, if any
+
+        Returns:
+            BatchReport (totals include earlier runs of a resumed checkpoint)
+        """
+        if self._qualify is None:
+            self._qualify = await asyncio.to_thread(_default_qualify)
+
+        cursor, report = self.load_checkpoint(source.name) if resume else (None, BatchReport())
+        elapsed_before = report.elapsed_s
+        started = time.perf_counter()
+        callback = _make_limiter_callback(self.rate_limiter, report)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        # Tasks in source order; results are written (and the cursor advanced)
+        # only once every earlier lead has finished
+        pending: deque = deque()
+        buffer: List[Dict[str, Any]] = []
+        done_cursor = cursor
+
+        async def qualify(row):
+            try:
+                return await asyncio.to_thread(self._qualify_row, row, callback, report)
+            finally:
+                semaphore.release()
+
+        async def drain(block: bool):
+            nonlocal done_cursor
+            while pending and (block or pending[0][1].done()):
+                row_cursor, task = pending.popleft()
+                row = await task
+                if row is not None:
+                    buffer.append(row)
+                done_cursor = row_cursor
+                if len(buffer) >= self.write_size:
+                    report.elapsed_s = elapsed_before + time.perf_counter() - started
+                    await self._flush(source.name, buffer[:], done_cursor, report)
+                    buffer.clear()
+
+        logger.info(f"🚀 Batch qualification of {source.name} ({self.concurrency} concurrent)")
+        try:
+            count = 0
+            async for row_cursor, row in source.rows(cursor):
+                if limit is not None and count >= limit:
+                    break
+                await semaphore.acquire()
+                pending.append((row_cursor, asyncio.create_task(qualify(row))))
+                count += 1
+                await drain(block=False)
+            await drain(block=True)
+        finally:
+            # Let in-flight workers finish before returning (they hold threads)
+            if pending:
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+        report.elapsed_s = elapsed_before + time.perf_counter() - started
+        if buffer or done_cursor != cursor:
+            await self._flush(source.name, buffer, done_cursor, report)
+        logger.info(report.summary())
+        return report
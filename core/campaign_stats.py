@@ -0,0 +1,290 @@
+"""
+GMass Campaign Statistics Cache
+
+Local cache of GMass campaign statistics for AuditAgent. Previously every
+audit downloaded the full campaign list, filtered it by creationTime in
+Python and summed each metric in a separate pass.
+
+- Sync: the campaign list is fetched over one shared HTTP client and diffed
+  against the cache; only new or changed campaigns (by a statistics/status
+  fingerprint) are applied, and campaigns GMass no longer returns are dropped.
+  The GMass list endpoint has no modified-since filter, so the saving is in
+  how often we download (at most once per GMASS_STATS_TTL_SECONDS, in the
+  background once the cache is warm) rather than in the payload.
+- Aggregates: campaigns are kept sorted by creation time with prefix sums of
+  every metric, rebuilt in one pass after a sync that changed something. Any
+  window ("last N hours") is then a binary search plus one subtraction.
+- Persistence: a JSON snapshot (GMASS_STATS_CACHE_PATH) lets audits after a
+  restart answer immediately while the first sync runs.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from utils.atomic_file import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+GMASS_CAMPAIGNS_URL = "https://api.gmass.co/api/campaigns"
+DEFAULT_CACHE_PATH = "data/gmass_campaign_stats.json"
+STAT_FIELDS = ("recipients", "opens", "clicks", "replies", "bounces", "blocks", "unsubscribes")
+_RECIPIENTS, _OPENS, _CLICKS, _REPLIES, _BOUNCES, _BLOCKS, _UNSUBSCRIBES = range(len(STAT_FIELDS))
+
+
+@dataclass
+class CampaignRecord:
+    """One campaign's identity, creation time and statistics."""
+    campaign_id: str
+    created_at: Optional[float]  # Epoch seconds; None if GMass sent no valid creationTime
+    creation_time: Optional[str]
+    name: Optional[str]
+    status: Optional[str]
+    stage: Optional[str]
+    stats: List[int] = field(default_factory=lambda: [0] * len(STAT_FIELDS))
+
+    @classmethod
+    def from_api(cls, campaign: Dict[str, Any]) -> "CampaignRecord":
+        creation_time = campaign.get("creationTime") or None
+        created_at = None
+        if creation_time:
+            try:
+                created_at = datetime.fromisoformat(creation_time.replace("Z", "+00:00")).timestamp()
+            except (ValueError, AttributeError):
+                created_at = None
+        statistics = campaign.get("statistics") or {}
+        return cls(
+            campaign_id=str(campaign.get("campaignId")),
+            created_at=created_at,
+            creation_time=creation_time,
+            name=campaign.get("friendlyName", campaign.get("subject")),
+            status=campaign.get("status"),
+            stage=campaign.get("stage"),
+            stats=[int(statistics.get(name, 0) or 0) for name in STAT_FIELDS]
+        )
+
+    def fingerprint(self) -> Tuple:
+        return (self.created_at, self.status, self.stage, self.name, tuple(self.stats))
+
+    def detail(self) -> Dict[str, Any]:
+        s = self.stats
+        return {
+            "campaign_id": self.campaign_id,
+            "name": self.name,
+            "sent": s[_RECIPIENTS],
+            "delivered": s[_RECIPIENTS] - s[_BOUNCES] - s[_BLOCKS],
+            "opens": s[_OPENS],
+            "clicks": s[_CLICKS],
+            "replies": s[_REPLIES],
+            "bounces": s[_BOUNCES],
+            "blocks": s[_BLOCKS],
+            "unsubscribes": s[_UNSUBSCRIBES],
+            "creation_time": self.creation_time,
+            "status": self.status,
+            "stage": self.stage
+        }
+
+
+def _rate(numerator: float, denominator: float) -> float:
+    return round((numerator / denominator * 100) if denominator > 0 else 0, 2)
+
+
+class CampaignStatsCache:
+    """Incrementally synced GMass campaign stats with O(log n) window aggregates."""
+
+    def __init__(
+        self,
+        api_key: str,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        timeout: float = 30.0
+    ):
+        self.api_key = api_key
+        self.path = path if path is not None else os.getenv("GMASS_STATS_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else float(os.getenv("GMASS_STATS_TTL_SECONDS", "300"))
+        )
+        self.timeout = timeout
+
+        self._campaigns: Dict[str, CampaignRecord] = {}
+        self._fingerprints: Dict[str, Tuple] = {}
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Window aggregates (rebuilt after changes)
+        self._dirty = True
+        self._times = np.empty(0)
+        self._dated: List[CampaignRecord] = []
+        self._cumulative = np.zeros((1, len(STAT_FIELDS)), dtype=np.int64)
+        self._undated: List[CampaignRecord] = []
+        self._undated_totals = np.zeros(len(STAT_FIELDS), dtype=np.int64)
+
+        self._load()
+
+    # ----- Persistence -----
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            for data in snapshot.get("campaigns", []):
+                record = CampaignRecord(**data)
+                self._campaigns[record.campaign_id] = record
+                self._fingerprints[record.campaign_id] = record.fingerprint()
+            self._synced_at = float(snapshot.get("synced_at", 0.0))
+            logger.info(f"✅ Loaded {len(self._campaigns)} cached GMass campaigns")
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"❌ Unreadable GMass stats cache {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        atomic_write_json(self.path, {
+            "synced_at": self._synced_at,
+            "campaigns": [asdict(record) for record in self._campaigns.values()]
+        })
+
+    # ----- Sync -----
+
+    async def _fetch_campaigns(self) -> List[Dict[str, Any]]:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(GMASS_CAMPAIGNS_URL, headers={"X-apikey": self.api_key})
+        if response.status_code != 200:
+            raise Exception(f"GMass API returned {response.status_code}: {response.text}")
+        return response.json()
+
+    def apply(self, campaigns: List[Dict[str, Any]]) -> int:
+        """Apply a full campaign listing; returns the number of added/changed/removed campaigns."""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for campaign in campaigns:
+                record = CampaignRecord.from_api(campaign)
+                seen.add(record.campaign_id)
+                fingerprint = record.fingerprint()
+                if self._fingerprints.get(record.campaign_id) != fingerprint:
+                    self._campaigns[record.campaign_id] = record
+                    self._fingerprints[record.campaign_id] = fingerprint
+                    changed += 1
+            for campaign_id in [c for c in self._campaigns if c not in seen]:
+                del self._campaigns[campaign_id]
+                del self._fingerprints[campaign_id]
+                changed += 1
+            self._synced_at = time.time()
+            if not changed:
+                return 0  # Nothing to rewrite on disk
+            self._dirty = True
+            self._save()
+        return changed
+
+    async def sync(self) -> int:
+        """Fetch the campaign list and apply new/changed campaigns (single-flight)."""
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        synced_before = self._synced_at
+        async with self._sync_lock:
+            if self._synced_at != synced_before:
+                return 0  # Another caller synced while we waited
+            started = time.perf_counter()
+            campaigns = await self._fetch_campaigns()
+            changed = await asyncio.to_thread(self.apply, campaigns)
+            logger.info(
+                f"📧 GMass stats sync: {len(campaigns)} campaigns, {changed} changed "
+                f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
+            return changed
+
+    async def ensure_fresh(self):
+        """Sync if the cache is empty; refresh in the background if it is stale."""
+        if not self._synced_at:
+            await self.sync()
+            return
+        if time.time() - self._synced_at > self.ttl_seconds and (
+                self._refresh_task is None or self._refresh_task.done()):
+
+            async def refresh():
+                try:
+                    await self.sync()
+                except Exception as e:
+                    logger.error(f"❌ GMass stats background sync failed: {e}")
+
+            self._refresh_task = asyncio.create_task(refresh())
+
+    # ----- Aggregates -----
+
+    def _rebuild(self):
+        """Sort dated campaigns and build metric prefix sums in one pass."""
+        dated, undated = [], []
+        for record in self._campaigns.values():
+            (dated if record.created_at is not None else undated).append(record)
+        dated.sort(key=lambda r: r.created_at)
+
+        stats = np.array([r.stats for r in dated], dtype=np.int64).reshape(len(dated), len(STAT_FIELDS))
+        self._cumulative = np.vstack([np.zeros((1, len(STAT_FIELDS)), dtype=np.int64), np.cumsum(stats, axis=0)])
+        self._times = np.array([r.created_at for r in dated], dtype=float)
+        self._dated = dated
+        self._undated = undated
+        self._undated_totals = (
+            np.array([r.stats for r in undated], dtype=np.int64).sum(axis=0)
+            if undated else np.zeros(len(STAT_FIELDS), dtype=np.int64)
+        )
+        self._dirty = False
+
+    def window(self, hours: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Aggregate metrics for campaigns created in the last `hours`.
+
+        Campaigns without a valid creationTime are included in every window.
+        """
+        cutoff = (now if now is not None else time.time()) - hours * 3600
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            start = int(np.searchsorted(self._times, cutoff, side="left"))
+            totals = self._cumulative[-1] - self._cumulative[start] + self._undated_totals
+            records = self._dated[start:][::-1] + self._undated
+
+        recipients, opens, clicks, replies, bounces, blocks = (int(totals[i]) for i in range(6))
+        delivered = recipients - bounces - blocks
+        return {
+            "total_campaigns": len(records),
+            "total_emails_sent": recipients,
+            "deliverability_rate": _rate(delivered, recipients),
+            "open_rate": _rate(opens, delivered),
+            "click_rate": _rate(clicks, delivered),
+            "reply_rate": _rate(replies, delivered),
+            "bounce_rate": _rate(bounces, recipients),
+            "campaigns_detail": [record.detail() for record in records]
+        }
+
+    @property
+    def synced_at(self) -> float:
+        return self._synced_at
+
+    def __len__(self) -> int:
+        return len(self._campaigns)
+
+
+_caches: Dict[str, CampaignStatsCache] = {}
+
+
+def get_campaign_stats_cache(api_key: str) -> CampaignStatsCache:
+    """Get or create the campaign stats cache for a GMass API key."""
+    cache = _caches.get(api_key)
+    if cache is None:
+        cache = _caches[api_key] = CampaignStatsCache(api_key)
+    return cache
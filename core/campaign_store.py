@@ -0,0 +1,233 @@
+"""
+ABM Campaign Store
+
+AccountOrchestrator used to keep campaigns in a plain dict, upsert the whole
+campaign document (contacts, metadata, every touchpoint) on each step, and
+had no way to find which campaigns were due short of walking all of them.
+
+CampaignStore keeps the same in-memory documents plus:
+
+- Due-time index: a min-heap of (next_touchpoint_at, campaign_id) in
+  memory, mirrored by the indexed campaigns.next_touchpoint_at column
+  (migrations/012). pop_due() pops only campaigns whose touchpoint is due,
+  so a sweep costs O(due steps), not O(active campaigns). Rescheduling
+  pushes a new heap entry; superseded entries are skipped when popped.
+- Claims: with a backend, due campaigns are claimed with one conditional
+  UPDATE (next_touchpoint_at <= now -> NULL) that also returns their rows,
+  so campaigns scheduled by another instance, or before a restart, are
+  picked up, and two instances never run the same step.
+- Touched-field writes: callers mark the fields they change with touch();
+  save() writes only those columns.
+
+Configuration: the backend is the orchestrator's Supabase client (none: memory only).
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGNS_TABLE = "campaigns"
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Naive UTC datetime from an ISO string (ours are naive; Postgres returns +00:00)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# ============================================================================
+# Backend
+# ============================================================================
+
+class SupabaseCampaignBackend:
+    """Campaign rows in Supabase (see migrations/012)."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def insert(self, campaign: Dict[str, Any]):
+        self.client.table(CAMPAIGNS_TABLE).upsert(campaign).execute()
+
+    def update(self, campaign_id: str, fields: Dict[str, Any]):
+        self.client.table(CAMPAIGNS_TABLE).update(fields).eq("campaign_id", campaign_id).execute()
+
+    def load(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        result = self.client.table(CAMPAIGNS_TABLE).select("*").eq("campaign_id", campaign_id).execute()
+        return result.data[0] if result.data else None
+
+    def due(self, before: str, limit: int) -> List[Dict[str, Any]]:
+        """IDs of active campaigns due by `before` (idx_campaigns_next_touchpoint_at)."""
+        result = self.client.table(CAMPAIGNS_TABLE).select("campaign_id, next_touchpoint_at").eq(
+            "status", "active"
+        ).lte("next_touchpoint_at", before).order("next_touchpoint_at").limit(limit).execute()
+        return result.data or []
+
+    def claim(self, campaign_ids: List[str], before: str) -> List[Dict[str, Any]]:
+        """Clear next_touchpoint_at on those still due; the returned rows are ours to run."""
+        result = self.client.table(CAMPAIGNS_TABLE).update({"next_touchpoint_at": None}).in_(
+            "campaign_id", campaign_ids
+        ).lte("next_touchpoint_at", before).execute()
+        return result.data or []
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+class CampaignStore:
+    """Campaign documents with a due-time heap and touched-field persistence."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.campaigns: Dict[str, Dict[str, Any]] = {}
+
+        self._heap: List[Tuple[datetime, str]] = []
+        self._due: Dict[str, datetime] = {}  # campaign_id -> live heap entry
+        self._dirty: Dict[str, Set[str]] = {}
+        # Producers schedule from worker-thread event loops while the sweep pops on the main one
+        self._heap_lock = threading.Lock()
+        self.stats = {"writes": 0, "fields_written": 0, "claimed": 0, "claims_lost": 0}
+
+    # ----- Documents -----
+
+    def get(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        return self.campaigns.get(campaign_id)
+
+    async def create(self, campaign: Dict[str, Any]):
+        """Store a new campaign and write its full row once."""
+        self.campaigns[campaign["campaign_id"]] = campaign
+        if self.backend is not None:
+            try:
+                await asyncio.to_thread(self.backend.insert, dict(campaign))
+                self.stats["writes"] += 1
+            except Exception as e:
+                logger.error(f"Error persisting campaign: {str(e)}")
+
+    async def load(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Campaign from memory, else from the backend."""
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is not None or self.backend is None:
+            return campaign
+        try:
+            campaign = await asyncio.to_thread(self.backend.load, campaign_id)
+        except Exception as e:
+            logger.error(f"Error loading campaign: {str(e)}")
+            return None
+        if campaign:
+            self._adopt(campaign)
+        return campaign
+
+    def _adopt(self, campaign: Dict[str, Any]):
+        campaign_id = campaign["campaign_id"]
+        self.campaigns[campaign_id] = campaign
+        due = parse_timestamp(campaign.get("next_touchpoint_at"))
+        if due is not None and campaign.get("status") == "active":
+            self._push(campaign_id, due)
+
+    def touch(self, campaign_id: str, *fields: str):
+        """Mark fields of a campaign as changed (written by the next save())."""
+        self._dirty.setdefault(campaign_id, set()).update(fields)
+
+    async def save(self, campaign_id: str):
+        """Write only the touched fields of a campaign."""
+        fields = self._dirty.pop(campaign_id, None)
+        campaign = self.campaigns.get(campaign_id)
+        if not fields or campaign is None or self.backend is None:
+            return
+        row = {name: campaign.get(name) for name in fields}
+        try:
+            await asyncio.to_thread(self.backend.update, campaign_id, row)
+            self.stats["writes"] += 1
+            self.stats["fields_written"] += len(row)
+        except Exception as e:
+            logger.error(f"Error persisting campaign: {str(e)}")
+            self.touch(campaign_id, *fields)  # Retried with the next save
+
+    # ----- Due-time index -----
+
+    def _push(self, campaign_id: str, due: datetime):
+        with self._heap_lock:
+            self._due[campaign_id] = due
+            heapq.heappush(self._heap, (due, campaign_id))
+
+    def schedule(self, campaign_id: str, due: datetime):
+        """Set a campaign's next touchpoint time (replaces any earlier one)."""
+        campaign = self.campaigns[campaign_id]
+        campaign["next_touchpoint_at"] = due.isoformat()
+        self.touch(campaign_id, "next_touchpoint_at")
+        self._push(campaign_id, due)
+
+    def unschedule(self, campaign_id: str):
+        """Drop a campaign from the index (paused, completed, cancelled)."""
+        with self._heap_lock:
+            self._due.pop(campaign_id, None)  # Its heap entry is skipped when popped
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is not None and campaign.get("next_touchpoint_at") is not None:
+            campaign["next_touchpoint_at"] = None
+            self.touch(campaign_id, "next_touchpoint_at")
+
+    def due_at(self, campaign_id: str) -> Optional[datetime]:
+        return self._due.get(campaign_id)
+
+    def next_due_at(self) -> Optional[datetime]:
+        with self._heap_lock:
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def depth(self) -> int:
+        """Scheduled campaigns in this process."""
+        return len(self._due)
+
+    def _pop_local(self, now: datetime, limit: int) -> List[str]:
+        campaign_ids = []
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] <= now and len(campaign_ids) < limit:
+                due, campaign_id = heapq.heappop(self._heap)
+                if self._due.get(campaign_id) != due:
+                    continue  # Rescheduled or unscheduled since this entry was pushed
+                del self._due[campaign_id]
+                campaign_ids.append(campaign_id)
+        return campaign_ids
+
+    async def pop_due(self, now: Optional[datetime] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Claim up to `limit` campaigns whose next touchpoint is due."""
+        now = now or datetime.utcnow()
+        campaign_ids = self._pop_local(now, limit)
+        if self.backend is None:
+            return [self.campaigns[c] for c in campaign_ids if c in self.campaigns]
+
+        before = now.isoformat()
+        try:
+            # Due rows this process didn't schedule (other instances, before a restart)
+            for row in await asyncio.to_thread(self.backend.due, before, limit):
+                if row["campaign_id"] not in campaign_ids and len(campaign_ids) < limit:
+                    campaign_ids.append(row["campaign_id"])
+                    self._due.pop(row["campaign_id"], None)
+            if not campaign_ids:
+                return []
+            claimed = await asyncio.to_thread(self.backend.claim, campaign_ids, before)
+        except Exception as e:
+            # Fail open for what this process scheduled itself
+            logger.error(f"❌ Campaign due index unavailable ({e}), running {len(campaign_ids)} local steps")
+            return [self.campaigns[c] for c in campaign_ids if c in self.campaigns]
+
+        campaigns = []
+        for row in claimed:
+            campaign = self.campaigns.get(row["campaign_id"])
+            if campaign is None:
+                campaign = self.campaigns[row["campaign_id"]] = row
+            campaign["next_touchpoint_at"] = None
+            campaigns.append(campaign)
+        self.stats["claimed"] += len(campaigns)
+        self.stats["claims_lost"] += len(campaign_ids) - len(campaigns)
+        return campaigns
@@ -0,0 +1,443 @@
+"""
+Conversation Store
+
+Per-user chat history shared by every StrategyAgent instance in the process
+(Slack bot singleton, webhook/A2A-constructed agents) and persisted so context
+survives deploys.
+
+- Bounded: each user keeps the last `max_turns` turns in a ring buffer;
+  older rows are trimmed from the backend as well.
+- Write-through: every turn is written to SQLite (default) or Postgres
+  before append() returns; a user's buffer is loaded lazily on first use.
+- Token-budgeted: render() returns the newest turns that fit the budget.
+  Each turn is rendered once when appended and the joined window is cached
+  until the next append, so prompt size and render cost stay flat as
+  sessions grow.
+- Optional summaries: turns evicted from the ring can be folded into a
+  running per-user summary (summarize_pending), rendered ahead of the window.
+
+Configuration (environment variables):
+- CONVERSATION_STORE_URL: "memory", "sqlite:///path/to.db", or a postgresql:// URL
+  (default: DATABASE_URL if it is Postgres, else sqlite:///data/conversations.db)
+- CONVERSATION_MAX_TURNS: turns kept per user (default 20)
+- CONVERSATION_HISTORY_TOKENS: token budget for rendered history (default 600)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = "data/conversations.db"
+ROLE_LABELS = {"user": "Josh", "assistant": "Strategy Agent"}
+EMPTY_HISTORY = "No previous conversation"
+
+# Summarize evicted turns in batches, not on every message; cap the backlog
+# if the summarizer keeps failing or is never run
+SUMMARIZE_BATCH = 6
+MAX_PENDING_SUMMARY = 4 * SUMMARIZE_BATCH
+
+# (previous summary, evicted turns) -> new summary
+Summarizer = Callable[[str, List["ConversationTurn"]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+@dataclass
+class ConversationTurn:
+    """One message in a user's conversation."""
+    role: str  # "user" | "assistant"
+    content: str
+    created_at: float
+    id: Optional[int] = None
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class SQLiteConversationBackend:
+    """Conversation turns + summaries in a local SQLite file (WAL mode)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversation_turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversation_turns_user
+                ON conversation_turns(user_id, id);
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                user_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+
+    def append(self, user_id: str, turn: ConversationTurn) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO conversation_turns (user_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (user_id, turn.role, turn.content, turn.created_at)
+            )
+            return cursor.lastrowid
+
+    def load(self, user_id: str, limit: int) -> Tuple[List[ConversationTurn], str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, role, content, created_at FROM conversation_turns "
+                "WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit)
+            ).fetchall()
+            summary = self._conn.execute(
+                "SELECT summary FROM conversation_summaries WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        turns = [ConversationTurn(role=r[1], content=r[2], created_at=r[3], id=r[0]) for r in reversed(rows)]
+        return turns, summary[0] if summary else ""
+
+    def trim(self, user_id: str, before_id: int):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM conversation_turns WHERE user_id = ? AND id < ?", (user_id, before_id)
+            )
+
+    def save_summary(self, user_id: str, summary: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO conversation_summaries (user_id, summary, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET summary = excluded.summary, updated_at = excluded.updated_at",
+                (user_id, summary, time.time())
+            )
+
+    def clear(self, user_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM conversation_turns WHERE user_id = ?", (user_id,))
+            self._conn.execute("DELETE FROM conversation_summaries WHERE user_id = ?", (user_id,))
+
+
+class PostgresConversationBackend:
+    """Conversation turns + summaries in Postgres (see migrations/010)."""
+
+    def __init__(self, database_url: str):
+        from psycopg_pool import ConnectionPool
+
+        self._pool = ConnectionPool(database_url, min_size=1, max_size=4, timeout=5.0, open=False)
+        self._pool.open()
+        with self._pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_turns (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversation_turns_user ON conversation_turns(user_id, id DESC)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    user_id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+
+    def append(self, user_id: str, turn: ConversationTurn) -> int:
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "INSERT INTO conversation_turns (user_id, role, content, created_at) "
+                "VALUES (%s, %s, %s, to_timestamp(%s)) RETURNING id",
+                (user_id, turn.role, turn.content, turn.created_at)
+            ).fetchone()
+        return row[0]
+
+    def load(self, user_id: str, limit: int) -> Tuple[List[ConversationTurn], str]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, role, content, EXTRACT(EPOCH FROM created_at) FROM conversation_turns "
+                "WHERE user_id = %s ORDER BY id DESC LIMIT %s",
+                (user_id, limit)
+            ).fetchall()
+            summary = conn.execute(
+                "SELECT summary FROM conversation_summaries WHERE user_id = %s", (user_id,)
+            ).fetchone()
+        turns = [ConversationTurn(role=r[1], content=r[2], created_at=float(r[3]), id=r[0]) for r in reversed(rows)]
+        return turns, summary[0] if summary else ""
+
+    def trim(self, user_id: str, before_id: int):
+        with self._pool.connection() as conn:
+            conn.execute("DELETE FROM conversation_turns WHERE user_id = %s AND id < %s", (user_id, before_id))
+
+    def save_summary(self, user_id: str, summary: str):
+        with self._pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO conversation_summaries (user_id, summary, updated_at) VALUES (%s, %s, NOW()) "
+                "ON CONFLICT (user_id) DO UPDATE SET summary = EXCLUDED.summary, updated_at = NOW()",
+                (user_id, summary)
+            )
+
+    def clear(self, user_id: str):
+        with self._pool.connection() as conn:
+            conn.execute("DELETE FROM conversation_turns WHERE user_id = %s", (user_id,))
+            conn.execute("DELETE FROM conversation_summaries WHERE user_id = %s", (user_id,))
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+class _UserConversation:
+    """In-memory ring buffer + render cache for one user."""
+
+    __slots__ = ("turns", "rendered", "summary", "pending", "evicted_since_trim", "cache", "lock")
+
+    def __init__(self, max_turns: int):
+        self.turns: Deque[ConversationTurn] = deque(maxlen=max_turns)
+        self.rendered: Deque[Tuple[str, int]] = deque(maxlen=max_turns)  # (line, tokens) per turn
+        self.summary = ""
+        self.pending: List[ConversationTurn] = []  # Evicted, not yet summarized
+        self.evicted_since_trim = 0
+        self.cache: Dict[int, str] = {}  # token budget -> rendered history
+        self.lock = threading.Lock()
+
+
+class ConversationStore:
+    """Bounded, persistent per-user conversation history."""
+
+    def __init__(
+        self,
+        backend=None,
+        max_turns: int = 20,
+        history_tokens: int = 600,
+        max_message_chars: int = 400,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """
+        Args:
+            backend: SQLite/Postgres backend (None: memory only)
+            max_turns: Turns kept per user (messages, not exchanges)
+            history_tokens: Default token budget for render()
+            max_message_chars: Per-message truncation in rendered history
+            summarizer: Folds evicted turns into the user's running summary
+        """
+        self.backend = backend
+        self.max_turns = max_turns
+        self.history_tokens = history_tokens
+        self.max_message_chars = max_message_chars
+        self.summarizer = summarizer
+        self._users: Dict[str, _UserConversation] = {}
+        self._lock = threading.Lock()
+
+    def _user(self, user_id: str) -> _UserConversation:
+        with self._lock:
+            conversation = self._users.get(user_id)
+            if conversation is not None:
+                return conversation
+            conversation = _UserConversation(self.max_turns)
+            self._users[user_id] = conversation
+
+        # Lazy load outside the store lock; the user lock keeps others waiting for it
+        with conversation.lock:
+            if self.backend is not None:
+                try:
+                    turns, summary = self.backend.load(user_id, self.max_turns)
+                    conversation.summary = summary
+                    for turn in turns:
+                        conversation.turns.append(turn)
+                        conversation.rendered.append(self._render_turn(turn))
+                except Exception as e:
+                    logger.error(f"❌ Failed to load conversation for {user_id}: {e}")
+        return conversation
+
+    def _render_turn(self, turn: ConversationTurn) -> Tuple[str, int]:
+        label = ROLE_LABELS.get(turn.role, turn.role)
+        line = f"{label}: {turn.content[:self.max_message_chars]}"
+        return line, estimate_tokens(line)
+
+    # ----- Writes -----
+
+    def append(self, user_id: str, role: str, content: str) -> ConversationTurn:
+        """Record one turn (written through to the backend)."""
+        turn = ConversationTurn(role=role, content=content, created_at=time.time())
+        conversation = self._user(user_id)
+
+        if self.backend is not None:
+            try:
+                turn.id = self.backend.append(user_id, turn)
+            except Exception as e:
+                logger.error(f"❌ Failed to persist conversation turn for {user_id}: {e}")
+
+        with conversation.lock:
+            if len(conversation.turns) == conversation.turns.maxlen:
+                evicted = conversation.turns[0]
+                conversation.evicted_since_trim += 1
+                if self.summarizer is not None:
+                    conversation.pending.append(evicted)
+                    del conversation.pending[:-MAX_PENDING_SUMMARY]
+            conversation.turns.append(turn)
+            conversation.rendered.append(self._render_turn(turn))
+            conversation.cache.clear()
+            trim_before = None
+            if conversation.evicted_since_trim >= self.max_turns // 2 and conversation.turns[0].id is not None:
+                trim_before = conversation.turns[0].id
+                conversation.evicted_since_trim = 0
+
+        if trim_before is not None:
+            try:
+                self.backend.trim(user_id, trim_before)
+            except Exception as e:
+                logger.error(f"❌ Failed to trim conversation for {user_id}: {e}")
+        return turn
+
+    def append_exchange(self, user_id: str, message: str, response: str):
+        """Record a user message and the assistant's response."""
+        self.append(user_id, "user", message)
+        self.append(user_id, "assistant", response)
+
+    def needs_summary(self, user_id: str) -> bool:
+        conversation = self._users.get(user_id)
+        return bool(self.summarizer and conversation and len(conversation.pending) >= SUMMARIZE_BATCH)
+
+    def summarize_pending(self, user_id: str) -> bool:
+        """Fold evicted turns into the user's summary (blocking; call off the event loop).
+
+        Returns:
+            True if the summary was updated
+        """
+        if not self.needs_summary(user_id):
+            return False
+        conversation = self._users[user_id]
+        with conversation.lock:
+            pending, conversation.pending = conversation.pending, []
+            previous = conversation.summary
+
+        try:
+            summary = self.summarizer(previous, pending).strip()
+        except Exception as e:
+            logger.error(f"❌ Conversation summary failed for {user_id}: {e}")
+            with conversation.lock:
+                conversation.pending = (pending + conversation.pending)[-MAX_PENDING_SUMMARY:]
+            return False
+
+        with conversation.lock:
+            conversation.summary = summary
+            conversation.cache.clear()
+        if self.backend is not None:
+            try:
+                self.backend.save_summary(user_id, summary)
+            except Exception as e:
+                logger.error(f"❌ Failed to persist conversation summary for {user_id}: {e}")
+        return True
+
+    def clear(self, user_id: str):
+        """Forget a user's history (memory and backend)."""
+        with self._lock:
+            self._users.pop(user_id, None)
+        if self.backend is not None:
+            self.backend.clear(user_id)
+
+    # ----- Reads -----
+
+    def turns(self, user_id: str) -> List[ConversationTurn]:
+        conversation = self._user(user_id)
+        with conversation.lock:
+            return list(conversation.turns)
+
+    def summary(self, user_id: str) -> str:
+        return self._user(user_id).summary
+
+    def render(self, user_id: str, max_tokens: Optional[int] = None) -> str:
+        """History for a prompt: running summary + newest turns within the token budget.
+
+        Cached per budget until the user's next append/summary update.
+        """
+        budget = max_tokens or self.history_tokens
+        conversation = self._user(user_id)
+        with conversation.lock:
+            cached = conversation.cache.get(budget)
+            if cached is not None:
+                return cached
+
+            lines: List[str] = []
+            used = 0
+            if conversation.summary:
+                summary_line = f"Earlier in this conversation: {conversation.summary}"
+                used = estimate_tokens(summary_line)
+            for line, tokens in reversed(conversation.rendered):
+                if used + tokens > budget and lines:
+                    break
+                lines.append(line)
+                used += tokens
+            lines.reverse()
+            if conversation.summary:
+                lines.insert(0, summary_line)
+
+            rendered = "\n".join(lines) if lines else EMPTY_HISTORY
+            conversation.cache[budget] = rendered
+            return rendered
+
+
+# ============================================================================
+# Global store
+# ============================================================================
+
+_conversation_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def _create_backend(url: str):
+    if url == "memory":
+        return None
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresConversationBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteConversationBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported CONVERSATION_STORE_URL: {url}")
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create the process-wide conversation store."""
+    global _conversation_store
+    if _conversation_store is None:
+        with _store_lock:
+            if _conversation_store is None:
+                database_url = os.getenv("DATABASE_URL", "")
+                default_url = (
+                    database_url if database_url.startswith(("postgres://", "postgresql://"))
+                    else f"sqlite:///{DEFAULT_SQLITE_PATH}"
+                )
+                url = os.getenv("CONVERSATION_STORE_URL", default_url)
+                try:
+                    backend = _create_backend(url)
+                except Exception as e:
+                    logger.error(f"❌ Conversation store backend unavailable ({e}), history will not persist")
+                    backend = None
+                _conversation_store = ConversationStore(
+                    backend=backend,
+                    max_turns=int(os.getenv("CONVERSATION_MAX_TURNS", "20")),
+                    history_tokens=int(os.getenv("CONVERSATION_HISTORY_TOKENS", "600"))
+                )
+                logger.info(f"✅ Conversation store: {type(backend).__name__ if backend else 'in-memory'}")
+    return _conversation_store
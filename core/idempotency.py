@@ -0,0 +1,310 @@
+"""
+Webhook Idempotency Index
+
+Providers retry deliveries (Typeform on slow acks, Slack after 3 seconds,
+VAPI on errors). Each retry used to run the full qualification pipeline
+again - duplicate leads, duplicate emails, duplicate LLM spend. Webhook
+receivers now claim the provider's event ID before queueing any work:
+
+- Memory window: a dict of recently claimed keys answers repeats in O(1).
+  Keys are grouped in time buckets (WEBHOOK_DEDUPE_WINDOW_SECONDS split into
+  60 buckets) and expire a whole bucket at a time, so expiry is O(1) per key
+  instead of rescanning the cache on every event.
+- Persistent unique index: the first claim of a key is inserted into
+  webhook_receipts (PRIMARY KEY (source, event_key)); a conflict means
+  another instance or a previous deploy already took it. Rows older than
+  WEBHOOK_DEDUPE_RETENTION_HOURS (default 168) are purged as buckets rotate.
+- Fails open: if the database is unreachable the event is processed, since
+  a duplicate is cheaper than a lost lead.
+
+Configuration (environment variables):
+- WEBHOOK_DEDUPE_URL: "memory", "sqlite:///path/to.db", or a postgresql:// URL
+  (default: DATABASE_URL if it is Postgres, else sqlite:///data/webhook_receipts.db)
+- WEBHOOK_DEDUPE_WINDOW_SECONDS: memory window (default 86400)
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = "data/webhook_receipts.db"
+WINDOW_BUCKETS = 60
+
+webhook_duplicates = get_metrics_registry().counter(
+    "webhook_duplicates", "Webhook deliveries dropped as duplicates", ("source",))
+
+
+# ============================================================================
+# Provider event keys
+# ============================================================================
+
+def typeform_event_key(payload: Dict[str, Any]) -> Optional[str]:
+    """Typeform delivery ID, falling back to the response token."""
+    return payload.get("event_id") or (payload.get("form_response") or {}).get("token")
+
+
+def slack_event_key(payload: Dict[str, Any]) -> Optional[str]:
+    """Slack Events API event_id, falling back to the message ts/user/channel."""
+    if payload.get("event_id"):
+        return payload["event_id"]
+    event = payload.get("event") or {}
+    if not event.get("ts"):
+        return None
+    return f"{event.get('ts')}_{event.get('user')}_{event.get('channel')}"
+
+
+def vapi_event_key(payload: Dict[str, Any]) -> Optional[str]:
+    """Call ID + message type for VAPI's once-per-call messages (None for streaming ones)."""
+    message = payload.get("message") or {}
+    call_id = (message.get("call") or {}).get("id")
+    if not call_id:
+        return None
+    if message.get("type") == "end-of-call-report":
+        return f"{call_id}:end-of-call-report"
+    if message.get("type") == "status-update" and message.get("status"):
+        return f"{call_id}:status-update:{message['status']}"
+    return None  # transcripts, speech updates, etc. repeat legitimately
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class SQLiteReceiptBackend:
+    """Claimed event keys in a local SQLite file (WAL mode)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS webhook_receipts (
+                source TEXT NOT NULL,
+                event_key TEXT NOT NULL,
+                received_at REAL NOT NULL,
+                PRIMARY KEY (source, event_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_webhook_receipts_received_at
+                ON webhook_receipts(received_at);
+        """)
+
+    def insert(self, source: str, event_key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO webhook_receipts (source, event_key, received_at) VALUES (?, ?, ?) "
+                "ON CONFLICT DO NOTHING",
+                (source, event_key, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, source: str, event_key: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM webhook_receipts WHERE source = ? AND event_key = ?", (source, event_key)
+            )
+
+    def purge(self, before: float):
+        with self._lock:
+            self._conn.execute("DELETE FROM webhook_receipts WHERE received_at < ?", (before,))
+
+
+class PostgresReceiptBackend:
+    """Claimed event keys in Postgres (see migrations/011)."""
+
+    def __init__(self, database_url: str):
+        from psycopg_pool import ConnectionPool
+
+        self._pool = ConnectionPool(database_url, min_size=1, max_size=4, timeout=5.0, open=False)
+        self._pool.open()
+        with self._pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS webhook_receipts (
+                    source TEXT NOT NULL,
+                    event_key TEXT NOT NULL,
+                    received_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (source, event_key)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_webhook_receipts_received_at ON webhook_receipts(received_at)"
+            )
+
+    def insert(self, source: str, event_key: str) -> bool:
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO webhook_receipts (source, event_key) VALUES (%s, %s) ON CONFLICT DO NOTHING",
+                (source, event_key)
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, source: str, event_key: str):
+        with self._pool.connection() as conn:
+            conn.execute(
+                "DELETE FROM webhook_receipts WHERE source = %s AND event_key = %s", (source, event_key)
+            )
+
+    def purge(self, before: float):
+        with self._pool.connection() as conn:
+            conn.execute("DELETE FROM webhook_receipts WHERE received_at < to_timestamp(%s)", (before,))
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class IdempotencyIndex:
+    """Time-bucketed memory window in front of a persistent unique index."""
+
+    def __init__(
+        self,
+        backend=None,
+        window_seconds: float = 86400,
+        retention_seconds: float = 7 * 86400
+    ):
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = window_seconds / WINDOW_BUCKETS
+
+        self._seen: Dict[Tuple[str, str], int] = {}  # (source, key) -> bucket number
+        self._buckets: Deque[Tuple[int, List[Tuple[str, str]]]] = deque()
+        self.stats = {"claimed": 0, "duplicates": 0, "backend_errors": 0}
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+
+    def _expire(self, current: int) -> bool:
+        """Drop buckets that left the window; True if any rotated out."""
+        rotated = False
+        while self._buckets and self._buckets[0][0] <= current - WINDOW_BUCKETS:
+            number, keys = self._buckets.popleft()
+            for key in keys:
+                if self._seen.get(key) == number:
+                    del self._seen[key]
+            rotated = True
+        return rotated
+
+    def _remember(self, key: Tuple[str, str], current: int):
+        if not self._buckets or self._buckets[-1][0] != current:
+            self._buckets.append((current, []))
+        self._buckets[-1][1].append(key)
+        self._seen[key] = current
+
+    async def claim(self, source: str, event_key: Optional[str]) -> bool:
+        """True if this is the first delivery of the event (process it), False for a duplicate."""
+        if not event_key:
+            return True  # Nothing to dedupe on
+        key = (source, event_key)
+        now = time.time()
+        current = self._bucket(now)
+        rotated = self._expire(current)
+
+        if key in self._seen:
+            return self._duplicate(source, event_key)
+        # Remember before awaiting the backend so concurrent retries can't both pass
+        self._remember(key, current)
+
+        if self.backend is not None:
+            try:
+                first = await asyncio.to_thread(self._claim_persistent, source, event_key, rotated, now)
+            except Exception as e:
+                self.stats["backend_errors"] += 1
+                logger.error(f"❌ Webhook receipt index unavailable ({e}), processing {source} event anyway")
+                first = True
+            if not first:
+                return self._duplicate(source, event_key)
+
+        self.stats["claimed"] += 1
+        return True
+
+    def _claim_persistent(self, source: str, event_key: str, purge: bool, now: float) -> bool:
+        if purge:
+            self.backend.purge(now - self.retention_seconds)
+        return self.backend.insert(source, event_key)
+
+    def _duplicate(self, source: str, event_key: str) -> bool:
+        self.stats["duplicates"] += 1
+        webhook_duplicates.inc(source=source)
+        logger.warning(f"⚠️ Duplicate {source} delivery dropped: {event_key}")
+        return False
+
+    async def release(self, source: str, event_key: Optional[str]):
+        """Forget a claim whose event was not accepted, so the provider's retry is processed."""
+        if not event_key:
+            return
+        self._seen.pop((source, event_key), None)
+        if self.backend is not None:
+            try:
+                await asyncio.to_thread(self.backend.delete, source, event_key)
+            except Exception as e:
+                logger.error(f"❌ Failed to release webhook receipt {source}:{event_key}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+# ============================================================================
+# Global index
+# ============================================================================
+
+_idempotency_index: Optional[IdempotencyIndex] = None
+_index_lock = threading.Lock()
+
+
+def _create_backend(url: str):
+    if url == "memory":
+        return None
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresReceiptBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteReceiptBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported WEBHOOK_DEDUPE_URL: {url}")
+
+
+def get_idempotency_index() -> IdempotencyIndex:
+    """Get or create the process-wide webhook idempotency index."""
+    global _idempotency_index
+    if _idempotency_index is None:
+        with _index_lock:
+            if _idempotency_index is None:
+                database_url = os.getenv("DATABASE_URL", "")
+                default_url = (
+                    database_url if database_url.startswith(("postgres://", "postgresql://"))
+                    else f"sqlite:///{DEFAULT_SQLITE_PATH}"
+                )
+                url = os.getenv("WEBHOOK_DEDUPE_URL", default_url)
+                try:
+                    backend = _create_backend(url)
+                except Exception as e:
+                    logger.error(f"❌ Webhook receipt backend unavailable ({e}), deduping in memory only")
+                    backend = None
+                _idempotency_index = IdempotencyIndex(
+                    backend=backend,
+                    window_seconds=float(os.getenv("WEBHOOK_DEDUPE_WINDOW_SECONDS", "86400")),
+                    retention_seconds=float(os.getenv("WEBHOOK_DEDUPE_RETENTION_HOURS", "168")) * 3600
+                )
+    return _idempotency_index
+
+
+async def get_idempotency_index_async() -> IdempotencyIndex:
+    """Get the webhook idempotency index without blocking the event loop while it builds.
+
+    Building it may open the Postgres pool and create the receipts table.
+    """
+    if _idempotency_index is not None:
+        return _idempotency_index
+    return await asyncio.to_thread(get_idempotency_index)
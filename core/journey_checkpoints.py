@@ -0,0 +1,308 @@
+"""
+Follow-Up Journey Checkpoints
+
+FollowUpAgent persists each lead's LangGraph journey under thread_id =
+lead_id. Every agent instance used to open its own sync psycopg pool
+(max 5) and run journeys with the sync graph.invoke from async request
+handlers, so checkpoint I/O blocked the web loop, and the hourly sweep
+advanced at most 10 leads, one at a time.
+
+This module owns the process-wide checkpointers:
+
+- Sync: one PostgresSaver on a shared ConnectionPool (get_journey_checkpointer)
+  for the remaining sync callers.
+- Async: one JourneyCheckpointer (AsyncPostgresSaver) on a shared
+  AsyncConnectionPool per event loop (aget_journey_checkpointer), used by
+  graph.ainvoke.
+- Memory: a single MemorySaver shared by both paths when no Postgres URL is
+  configured (or Postgres is unreachable), so sync and async journeys still
+  see each other's state.
+
+For sweeps over many journeys, JourneyCheckpointer groups database work:
+
+- Grouped reads: aprefetch(thread_ids) loads the latest checkpoint of every
+  lead in one query; the graph's own read of a prefetched thread is then
+  served from memory.
+- Grouped writes: inside grouped_writes(), checkpoint puts from concurrent
+  journeys are queued and committed together, one transaction per batch
+  (FOLLOWUP_CHECKPOINT_BATCH_SIZE, or whatever arrived within
+  FOLLOWUP_CHECKPOINT_FLUSH_MS). If a batch fails, its items are retried
+  one by one so a bad checkpoint only fails its own journey.
+
+Configuration (environment variables):
+- FOLLOWUP_CHECKPOINT_URL: "memory" or a postgresql:// URL (default: DATABASE_URL)
+- FOLLOWUP_CHECKPOINT_POOL_SIZE: max connections per pool (default 10)
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from langgraph.checkpoint.base import CheckpointTuple, get_checkpoint_id
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from core.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_MS = 10
+
+# Latest root-namespace checkpoint for each of many threads
+LATEST_CHECKPOINTS_WHERE = """
+WHERE checkpoint_ns = '' AND (thread_id, checkpoint_id) IN (
+    SELECT thread_id, max(checkpoint_id) FROM checkpoints
+    WHERE thread_id = ANY(%s) AND checkpoint_ns = ''
+    GROUP BY thread_id
+)"""
+
+checkpoint_batch_size = get_metrics_registry().histogram(
+    "journey_checkpoint_batch_size", "Checkpoint writes committed per transaction during sweeps",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+
+
+def checkpoint_url() -> str:
+    """Postgres URL for journey checkpoints, or "memory"."""
+    url = os.getenv("FOLLOWUP_CHECKPOINT_URL") or os.getenv("DATABASE_URL") or "memory"
+    return url if url.startswith(("postgres://", "postgresql://")) else "memory"
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    # What the LangGraph savers expect from their connections
+    from psycopg.rows import dict_row
+    return {"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row}
+
+
+def _pool_size() -> int:
+    return int(os.getenv("FOLLOWUP_CHECKPOINT_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+
+
+# ============================================================================
+# Async checkpointer with grouped reads/writes
+# ============================================================================
+
+class JourneyCheckpointer(AsyncPostgresSaver):
+    """AsyncPostgresSaver on a shared pool, with prefetch and group-committed writes."""
+
+    def __init__(self, pool, batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_MS / 1000):
+        super().__init__(pool)
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._prefetched: Dict[str, CheckpointTuple] = {}
+        self._grouping = 0
+        self._pending: List[Tuple[Any, tuple, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+
+    # ----- Grouped reads -----
+
+    async def aprefetch(self, thread_ids: Iterable[str]) -> Dict[str, CheckpointTuple]:
+        """Load the latest checkpoint of every thread in one query."""
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return {}
+        async with self._cursor() as cur:
+            await cur.execute(self.SELECT_SQL + LATEST_CHECKPOINTS_WHERE, (thread_ids,), binary=True)
+            rows = await cur.fetchall()
+
+        tuples = {}
+        for row in rows:
+            if row["checkpoint"]["v"] < 4 and row["parent_checkpoint_id"]:
+                continue  # Pre-v4 checkpoint: aget_tuple migrates its pending sends
+            tuples[row["thread_id"]] = await self._load_checkpoint_tuple(row)
+        self._prefetched.update(tuples)
+        return tuples
+
+    def discard_prefetched(self, thread_ids: Iterable[str]):
+        for thread_id in thread_ids:
+            self._prefetched.pop(thread_id, None)
+
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        if not get_checkpoint_id(config) and not configurable.get("checkpoint_ns"):
+            prefetched = self._prefetched.pop(configurable["thread_id"], None)
+            if prefetched is not None:
+                return prefetched
+        return await super().aget_tuple(config)
+
+    # ----- Grouped writes -----
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        if not self._grouping:
+            return await super().aput(config, checkpoint, metadata, new_versions)
+        return await self._enqueue(AsyncPostgresSaver.aput, (config, checkpoint, metadata, new_versions))
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        if not self._grouping:
+            return await super().aput_writes(config, writes, task_id, task_path)
+        return await self._enqueue(AsyncPostgresSaver.aput_writes, (config, writes, task_id, task_path))
+
+    async def _enqueue(self, method, args: tuple):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, args, future))
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Any, tuple, asyncio.Future]]):
+        try:
+            async with self.pool.connection() as conn:
+                # A connection-bound saver skips this saver's lock; one transaction for the batch
+                saver = AsyncPostgresSaver(conn, serde=self.serde)
+                async with conn.transaction():
+                    results = [await method(saver, *args) for method, args, _ in batch]
+        except Exception as e:
+            logger.warning(f"⚠️ Grouped checkpoint commit of {len(batch)} failed ({e}), retrying individually")
+            for method, args, future in batch:
+                try:
+                    result = await method(self, *args)
+                except Exception as item_error:
+                    if not future.done():
+                        future.set_exception(item_error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+
+        checkpoint_batch_size.observe(len(batch))
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def aflush(self):
+        """Commit queued writes now and wait for in-flight batches."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+
+@contextlib.asynccontextmanager
+async def grouped_writes(checkpointer) -> AsyncIterator[None]:
+    """Group-commit checkpoint writes made inside the block (no-op for MemorySaver)."""
+    if not isinstance(checkpointer, JourneyCheckpointer):
+        yield
+        return
+    checkpointer._grouping += 1
+    try:
+        yield
+    finally:
+        checkpointer._grouping -= 1
+        await checkpointer.aflush()
+
+
+async def load_journey_states(checkpointer, thread_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest journey state per thread: one query on Postgres, dict lookups in memory."""
+    thread_ids = list(thread_ids)
+    if isinstance(checkpointer, JourneyCheckpointer):
+        tuples = await checkpointer.aprefetch(thread_ids)
+    else:
+        tuples = {}
+        for thread_id in thread_ids:
+            checkpoint_tuple = await checkpointer.aget_tuple({"configurable": {"thread_id": thread_id}})
+            if checkpoint_tuple is not None:
+                tuples[thread_id] = checkpoint_tuple
+    return {
+        thread_id: checkpoint_tuple.checkpoint.get("channel_values") or {}
+        for thread_id, checkpoint_tuple in tuples.items()
+    }
+
+
+# ============================================================================
+# Process-wide checkpointers
+# ============================================================================
+
+_memory_saver: Optional[MemorySaver] = None
+_sync_checkpointer = None
+_sync_lock = threading.Lock()
+_memory_lock = threading.Lock()
+_async_entry: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = None
+
+
+def get_memory_saver() -> MemorySaver:
+    """In-memory fallback shared by the sync and async paths (state lost on restart)."""
+    global _memory_saver
+    if _memory_saver is None:
+        with _memory_lock:
+            if _memory_saver is None:
+                _memory_saver = MemorySaver()
+    return _memory_saver
+
+
+def get_journey_checkpointer():
+    """Get or create the sync checkpointer (blocking: opens the pool on first use)."""
+    global _sync_checkpointer
+    if _sync_checkpointer is None:
+        url = checkpoint_url()
+        if url == "memory":
+            logger.warning("⚠️ No DATABASE_URL set, using in-memory checkpointer (state lost on restart)")
+            return get_memory_saver()
+        with _sync_lock:
+            if _sync_checkpointer is None:
+                try:
+                    from langgraph.checkpoint.postgres import PostgresSaver
+                    from psycopg_pool import ConnectionPool
+
+                    pool = ConnectionPool(url, min_size=1, max_size=_pool_size(), timeout=5.0,
+                                          kwargs=_pool_kwargs(), open=False)
+                    pool.open()
+                    checkpointer = PostgresSaver(pool)
+                    checkpointer.setup()
+                    _sync_checkpointer = checkpointer
+                    logger.info("✅ Follow-up journeys: using PostgreSQL checkpointer")
+                except Exception as e:
+                    logger.warning(f"⚠️ PostgreSQL checkpointer failed, using in-memory: {e}")
+                    return get_memory_saver()
+    return _sync_checkpointer
+
+
+async def _create_async_checkpointer():
+    url = checkpoint_url()
+    if url == "memory":
+        return get_memory_saver()
+    try:
+        from psycopg_pool import AsyncConnectionPool
+
+        pool = AsyncConnectionPool(url, min_size=1, max_size=_pool_size(), timeout=5.0,
+                                   kwargs=_pool_kwargs(), open=False)
+        await pool.open()
+        checkpointer = JourneyCheckpointer(
+            pool,
+            batch_size=int(os.getenv("FOLLOWUP_CHECKPOINT_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))),
+            flush_interval=float(os.getenv("FOLLOWUP_CHECKPOINT_FLUSH_MS", str(DEFAULT_FLUSH_MS))) / 1000
+        )
+        await checkpointer.setup()
+        logger.info(f"✅ Follow-up journeys: using async PostgreSQL checkpointer (pool max {_pool_size()})")
+        return checkpointer
+    except Exception as e:
+        logger.warning(f"⚠️ Async PostgreSQL checkpointer failed, using in-memory: {e}")
+        return get_memory_saver()
+
+
+async def aget_journey_checkpointer():
+    """Get or create the async checkpointer for the running event loop."""
+    global _async_entry
+    loop = asyncio.get_running_loop()
+    if _async_entry is None or _async_entry[0] is not loop:
+        # No await between the check and the assignment: concurrent callers share one build
+        _async_entry = (loop, loop.create_task(_create_async_checkpointer()))
+    return await asyncio.shield(_async_entry[1])
@@ -0,0 +1,364 @@
+"""
+Columnar Lead Analytics
+
+Shared analytics over the `leads` table for StrategyAgent (pipeline analysis,
+outbound pattern mining), AuditAgent and the supabase_pipeline_analytics tool.
+
+Rows are loaded once (paginated - PostgREST caps a response at 1000 rows) and
+converted into a column-oriented LeadFrame with normalized
+columns: tier/source/industry fallbacks (`qualification_tier`/`tier`/
+`lead_tier`, ...) are resolved at load time, strings become categorical codes,
+timestamps become epoch floats. Group-bys, means, percentiles and time
+buckets are then NumPy reductions (bincount, nanpercentile, unique).
+
+LeadAnalytics caches the widest recently loaded window per Supabase project
+for LEAD_ANALYTICS_TTL_SECONDS (default 60, 0 disables); narrower windows
+are sliced from it instead of re-querying.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("SCORCHING", "HOT", "WARM", "COOL", "COLD", "UNQUALIFIED")
+PAGE_SIZE = 1000
+
+# Normalized column -> row fields tried in order
+FIELD_FALLBACKS = {
+    "tier": ("qualification_tier", "tier", "lead_tier"),
+    "source": ("source", "lead_source"),
+    "industry": ("industry", "company_industry"),
+    "score": ("qualification_score", "score"),
+}
+MEETING_FLAGS = ("meeting_booked", "appointment_scheduled", "demo_scheduled")
+METADATA_FLAGS = ("has_budget", "decision_maker", "pain_points")
+METADATA_CATEGORIES = ("company_size", "location")
+
+
+def _column(rows: List[Dict[str, Any]], fields: Sequence[str]) -> List[Any]:
+    """First truthy value among `fields` for every row (None if none is set)."""
+    values = [row.get(fields[0]) for row in rows]
+    for name in fields[1:]:
+        values = [value or row.get(name) for value, row in zip(values, rows)]
+    return values
+
+
+def _floats(values: List[Any]) -> np.ndarray:
+    """Numeric column; None and unparseable values become NaN."""
+    try:
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+    except (TypeError, ValueError):
+        result = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                result[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return result
+
+
+def _encode(values: List[Any]) -> Tuple[np.ndarray, List[str]]:
+    """Categorical codes (-1 = missing) and categories in order of first appearance."""
+    lookup: Dict[Any, int] = {}
+    codes = np.array([lookup.setdefault(value, len(lookup)) for value in values], dtype=np.int32)
+    seen = list(lookup)
+    kept = [code for code, value in enumerate(seen) if value is not None and value != ""]
+    if len(kept) < len(seen):
+        remap = np.full(len(seen), -1, dtype=np.int32)
+        remap[kept] = np.arange(len(kept), dtype=np.int32)
+        codes = remap[codes]
+    return codes, [str(seen[code]) for code in kept]
+
+
+def parse_timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """ISO-8601 strings -> epoch seconds (NaN for missing/invalid).
+
+    UTC strings ('Z' / '+00:00' / naive) are parsed in one vectorized call;
+    other offsets fall back to datetime.fromisoformat.
+    """
+    result = np.full(len(values), np.nan)
+    stripped = [
+        (value[:-6] if value.endswith("+00:00") else value[:-1] if value.endswith("Z") else value)
+        if value and isinstance(value, str) else None
+        for value in values
+    ]
+    # Anything still carrying an offset ("+02:00") takes the slow path
+    offsets = {
+        i for i, value in enumerate(stripped)
+        if value and value[-6:-5] in ("+", "-") and value[-3:-2] == ":"
+    }
+    utc_index = [i for i, value in enumerate(stripped) if value and i not in offsets]
+    other = sorted(offsets)
+
+    if utc_index:
+        try:
+            parsed = np.array([stripped[i] for i in utc_index], dtype="datetime64[us]")
+            result[utc_index] = parsed.astype("int64") / 1e6
+        except ValueError:
+            other.extend(utc_index)
+    for i in other:
+        try:
+            parsed = datetime.fromisoformat(str(values[i]).replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            result[i] = parsed.timestamp()
+        except ValueError:
+            pass
+    return result
+
+
+class LeadFrame:
+    """Column-oriented view of lead rows with vectorized aggregations."""
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        rows: List[Dict[str, Any]],
+        tech_rows: Optional[np.ndarray] = None,
+        tech_codes: Optional[np.ndarray] = None
+    ):
+        self.columns = columns
+        self.categories = categories
+        self.rows = rows
+        # Exploded metadata.tech_stack: (row index, tech code) pairs
+        self.tech_rows = tech_rows if tech_rows is not None else np.empty(0, dtype=np.int64)
+        self.tech_codes = tech_codes if tech_codes is not None else np.empty(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "LeadFrame":
+        """Normalize lead rows into columns (one list pass per column, converted once)."""
+        metadata = [row.get("metadata") for row in rows]
+        metadata = [value if isinstance(value, dict) else {} for value in metadata]
+        columns: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+
+        # Unknown tiers count as UNQUALIFIED
+        tier_codes = {tier: code for code, tier in enumerate(TIERS)}
+        unqualified = tier_codes["UNQUALIFIED"]
+        columns["tier"] = np.array([
+            tier_codes.get(str(value).upper(), unqualified) if value else unqualified
+            for value in _column(rows, FIELD_FALLBACKS["tier"])
+        ], dtype=np.int32)
+        categories["tier"] = list(TIERS)
+
+        statuses = [row.get("status") for row in rows]
+        encoded = {
+            "source": [value or "unknown" for value in _column(rows, FIELD_FALLBACKS["source"])],
+            "industry": [
+                value or meta.get("industry")
+                for value, meta in zip(_column(rows, FIELD_FALLBACKS["industry"]), metadata)
+            ],
+            "status": statuses,
+            **{name: [meta.get(name) for meta in metadata] for name in METADATA_CATEGORIES},
+        }
+        for name, values in encoded.items():
+            columns[name], categories[name] = _encode(values)
+
+        columns["score"] = _floats(_column(rows, FIELD_FALLBACKS["score"]))
+        for name in ("engagement_score", "business_fit_score"):
+            columns[name] = _floats([row.get(name) for row in rows])
+        columns["created_at"] = parse_timestamps([row.get("created_at") for row in rows])
+        columns["updated_at"] = parse_timestamps([row.get("updated_at") for row in rows])
+
+        columns["meeting_booked"] = np.array([
+            bool(value) or status == "meeting_scheduled"
+            for value, status in zip(_column(rows, MEETING_FLAGS), statuses)
+        ], dtype=bool)
+        columns["has_company"] = np.array([bool(row.get("company")) for row in rows], dtype=bool)
+        for name in METADATA_FLAGS:
+            columns[name] = np.array([bool(meta.get(name)) for meta in metadata], dtype=bool)
+
+        tech_rows, tech_values = [], []
+        for i, meta in enumerate(metadata):
+            tech_stack = meta.get("tech_stack")
+            if isinstance(tech_stack, list):
+                tech_rows.extend([i] * len(tech_stack))
+                tech_values.extend(tech_stack)
+        tech_codes, categories["tech_stack"] = _encode(tech_values)
+        keep = tech_codes >= 0
+        return cls(columns, categories, rows, np.asarray(tech_rows, dtype=np.int64)[keep], tech_codes[keep])
+
+    # ----- Selection -----
+
+    def filter(self, mask: np.ndarray) -> "LeadFrame":
+        """Rows where mask is True."""
+        index = np.flatnonzero(mask)
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[index] = np.arange(len(index))
+        keep = mask[self.tech_rows] if len(self.tech_rows) else np.zeros(0, dtype=bool)
+        return LeadFrame(
+            {name: values[index] for name, values in self.columns.items()},
+            self.categories,
+            [self.rows[i] for i in index],
+            remap[self.tech_rows[keep]],
+            self.tech_codes[keep]
+        )
+
+    def since(self, epoch: float) -> "LeadFrame":
+        """Leads created at or after `epoch` (seconds)."""
+        return self.filter(self.columns["created_at"] >= epoch)
+
+    def isin(self, column: str, values: Iterable[str]) -> np.ndarray:
+        """Boolean mask: categorical column value in `values`."""
+        lookup = {value: code for code, value in enumerate(self.categories[column])}
+        wanted = [lookup[v] for v in values if v in lookup]
+        return np.isin(self.columns[column], wanted)
+
+    # ----- Aggregations -----
+
+    def count_by(self, column: str, include: Sequence[str] = ()) -> Dict[str, int]:
+        """Value counts of a categorical column (missing values skipped).
+
+        `include` lists categories reported even when their count is zero.
+        """
+        if column == "tech_stack":
+            codes = self.tech_codes
+        else:
+            codes = self.columns[column]
+            codes = codes[codes >= 0]
+        categories = self.categories[column]
+        counts = np.bincount(codes, minlength=len(categories))
+        result = {value: 0 for value in include}
+        for code in np.flatnonzero(counts):
+            result[categories[code]] = int(counts[code])
+        return result
+
+    def top(self, column: str, k: int) -> List[Tuple[str, int]]:
+        """k most frequent values, ties broken by first appearance."""
+        counts = self.count_by(column)
+        return sorted(counts.items(), key=lambda kv: -kv[1])[:k]
+
+    def mean(self, column: str) -> float:
+        """Mean over non-missing values (0.0 when there are none)."""
+        values = self.columns[column]
+        present = values[~np.isnan(values)]
+        return float(present.mean()) if len(present) else 0.0
+
+    def percentiles(self, column: str, percentiles: Sequence[float] = (50, 95)) -> Dict[float, float]:
+        values = self.columns[column]
+        present = values[~np.isnan(values)]
+        if not len(present):
+            return {p: 0.0 for p in percentiles}
+        return dict(zip(percentiles, (float(v) for v in np.percentile(present, percentiles))))
+
+    def group_mean(self, by: str, column: str) -> Dict[str, float]:
+        """Mean of a numeric column per category of `by` (missing values skipped)."""
+        codes, values = self.columns[by], self.columns[column]
+        present = (codes >= 0) & ~np.isnan(values)
+        categories = self.categories[by]
+        sums = np.bincount(codes[present], weights=values[present], minlength=len(categories))
+        counts = np.bincount(codes[present], minlength=len(categories))
+        return {categories[c]: float(sums[c] / counts[c]) for c in np.flatnonzero(counts)}
+
+    def bucket_counts(self, freq: str = "day", column: str = "created_at") -> Dict[str, int]:
+        """Leads per UTC time bucket: freq is 'hour', 'day' or 'week' (ISO weeks, Monday labels)."""
+        values = self.columns[column]
+        present = values[~np.isnan(values)]
+        if freq == "hour":
+            buckets, width, fmt = np.floor(present / 3600), 3600, "%Y-%m-%dT%H:00"
+        elif freq == "day":
+            buckets, width, fmt = np.floor(present / 86400), 86400, "%Y-%m-%d"
+        elif freq == "week":
+            # 1970-01-01 was a Thursday: shift by 3 days so buckets start on Monday
+            buckets, width, fmt = np.floor((present / 86400 + 3) / 7), 7 * 86400, "%Y-%m-%d"
+        else:
+            raise ValueError(f"Unknown bucket frequency: {freq}")
+        offset = -3 * 86400 if freq == "week" else 0
+        unique, counts = np.unique(buckets, return_counts=True)
+        return {
+            datetime.fromtimestamp(bucket * width + offset, tz=timezone.utc).strftime(fmt): int(count)
+            for bucket, count in zip(unique, counts)
+        }
+
+
+def load_lead_rows(
+    supabase,
+    since: Optional[datetime] = None,
+    columns: str = "*",
+    page_size: int = PAGE_SIZE
+) -> List[Dict[str, Any]]:
+    """All `leads` rows created since `since` (UTC), fetched page by page.
+
+    Pages are ordered by created_at then id: Postgres returns rows with equal
+    created_at in no fixed order, so without the unique tiebreaker a batch
+    import straddling a page boundary can be skipped or counted twice.
+    """
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        query = supabase.table("leads").select(columns)
+        if since is not None:
+            query = query.gte("created_at", since.isoformat())
+        page = query.order("created_at").order("id").range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+class LeadAnalytics:
+    """Loads lead windows once and serves narrower windows from the cached frame."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else float(os.getenv("LEAD_ANALYTICS_TTL_SECONDS", "60"))
+        )
+        # project key -> (window start epoch, loaded at, frame)
+        self._cache: Dict[Any, Tuple[float, float, LeadFrame]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(supabase) -> Any:
+        return getattr(supabase, "supabase_url", None) or id(supabase)
+
+    async def window(self, supabase, days: Optional[float] = None, hours: Optional[float] = None) -> LeadFrame:
+        """Leads created in the last `days` / `hours`."""
+        span = timedelta(days=days or 0, hours=hours or 0)
+        since = datetime.utcnow() - span
+        since_epoch = since.replace(tzinfo=timezone.utc).timestamp()
+        key = self._key(supabase)
+
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            window_start, loaded_at, frame = cached
+            if time.monotonic() - loaded_at <= self.ttl_seconds and window_start <= since_epoch:
+                return frame.since(since_epoch)
+
+        started = time.perf_counter()
+        frame = await asyncio.to_thread(lambda: LeadFrame.from_rows(load_lead_rows(supabase, since)))
+        logger.info(f"📊 Loaded {len(frame)} leads ({span}) in {(time.perf_counter() - started) * 1000:.0f}ms")
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._cache[key] = (since_epoch, time.monotonic(), frame)
+        return frame
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_lead_analytics: Optional[LeadAnalytics] = None
+
+
+def get_lead_analytics() -> LeadAnalytics:
+    """Get or create the process-wide lead analytics cache."""
+    global _lead_analytics
+    if _lead_analytics is None:
+        _lead_analytics = LeadAnalytics()
+    return _lead_analytics
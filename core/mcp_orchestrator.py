@@ -13,10 +13,15 @@ Benefits:
 Phase 0.7 - October 19, 2025
 """
 
+import json
 import logging
+import math
 import os
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+import re
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
 import dspy
 
 logger = logging.getLogger(__name__)
@@ -62,6 +67,152 @@ class MCPServerConfig:
     cost: str  # "FREE", "MEDIUM", "HIGH"
     performance: str  # "Fast", "Medium", "Slow"
     is_internal: bool = False  # Internal tools (always available)
+    keywords: List[str] = field(default_factory=list)  # Extra routing hints for the heuristic tier
+
+
+@dataclass
+class ServerSelection:
+    """Result of routing a task to MCP servers."""
+    servers: List[str]
+    source: str  # "cache", "heuristic", "llm", "fallback"
+    confidence: float
+    reasoning: str = ""
+    latency_ms: float = 0.0
+
+
+# ===== Heuristic Server Classifier =====
+
+_STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "can", "do", "for",
+    "from", "get", "how", "i", "in", "is", "it", "me", "my", "need", "of", "on",
+    "or", "our", "please", "should", "the", "their", "them", "this", "to", "up",
+    "us", "use", "was", "we", "what", "when", "which", "who", "why", "with",
+    "you", "your", "already", "data", "operations", "ops", "tools",
+}
+
+
+def _stem(token: str) -> str:
+    """Very small suffix stripper so 'scraping'/'scrape'/'scrapes' collide."""
+    if len(token) <= 4:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    for suffix in ("ing", "ers", "es", "ed", "er", "s", "e"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: -len(suffix)]
+    return token
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, stem."""
+    return [
+        _stem(t) for t in re.findall(r"[a-z0-9]+", text.lower())
+        if t not in _STOPWORDS and len(t) > 1
+    ]
+
+
+def normalize_task(task: str) -> str:
+    """Normalize a task string for cache keys (case, punctuation, whitespace)."""
+    return " ".join(re.findall(r"[a-z0-9]+", task.lower()))
+
+
+class HeuristicServerClassifier:
+    """Keyword classifier over MCPServerConfig.when_to_use text.
+
+    Each server gets an IDF-weighted keyword profile built from its
+    description, when_to_use and keywords (positive) and when_not_to_use
+    (negative). A task is scored against every profile; servers scoring above
+    `select_threshold` are selected, below `reject_threshold` are rejected,
+    and anything in between makes the decision ambiguous (LLM tier).
+    """
+
+    NEGATIVE_WEIGHT = 0.5
+
+    def __init__(
+        self,
+        servers: Dict[str, MCPServerConfig],
+        select_threshold: float = 1.2,
+        reject_threshold: float = 0.5
+    ):
+        self.select_threshold = select_threshold
+        self.reject_threshold = reject_threshold
+        self.positive: Dict[str, Dict[str, float]] = {}
+        self.negative: Dict[str, Dict[str, float]] = {}
+        self._build(servers)
+
+    def _build(self, servers: Dict[str, MCPServerConfig]):
+        """Build IDF-weighted keyword profiles for every server."""
+        positive_terms: Dict[str, Set[str]] = {}
+        for name, config in servers.items():
+            text = " ".join([config.description, config.when_to_use, " ".join(config.keywords)])
+            positive_terms[name] = set(_tokenize(text))
+
+        # Document frequency across servers: shared words discriminate less
+        df: Dict[str, int] = {}
+        for terms in positive_terms.values():
+            for term in terms:
+                df[term] = df.get(term, 0) + 1
+
+        n = len(servers)
+        for name, config in servers.items():
+            self.positive[name] = {
+                term: math.log(n / df[term]) for term in positive_terms[name]
+            }
+            self.negative[name] = {
+                term: math.log(n / df.get(term, 1)) * self.NEGATIVE_WEIGHT
+                for term in set(_tokenize(config.when_not_to_use))
+                if term not in positive_terms[name]
+            }
+
+    def score(self, task: str) -> Dict[str, float]:
+        """Score a task against every server profile."""
+        tokens = set(_tokenize(task))
+        return {
+            name: (
+                sum(weight for term, weight in profile.items() if term in tokens)
+                - sum(weight for term, weight in self.negative[name].items() if term in tokens)
+            )
+            for name, profile in self.positive.items()
+        }
+
+    def classify(
+        self,
+        task: str,
+        servers: Dict[str, MCPServerConfig]
+    ) -> Tuple[Optional[List[str]], float, Dict[str, float]]:
+        """Classify a task.
+
+        Returns:
+            (selected servers or None if ambiguous, confidence 0-1, raw scores)
+        """
+        scores = self.score(task)
+        external = {n: s for n, s in scores.items() if not servers[n].is_internal}
+        internal_score = max(
+            (s for n, s in scores.items() if servers[n].is_internal), default=0.0
+        )
+
+        selected = [n for n, s in external.items() if s >= self.select_threshold]
+        uncertain = [
+            n for n, s in external.items()
+            if self.reject_threshold < s < self.select_threshold
+        ]
+
+        if uncertain:
+            return None, 0.0, scores
+
+        if not selected and internal_score < self.select_threshold:
+            # No evidence either way - let the LLM decide
+            return None, 0.0, scores
+
+        # Confidence = how far the weakest decision sits from the ambiguous band
+        margins = [external[n] - self.select_threshold for n in selected]
+        margins += [self.reject_threshold - s for n, s in external.items() if n not in selected]
+        if not selected:
+            margins.append(internal_score - self.select_threshold)
+        confidence = min(1.0, 0.5 + min(margins) / (2 * self.select_threshold))
+
+        selected.sort(key=lambda n: external[n], reverse=True)
+        return selected, round(confidence, 3), scores
 
 
 # ===== MCP Orchestrator =====
@@ -80,8 +231,13 @@ class MCPOrchestrator:
     context windows lean (15-25 tools vs 300+).
     """
     
-    def __init__(self):
-        """Initialize orchestrator with trusted servers list."""
+    def __init__(self, cache_size: int = 512, use_heuristics: bool = True):
+        """Initialize orchestrator with trusted servers list.
+        
+        Args:
+            cache_size: Max routing decisions cached per normalized task
+            use_heuristics: Answer confident cases locally before calling the LLM
+        """
         self.trusted_servers: Dict[str, MCPServerConfig] = {}
         self.active_servers: Set[str] = set()  # Currently loaded servers
         self.server_selector = dspy.ChainOfThought(AnalyzeTaskForServers)
@@ -89,6 +245,13 @@ class MCPOrchestrator:
         # Load trusted servers from config
         self._load_trusted_servers()
         
+        # Tiered routing: cache → keyword classifier → LLM
+        self.use_heuristics = use_heuristics
+        self.classifier = HeuristicServerClassifier(self.trusted_servers)
+        self.cache_size = cache_size
+        self._decision_cache: "OrderedDict[str, ServerSelection]" = OrderedDict()
+        self.routing_stats = {"cache": 0, "heuristic": 0, "llm": 0, "fallback": 0}
+        
         logger.info("✅ MCP Orchestrator initialized")
         logger.info(f"   Trusted servers: {len(self.trusted_servers)}")
     
@@ -110,7 +273,9 @@ class MCPOrchestrator:
                 when_to_use="Creating/updating CRM leads, sending emails, calendar ops, workflow automation",
                 when_not_to_use="Read-only operations, simple queries, research, testing",
                 cost="HIGH",
-                performance="Medium"
+                performance="Medium",
+                keywords=["close", "gmail", "google drive", "docs", "sheets", "spreadsheet",
+                          "meeting", "schedule", "sequence", "sync"]
             ),
             "perplexity": MCPServerConfig(
                 name="perplexity",
@@ -118,7 +283,8 @@ class MCPOrchestrator:
                 when_to_use="Researching companies, finding decision-makers, recent news, competitive intelligence",
                 when_not_to_use="Data already in database, historical analysis, structured data",
                 cost="MEDIUM",
-                performance="Fast"
+                performance="Fast",
+                keywords=["competitor", "funding", "acquisition", "market", "trends", "investigate"]
             ),
             "apify": MCPServerConfig(
                 name="apify",
@@ -126,7 +292,8 @@ class MCPOrchestrator:
                 when_to_use="Scraping multiple websites, building lead lists, monitoring competitors at scale",
                 when_not_to_use="Single page lookups, data available via API, real-time research",
                 cost="HIGH",
-                performance="Slow"
+                performance="Slow",
+                keywords=["crawl", "extract", "websites", "urls"]
             ),
             # Internal tools (always available, no MCP server needed)
             "internal": MCPServerConfig(
@@ -136,7 +303,8 @@ class MCPOrchestrator:
                 when_not_to_use="External data needed, CRM updates, web research",
                 cost="FREE",
                 performance="Fast",
-                is_internal=True
+                is_internal=True,
+                keywords=["supabase", "pipeline", "stats", "metrics", "tier", "conversion", "qualified"]
             )
         }
         
@@ -149,8 +317,10 @@ class MCPOrchestrator:
     ) -> List[str]:
         """Analyze task and select relevant MCP servers to load.
         
-        This is the core agentic selection logic - use LLM intelligence
-        to choose the right tools for the job.
+        Tiered selection (cheapest first):
+        1. Decision cache keyed by normalized task and context
+        2. Keyword classifier over each server's when_to_use text
+        3. LLM (ChainOfThought) only when the classifier is ambiguous
         
         Args:
             task: User's task description
@@ -159,6 +329,88 @@ class MCPOrchestrator:
         Returns:
             List of server names to activate (e.g., ["perplexity", "zapier"])
         """
+        selection = await self.route_task(task, context)
+        return selection.servers
+    
+    async def route_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> ServerSelection:
+        """Route a task and return the full selection (servers, source, confidence).
+        
+        Args:
+            task: User's task description
+            context: Additional context (user type, recent activity, etc.)
+        
+        Returns:
+            ServerSelection describing which tier answered
+        """
+        start = time.perf_counter()
+        cache_key = self._cache_key(task, context)
+        
+        cached = self._decision_cache.get(cache_key)
+        if cached is not None:
+            self._decision_cache.move_to_end(cache_key)
+            self.routing_stats["cache"] += 1
+            logger.debug(f"🎯 Server selection cache hit: {cached.servers}")
+            return ServerSelection(
+                servers=list(cached.servers),
+                source="cache",
+                confidence=cached.confidence,
+                reasoning=cached.reasoning,
+                latency_ms=(time.perf_counter() - start) * 1000
+            )
+        
+        heuristic_servers: Optional[List[str]] = None
+        scores: Dict[str, float] = {}
+        if self.use_heuristics:
+            heuristic_servers, confidence, scores = self.classifier.classify(task, self.trusted_servers)
+            if heuristic_servers is not None:
+                selection = ServerSelection(
+                    servers=heuristic_servers,
+                    source="heuristic",
+                    confidence=confidence,
+                    reasoning=f"Keyword match scores: {self._format_scores(scores)}"
+                )
+                logger.info(f"🎯 Task analysis (heuristic): {heuristic_servers or 'internal only'}")
+                return self._remember(cache_key, selection, start)
+        
+        servers, reasoning = await self._select_with_llm(task, context)
+        if servers is not None:
+            selection = ServerSelection(
+                servers=servers,
+                source="llm",
+                confidence=1.0,
+                reasoning=reasoning
+            )
+            return self._remember(cache_key, selection, start)
+        
+        # LLM failed: use the best-effort keyword guess (not cached)
+        fallback = [
+            n for n, s in scores.items()
+            if s >= self.classifier.select_threshold and not self.trusted_servers[n].is_internal
+        ]
+        self.routing_stats["fallback"] += 1
+        logger.warning(f"   Falling back to keyword selection: {fallback or 'internal tools only'}")
+        return ServerSelection(
+            servers=fallback,
+            source="fallback",
+            confidence=0.0,
+            reasoning="LLM selection failed",
+            latency_ms=(time.perf_counter() - start) * 1000
+        )
+    
+    async def _select_with_llm(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[List[str]], str]:
+        """Ask the LLM to select servers (ambiguous tasks only).
+        
+        Returns:
+            (valid server names, reasoning), or (None, error) if the call failed
+        """
         # Build trusted servers description for the LLM
         servers_desc = self._format_servers_for_llm()
         
@@ -178,7 +430,7 @@ class MCPOrchestrator:
             
             if selected == "none" or not selected:
                 logger.info("🎯 Task analysis: No external servers needed (internal tools sufficient)")
-                return []
+                return [], result.reasoning
             
             # Parse comma-separated list
             servers = [s.strip() for s in selected.split(",") if s.strip()]
@@ -193,12 +445,50 @@ class MCPOrchestrator:
             logger.info(f"   Servers: {', '.join(valid_servers)}")
             logger.info(f"   Reasoning: {result.reasoning}")
             
-            return valid_servers
+            return valid_servers, result.reasoning
         
         except Exception as e:
             logger.error(f"❌ Server selection failed: {e}")
-            logger.warning("   Falling back to NO external servers (internal tools only)")
-            return []
+            return None, str(e)
+    
+    def _remember(self, cache_key: str, selection: ServerSelection, start: float) -> ServerSelection:
+        """Record stats, cache the decision (LRU) and stamp latency."""
+        self.routing_stats[selection.source] += 1
+        selection.latency_ms = (time.perf_counter() - start) * 1000
+        
+        # Cache a copy: callers may mutate the selection they get back
+        self._decision_cache[cache_key] = replace(selection, servers=list(selection.servers))
+        self._decision_cache.move_to_end(cache_key)
+        while len(self._decision_cache) > self.cache_size:
+            self._decision_cache.popitem(last=False)
+        
+        return selection
+    
+    @staticmethod
+    def _cache_key(task: str, context: Optional[Dict[str, Any]]) -> str:
+        """Normalized task plus context (the LLM tier routes on both)."""
+        key = normalize_task(task)
+        if context:
+            key += "|" + json.dumps(context, sort_keys=True, default=str)
+        return key
+    
+    def _format_scores(self, scores: Dict[str, float]) -> str:
+        """Format classifier scores for logging/reasoning."""
+        return ", ".join(f"{n}={s:.2f}" for n, s in sorted(scores.items(), key=lambda x: -x[1]))
+    
+    def clear_routing_cache(self):
+        """Clear cached routing decisions (e.g. after changing server configs)."""
+        self._decision_cache.clear()
+    
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """Get routing tier statistics (how often each tier answered)."""
+        total = sum(self.routing_stats.values())
+        return {
+            **self.routing_stats,
+            "total": total,
+            "llm_rate": round(self.routing_stats["llm"] / total, 3) if total else 0.0,
+            "cache_size": len(self._decision_cache)
+        }
     
     def _format_servers_for_llm(self) -> str:
         """Format trusted servers as readable text for LLM."""
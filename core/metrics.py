@@ -0,0 +1,665 @@
+"""
+Metrics
+
+One metrics layer for every agent call, replacing scattered time.time() log
+lines and hardcoded cost constants:
+
+- Per-agent operation latency + errors     agent_call() / instrument_agent_call()
+- Per-signature DSPy module latency        MetricsCallback (global DSPy callback)
+- LM latency, real token counts and cost   MetricsCallback (read from the LM response)
+- ReAct tool latency                       MetricsCallback
+- Queue depths                             register_queue(), sampled at scrape time
+- Error counters                           record_error()
+- Recent agent-call spans                  recent_spans() (PerformanceAgent input)
+
+Exposed as Prometheus text on /metrics (api/main.py) and mirrored into
+OpenTelemetry when an OTLP metrics endpoint is configured
+(core/observability.setup_metrics_export).
+
+No dependency on prometheus_client: the registry renders the text format
+itself and notifies listeners (the OTel bridge) on every update.
+"""
+
+import contextvars
+import functools
+import inspect
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # tracing is optional; metrics still work
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+# LLM calls routinely take 1-30s; the low buckets cover tools and DB calls
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+# ============================================================================
+# Metric types
+# ============================================================================
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], registry: "MetricsRegistry"):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        unknown = set(labels) - set(self.labelnames)
+        if unknown:
+            raise ValueError(f"{self.name}: unknown labels {sorted(unknown)}")
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._notify(self, amount, labels)
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name + "_total", dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """Point-in-time value; can also be computed at scrape time via callbacks."""
+    kind = "gauge"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+        self._callbacks: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+        self._registry._notify(self, float(value), labels)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            value = self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._notify(self, value, labels)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """Sample `fn()` at scrape time (replaces any stored value)."""
+        key = self._key(labels)
+        with self._lock:
+            self._callbacks[key] = fn
+            self._values.pop(key, None)
+
+    def get(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            fn = self._callbacks.get(key)
+            if fn is None:
+                return self._values.get(key, 0.0)
+        return _sample(fn, self.name)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+            callbacks = list(self._callbacks.items())
+        items += [(key, _sample(fn, self.name)) for key, fn in callbacks]
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (Prometheus cumulative buckets + sum + count)."""
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+        self._registry._notify(self, value, labels)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), []))
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Approximate quantile (upper bucket bound), None if nothing observed."""
+        with self._lock:
+            counts = list(self._counts.get(self._key(labels), []))
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        running = 0
+        for i, n in enumerate(counts):
+            running += n
+            if running >= rank:
+                return self.buckets[i] if i < len(self.buckets) else math.inf
+        return math.inf
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            running = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                running += n
+                samples.append((self.name + "_bucket", {**labels, "le": _format_value(bound)}, running))
+            samples.append((self.name + "_sum", labels, total))
+            samples.append((self.name + "_count", labels, running))
+        return samples
+
+
+def _sample(fn: Callable[[], float], name: str) -> float:
+    try:
+        return float(fn())
+    except Exception as e:
+        logger.debug(f"Metric {name}: gauge callback failed: {e}")
+        return math.nan
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+class MetricsRegistry:
+    """Holds metrics, renders Prometheus text, and fans updates out to listeners."""
+
+    def __init__(self, namespace: str = "hume"):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._listeners: List[Callable[[_Metric, float, Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames, **kwargs) -> Any:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = cls(full_name, help_text, tuple(labelnames), self, **kwargs)
+                self._metrics[full_name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {full_name} already registered with a different type/labels")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def add_listener(self, listener: Callable[[_Metric, float, Dict[str, Any]], None]):
+        """Call `listener(metric, value, labels)` on every update (e.g. OTel bridge)."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, metric: _Metric, value: float, labels: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                listener(metric, value, labels)
+            except Exception as e:
+                logger.debug(f"Metrics listener failed for {metric.name}: {e}")
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                label_str = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                lines.append(f"{sample_name}{{{label_str}}} {_format_value(value)}" if label_str
+                             else f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the standard metrics every module records into
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global MetricsRegistry."""
+    return _metrics_registry
+
+
+agent_call_seconds = _metrics_registry.histogram(
+    "agent_call_seconds", "Agent operation latency", ("agent", "operation", "status"))
+module_call_seconds = _metrics_registry.histogram(
+    "dspy_module_seconds", "DSPy module latency per signature", ("agent", "module", "signature", "status"))
+lm_call_seconds = _metrics_registry.histogram(
+    "lm_call_seconds", "LM request latency", ("agent", "model", "status"))
+lm_tokens = _metrics_registry.counter(
+    "lm_tokens", "LM tokens reported by the provider", ("agent", "model", "type"))
+lm_cost_usd = _metrics_registry.counter(
+    "lm_cost_usd", "LM cost in USD reported by the provider", ("agent", "model"))
+tool_call_seconds = _metrics_registry.histogram(
+    "tool_call_seconds", "Tool call latency", ("agent", "tool", "status"))
+queue_depth = _metrics_registry.gauge(
+    "queue_depth", "Items waiting or in flight", ("queue",))
+errors = _metrics_registry.counter(
+    "errors", "Errors by component and exception type", ("component", "error"))
+
+
+def record_error(component: str, error: BaseException):
+    errors.inc(component=component, error=type(error).__name__)
+
+
+def register_queue(name: str, depth_fn: Callable[[], float]):
+    """Expose a queue's depth, sampled from `depth_fn()` at scrape time."""
+    queue_depth.set_function(depth_fn, queue=name)
+
+
+def queued(queue: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Callable[[], Awaitable[Any]]:
+    """Count `fn(*args, **kwargs)` in queue_depth{queue} from now until it finishes.
+
+    Returns a no-argument async callable for BackgroundTasks.add_task or
+    asyncio.create_task(queued(...)()).
+    """
+    queue_depth.inc(queue=queue)
+
+    async def run():
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            queue_depth.dec(queue=queue)
+
+    return run
+
+
+# ============================================================================
+# Agent calls + usage scopes
+# ============================================================================
+
+@dataclass
+class UsageScope:
+    """LM usage accumulated while a scope is active (see track_usage)."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    lm_calls: int = 0
+    models: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+_current_agent: contextvars.ContextVar[str] = contextvars.ContextVar("metrics_current_agent", default="")
+_usage_scopes: contextvars.ContextVar[Tuple[UsageScope, ...]] = contextvars.ContextVar("metrics_usage_scopes", default=())
+
+
+def current_agent() -> str:
+    return _current_agent.get()
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageScope]:
+    """Collect LM usage (tokens, cost) from every LM call made inside the block.
+
+    Context-local, so it follows asyncio tasks and asyncio.to_thread workers.
+    """
+    scope = UsageScope()
+    token = _usage_scopes.set(_usage_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _usage_scopes.reset(token)
+
+
+@dataclass
+class SpanRecord:
+    """One finished agent_call, kept in memory for numeric performance analysis."""
+    agent: str
+    operation: str
+    status: str
+    started_at: float  # epoch seconds
+    duration_s: float
+    lm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    error: Optional[str] = None
+
+
+# Bounded: ~10k calls covers several 30-minute PerformanceAgent windows
+_span_log: deque = deque(maxlen=int(os.getenv("METRICS_SPAN_LOG_SIZE", "10000")))
+
+
+def recent_spans(since: Optional[float] = None, agent: Optional[str] = None) -> List[SpanRecord]:
+    """Agent-call spans recorded in this process, oldest first.
+
+    Args:
+        since: Only spans started at/after this epoch time
+        agent: Only spans for this agent
+    """
+    spans = list(_span_log)
+    if since is not None:
+        spans = [s for s in spans if s.started_at >= since]
+    if agent is not None:
+        spans = [s for s in spans if s.agent == agent]
+    return spans
+
+
+class AgentCall:
+    """Handle yielded by agent_call()."""
+
+    def __init__(self, usage: UsageScope):
+        self.usage = usage
+        self.status = "ok"
+        self.error: Optional[BaseException] = None
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def fail(self, error: Optional[BaseException] = None):
+        """Mark the call failed when the code handles the exception itself."""
+        self.status = "error"
+        self.error = error
+
+
+@contextmanager
+def agent_call(agent: str, operation: str) -> Iterator[AgentCall]:
+    """Time an agent operation and attribute nested LM/module/tool metrics to it.
+
+    Also opens an OpenTelemetry span, so with Phoenix tracing enabled the
+    operation's LM calls are grouped under it with token/cost totals.
+
+    Example:
+        with agent_call("StrategyAgent", "respond") as call:
+            ...
+            logger.info(f"⚡ {call.elapsed:.2f}s | ${call.usage.cost:.4f}")
+    """
+    agent_token = _current_agent.set(agent)
+    span_context = (
+        otel_trace.get_tracer(__name__).start_as_current_span(f"{agent}.{operation}")
+        if otel_trace else nullcontext()
+    )
+    with span_context as span, track_usage() as usage:
+        call = AgentCall(usage)
+        try:
+            yield call
+        except BaseException as e:
+            call.fail(e)
+            raise
+        finally:
+            _current_agent.reset(agent_token)
+            elapsed = call.elapsed
+            agent_call_seconds.observe(elapsed, agent=agent, operation=operation, status=call.status)
+            _span_log.append(SpanRecord(
+                agent=agent,
+                operation=operation,
+                status=call.status,
+                started_at=time.time() - elapsed,
+                duration_s=elapsed,
+                lm_calls=usage.lm_calls,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cost=usage.cost,
+                error=type(call.error).__name__ if call.error else None
+            ))
+            if call.status != "ok":
+                errors.inc(component=agent, error=type(call.error).__name__ if call.error else "Error")
+            if span is not None:
+                span.set_attribute("agent.name", agent)
+                span.set_attribute("agent.operation", operation)
+                span.set_attribute("agent.status", call.status)
+                span.set_attribute("agent.lm_calls", usage.lm_calls)
+                span.set_attribute("agent.tokens.prompt", usage.prompt_tokens)
+                span.set_attribute("agent.tokens.completion", usage.completion_tokens)
+                span.set_attribute("agent.cost_usd", usage.cost)
+
+
+def instrument_agent_call(operation: str):
+    """Decorator form of agent_call for agent methods (sync or async).
+
+    The agent label is `self.agent_name`, falling back to the class name.
+    """
+    def decorator(func):
+        def _agent_name(self) -> str:
+            return getattr(self, "agent_name", None) or type(self).__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                with agent_call(_agent_name(self), operation):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with agent_call(_agent_name(self), operation):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# DSPy callback
+# ============================================================================
+
+# instructions -> class name of user-defined signatures (see _signature_name)
+_signature_names: Dict[str, str] = {}
+_signature_classes_seen = 0
+
+
+def _named_signature(instructions: str) -> Optional[str]:
+    """Name of the dspy.Signature class with these instructions, if any.
+
+    ChainOfThought/ReAct rebuild class signatures as anonymous StringSignatures
+    (extra reasoning fields), but keep the instructions.
+    """
+    global _signature_classes_seen
+    if instructions not in _signature_names:
+        import dspy
+
+        classes = dspy.Signature.__subclasses__()
+        if len(classes) != _signature_classes_seen:
+            _signature_classes_seen = len(classes)
+            for cls in classes:
+                if cls.__name__ != "StringSignature":
+                    _signature_names.setdefault(cls.instructions, cls.__name__)
+    return _signature_names.get(instructions)
+
+
+def _signature_name(instance: Any) -> str:
+    signature = getattr(instance, "signature", None)
+    if signature is None and hasattr(instance, "predict"):
+        signature = getattr(instance.predict, "signature", None)
+    if signature is None:
+        return ""
+    name = getattr(signature, "__name__", "")
+    if name and name != "StringSignature":
+        return name
+    return _named_signature(getattr(signature, "instructions", "")) or getattr(signature, "signature", name)
+
+
+def _find_history_entry(lm: Any, outputs: Any) -> Optional[Dict[str, Any]]:
+    """The history entry for this call (matched by identity; other threads may append)."""
+    history = getattr(lm, "history", None) or []
+    for entry in reversed(history[-20:]):
+        if entry.get("outputs") is outputs:
+            return entry
+    return None
+
+
+def _make_callback_class():
+    from dspy.utils.callback import BaseCallback
+
+    class MetricsCallback(BaseCallback):
+        """Records module, LM and tool metrics for every DSPy call."""
+
+        def __init__(self):
+            self._calls: Dict[str, Tuple[float, Any, str]] = {}
+
+        def _start(self, call_id: str, instance: Any):
+            self._calls[call_id] = (time.perf_counter(), instance, current_agent())
+
+        def _finish(self, call_id: str) -> Optional[Tuple[float, Any, str]]:
+            started = self._calls.pop(call_id, None)
+            if started is None:
+                return None
+            return time.perf_counter() - started[0], started[1], started[2]
+
+        def on_module_start(self, call_id, instance, inputs):
+            self._start(call_id, instance)
+
+        def on_module_end(self, call_id, outputs, exception=None):
+            finished = self._finish(call_id)
+            if finished is None:
+                return
+            elapsed, instance, agent = finished
+            module_call_seconds.observe(
+                elapsed,
+                agent=agent,
+                module=type(instance).__name__,
+                signature=_signature_name(instance),
+                status="error" if exception else "ok"
+            )
+
+        def on_lm_start(self, call_id, instance, inputs):
+            self._start(call_id, instance)
+
+        def on_lm_end(self, call_id, outputs, exception=None):
+            finished = self._finish(call_id)
+            if finished is None:
+                return
+            elapsed, lm, agent = finished
+            model = getattr(lm, "model", type(lm).__name__)
+            lm_call_seconds.observe(elapsed, agent=agent, model=model, status="error" if exception else "ok")
+            if exception:
+                record_error("lm", exception)
+                return
+
+            entry = _find_history_entry(lm, outputs)
+            if entry is None:
+                return
+            usage = entry.get("usage") or {}
+            prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            completion_tokens = int(usage.get("completion_tokens") or 0)
+            cost = entry.get("cost") or 0.0
+            if prompt_tokens:
+                lm_tokens.inc(prompt_tokens, agent=agent, model=model, type="prompt")
+            if completion_tokens:
+                lm_tokens.inc(completion_tokens, agent=agent, model=model, type="completion")
+            if cost:
+                lm_cost_usd.inc(cost, agent=agent, model=model)
+
+            for scope in _usage_scopes.get():
+                scope.prompt_tokens += prompt_tokens
+                scope.completion_tokens += completion_tokens
+                scope.cost += cost
+                scope.lm_calls += 1
+                scope.models[model] = scope.models.get(model, 0) + 1
+
+        def on_tool_start(self, call_id, instance, inputs):
+            self._start(call_id, instance)
+
+        def on_tool_end(self, call_id, outputs, exception=None):
+            finished = self._finish(call_id)
+            if finished is None:
+                return
+            elapsed, tool, agent = finished
+            name = getattr(tool, "name", None) or type(tool).__name__
+            tool_call_seconds.observe(elapsed, agent=agent, tool=name, status="error" if exception else "ok")
+            if exception:
+                record_error("tool", exception)
+
+    return MetricsCallback
+
+
+_dspy_callback = None
+_dspy_callback_lock = threading.Lock()
+
+
+def install_dspy_metrics():
+    """Register the metrics callback globally in DSPy (idempotent).
+
+    Must run on the thread that configures DSPy (api.main does it alongside
+    dspy.configure).
+    """
+    global _dspy_callback
+    import dspy
+
+    with _dspy_callback_lock:
+        if _dspy_callback is None:
+            _dspy_callback = _make_callback_class()()
+        callbacks = list(dspy.settings.get("callbacks") or [])
+        if _dspy_callback not in callbacks:
+            dspy.configure(callbacks=callbacks + [_dspy_callback])
+            logger.info("✅ DSPy metrics callback installed")
+    return _dspy_callback
@@ -12,10 +12,14 @@ Phoenix provides:
 Environment Variables Required:
 - PHOENIX_API_KEY: Your Phoenix API key (from Settings)
 - PHOENIX_PROJECT_NAME: Project name (default: "hume-dspy-agent")
+
+Metrics (core/metrics.py) are always served on /metrics; set
+OTEL_EXPORTER_OTLP_METRICS_ENDPOINT to also push them over OTLP.
 """
 
 import os
 import logging
+import threading
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -123,3 +127,93 @@ def setup_observability():
     if tracer_provider is None:
         tracer_provider = initialize_phoenix_tracing()
     return tracer_provider
+
+
+# ============================================================================
+# METRICS EXPORT (core/metrics.py -> OpenTelemetry)
+# ============================================================================
+
+class OTelMetricsBridge:
+    """Mirrors core.metrics updates into OpenTelemetry instruments."""
+
+    def __init__(self, meter):
+        self.meter = meter
+        self._instruments = {}
+        self._gauge_values = {}
+        self._lock = threading.Lock()
+
+    def _instrument(self, metric):
+        with self._lock:
+            instrument = self._instruments.get(metric.name)
+            if instrument is not None:
+                return instrument
+            if metric.kind == "counter":
+                instrument = self.meter.create_counter(metric.name, description=metric.help)
+            elif metric.kind == "histogram":
+                instrument = self.meter.create_histogram(metric.name, unit="s", description=metric.help)
+            else:
+                # Gauges go up and down; recorded as deltas from the last value
+                instrument = self.meter.create_up_down_counter(metric.name, description=metric.help)
+            self._instruments[metric.name] = instrument
+        return instrument
+
+    def __call__(self, metric, value, labels):
+        attributes = {k: str(v) for k, v in labels.items()}
+        instrument = self._instrument(metric)
+        if metric.kind == "histogram":
+            instrument.record(value, attributes=attributes)
+        elif metric.kind == "counter":
+            instrument.add(value, attributes=attributes)
+        else:
+            key = (metric.name, tuple(sorted(attributes.items())))
+            with self._lock:
+                previous = self._gauge_values.get(key, 0.0)
+                self._gauge_values[key] = value
+            instrument.add(value - previous, attributes=attributes)
+
+
+meter_provider = None
+
+
+def setup_metrics_export():
+    """Push core.metrics over OTLP when OTEL_EXPORTER_OTLP_METRICS_ENDPOINT is set.
+
+    Returns:
+        MeterProvider instance or None if not configured
+    """
+    global meter_provider
+    if meter_provider is not None:
+        return meter_provider
+
+    endpoint = os.getenv("OTEL_EXPORTER_OTLP_METRICS_ENDPOINT")
+    if not endpoint:
+        logger.info("ℹ️ OTLP metrics export disabled - metrics served on /metrics only")
+        return None
+
+    try:
+        from opentelemetry import metrics as otel_metrics
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+        from core.metrics import get_metrics_registry
+
+        reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(endpoint=endpoint),
+            export_interval_millis=int(os.getenv("OTEL_METRIC_EXPORT_INTERVAL", "60000"))
+        )
+        meter_provider = MeterProvider(metric_readers=[reader])
+        otel_metrics.set_meter_provider(meter_provider)
+        get_metrics_registry().add_listener(OTelMetricsBridge(meter_provider.get_meter("hume-dspy-agent")))
+
+        logger.info("✅ OTLP metrics export enabled")
+        logger.info(f"   Endpoint: {endpoint}")
+        return meter_provider
+
+    except ImportError as e:
+        logger.warning(f"⚠️ OTLP metrics export unavailable: {e}")
+        logger.warning("   Run: pip install opentelemetry-sdk opentelemetry-exporter-otlp")
+        return None
+    except Exception as e:
+        logger.error(f"❌ Failed to set up OTLP metrics export: {e}")
+        return None
@@ -0,0 +1,299 @@
+"""
+Buffered Persistence Writer
+
+`leads` and `agent_state` rows used to be written one request per call
+(processors.save_lead_to_database, StrategyAgent._save_lead_to_db,
+save_agent_state, AgentStateManager), several of them on their own clients.
+During lead bursts those per-row round-trips dominated database time.
+PersistenceWriter queues the rows and writes them in bulk on the shared
+async Supabase client:
+
+- Batching: the queue is flushed every PERSIST_FLUSH_INTERVAL_MS (default
+  25) or as soon as PERSIST_BATCH_SIZE rows are waiting (default 100). Each
+  flush is one bulk request per table and column set: upserts for `leads`,
+  inserts for `agent_state`.
+- Ordering: one flusher writes batches in enqueue order. Within a batch,
+  `leads` rows go first, because agent_state.lead_id references leads.id.
+  Rows for the same lead are merged in call order, because a single upsert
+  can't touch a row twice. agent_state rows are stamped with created_at at
+  enqueue time, so a lead's history keeps call order inside one insert.
+- Backpressure: at most PERSIST_MAX_PENDING rows are queued or in flight
+  (default 5000). write() waits for room instead of growing the queue.
+- Failures: a failed bulk request is retried row by row. Rows that still fail
+  are logged, and their callers get the exception.
+- Event loops: a writer is bound to one loop, and get_persistence_writer()
+  keeps one per loop (the API loop, asyncio.run in worker threads, the tool
+  bridge loop), so one loop's rows are never orphaned by another's and keep
+  call order. Writers of closed loops are dropped.
+- Shutdown: close_persistence_writer() (API shutdown hook) flushes every
+  loop's writer.
+- Metrics: persistence_write_seconds{table,status} (enqueue -> committed),
+  persistence_batch_rows{table}, queue_depth{queue="persistence_writer"}.
+
+write() waits until its row is committed by default: callers keep their
+"saved or raised" contract, and concurrent callers still share a request.
+Pass wait=False to queue and return immediately.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.metrics import get_metrics_registry, register_queue
+
+logger = logging.getLogger(__name__)
+
+# table -> conflict column for upserts (None: plain insert), in flush order
+TABLES: Dict[str, Optional[str]] = {
+    "leads": "id",
+    "agent_state": None,
+}
+
+persistence_write_seconds = get_metrics_registry().histogram(
+    "persistence_write_seconds", "Buffered row write latency, enqueue to commit", ("table", "status"))
+persistence_batch_rows = get_metrics_registry().histogram(
+    "persistence_batch_rows", "Rows per bulk persistence request", ("table",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500))
+
+
+@dataclass
+class PendingWrite:
+    """One queued row."""
+    table: str
+    row: Dict[str, Any]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class PersistenceWriter:
+    """Groups leads/agent_state writes into bulk requests (bound to one event loop)."""
+
+    def __init__(
+        self,
+        client=None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            client: Async Supabase client (default: get_async_supabase_client())
+            batch_size: Rows that trigger a flush / max rows per request
+            flush_interval: Seconds a row may wait for more rows
+            max_pending: Rows queued or in flight before write() waits
+        """
+        self._client = client
+        self.batch_size = batch_size or int(os.getenv("PERSIST_BATCH_SIZE", "100"))
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else int(os.getenv("PERSIST_FLUSH_INTERVAL_MS", "25")) / 1000
+        )
+        self.max_pending = max_pending or int(os.getenv("PERSIST_MAX_PENDING", "5000"))
+
+        self.loop = asyncio.get_running_loop()
+        self._pending: List[PendingWrite] = []
+        self._outstanding: set = set()  # Futures of rows not yet committed
+        self._room = asyncio.Semaphore(self.max_pending)
+        self._full = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self.stats = {"rows": 0, "requests": 0, "failed": 0}
+
+    # ----- Enqueue -----
+
+    async def write(self, table: str, row: Dict[str, Any], wait: bool = True) -> Dict[str, Any]:
+        """Queue a row for `table`; with wait, return it once committed (or raise)."""
+        if table not in TABLES:
+            raise ValueError(f"Unbuffered table: {table}")
+        if self._closing:
+            raise RuntimeError("Persistence writer is closed")
+
+        await self._room.acquire()
+        future = self.loop.create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # Logged by the writer if unawaited
+        self._outstanding.add(future)
+        self._pending.append(PendingWrite(table, row, future))
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = self.loop.create_task(self._run())
+
+        return await asyncio.shield(future) if wait else row
+
+    async def upsert_lead(self, row: Dict[str, Any], wait: bool = True) -> Dict[str, Any]:
+        """Insert or update a `leads` row (keyed by id)."""
+        return await self.write("leads", row, wait)
+
+    async def insert_agent_state(
+        self,
+        agent_name: str,
+        lead_id: Optional[str],
+        state_data: Dict[str, Any],
+        status: str = "completed",
+        state_id: Optional[str] = None,
+        wait: bool = True,
+    ) -> Dict[str, Any]:
+        """Append an `agent_state` row (id and created_at are set now)."""
+        now = datetime.now(timezone.utc).isoformat()
+        return await self.write("agent_state", {
+            "id": state_id or str(uuid.uuid4()),
+            "agent_name": agent_name,
+            "lead_id": lead_id,
+            "state_data": state_data or {},
+            "status": status,
+            "created_at": now,
+            "updated_at": now,
+        }, wait)
+
+    # ----- Flushing -----
+
+    async def _run(self):
+        """Flush until the queue is empty (write() restarts it)."""
+        while self._pending:
+            if not self._closing and len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending, []
+            self._full.clear()
+            await self._write_batch(batch)
+
+    async def _get_client(self):
+        if self._client is None:
+            from core.async_supabase_client import get_async_supabase_client
+            self._client = await get_async_supabase_client()
+        return self._client
+
+    @staticmethod
+    def _group(batch: List[PendingWrite]) -> List[Tuple[str, List[Dict[str, Any]], List[List[PendingWrite]]]]:
+        """(table, rows, writes per row) in flush order; upserted rows merged per key."""
+        groups = []
+        for table, key in TABLES.items():
+            rows: Dict[Any, Dict[str, Any]] = {}
+            writes: Dict[Any, List[PendingWrite]] = {}
+            for i, write in enumerate(w for w in batch if w.table == table):
+                row_key = write.row.get(key, i) if key else i
+                if row_key in rows:
+                    rows[row_key] = {**rows[row_key], **write.row}  # Later calls win
+                else:
+                    rows[row_key] = dict(write.row)
+                writes.setdefault(row_key, []).append(write)
+
+            # One request per column set: bulk upserts null any column a row omits
+            by_columns: Dict[frozenset, Tuple[List, List]] = {}
+            for row_key, row in rows.items():
+                group_rows, group_writes = by_columns.setdefault(frozenset(row), ([], []))
+                group_rows.append(row)
+                group_writes.append(writes[row_key])
+            groups += [(table, r, w) for r, w in by_columns.values()]
+        return groups
+
+    async def _request(self, table: str, rows: List[Dict[str, Any]]):
+        client = await self._get_client()
+        key = TABLES[table]
+        query = client.table(table)
+        query = query.upsert(rows, on_conflict=key) if key else query.insert(rows)
+        await query.execute()
+        self.stats["requests"] += 1
+        persistence_batch_rows.observe(len(rows), table=table)
+
+    def _finish(self, writes: List[PendingWrite], row: Dict[str, Any], error: Optional[BaseException] = None):
+        now = time.monotonic()
+        for write in writes:
+            persistence_write_seconds.observe(now - write.enqueued_at, table=write.table,
+                                              status="error" if error else "ok")
+            if not write.future.done():
+                if error is None:
+                    write.future.set_result(row)
+                else:
+                    write.future.set_exception(error)
+            self._outstanding.discard(write.future)
+            self._room.release()
+        if error is None:
+            self.stats["rows"] += len(writes)
+        else:
+            self.stats["failed"] += len(writes)
+
+    async def _write_batch(self, batch: List[PendingWrite]):
+        for table, rows, writes in self._group(batch):
+            for start in range(0, len(rows), self.batch_size):
+                chunk = slice(start, start + self.batch_size)
+                try:
+                    await self._request(table, rows[chunk])
+                except Exception as e:
+                    logger.warning(f"⚠️ Bulk {table} write of {len(rows[chunk])} rows failed ({e}), retrying per row")
+                    await self._write_rows(table, rows[chunk], writes[chunk])
+                    continue
+                for row, row_writes in zip(rows[chunk], writes[chunk]):
+                    self._finish(row_writes, row)
+
+    async def _write_rows(self, table: str, rows: List[Dict[str, Any]], writes: List[List[PendingWrite]]):
+        for row, row_writes in zip(rows, writes):
+            try:
+                await self._request(table, [row])
+                self._finish(row_writes, row)
+            except Exception as e:
+                logger.error(f"❌ Failed to write {table} row {row.get('id')}: {e}")
+                self._finish(row_writes, row, e)
+
+    # ----- Lifecycle -----
+
+    def depth(self) -> int:
+        """Rows queued or in flight."""
+        return len(self._outstanding)
+
+    async def flush(self):
+        """Wait until every row queued so far is committed (or failed)."""
+        outstanding = list(self._outstanding)
+        if outstanding:
+            self._full.set()
+            await asyncio.gather(*outstanding, return_exceptions=True)
+
+    async def aclose(self):
+        """Flush remaining rows and stop accepting writes."""
+        self._closing = True
+        self._full.set()
+        if self._flusher is not None:
+            await self._flusher
+        logger.info(f"✅ Persistence writer closed ({self.stats['rows']} rows, {self.stats['requests']} requests)")
+
+
+_writers: Dict[asyncio.AbstractEventLoop, PersistenceWriter] = {}
+_writers_lock = threading.Lock()
+register_queue("persistence_writer", lambda: sum(w.depth() for w in list(_writers.values())))
+
+
+def get_persistence_writer() -> PersistenceWriter:
+    """Get or create the writer for the running event loop."""
+    loop = asyncio.get_running_loop()
+    writer = _writers.get(loop)
+    if writer is None:
+        with _writers_lock:
+            for closed in [l for l in _writers if l.is_closed()]:
+                stale = _writers.pop(closed)
+                if stale.depth():
+                    logger.error(f"❌ {stale.depth()} buffered rows lost: their event loop was closed")
+            writer = _writers[loop] = PersistenceWriter()
+    return writer
+
+
+async def close_persistence_writer():
+    """Flush and close every loop's writer (API shutdown)."""
+    current = asyncio.get_running_loop()
+    with _writers_lock:
+        writers = list(_writers.items())
+        _writers.clear()
+    for loop, writer in writers:
+        if loop is current:
+            await writer.aclose()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(writer.aclose(), loop))
+        elif writer.depth():
+            logger.error(f"❌ {writer.depth()} buffered rows lost: their event loop has stopped")
@@ -0,0 +1,280 @@
+"""
+Lead Pre-Qualification
+
+Every Typeform submission - partials with no email, test entries, spam -
+went through InboundAgent's full pipeline (business fit, engagement, next
+actions, email/SMS templates: five LLM calls) before landing in
+UNQUALIFIED. PreQualifier decides the obvious cases locally, in
+microseconds, before any LLM call:
+
+1. Rules, first match decides:
+   - no_contact_info    neither email nor phone (has_contact_info)
+   - test_submission    placeholder email or name (test@, asdf, example.com)
+   - disposable_email   throwaway email domain
+   - spam_content       links in name/company fields, spam keywords
+   - empty_partial      partial submission (is_complete) with no company,
+                        size, volume or use case (extract_semantic_fields)
+                        and no name to go with the email/phone
+2. Classifier: a logistic model over cheap features of the same fields.
+   Leads with P(junk) >= PREQUAL_REJECT_THRESHOLD (default 0.9) are
+   rejected as low_fit_signals, with the features that pushed them there.
+
+A Calendly booking always goes to the LLM. Rejected leads get an
+UNQUALIFIED QualificationResult (model_used "prequalifier") that records
+why; everything else is ambiguous and goes through the LLM pipeline
+unchanged. Pre-qualification never promotes a lead.
+
+PREQUAL_ENABLED=false sends every lead to the LLM. Metrics:
+prequalification_decisions{decision,reason}, prequalification_seconds.
+"""
+
+import logging
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.metrics import get_metrics_registry
+from models import Lead, LeadTier, NextAction, QualificationCriteria, QualificationResult
+
+logger = logging.getLogger(__name__)
+
+REJECT = "reject"
+AMBIGUOUS = "ambiguous"
+
+# reason -> description recorded on the result
+REASONS = {
+    "no_contact_info": "No email or phone number",
+    "test_submission": "Test or placeholder submission",
+    "disposable_email": "Disposable email domain",
+    "spam_content": "Spam content in submission",
+    "empty_partial": "Partial submission without business information",
+    "low_fit_signals": "Too few business signals",
+}
+
+PLACEHOLDER_LOCAL_PARTS = {
+    "test", "testing", "tester", "asdf", "qwerty", "foo", "aaa", "xxx",
+    "none", "n/a", "noemail", "no-reply", "noreply", "fake", "spam",
+}
+PLACEHOLDER_DOMAINS = {"example.com", "example.org", "example.net", "test.com", "domain.com"}
+PLACEHOLDER_NAMES = {"test", "testing", "asdf", "qwerty", "xxx", "n/a", "none"}
+DISPOSABLE_DOMAINS = {
+    "mailinator.com", "guerrillamail.com", "guerrillamail.net", "sharklasers.com", "10minutemail.com",
+    "tempmail.com", "temp-mail.org", "yopmail.com", "trashmail.com", "getnada.com", "dispostable.com",
+    "throwawaymail.com", "maildrop.cc", "fakeinbox.com", "mailnesia.com", "spamgourmet.com",
+}
+FREE_EMAIL_DOMAINS = {
+    "gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com", "icloud.com", "live.com",
+    "msn.com", "protonmail.com", "proton.me", "gmx.com", "mail.com", "ymail.com",
+}
+
+SPAM_KEYWORDS = re.compile(
+    r"\b(casino|crypto|bitcoin|forex|viagra|cialis|porn|escort|backlinks?|seo (?:services|agency|ranking)"
+    r"|guest posts?|loan offer)\b",
+    re.IGNORECASE,
+)
+LINK = re.compile(r"https?://|www\.", re.IGNORECASE)
+KEYBOARD_MASH = re.compile(r"asdf|qwer|zxcv|hjkl|(\w)\1{3,}", re.IGNORECASE)
+VOWELLESS_WORD = re.compile(r"\b[b-df-hj-np-tv-xz]{5,}\b", re.IGNORECASE)
+
+# Logistic model: P(junk) = sigmoid(BIAS + sum(weight * feature))
+BIAS = 2.0
+WEIGHTS: Dict[str, float] = {
+    "complete": -1.5,
+    "has_phone": -0.5,
+    "has_company": -1.5,
+    "has_business_size": -1.2,
+    "has_patient_volume": -1.5,
+    "has_use_case": -1.0,
+    "use_case_detail": -1.0,   # 0..1, by use case length (saturates at 40 words)
+    "free_email": 0.8,
+    "gibberish": 2.5,
+    "few_answers": 1.0,        # <= 2 answered fields
+}
+FEATURE_LABELS = {
+    "free_email": "free email domain",
+    "gibberish": "gibberish name/company",
+    "few_answers": "few answered fields",
+    "complete": "partial submission",
+    "has_phone": "no phone",
+    "has_company": "no company",
+    "has_business_size": "no business size",
+    "has_patient_volume": "no patient volume",
+    "has_use_case": "no use case",
+    "use_case_detail": "little use case detail",
+}
+
+_metrics = get_metrics_registry()
+prequalification_decisions = _metrics.counter(
+    "prequalification_decisions", "Pre-qualification outcomes", ("decision", "reason"))
+prequalification_seconds = _metrics.histogram(
+    "prequalification_seconds", "Time to pre-qualify a lead", (),
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01))
+
+
+@dataclass
+class PreQualification:
+    """Outcome of pre-qualifying one lead."""
+    decision: str
+    reasons: List[str] = field(default_factory=list)
+    junk_probability: float = 0.0
+    elapsed_seconds: float = 0.0
+    semantic: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def rejected(self) -> bool:
+        return self.decision == REJECT
+
+    def describe(self) -> List[str]:
+        """Reasons as recorded on the result."""
+        return [REASONS.get(reason, reason) for reason in self.reasons]
+
+    def to_result(self) -> QualificationResult:
+        """UNQUALIFIED result for a rejected lead (no LLM analysis)."""
+        score = min(29, int(round((1 - self.junk_probability) * 100)))
+        return QualificationResult(
+            is_qualified=False,
+            score=score,
+            tier=LeadTier.UNQUALIFIED,
+            reasoning=f"Pre-qualified as UNQUALIFIED without LLM analysis: {'; '.join(self.describe())}.",
+            concerns=self.describe(),
+            criteria=QualificationCriteria(),
+            next_actions=[NextAction.NO_ACTION],
+            priority=5,
+            model_used="prequalifier",
+            processing_time_ms=int(self.elapsed_seconds * 1000),
+        )
+
+
+def _domain(email: str) -> Tuple[str, str]:
+    local, _, domain = email.lower().rpartition("@")
+    return local, domain
+
+
+class PreQualifier:
+    """Rules plus a local logistic model; rejects only clearly unqualified leads."""
+
+    def __init__(self, reject_threshold: Optional[float] = None, enabled: Optional[bool] = None):
+        self.reject_threshold = (
+            reject_threshold if reject_threshold is not None
+            else float(os.getenv("PREQUAL_REJECT_THRESHOLD", "0.9"))
+        )
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("PREQUAL_ENABLED", "true").lower() == "true"
+        )
+
+    def evaluate(self, lead: Lead) -> PreQualification:
+        """Decide whether `lead` needs the LLM pipeline."""
+        started = time.perf_counter()
+        semantic = lead.extract_semantic_fields()
+        if not self.enabled:
+            return PreQualification(AMBIGUOUS, semantic=semantic)
+
+        reason = self._rule(lead, semantic)
+        if reason:
+            result = PreQualification(REJECT, [reason], 1.0, semantic=semantic)
+        elif reason is None:
+            features = self.features(lead, semantic)
+            probability = self.junk_probability(features)
+            if probability >= self.reject_threshold:
+                result = PreQualification(REJECT, ["low_fit_signals"], probability, semantic=semantic)
+                result.reasons += self.explain(features)
+            else:
+                result = PreQualification(AMBIGUOUS, junk_probability=probability, semantic=semantic)
+        else:
+            result = PreQualification(AMBIGUOUS, semantic=semantic)  # Booked a call
+
+        result.elapsed_seconds = time.perf_counter() - started
+        prequalification_seconds.observe(result.elapsed_seconds)
+        prequalification_decisions.inc(decision=result.decision, reason=result.reasons[0] if result.reasons else "")
+        return result
+
+    # ----- Rules -----
+
+    @staticmethod
+    def _text(lead: Lead, name: str) -> str:
+        value = getattr(lead, name, None) or lead.get_field(name)
+        return str(value).strip() if value else ""
+
+    def _rule(self, lead: Lead, semantic: Dict[str, Any]) -> Optional[str]:
+        """Reason to reject, None to use the classifier, "" to always use the LLM."""
+        if lead.booking_confirmed or lead.calendly_url or lead.has_field("calendly_url") or semantic.get("has_calendly"):
+            return ""
+
+        email = str(lead.email or semantic.get("email") or "")
+        if not (lead.has_contact_info() or email):
+            return "no_contact_info"
+
+        local, domain = _domain(email) if email else ("", "")
+        names = [self._text(lead, "first_name").lower(), self._text(lead, "last_name").lower()]
+        if local in PLACEHOLDER_LOCAL_PARTS or domain in PLACEHOLDER_DOMAINS or any(
+                name in PLACEHOLDER_NAMES for name in names if name):
+            return "test_submission"
+        if domain in DISPOSABLE_DOMAINS:
+            return "disposable_email"
+
+        company = self._text(lead, "company") or str(semantic.get("company") or "")
+        identity = " ".join(names + [company])
+        use_case = str(semantic.get("use_case") or lead.get_field("use_case") or "")
+        if LINK.search(identity) or SPAM_KEYWORDS.search(identity) or SPAM_KEYWORDS.search(use_case):
+            return "spam_content"
+
+        # A named contact with a real email/phone is worth the LLM even without business info
+        if not lead.is_complete() and not any(names) and not (
+                company or use_case or lead.get_field("business_size") or lead.get_field("patient_volume")
+                or semantic.get("patient_volume_raw")):
+            return "empty_partial"
+        return None
+
+    # ----- Classifier -----
+
+    def features(self, lead: Lead, semantic: Dict[str, Any]) -> Dict[str, float]:
+        email = str(lead.email or semantic.get("email") or "")
+        company = self._text(lead, "company") or str(semantic.get("company") or "")
+        use_case = str(semantic.get("use_case") or lead.get_field("use_case") or "")
+        identity = " ".join([self._text(lead, "first_name"), self._text(lead, "last_name"), company])
+        answered = sum(1 for value in lead.raw_answers.values() if value not in (None, "", "null"))
+        return {
+            "complete": float(lead.is_complete()),
+            "has_phone": float(bool(lead.phone)),
+            "has_company": float(bool(company)),
+            "has_business_size": float(bool(lead.get_field("business_size") or lead.business_size)),
+            "has_patient_volume": float(bool(
+                lead.get_field("patient_volume") or lead.patient_volume or semantic.get("patient_volume_raw"))),
+            "has_use_case": float(bool(use_case)),
+            "use_case_detail": min(1.0, len(use_case.split()) / 40),
+            "free_email": float(_domain(email)[1] in FREE_EMAIL_DOMAINS) if email else 0.0,
+            "gibberish": float(bool(KEYBOARD_MASH.search(identity) or VOWELLESS_WORD.search(identity))),
+            "few_answers": float(answered <= 2),
+        }
+
+    @staticmethod
+    def junk_probability(features: Dict[str, float]) -> float:
+        z = BIAS + sum(WEIGHTS[name] * value for name, value in features.items())
+        return 1 / (1 + math.exp(-z))
+
+    @staticmethod
+    def explain(features: Dict[str, float], top: int = 3) -> List[str]:
+        """Features that pushed towards junk, strongest first."""
+        contributions = []
+        for name, value in features.items():
+            weight = WEIGHTS[name]
+            # Present junk features, or missing/low good features
+            push = weight * value if weight > 0 else -weight * (1 - value)
+            if push > 0:
+                contributions.append((push, FEATURE_LABELS[name]))
+        return [label for _, label in sorted(contributions, reverse=True)[:top]]
+
+
+_prequalifier: Optional[PreQualifier] = None
+
+
+def get_prequalifier() -> PreQualifier:
+    """Get or create the process-wide pre-qualifier."""
+    global _prequalifier
+    if _prequalifier is None:
+        _prequalifier = PreQualifier()
+    return _prequalifier
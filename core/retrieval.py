@@ -0,0 +1,416 @@
+"""
+Hybrid Knowledge-Base Retrieval
+
+Shared retrieval engine for the knowledge-base tools (tools/rag_tools.py,
+tools/strategy_tools.py). Replaces "embed every query + pure-vector
+match_documents with a fixed threshold":
+
+1. Query embeddings are cached (LRU), so repeated ReAct lookups skip the
+   OpenAI round-trip.
+2. A BM25 keyword index over the `documents` chunks catches exact terms
+   that embeddings blur (product SKUs, names, codes). It is built lazily
+   from Supabase and rebuilt in the background after RETRIEVAL_INDEX_TTL_SECONDS.
+3. Vector and keyword rankings are fused with reciprocal rank fusion.
+   A fused chunk is kept when its cosine similarity clears match_threshold
+   or its BM25 score is within RETRIEVAL_KEYWORD_MIN_RATIO of the query's
+   best keyword hit, so weak lexical overlaps do not bypass the cutoff.
+4. An optional rerank stage reorders the fused candidates:
+   - "overlap": query-term coverage + exact phrase match (no dependencies)
+   - "cross-encoder": local sentence-transformers CrossEncoder (optional install)
+
+If the embedding call fails, keyword results are still returned.
+
+Configuration (environment variables):
+- RETRIEVAL_EMBEDDING_MODEL: default text-embedding-3-small
+- RETRIEVAL_EMBEDDING_CACHE_SIZE: cached query embeddings (default 1024)
+- RETRIEVAL_INDEX_TTL_SECONDS: keyword index refresh interval (default 3600)
+- RETRIEVAL_KEYWORD_MIN_RATIO: keyword-only cutoff as a share of the top BM25 score (default 0.5)
+- RETRIEVAL_RERANKER: none | overlap | cross-encoder (default overlap)
+- RETRIEVAL_CROSS_ENCODER_MODEL: default cross-encoder/ms-marco-MiniLM-L-6-v2
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+RRF_K = 60
+PAGE_SIZE = 1000
+
+# Identifiers like "HM-BP200" or "v2.1" stay one token (and also index their parts)
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its of on or our that the this to "
+    "was we what when where which who why will with you your did does do about".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms for the keyword index (compound identifiers + their parts)."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(part for part in re.split(r"[-_./]", token) if part and part not in _STOPWORDS)
+    return tokens
+
+
+@dataclass
+class RetrievedChunk:
+    """One knowledge-base chunk with its retrieval scores."""
+    id: Any
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    similarity: Optional[float] = None  # Cosine similarity from match_documents
+    keyword_score: Optional[float] = None  # BM25
+    score: float = 0.0  # Fused (and reranked) score
+
+    @property
+    def file_title(self) -> str:
+        return self.metadata.get("file_title", "Unknown")
+
+    @property
+    def file_url(self) -> str:
+        return self.metadata.get("file_url", "")
+
+
+# ============================================================================
+# Query embedding cache
+# ============================================================================
+
+class EmbeddingCache:
+    """LRU cache of query embeddings keyed by (model, normalized query)."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model: str, query: str) -> Tuple[str, str]:
+        return model, " ".join(query.lower().split())
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        key = self._key(model, query)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, model: str, query: str, embedding: List[float]):
+        key = self._key(model, query)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+# ============================================================================
+# BM25 keyword index
+# ============================================================================
+
+class BM25Index:
+    """In-memory BM25 (Okapi) inverted index over knowledge-base chunks."""
+
+    def __init__(self, chunks: List[Dict[str, Any]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks = chunks
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # term -> [(chunk index, tf)]
+        self.lengths: List[int] = []
+
+        for index, chunk in enumerate(chunks):
+            counts: Dict[str, int] = defaultdict(int)
+            for term in tokenize(chunk.get("content") or ""):
+                counts[term] += 1
+            self.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((index, tf))
+
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        n = len(chunks)
+        self.idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Top (chunk index, score) pairs for the query."""
+        scores: Dict[int, float] = defaultdict(float)
+        k1, b, avg = self.k1, self.b, self.avg_length or 1.0
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for index, tf in self.postings[term]:
+                norm = k1 * (1 - b + b * self.lengths[index] / avg)
+                scores[index] += idf * tf * (k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda kv: -kv[1])[:limit]
+
+
+# ============================================================================
+# Rerankers
+# ============================================================================
+
+class OverlapReranker:
+    """Lightweight reranker: query-term coverage and exact phrase match."""
+
+    def rerank(self, query: str, chunks: List[RetrievedChunk]) -> List[float]:
+        terms = set(tokenize(query))
+        phrase = " ".join(query.lower().split())
+        scores = []
+        for chunk in chunks:
+            content = (chunk.content or "").lower()
+            chunk_terms = set(tokenize(content))
+            coverage = len(terms & chunk_terms) / len(terms) if terms else 0.0
+            scores.append(coverage + (0.5 if len(phrase) > 3 and phrase in content else 0.0))
+        return scores
+
+
+class CrossEncoderReranker:
+    """Local cross-encoder reranker (requires sentence-transformers)."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name)
+
+    def rerank(self, query: str, chunks: List[RetrievedChunk]) -> List[float]:
+        return [float(s) for s in self.model.predict([(query, chunk.content or "") for chunk in chunks])]
+
+
+def _create_reranker(name: str):
+    if name == "overlap":
+        return OverlapReranker()
+    if name == "cross-encoder":
+        try:
+            model = os.getenv("RETRIEVAL_CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+            return CrossEncoderReranker(model)
+        except Exception as e:
+            logger.warning(f"⚠️ Cross-encoder reranker unavailable ({e}), using overlap reranker")
+            return OverlapReranker()
+    return None
+
+
+# ============================================================================
+# Hybrid retriever
+# ============================================================================
+
+class HybridRetriever:
+    """Vector + BM25 retrieval over the `documents` table with RRF fusion."""
+
+    def __init__(
+        self,
+        embedding_model: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        index_ttl_seconds: Optional[float] = None,
+        keyword_min_ratio: Optional[float] = None,
+        reranker: Any = "env"
+    ):
+        self.embedding_model = embedding_model or os.getenv("RETRIEVAL_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        self.embeddings = EmbeddingCache(
+            cache_size if cache_size is not None else int(os.getenv("RETRIEVAL_EMBEDDING_CACHE_SIZE", "1024"))
+        )
+        self.index_ttl_seconds = (
+            index_ttl_seconds if index_ttl_seconds is not None
+            else float(os.getenv("RETRIEVAL_INDEX_TTL_SECONDS", "3600"))
+        )
+        self.keyword_min_ratio = (
+            keyword_min_ratio if keyword_min_ratio is not None
+            else float(os.getenv("RETRIEVAL_KEYWORD_MIN_RATIO", "0.5"))
+        )
+        self.reranker = _create_reranker(os.getenv("RETRIEVAL_RERANKER", "overlap")) if reranker == "env" else reranker
+
+        self._index: Optional[BM25Index] = None
+        self._index_built_at = 0.0
+        self._index_lock = asyncio.Lock()
+        self._refreshing = False
+
+    # ----- Embeddings -----
+
+    async def embed_query(self, openai_client, query: str) -> List[float]:
+        """Query embedding, from cache when possible."""
+        cached = self.embeddings.get(self.embedding_model, query)
+        if cached is not None:
+            return cached
+        response = await openai_client.embeddings.create(model=self.embedding_model, input=query)
+        embedding = response.data[0].embedding
+        self.embeddings.put(self.embedding_model, query, embedding)
+        return embedding
+
+    # ----- Keyword index -----
+
+    @staticmethod
+    def _load_chunks(supabase) -> List[Dict[str, Any]]:
+        chunks = []
+        start = 0
+        while True:
+            result = supabase.table("documents") \
+                .select("id, content, metadata") \
+                .order("id") \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute()
+            rows = result.data or []
+            chunks.extend(rows)
+            if len(rows) < PAGE_SIZE:
+                return chunks
+            start += PAGE_SIZE
+
+    async def _build_index(self, supabase) -> BM25Index:
+        started = time.perf_counter()
+        index = await asyncio.to_thread(lambda: BM25Index(self._load_chunks(supabase)))
+        self._index = index
+        self._index_built_at = time.monotonic()
+        logger.info(f"✅ Knowledge-base keyword index: {len(index)} chunks in {time.perf_counter() - started:.1f}s")
+        return index
+
+    async def keyword_index(self, supabase) -> BM25Index:
+        """BM25 index, built on first use and refreshed in the background when stale."""
+        if self._index is None:
+            async with self._index_lock:
+                if self._index is None:
+                    return await self._build_index(supabase)
+
+        if time.monotonic() - self._index_built_at > self.index_ttl_seconds and not self._refreshing:
+            self._refreshing = True
+
+            async def refresh():
+                try:
+                    await self._build_index(supabase)
+                except Exception as e:
+                    logger.error(f"❌ Keyword index refresh failed: {e}")
+                finally:
+                    self._refreshing = False
+
+            asyncio.create_task(refresh())
+        return self._index
+
+    def invalidate(self):
+        """Drop the keyword index (e.g. after re-indexing documents)."""
+        self._index = None
+
+    # ----- Search -----
+
+    async def _vector_search(self, supabase, openai_client, query: str, count: int) -> List[Dict[str, Any]]:
+        embedding = await self.embed_query(openai_client, query)
+        result = await asyncio.to_thread(
+            lambda: supabase.rpc("match_documents", {
+                "query_embedding": embedding,
+                "match_threshold": 0.0,
+                "match_count": count
+            }).execute()
+        )
+        return result.data or []
+
+    async def search(
+        self,
+        supabase,
+        openai_client,
+        query: str,
+        limit: int = 5,
+        match_threshold: float = 0.7,
+        candidates: int = 30
+    ) -> List[RetrievedChunk]:
+        """Hybrid search.
+
+        Args:
+            supabase: Supabase client (documents table + match_documents RPC)
+            openai_client: AsyncOpenAI client for query embeddings (None: keyword only)
+            query: Search query
+            limit: Results returned
+            match_threshold: Minimum cosine similarity for a chunk to be kept
+                (a chunk is also kept when its BM25 score is at least
+                keyword_min_ratio of the best keyword hit)
+            candidates: Candidates taken from each ranking before fusion
+
+        Returns:
+            Chunks ordered by fused (and reranked) score
+        """
+        vector_task = None
+        if openai_client is not None:
+            vector_task = asyncio.create_task(self._vector_search(supabase, openai_client, query, candidates))
+
+        keyword_hits: List[Tuple[int, float]] = []
+        index = None
+        try:
+            index = await self.keyword_index(supabase)
+            keyword_hits = index.search(query, candidates)
+        except Exception as e:
+            logger.error(f"❌ Keyword search failed: {e}")
+
+        vector_rows: List[Dict[str, Any]] = []
+        if vector_task is not None:
+            try:
+                vector_rows = await vector_task
+            except Exception as e:
+                logger.error(f"❌ Vector search failed, using keyword results only: {e}")
+
+        fused: Dict[Any, RetrievedChunk] = {}
+        for rank, row in enumerate(vector_rows):
+            similarity = row.get("similarity")
+            chunk = fused.setdefault(row["id"], RetrievedChunk(
+                id=row["id"], content=row.get("content", ""), metadata=row.get("metadata") or {}
+            ))
+            chunk.similarity = similarity
+            chunk.score += 1.0 / (RRF_K + rank + 1)
+
+        for rank, (position, bm25) in enumerate(keyword_hits):
+            row = index.chunks[position]
+            chunk = fused.setdefault(row["id"], RetrievedChunk(
+                id=row["id"], content=row.get("content", ""), metadata=row.get("metadata") or {}
+            ))
+            chunk.keyword_score = bm25
+            chunk.score += 1.0 / (RRF_K + rank + 1)
+
+        keyword_cutoff = (keyword_hits[0][1] * self.keyword_min_ratio) if keyword_hits else math.inf
+        results = [
+            chunk for chunk in fused.values()
+            if (chunk.similarity or 0.0) >= match_threshold
+            or (chunk.keyword_score is not None and chunk.keyword_score >= keyword_cutoff)
+        ]
+        results.sort(key=lambda c: -c.score)
+
+        if self.reranker is not None and len(results) > 1:
+            pool = results[:max(limit * 3, 10)]
+            try:
+                # Cross-encoder inference is CPU-bound; keep it off the event loop
+                rerank_scores = await asyncio.to_thread(self.reranker.rerank, query, pool)
+                # Rerank score first, fused rank breaks ties
+                order = sorted(range(len(pool)), key=lambda i: (-rerank_scores[i], -pool[i].score))
+                results = [pool[i] for i in order] + results[len(pool):]
+            except Exception as e:
+                logger.error(f"❌ Rerank failed, keeping fused order: {e}")
+
+        return results[:limit]
+
+
+_retriever: Optional[HybridRetriever] = None
+
+
+def get_retriever() -> HybridRetriever:
+    """Get or create the process-wide hybrid retriever."""
+    global _retriever
+    if _retriever is None:
+        _retriever = HybridRetriever()
+    return _retriever
@@ -0,0 +1,332 @@
+"""
+Outbound Slack Queue
+
+Every chat.postMessage from the agents goes through one SlackOutbox per bot
+token instead of ad-hoc httpx/WebClient calls (StrategyAgent messages and
+state broadcasts, webhook error reports, PerformanceAgent alerts,
+FollowUpAgent thread updates). During lead bursts those independent posts
+hit Slack's rate limits and kept retrying blind.
+
+- Per-channel FIFO queues, each drained by its own worker task and paced by
+  a token bucket: SLACK_CHANNEL_RATE messages per second (default 1.0, Slack's
+  chat.postMessage limit per channel) with bursts of SLACK_CHANNEL_BURST
+  (default 3). A rate of 0 disables pacing. Whatever the bucket allows is
+  posted concurrently in queue order; replies to one thread stay sequential.
+- A 429 pauses every channel for Retry-After seconds (the limit is
+  per-workspace) and the message is retried, up to 3 attempts.
+- notify() coalesces: updates for the same (channel, thread, key) within
+  SLACK_COALESCE_WINDOW_SECONDS (default 5) are posted as one message.
+- Metrics: slack_delivery_seconds{kind,status} measures enqueue -> Slack
+  acknowledgement, slack_retries{reason} counts retries, and
+  queue_depth{queue="slack_outbox"} shows pending messages.
+
+send() awaits delivery and returns Slack's response (for callers that need
+the message ts). post() and notify() return immediately and are safe to call
+from worker threads (e.g. LangGraph nodes) once the outbox knows its loop.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from core.metrics import get_metrics_registry, register_queue
+
+logger = logging.getLogger(__name__)
+
+SLACK_POST_URL = "https://slack.com/api/chat.postMessage"
+MAX_ATTEMPTS = 3
+MAX_IN_FLIGHT = 16  # Concurrent posts per channel when the bucket allows
+MAX_TEXT_LENGTH = 39000  # Slack truncates text beyond 40k characters
+
+slack_delivery_seconds = get_metrics_registry().histogram(
+    "slack_delivery_seconds", "Outbound Slack message latency, enqueue to acknowledgement", ("kind", "status"))
+slack_retries = get_metrics_registry().counter(
+    "slack_retries", "Outbound Slack message retries", ("reason",))
+
+
+@dataclass
+class OutboundMessage:
+    """One queued chat.postMessage call."""
+    channel: str
+    text: str
+    thread_ts: Optional[str] = None
+    fields: Dict[str, Any] = field(default_factory=dict)  # Extra chat.postMessage fields (mrkdwn, blocks, ...)
+    kind: str = "message"
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+    attempts: int = 0
+
+    def payload(self) -> Dict[str, Any]:
+        payload = {"channel": self.channel, "text": self.text[:MAX_TEXT_LENGTH], **self.fields}
+        if self.thread_ts:
+            payload["thread_ts"] = self.thread_ts
+        return payload
+
+
+class SlackOutbox:
+    """Rate-limit-aware, coalescing chat.postMessage queue for one bot token."""
+
+    def __init__(
+        self,
+        token: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        coalesce_window: Optional[float] = None,
+        timeout: float = 10.0
+    ):
+        self.token = token
+        self.rate = rate if rate is not None else float(os.getenv("SLACK_CHANNEL_RATE", "1.0"))
+        self.burst = burst if burst is not None else float(os.getenv("SLACK_CHANNEL_BURST", "3"))
+        self.coalesce_window = (
+            coalesce_window if coalesce_window is not None
+            else float(os.getenv("SLACK_COALESCE_WINDOW_SECONDS", "5"))
+        )
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[str, Deque[OutboundMessage]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # channel -> (tokens, monotonic refill time)
+        self._paused_until = 0.0
+        self._batches: Dict[Tuple[str, Optional[str], str], List[str]] = {}
+        self._flush_handles: Dict[Tuple[str, Optional[str], str], asyncio.TimerHandle] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {"sent": 0, "failed": 0, "coalesced": 0, "rate_limited": 0}
+
+    # ----- Loop binding -----
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Bind to the event loop that runs the workers (called at API startup)."""
+        self._loop = loop
+
+    def _call_in_loop(self, fn, *args) -> bool:
+        """Run fn(*args) on the outbox loop; False if there is no loop to use."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or self._loop.is_closed():
+            if running is None:
+                return False
+            self._loop = running
+        if running is self._loop:
+            fn(*args)
+        else:
+            self._loop.call_soon_threadsafe(fn, *args)
+        return True
+
+    # ----- Enqueue -----
+
+    async def send(self, channel: str, text: str, thread_ts: Optional[str] = None, **fields) -> Dict[str, Any]:
+        """Queue a message and wait for Slack's response (ok, ts, channel, ...)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+        message = OutboundMessage(channel, text, thread_ts, fields, future=loop.create_future())
+        if loop is self._loop:
+            self._enqueue(message)
+            return await message.future
+        # Called from another loop (e.g. a tool bridge worker): deliver there, await here
+        message.future = None
+        done = asyncio.run_coroutine_threadsafe(self._send_on_loop(message), self._loop)
+        return await asyncio.wrap_future(done)
+
+    async def _send_on_loop(self, message: OutboundMessage) -> Dict[str, Any]:
+        message.future = asyncio.get_running_loop().create_future()
+        self._enqueue(message)
+        return await message.future
+
+    def post(self, channel: str, text: str, thread_ts: Optional[str] = None, kind: str = "message", **fields):
+        """Queue a message without waiting (thread-safe)."""
+        message = OutboundMessage(channel, text, thread_ts, fields, kind=kind)
+        if not self._call_in_loop(self._enqueue, message):
+            self._post_blocking(message)
+
+    def notify(self, channel: str, text: str, key: str = "updates", thread_ts: Optional[str] = None):
+        """Queue a status/alert update, coalesced with others for the same key (thread-safe)."""
+        if not self._call_in_loop(self._add_to_batch, (channel, thread_ts, key), text):
+            self._post_blocking(OutboundMessage(channel, text, thread_ts, kind=key))
+
+    def _add_to_batch(self, batch_key: Tuple[str, Optional[str], str], text: str):
+        texts = self._batches.setdefault(batch_key, [])
+        texts.append(text)
+        if len(texts) > 1:
+            self.stats["coalesced"] += 1
+        if batch_key not in self._flush_handles:
+            self._flush_handles[batch_key] = self._loop.call_later(
+                self.coalesce_window, self._flush_batch, batch_key)
+
+    def _flush_batch(self, batch_key: Tuple[str, Optional[str], str]):
+        self._flush_handles.pop(batch_key, None)
+        texts = self._batches.pop(batch_key, [])
+        if not texts:
+            return
+        channel, thread_ts, key = batch_key
+        text = texts[0] if len(texts) == 1 else (
+            f"_{len(texts)} updates in the last {self.coalesce_window:g}s_\n\n" + "\n\n".join(texts)
+        )
+        self._enqueue(OutboundMessage(channel, text, thread_ts, kind=key))
+
+    def _enqueue(self, message: OutboundMessage):
+        self._queues.setdefault(message.channel, deque()).append(message)
+        worker = self._workers.get(message.channel)
+        if worker is None or worker.done():
+            self._workers[message.channel] = asyncio.ensure_future(self._drain(message.channel))
+
+    # ----- Delivery -----
+
+    async def _drain(self, channel: str):
+        queue = self._queues[channel]
+        while queue:
+            wait = max(self._pacing_wait(channel), self._paused_until - time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue  # A 429 elsewhere may have extended the pause
+
+            # Post as many as the bucket allows concurrently, in queue order; replies
+            # to the same thread stay sequential so multi-part messages keep their order
+            batch: List[OutboundMessage] = []
+            threads = set()
+            while queue and len(batch) < self._available(channel) and queue[0].thread_ts not in threads:
+                message = queue.popleft()
+                if message.thread_ts:
+                    threads.add(message.thread_ts)
+                batch.append(message)
+            self._take_tokens(channel, len(batch))
+            # An unexpected exception must not kill the worker and strand pending send() futures
+            results = await asyncio.gather(*(self._post(message) for message in batch), return_exceptions=True)
+
+            retry = []
+            for message, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Unexpected error posting to Slack: {result!r}")
+                    result = ("error", {"ok": False, "error": str(result) or type(result).__name__})
+                status, data = result
+                if status in ("rate_limited", "error") and message.attempts < MAX_ATTEMPTS:
+                    if status == "error":
+                        slack_retries.inc(reason="error")
+                    retry.append(message)  # Retry after the pause / next token
+                else:
+                    self._finish(message, status, data)
+            queue.extendleft(reversed(retry))
+        self._workers.pop(channel, None)
+        self._queues.pop(channel, None)
+
+    def _finish(self, message: OutboundMessage, status: str, data: Dict[str, Any]):
+        ok = status == "ok"
+        self.stats["sent" if ok else "failed"] += 1
+        slack_delivery_seconds.observe(
+            time.monotonic() - message.enqueued_at, kind=message.kind, status="ok" if ok else "error")
+        if not ok:
+            logger.error(f"❌ Slack message to {message.channel} failed: {data.get('error')}")
+        if message.future is not None and not message.future.done():
+            message.future.set_result(data)
+
+    def _refill(self, channel: str) -> float:
+        now = time.monotonic()
+        tokens, refilled_at = self._buckets.get(channel, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - refilled_at) * self.rate)
+        self._buckets[channel] = (tokens, now)
+        return tokens
+
+    def _pacing_wait(self, channel: str) -> float:
+        if self.rate <= 0:
+            return 0.0
+        tokens = self._refill(channel)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def _available(self, channel: str) -> int:
+        if self.rate <= 0:
+            return MAX_IN_FLIGHT
+        return max(1, min(MAX_IN_FLIGHT, int(self._buckets[channel][0])))
+
+    def _take_tokens(self, channel: str, count: int):
+        if self.rate > 0:
+            tokens, refilled_at = self._buckets[channel]
+            self._buckets[channel] = (tokens - count, refilled_at)
+
+    async def _post(self, message: OutboundMessage) -> Tuple[str, Dict[str, Any]]:
+        """One attempt: ('ok' | 'rate_limited' | 'error' | 'rejected', response data)."""
+        message.attempts += 1
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        try:
+            response = await self._client.post(
+                SLACK_POST_URL,
+                headers={"Authorization": f"Bearer {self.token}"},
+                json=message.payload()
+            )
+        except httpx.HTTPError as e:
+            return "error", {"ok": False, "error": str(e)}
+
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After", "1"))
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self.stats["rate_limited"] += 1
+            slack_retries.inc(reason="rate_limited")
+            logger.warning(f"⚠️ Slack rate limited, pausing outbound messages for {retry_after:.0f}s")
+            return "rate_limited", {"ok": False, "error": "ratelimited"}
+        if response.status_code >= 500:
+            return "error", {"ok": False, "error": f"HTTP {response.status_code}"}
+        try:
+            data = response.json()
+        except ValueError:
+            return "error", {"ok": False, "error": response.text}
+        # Slack rejections (channel_not_found, invalid_auth, ...) will not succeed on retry
+        return ("ok" if data.get("ok") else "rejected"), data
+
+    def _post_blocking(self, message: OutboundMessage):
+        """No event loop to queue on (scripts, CLI): post directly from this thread."""
+        try:
+            response = httpx.post(
+                SLACK_POST_URL,
+                headers={"Authorization": f"Bearer {self.token}"},
+                json=message.payload(),
+                timeout=self.timeout
+            )
+            if not response.json().get("ok"):
+                logger.error(f"❌ Slack message to {message.channel} failed: {response.json().get('error')}")
+        except Exception as e:
+            logger.error(f"❌ Slack message to {message.channel} failed: {e}")
+
+    # ----- Lifecycle -----
+
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values()) + sum(
+            len(texts) for texts in self._batches.values())
+
+    async def flush(self):
+        """Post pending coalesced updates now and wait for every queue to drain."""
+        for batch_key, handle in list(self._flush_handles.items()):
+            handle.cancel()
+            self._flush_batch(batch_key)
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def aclose(self):
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_outboxes: Dict[str, SlackOutbox] = {}
+_outboxes_lock = threading.Lock()
+
+
+def get_slack_outbox(token: Optional[str] = None) -> SlackOutbox:
+    """Get or create the outbox for a bot token (default: SLACK_BOT_TOKEN)."""
+    token = token or os.getenv("SLACK_BOT_TOKEN", "")
+    with _outboxes_lock:
+        outbox = _outboxes.get(token)
+        if outbox is None:
+            outbox = _outboxes[token] = SlackOutbox(token)
+            register_queue("slack_outbox", lambda: sum(o.depth() for o in list(_outboxes.values())))
+    return outbox
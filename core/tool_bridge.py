@@ -0,0 +1,288 @@
+"""Async Tool Bridge for ReAct Agents.
+
+DSPy ReAct calls tools synchronously, but most of our tools wrap coroutines
+(audit, MCP, delegation, knowledge base). Previously every tool call created
+a brand-new event loop inside a small ThreadPoolExecutor and blocked on it,
+which meant:
+- Async clients (httpx, Supabase, MCP) were rebuilt on every call
+- Three concurrent tool calls exhausted the executor
+- Each agent copied its own variant of the pattern
+
+The bridge schedules tool coroutines onto ONE long-lived loop instead:
+- The application's main loop, when it has been attached and the caller is a
+  worker thread (e.g. ReAct running under asyncio.to_thread)
+- Otherwise a dedicated background loop owned by the bridge
+
+Both loops stay alive for the life of the process, so pooled clients created
+inside tool coroutines are reused across calls.
+
+Configuration (environment variables):
+- TOOL_BRIDGE_MAX_CONCURRENCY: max tool coroutines in flight per loop (default 8)
+- TOOL_BRIDGE_TIMEOUT_SECONDS: default per-call timeout (default 60)
+
+Usage:
+    from core.tool_bridge import run_tool_coroutine
+
+    def audit_lead_flow(timeframe_hours: int = 24) -> str:
+        result = run_tool_coroutine(audit_agent.audit_lead_flow(timeframe_hours))
+        return json.dumps(result)
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.metrics import register_queue
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+
+class AsyncToolBridge:
+    """Run tool coroutines from synchronous call sites on a shared event loop."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        default_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the bridge.
+
+        Args:
+            max_concurrency: Max coroutines in flight per loop (env: TOOL_BRIDGE_MAX_CONCURRENCY)
+            default_timeout: Default seconds to wait for a result (env: TOOL_BRIDGE_TIMEOUT_SECONDS)
+        """
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("TOOL_BRIDGE_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        self.default_timeout = default_timeout or float(
+            os.getenv("TOOL_BRIDGE_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)
+        )
+
+        self._lock = threading.Lock()
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_thread: Optional[threading.Thread] = None
+
+        # One semaphore per loop; asyncio primitives must not cross loops
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # Counters for monitoring
+        self._in_flight = 0
+        self._total_calls = 0
+        self._timeouts = 0
+        self._errors = 0
+
+    # ===== Loop management =====
+
+    def attach_loop(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Attach the application's main event loop.
+
+        Call this from inside the running loop (e.g. FastAPI startup). Tool calls
+        made from worker threads will then run on the main loop and share its
+        clients and connection pools.
+        """
+        self._main_loop = loop or asyncio.get_running_loop()
+        logger.info("🔌 Tool bridge attached to main event loop")
+
+    def _ensure_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the dedicated background loop on first use."""
+        with self._lock:
+            if self._background_loop is not None and not self._background_loop.is_closed():
+                return self._background_loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="tool-bridge-loop", daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._background_loop = loop
+            self._background_thread = thread
+            logger.info(f"✅ Tool bridge background loop started (max concurrency: {self.max_concurrency})")
+            return loop
+
+    def _select_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Pick a loop that can run the coroutine without deadlocking the caller.
+
+        Returns:
+            Target loop, or None if the caller is running on every available loop
+        """
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+
+        main = self._main_loop
+        if main is not None and main.is_running() and not main.is_closed() and main is not current:
+            return main
+
+        background = self._ensure_background_loop()
+        if background is not current:
+            return background
+
+        return None
+
+    def _semaphore_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """Get (or create) the concurrency semaphore for a loop."""
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    async def _guarded(self, coro: Awaitable[Any]) -> Any:
+        """Run coroutine under the per-loop concurrency cap."""
+        semaphore = self._semaphore_for(asyncio.get_running_loop())
+        async with semaphore:
+            return await coro
+
+    # ===== Execution =====
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine from synchronous code and return its result.
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Seconds to wait (defaults to bridge default_timeout)
+
+        Returns:
+            Coroutine result
+
+        Raises:
+            TimeoutError: If the coroutine does not finish in time (it is cancelled)
+            Exception: Any exception raised by the coroutine
+        """
+        timeout = timeout if timeout is not None else self.default_timeout
+        loop = self._select_loop()
+
+        if loop is None:
+            # Caller is blocking the bridge loop itself (sync tool called from a
+            # coroutine already on it). Fall back to an isolated loop in a thread.
+            logger.warning("⚠️ Tool bridge called from its own loop - running in isolated loop")
+            return self._run_isolated(coro, timeout)
+
+        with self._lock:
+            self._in_flight += 1
+            self._total_calls += 1
+
+        future = asyncio.run_coroutine_threadsafe(self._guarded(coro), loop)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise TimeoutError(f"Tool coroutine timed out after {timeout}s")
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _run_isolated(self, coro: Awaitable[Any], timeout: float) -> Any:
+        """Run coroutine on a throwaway loop in a separate thread (last resort)."""
+        result: Dict[str, Any] = {}
+
+        def _target():
+            try:
+                result["value"] = asyncio.run(asyncio.wait_for(coro, timeout))
+            except BaseException as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=_target, name="tool-bridge-isolated", daemon=True)
+        thread.start()
+        thread.join()
+
+        if "error" in result:
+            if isinstance(result["error"], asyncio.TimeoutError):
+                raise TimeoutError(f"Tool coroutine timed out after {timeout}s")
+            raise result["error"]
+        return result.get("value")
+
+    def wrap(self, async_fn: Callable[..., Awaitable[Any]], timeout: Optional[float] = None) -> Callable[..., Any]:
+        """Wrap an async function as a sync tool (name/docstring preserved for DSPy).
+
+        Example:
+            tools = [bridge.wrap(search_knowledge_base), ...]
+            dspy.ReAct(Signature, tools=tools)
+        """
+        @functools.wraps(async_fn)
+        def _sync_tool(*args, **kwargs):
+            return self.run(async_fn(*args, **kwargs), timeout=timeout)
+
+        return _sync_tool
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bridge statistics for monitoring."""
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "default_timeout": self.default_timeout,
+                "in_flight": self._in_flight,
+                "total_calls": self._total_calls,
+                "timeouts": self._timeouts,
+                "errors": self._errors,
+                "main_loop_attached": self._main_loop is not None,
+                "background_loop_running": (
+                    self._background_loop is not None and self._background_loop.is_running()
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the background loop (main loop is owned by the application)."""
+        with self._lock:
+            loop = self._background_loop
+            thread = self._background_thread
+            self._background_loop = None
+            self._background_thread = None
+            self._main_loop = None
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=5)
+            loop.close()
+            logger.info("🛑 Tool bridge background loop stopped")
+
+
+# Global singleton
+_tool_bridge: Optional[AsyncToolBridge] = None
+_tool_bridge_lock = threading.Lock()
+
+
+def get_tool_bridge() -> AsyncToolBridge:
+    """Get or create the global AsyncToolBridge instance."""
+    global _tool_bridge
+    if _tool_bridge is None:
+        with _tool_bridge_lock:
+            if _tool_bridge is None:
+                _tool_bridge = AsyncToolBridge()
+                bridge = _tool_bridge
+                register_queue("tool_bridge", lambda: bridge.get_stats()["in_flight"])
+    return _tool_bridge
+
+
+def run_tool_coroutine(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Convenience function to run a tool coroutine via the global bridge."""
+    return get_tool_bridge().run(coro, timeout=timeout)
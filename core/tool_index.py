@@ -0,0 +1,263 @@
+"""
+Tool Discovery Index
+
+Incremental search index shared by tools/registry.ToolRegistry and
+instruments/instrument_manager.InstrumentManager. Tool discovery runs on
+every agent turn, so the index does its work at registration time:
+
+- Inverted index: field-weighted terms (name > tags > description) are
+  posted when a tool is added and removed when it is unregistered. A lookup
+  touches only the postings of the query terms; unknown terms fall back to
+  prefix matches ("supa" -> "supabase") via a sorted vocabulary.
+- Embeddings (optional): tool texts are embedded once, in one batch at the
+  first lookup after registration, and cached by text so re-registering an
+  unchanged tool costs nothing. Query embeddings go through an LRU cache.
+- Ranking: BM25 keyword scores and cosine similarities are fused with
+  reciprocal rank fusion, as in core/retrieval.py.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.retrieval import RRF_K, EmbeddingCache, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Embeds a batch of texts: List[str] -> List[vector]
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+DEFAULT_FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "category": 1.5, "description": 1.0}
+PREFIX_MATCH_WEIGHT = 0.5
+COMMON_TERM_FRACTION = 0.5
+
+
+class ToolIndex:
+    """Incrementally maintained keyword + embedding index over tools."""
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        field_weights: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        embedding_cache_size: int = 512
+    ):
+        self.embedder = embedder
+        self.field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)  # term -> {key: weighted tf}
+        self._vocabulary: List[str] = []  # Sorted, for prefix lookups
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._norms: Optional[Dict[str, float]] = None  # BM25 length norms, rebuilt after updates
+        self._texts: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+        # Embeddings: text -> vector cache survives re-registration
+        self._text_vectors: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[str] = []
+        self.query_embeddings = EmbeddingCache(embedding_cache_size)
+        self.embedding_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._doc_terms
+
+    # ----- Updates -----
+
+    def add(self, key: str, fields: Dict[str, Any]):
+        """Index (or re-index) a tool.
+
+        Args:
+            key: Unique tool name
+            fields: Field name -> text (lists are joined), e.g. name/description/tags
+        """
+        with self._lock:
+            if key in self._doc_terms:
+                self.remove(key)
+
+            weights: Dict[str, float] = defaultdict(float)
+            texts = []
+            for field_name, value in fields.items():
+                if value is None:
+                    continue
+                text = " ".join(value) if isinstance(value, (list, tuple, set)) else str(value)
+                texts.append(text)
+                weight = self.field_weights.get(field_name, 1.0)
+                for term in tokenize(text):
+                    weights[term] += weight
+
+            for term, weight in weights.items():
+                postings = self._postings[term]
+                if not postings:
+                    bisect.insort(self._vocabulary, term)
+                postings[key] = weight
+
+            length = sum(weights.values())
+            self._doc_terms[key] = dict(weights)
+            self._doc_lengths[key] = length
+            self._total_length += length
+            self._texts[key] = "\n".join(texts)
+            self._norms = None
+            self._matrix = None
+
+    def remove(self, key: str) -> bool:
+        """Drop a tool from the index. Returns False if it was not indexed."""
+        with self._lock:
+            terms = self._doc_terms.pop(key, None)
+            if terms is None:
+                return False
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+                    position = bisect.bisect_left(self._vocabulary, term)
+                    if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                        self._vocabulary.pop(position)
+            self._total_length -= self._doc_lengths.pop(key, 0.0)
+            self._texts.pop(key, None)
+            self._norms = None
+            self._matrix = None
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._vocabulary.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+            self._texts.clear()
+            self._norms = None
+            self._matrix = None
+
+    # ----- Keyword search -----
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Exact term, or vocabulary terms with this prefix at reduced weight."""
+        if term in self._postings:
+            return [(term, 1.0)]
+        expanded = []
+        position = bisect.bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            expanded.append((self._vocabulary[position], PREFIX_MATCH_WEIGHT))
+            position += 1
+        return expanded
+
+    def keyword_search(self, query: str) -> Dict[str, float]:
+        """BM25 scores for every tool matching at least one query term."""
+        with self._lock:
+            n = len(self._doc_terms)
+            if not n:
+                return {}
+            if self._norms is None:
+                avg_length = self._total_length / n or 1.0
+                self._norms = {
+                    key: self.k1 * (1 - self.b + self.b * length / avg_length)
+                    for key, length in self._doc_lengths.items()
+                }
+            norms = self._norms
+            expanded = [pair for query_term in set(tokenize(query)) for pair in self._expand(query_term)]
+            # Terms in most tools ("zapier") add cost, not ranking signal, when rarer terms are present
+            selective = [(t, boost) for t, boost in expanded if len(self._postings[t]) <= n * COMMON_TERM_FRACTION]
+            scores: Dict[str, float] = defaultdict(float)
+            for term, boost in selective or expanded:
+                postings = self._postings[term]
+                weight = boost * (self.k1 + 1) * math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    scores[key] += weight * tf / (tf + norms[key])
+            return scores
+
+    # ----- Vector search -----
+
+    def _ensure_matrix(self):
+        """Embed any tools without a cached vector (one batch), then stack."""
+        if self._matrix is not None:
+            return
+        keys = list(self._texts)
+        missing = sorted({self._texts[k] for k in keys if self._texts[k] not in self._text_vectors})
+        if missing:
+            self.embedding_calls += 1
+            for text, vector in zip(missing, self.embedder(missing)):
+                vector = np.asarray(vector, dtype="float32")
+                norm = np.linalg.norm(vector)
+                self._text_vectors[text] = vector / norm if norm else vector
+        self._matrix_keys = keys
+        self._matrix = np.stack([self._text_vectors[self._texts[k]] for k in keys]) if keys else None
+
+    def vector_search(self, query: str) -> Dict[str, float]:
+        """Cosine similarity of the query to every tool (empty without an embedder)."""
+        if self.embedder is None:
+            return {}
+        with self._lock:
+            self._ensure_matrix()
+            if self._matrix is None:
+                return {}
+            matrix, keys = self._matrix, self._matrix_keys
+
+        query_vector = self.query_embeddings.get("tools", query)
+        if query_vector is None:
+            self.embedding_calls += 1
+            query_vector = np.asarray(self.embedder([query])[0], dtype="float32")
+            norm = np.linalg.norm(query_vector)
+            query_vector = query_vector / norm if norm else query_vector
+            self.query_embeddings.put("tools", query, query_vector)
+        similarities = matrix @ query_vector
+        return {key: float(similarities[i]) for i, key in enumerate(keys)}
+
+    # ----- Ranked lookup -----
+
+    def search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        predicate: Optional[Callable[[str], bool]] = None,
+        min_similarity: float = 0.3
+    ) -> List[Tuple[str, float]]:
+        """Ranked hybrid lookup.
+
+        Args:
+            query: Task description or search terms
+            k: Maximum results (None: all matches)
+            predicate: Optional filter on tool key, applied before truncation
+            min_similarity: Minimum cosine similarity for embedding-only matches
+
+        Returns:
+            (key, fused score) pairs, best first
+        """
+        keyword = self.keyword_search(query)
+        try:
+            vector = self.vector_search(query)
+        except Exception as e:
+            logger.error(f"❌ Tool embedding lookup failed, using keyword ranking: {e}")
+            vector = {}
+
+        fused: Dict[str, float] = defaultdict(float)
+        for rank, key in enumerate(sorted(keyword, key=keyword.__getitem__, reverse=True)):
+            fused[key] += 1.0 / (RRF_K + rank + 1)
+        vector_hits = [key for key, s in vector.items() if s >= min_similarity or key in keyword]
+        for rank, key in enumerate(sorted(vector_hits, key=vector.__getitem__, reverse=True)):
+            fused[key] += 1.0 / (RRF_K + rank + 1)
+
+        items = fused.items()
+        if predicate is not None:
+            items = [(key, score) for key, score in items if predicate(key)]
+        if k is not None:
+            return heapq.nsmallest(k, items, key=lambda kv: (-kv[1], kv[0]))
+        return sorted(items, key=lambda kv: (-kv[1], kv[0]))
@@ -289,6 +289,18 @@ class QuickPipelineStatus(dspy.Signature):
     action_needed: str = dspy.OutputField(desc="What Josh should focus on today (if anything urgent)")
 
 
+class SummarizeConversation(dspy.Signature):
+    """Fold older conversation turns into a running summary.
+    
+    Keep decisions, open questions, named leads/companies and commitments; drop small talk.
+    """
+    
+    previous_summary: str = dspy.InputField(desc="Existing summary of even earlier turns (may be empty)")
+    turns: str = dspy.InputField(desc="Older turns being dropped from the history window")
+    
+    summary: str = dspy.OutputField(desc="Updated summary, at most 5 short sentences")
+
+
 # ============================================================================
 # FOLLOW-UP AGENT SIGNATURES
 # ============================================================================
@@ -349,6 +361,7 @@ __all__ = [
     "StrategyConversation",
     "PipelineAnalysis",
     "GenerateRecommendations",
+    "SummarizeConversation",
     
     # Slack Interface
     "GenerateHelpMessage",
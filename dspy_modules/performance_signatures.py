@@ -189,6 +189,8 @@ class AgentMetrics(BaseModel):
     task_count: int = Field(ge=0)
     performance_score: float = Field(ge=0.0, le=100.0)
     trend: str = Field(pattern="^(improving|stable|degrading)$")
+    p95_latency_ms: float = Field(default=0.0, ge=0.0)
+    cost_usd: float = Field(default=0.0, ge=0.0)
 
 
 class PerformanceAnomaly(BaseModel):
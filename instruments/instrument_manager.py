@@ -1,8 +1,13 @@
 """Instrument Manager - Dynamic tool discovery via semantic search.
 
-Instead of putting all tools in the system prompt, store them in a vector DB
-and discover relevant tools based on the query. This allows unlimited tools
-without prompt bloat.
+Instead of putting all tools in the system prompt, index them and discover
+relevant tools based on the query. This allows unlimited tools without
+prompt bloat.
+
+Discovery uses core.tool_index.ToolIndex: a keyword index updated on
+registration plus instrument embeddings computed once (OpenAI embeddings via
+the instruments AgentMemory when available), so a lookup costs at most one
+cached query embedding instead of a vector-store round-trip.
 """
 
 import logging
@@ -11,7 +16,8 @@ from typing import List, Dict, Callable, Optional, Any
 from dataclasses import dataclass
 import os
 
-from memory.vector_memory import AgentMemory, MemoryType
+from core.tool_index import ToolIndex
+from memory.vector_memory import AgentMemory
 
 logger = logging.getLogger(__name__)
 
@@ -63,11 +69,11 @@ class Instrument:
 
 
 class InstrumentManager:
-    """Manage tools using vector search instead of system prompt.
+    """Manage tools using hybrid search instead of system prompt.
     
     Benefits:
     - Add unlimited tools without bloating prompts
-    - Semantic discovery of relevant tools
+    - Keyword + semantic discovery of relevant tools
     - Dynamic loading based on query
     - Easy categorization and organization
     """
@@ -89,12 +95,14 @@ class InstrumentManager:
         
         self.memory = memory
         self.instruments: Dict[str, Instrument] = {}
-        self.enabled = memory is not None
+        self.index = ToolIndex(embedder=memory.embeddings.embed_documents if memory is not None else None)
+        # Keyword discovery works without FAISS/OpenAI; embeddings add semantic matches
+        self.enabled = True
         
-        if self.enabled:
-            logger.info("✅ Instrument Manager initialized with vector search")
+        if memory is not None:
+            logger.info("✅ Instrument Manager initialized with hybrid search")
         else:
-            logger.warning("⚠️ Instrument Manager disabled (FAISS not available)")
+            logger.warning("⚠️ Instrument Manager using keyword search only (vector memory not available)")
     
     def register_instrument(
         self,
@@ -130,20 +138,13 @@ class InstrumentManager:
                 examples=examples or []
             )
             
-            # Store locally
+            # Store locally and index (embedding is computed on first lookup)
             self.instruments[name] = instrument
-            
-            # Store in vector DB for semantic search
-            if self.memory:
-                self.memory.remember_sync(
-                    content=instrument.to_search_text(),
-                    memory_type=MemoryType.TOOL_RESULT,  # Reusing tool_result type
-                    metadata={
-                        "instrument_name": name,
-                        "category": category,
-                        "signature": instrument.signature
-                    }
-                )
+            self.index.add(name, {
+                "name": name,
+                "category": category,
+                "description": instrument.to_search_text()
+            })
             
             logger.info(f"✅ Registered instrument: {name} ({category})")
             return True
@@ -159,7 +160,7 @@ class InstrumentManager:
         category: Optional[str] = None,
         min_score: float = 0.3
     ) -> List[Instrument]:
-        """Find relevant instruments via semantic search.
+        """Find relevant instruments via hybrid keyword + semantic search.
         
         Args:
             query: The user's query or task description
@@ -170,37 +171,14 @@ class InstrumentManager:
         Returns:
             List of relevant Instrument objects
         """
-        if not self.enabled or not self.memory:
-            # Return all instruments if discovery disabled
-            return list(self.instruments.values())[:k]
-        
         try:
-            # Search for relevant instruments
-            results = self.memory.recall_sync(
-                query=query,
-                k=k * 2,  # Get more, then filter
-                memory_type=MemoryType.TOOL_RESULT,
-                min_score=min_score
+            ranked = self.index.search(
+                query,
+                k=k,
+                predicate=(lambda n: self.instruments[n].category == category) if category else None,
+                min_similarity=min_score
             )
-            
-            # Extract instruments
-            instruments = []
-            seen = set()
-            
-            for result in results:
-                inst_name = result["metadata"].get("instrument_name")
-                if inst_name and inst_name in self.instruments and inst_name not in seen:
-                    instrument = self.instruments[inst_name]
-                    
-                    # Apply category filter if specified
-                    if category and instrument.category != category:
-                        continue
-                    
-                    instruments.append(instrument)
-                    seen.add(inst_name)
-                    
-                    if len(instruments) >= k:
-                        break
+            instruments = [self.instruments[name] for name, _ in ranked]
             
             logger.debug(
                 f"🔍 Discovered {len(instruments)} instruments for: {query[:50]}..."
@@ -233,19 +211,14 @@ class InstrumentManager:
         """Get all unique categories."""
         return list(set(inst.category for inst in self.instruments.values()))
     
-    def save(self):
-        """Persist instruments to disk."""
-        if self.memory:
-            self.memory.save()
-            logger.info("💾 Saved instruments to disk")
-    
     def get_stats(self) -> Dict[str, Any]:
         """Get instrument manager statistics."""
         return {
             "enabled": self.enabled,
             "total_instruments": len(self.instruments),
             "categories": self.get_categories(),
-            "memory_stats": self.memory.get_stats() if self.memory else None
+            "semantic_search": self.index.embedder is not None,
+            "embedding_calls": self.index.embedding_calls
         }
 
 
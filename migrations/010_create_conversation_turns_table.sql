@@ -0,0 +1,32 @@
+-- Migration 010: Create Conversation Turns Tables
+-- Created: 2025-10-27
+-- Purpose: Persist StrategyAgent chat history across deploys (core/conversation_store.py)
+
+-- ============================================================================
+-- CONVERSATION TURNS TABLE
+-- ============================================================================
+-- One row per chat message. The store keeps only the newest
+-- CONVERSATION_MAX_TURNS rows per user and trims older ones.
+-- (Created automatically by PostgresConversationBackend if missing.)
+
+CREATE TABLE IF NOT EXISTS conversation_turns (
+    id BIGSERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_turns_user
+    ON conversation_turns(user_id, id DESC);
+
+-- ============================================================================
+-- CONVERSATION SUMMARIES TABLE
+-- ============================================================================
+-- Running summary of turns evicted from the window (CONVERSATION_SUMMARIES=true)
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    user_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,21 @@
+-- Migration 011: Create Webhook Receipts Table
+-- Created: 2025-10-28
+-- Purpose: Persistent idempotency index for webhook deliveries (core/idempotency.py)
+
+-- ============================================================================
+-- WEBHOOK RECEIPTS TABLE
+-- ============================================================================
+-- One row per provider event ID (Typeform event_id/token, Slack event_id,
+-- VAPI call ID + message type). A conflicting insert means the delivery is a
+-- retry and is dropped. Rows older than WEBHOOK_DEDUPE_RETENTION_HOURS are purged.
+-- (Created automatically by PostgresReceiptBackend if missing.)
+
+CREATE TABLE IF NOT EXISTS webhook_receipts (
+    source TEXT NOT NULL,
+    event_key TEXT NOT NULL,
+    received_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source, event_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_webhook_receipts_received_at
+    ON webhook_receipts(received_at);
@@ -0,0 +1,41 @@
+-- Migration 012: Create Campaigns Table
+-- Created: 2025-10-29
+-- Purpose: Durable ABM campaign documents with a due-touchpoint index (core/campaign_store.py)
+
+-- ============================================================================
+-- CAMPAIGNS TABLE
+-- ============================================================================
+-- One row per AccountOrchestrator campaign. The full row is written once at
+-- creation; later steps update only the columns they touched.
+-- next_touchpoint_at is the persistent mirror of the store's in-memory
+-- due-time heap: sweeps select and claim active campaigns with
+-- next_touchpoint_at <= now (setting it to NULL), so a sweep reads only due
+-- campaigns and two instances never run the same step.
+
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id TEXT PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    -- Status: active, paused, completed, cancelled
+    pause_reason TEXT,
+
+    contacts JSONB NOT NULL DEFAULT '[]'::jsonb,
+    current_step INTEGER NOT NULL DEFAULT 0,
+    touchpoints JSONB NOT NULL DEFAULT '[]'::jsonb,
+    scheduled_touchpoints JSONB NOT NULL DEFAULT '[]'::jsonb,
+    metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    next_touchpoint_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_updated TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Due-touchpoint index: only active, scheduled campaigns
+CREATE INDEX IF NOT EXISTS idx_campaigns_next_touchpoint_at
+    ON campaigns(next_touchpoint_at)
+    WHERE status = 'active' AND next_touchpoint_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_campaigns_account_id ON campaigns(account_id);
+
+COMMENT ON TABLE campaigns IS 'ABM campaigns run by AccountOrchestrator';
+COMMENT ON COLUMN campaigns.next_touchpoint_at IS 'When the next step is due (NULL: not scheduled or claimed by a sweep)';
@@ -0,0 +1,364 @@
+"""
+Performance Metrics Pipeline
+
+Numeric per-agent statistics for PerformanceAgent. Previously each 30-minute
+run sent JSON blobs of spans/logs to an LLM once per agent to "compute"
+success rates and latencies (from mock data); this computes them directly.
+
+Inputs:
+- Agent-call spans recorded in-process by core.metrics.agent_call
+- agent_state rows from Supabase (all replicas, survives restarts)
+
+Per agent, spans are authoritative when the window has any (they carry
+latency and status for every call); agent_state rows fill in agents without
+local spans. Percentiles are computed for all agents at once with numpy.
+
+Baselines are exponentially weighted moving averages (+ variance) persisted
+to PERFORMANCE_BASELINE_PATH (default data/performance_baselines.json), so
+anomalies are scored as z-scores against each agent's own history.
+
+Configuration (environment variables):
+- PERFORMANCE_BASELINE_PATH: baseline file (default data/performance_baselines.json)
+- PERFORMANCE_EWMA_ALPHA: weight of the newest window (default 0.2)
+- PERFORMANCE_ANOMALY_Z: z-score that counts as an anomaly (default 3.0)
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.atomic_file import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = "data/performance_baselines.json"
+PERCENTILES = (50.0, 95.0, 99.0)
+
+# Windows needed before a baseline is trusted for anomaly detection
+MIN_BASELINE_SAMPLES = 3
+
+# Noise floors so a perfectly steady history does not turn 1ms jitter into z=50
+MIN_LATENCY_STD_MS = 50.0
+MIN_RATE_STD = 0.02
+
+
+@dataclass
+class AgentStats:
+    """Per-agent statistics for one monitoring window."""
+    agent_name: str
+    task_count: int
+    error_count: int
+    success_rate: float  # 0-100
+    error_rate: float  # 0-1
+    avg_latency_ms: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    p99_latency_ms: float
+    tokens: int = 0
+    cost_usd: float = 0.0
+    source: str = "spans"
+
+
+@dataclass
+class Baseline:
+    """EWMA mean/variance of an agent's window statistics."""
+    success_rate: float
+    success_rate_var: float
+    error_rate: float
+    error_rate_var: float
+    p95_latency_ms: float
+    p95_latency_var: float
+    samples: int = 1
+    updated_at: str = ""
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+def _group_percentiles(groups: np.ndarray, values: np.ndarray, n_groups: int, qs: Iterable[float]) -> np.ndarray:
+    """Linear-interpolated percentiles of `values` per group, all groups at once.
+
+    Equivalent to np.percentile per group (NaN values ignored); returns an
+    array of shape (n_groups, len(qs)) with NaN for groups without values.
+    """
+    qs = np.asarray(list(qs), dtype=float) / 100.0
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full((n_groups, len(qs)), np.nan)
+    has_values = counts > 0
+    if not has_values.any():
+        return result
+
+    # Fractional rank of each percentile inside each group's sorted slice
+    rank = (counts[has_values, None] - 1) * qs[None, :]
+    lower = np.floor(rank).astype(int)
+    upper = np.ceil(rank).astype(int)
+    base = starts[has_values, None]
+    low_values = values[base + lower]
+    high_values = values[base + upper]
+    result[has_values] = low_values + (high_values - low_values) * (rank - lower)
+    return result
+
+
+def _samples_from_spans(spans: List[Any]) -> List[Tuple[str, float, bool, int, float]]:
+    return [
+        (
+            s.agent,
+            s.duration_s * 1000.0,
+            s.status == "ok",
+            s.prompt_tokens + s.completion_tokens,
+            s.cost,
+        )
+        for s in spans
+    ]
+
+
+def _samples_from_state_rows(rows: List[Dict[str, Any]]) -> List[Tuple[str, float, bool, int, float]]:
+    samples = []
+    for row in rows:
+        state = row.get("state_data") or {}
+        latency = state.get("processing_time_ms") if isinstance(state, dict) else None
+        samples.append((
+            row.get("agent_name") or "unknown",
+            float(latency) if isinstance(latency, (int, float)) else np.nan,
+            (row.get("status") or "").lower() not in ("failed", "error"),
+            0,
+            0.0,
+        ))
+    return samples
+
+
+def compute_agent_stats(
+    spans: List[Any],
+    state_rows: List[Dict[str, Any]],
+    agents: Optional[List[str]] = None
+) -> Dict[str, AgentStats]:
+    """Aggregate spans + agent_state rows into per-agent window statistics.
+
+    Args:
+        spans: core.metrics.SpanRecord objects for the window
+        state_rows: agent_state rows (agent_name, status, state_data) for the window
+        agents: Restrict to these agents (default: every agent seen)
+
+    Returns:
+        agent name -> AgentStats (agents with no activity are omitted)
+    """
+    span_agents = {s.agent for s in spans}
+    samples = _samples_from_spans(spans)
+    samples += _samples_from_state_rows([r for r in state_rows if r.get("agent_name") not in span_agents])
+    if agents is not None:
+        wanted = set(agents)
+        samples = [s for s in samples if s[0] in wanted]
+    if not samples:
+        return {}
+
+    names = np.array([s[0] for s in samples])
+    latencies = np.array([s[1] for s in samples], dtype=float)
+    ok = np.array([s[2] for s in samples], dtype=bool)
+    tokens = np.array([s[3] for s in samples], dtype=float)
+    costs = np.array([s[4] for s in samples], dtype=float)
+
+    agent_names, groups = np.unique(names, return_inverse=True)
+    n = len(agent_names)
+    counts = np.bincount(groups, minlength=n)
+    errors = np.bincount(groups, weights=(~ok).astype(float), minlength=n)
+    token_sums = np.bincount(groups, weights=tokens, minlength=n)
+    cost_sums = np.bincount(groups, weights=costs, minlength=n)
+
+    latency_valid = ~np.isnan(latencies)
+    latency_counts = np.bincount(groups[latency_valid], minlength=n)
+    latency_sums = np.bincount(groups[latency_valid], weights=latencies[latency_valid], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(latency_counts > 0, latency_sums / np.maximum(latency_counts, 1), 0.0)
+    percentiles = np.nan_to_num(_group_percentiles(groups, latencies, n, PERCENTILES), nan=0.0)
+
+    stats = {}
+    for i, agent in enumerate(agent_names):
+        agent = str(agent)
+        error_rate = float(errors[i] / counts[i])
+        stats[agent] = AgentStats(
+            agent_name=agent,
+            task_count=int(counts[i]),
+            error_count=int(errors[i]),
+            success_rate=round(100.0 * (1.0 - error_rate), 2),
+            error_rate=round(error_rate, 4),
+            avg_latency_ms=round(float(means[i]), 1),
+            p50_latency_ms=round(float(percentiles[i, 0]), 1),
+            p95_latency_ms=round(float(percentiles[i, 1]), 1),
+            p99_latency_ms=round(float(percentiles[i, 2]), 1),
+            tokens=int(token_sums[i]),
+            cost_usd=round(float(cost_sums[i]), 6),
+            source="spans" if agent in span_agents else "agent_state",
+        )
+    return stats
+
+
+# ============================================================================
+# Scoring against baselines
+# ============================================================================
+
+def _z(value: float, mean: float, var: float, floor: float) -> float:
+    return (value - mean) / max(float(np.sqrt(var)), floor)
+
+
+def performance_score(stats: AgentStats, baseline: Optional[Baseline]) -> float:
+    """0-100: 70% success rate, 30% p95 latency relative to baseline."""
+    latency_score = 100.0
+    if baseline and baseline.p95_latency_ms > 0 and stats.p95_latency_ms > 0:
+        latency_score = 100.0 * min(1.0, baseline.p95_latency_ms / stats.p95_latency_ms)
+    return round(float(np.clip(0.7 * stats.success_rate + 0.3 * latency_score, 0.0, 100.0)), 1)
+
+
+def trend(stats: AgentStats, baseline: Optional[Baseline]) -> str:
+    """improving / stable / degrading relative to the EWMA baseline."""
+    if baseline is None or baseline.samples < MIN_BASELINE_SAMPLES:
+        return "stable"
+    success_delta = stats.success_rate - baseline.success_rate
+    latency_ratio = (stats.p95_latency_ms / baseline.p95_latency_ms) if baseline.p95_latency_ms else 1.0
+    if success_delta <= -5.0 or latency_ratio >= 1.25:
+        return "degrading"
+    if success_delta >= 5.0 or latency_ratio <= 0.8:
+        return "improving"
+    return "stable"
+
+
+def _severity(z: float) -> str:
+    if z >= 8:
+        return "critical"
+    if z >= 5:
+        return "high"
+    if z >= 4:
+        return "medium"
+    return "low"
+
+
+def detect_anomalies(
+    stats: Dict[str, AgentStats],
+    baselines: Dict[str, Baseline],
+    z_threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Flag windows that deviate from each agent's baseline.
+
+    Returns:
+        dicts shaped like PerformanceAnomaly (agent_name, anomaly_type,
+        severity, root_cause, recommended_action, details)
+    """
+    z_threshold = z_threshold if z_threshold is not None else float(os.getenv("PERFORMANCE_ANOMALY_Z", "3.0"))
+    anomalies = []
+    for agent, current in stats.items():
+        baseline = baselines.get(agent)
+        if baseline is None or baseline.samples < MIN_BASELINE_SAMPLES:
+            continue
+
+        latency_z = _z(current.p95_latency_ms, baseline.p95_latency_ms, baseline.p95_latency_var, MIN_LATENCY_STD_MS)
+        error_z = _z(current.error_rate, baseline.error_rate, baseline.error_rate_var, MIN_RATE_STD)
+
+        if current.p95_latency_ms > 0 and latency_z >= z_threshold:
+            anomalies.append({
+                "agent_name": agent,
+                "anomaly_type": "latency_regression",
+                "severity": _severity(latency_z),
+                "root_cause": (
+                    f"p95 latency {current.p95_latency_ms:.0f}ms vs baseline "
+                    f"{baseline.p95_latency_ms:.0f}ms (z={latency_z:.1f})"
+                ),
+                "recommended_action": "Check /metrics lm_call_seconds and tool_call_seconds for the slow stage",
+                "details": json.dumps(asdict(current)),
+            })
+
+        # At least two failures, so a single error in a quiet window is not an alert
+        if current.error_count >= 2 and error_z >= z_threshold:
+            severity = "critical" if current.error_rate >= 0.5 and current.task_count >= 5 else _severity(error_z)
+            anomalies.append({
+                "agent_name": agent,
+                "anomaly_type": "error_rate_spike",
+                "severity": severity,
+                "root_cause": (
+                    f"error rate {current.error_rate:.0%} ({current.error_count}/{current.task_count}) "
+                    f"vs baseline {baseline.error_rate:.0%} (z={error_z:.1f})"
+                ),
+                "recommended_action": "Inspect hume_errors_total by component and recent deploys",
+                "details": json.dumps(asdict(current)),
+            })
+    return anomalies
+
+
+# ============================================================================
+# EWMA baselines
+# ============================================================================
+
+def _ewma(mean: float, var: float, value: float, alpha: float) -> Tuple[float, float]:
+    """Exponentially weighted mean and variance update."""
+    delta = value - mean
+    mean = mean + alpha * delta
+    var = (1 - alpha) * (var + alpha * delta * delta)
+    return mean, var
+
+
+class BaselineStore:
+    """Per-agent EWMA baselines persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, alpha: Optional[float] = None):
+        self.path = path or os.getenv("PERFORMANCE_BASELINE_PATH", DEFAULT_BASELINE_PATH)
+        self.alpha = alpha if alpha is not None else float(os.getenv("PERFORMANCE_EWMA_ALPHA", "0.2"))
+        self._lock = threading.Lock()
+        self._baselines: Dict[str, Baseline] = self._load()
+
+    def _load(self) -> Dict[str, Baseline]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {name: Baseline(**data) for name, data in json.load(f).items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"❌ Unreadable performance baselines {self.path}: {e}")
+            return {}
+
+    def all(self) -> Dict[str, Baseline]:
+        with self._lock:
+            return dict(self._baselines)
+
+    def get(self, agent: str) -> Optional[Baseline]:
+        with self._lock:
+            return self._baselines.get(agent)
+
+    def update(self, stats: Dict[str, AgentStats]):
+        """Fold one window into the baselines and persist them."""
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            for agent, current in stats.items():
+                baseline = self._baselines.get(agent)
+                if baseline is None:
+                    self._baselines[agent] = Baseline(
+                        success_rate=current.success_rate, success_rate_var=0.0,
+                        error_rate=current.error_rate, error_rate_var=0.0,
+                        p95_latency_ms=current.p95_latency_ms, p95_latency_var=0.0,
+                        samples=1, updated_at=now
+                    )
+                    continue
+                baseline.success_rate, baseline.success_rate_var = _ewma(
+                    baseline.success_rate, baseline.success_rate_var, current.success_rate, self.alpha)
+                baseline.error_rate, baseline.error_rate_var = _ewma(
+                    baseline.error_rate, baseline.error_rate_var, current.error_rate, self.alpha)
+                if current.p95_latency_ms > 0:
+                    baseline.p95_latency_ms, baseline.p95_latency_var = _ewma(
+                        baseline.p95_latency_ms, baseline.p95_latency_var, current.p95_latency_ms, self.alpha)
+                baseline.samples += 1
+                baseline.updated_at = now
+            self._save()
+
+    def _save(self):
+        atomic_write_json(self.path, {name: asdict(b) for name, b in self._baselines.items()}, indent=2)
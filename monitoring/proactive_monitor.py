@@ -4,8 +4,8 @@ This system continuously monitors production logs, detects anomalies,
 generates fixes using DSPy, and proposes them to Josh via Slack for approval.
 
 Pattern:
-1. Monitor logs continuously (Railway + Phoenix)
-2. Detect anomalies (errors, performance issues, patterns)
+1. Monitor logs continuously (local file / stdin stream, or Railway CLI polling)
+2. Detect anomalies (errors, performance issues, patterns) as rate changes
 3. Analyze root cause 
 4. Generate fix (code generation)
 5. Post to Slack for approval
@@ -16,15 +16,21 @@ Phase 0.6 - October 20, 2025
 
 import asyncio
 import logging
+import math
 import os
 import re
+import sys
+import time
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Any, Optional, TextIO, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import OrderedDict, deque
 import dspy
 import httpx
 
+from core.metrics import LATENCY_BUCKETS
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,119 +110,417 @@ class GenerateFix(dspy.Signature):
     )
 
 
-# ===== Log Analyzer =====
+# ===== Streaming Log Analyzer =====
+
+# Variable parts of a log line, replaced in one pass to fingerprint it
+_VARIABLE_PARTS = re.compile(
+    r'(?P<ts>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,.]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)'
+    r'|(?P<event>\d{10,}\.\d+_[A-Z0-9_]+)'
+    r'|(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'
+    r'|(?P<num>\d+(?:\.\d+)?)'
+)
+_PLACEHOLDERS = {"ts": "", "event": "[EVENT_ID]", "uuid": "[UUID]", "num": "[NUM]"}
+
+# "took 1.2s", "in 450ms", "duration=3.1s", "⚡ 2.40s | $0.01": match the number + unit
+# first (cheap), then require a latency word right before it
+_DURATION = re.compile(r'(?<=[\s=:⚡])(\d+(?:\.\d+)?)\s?(ms|s)\b')
+_DURATION_CONTEXT = re.compile(r'(?:\b(?:took|in|after|duration|latency|elapsed)\b[=:]?\s*|⚡\s*)$', re.IGNORECASE)
+# "processing_time_ms": 812
+_DURATION_MS_FIELD = re.compile(r'_ms["\']?\s*[=:]\s*(\d+(?:\.\d+)?)')
+# Durations that are waits, not work ("Retrying in 5s", "timeout=30s")
+_NOT_LATENCY = re.compile(r'\b(?:retry|retrying|sleep|sleeping|wait|waiting|timeout|backoff)\b', re.IGNORECASE)
+
+_ERROR_MARKERS = ("ERROR", "❌", "CRITICAL")
+
+
+class _RollingCounts:
+    """Per-bucket event counts over a ring of fixed-width time buckets."""
+
+    __slots__ = ("counts", "total", "last_bucket", "first_bucket")
+
+    def __init__(self, size: int, bucket: int):
+        self.counts = [0] * size
+        self.total = 0
+        self.last_bucket = bucket
+        self.first_bucket = bucket
+
+    def add(self, bucket: int):
+        size = len(self.counts)
+        if bucket > self.last_bucket:
+            if bucket - self.last_bucket >= size:
+                self.counts = [0] * size
+                self.total = 0
+            else:
+                for b in range(self.last_bucket + 1, bucket + 1):
+                    self.total -= self.counts[b % size]
+                    self.counts[b % size] = 0
+            self.last_bucket = bucket
+        elif self.last_bucket - bucket >= size:
+            return  # Older than the ring, drop
+        self.counts[bucket % size] += 1
+        self.total += 1
+
+    def window(self, buckets: int) -> int:
+        size = len(self.counts)
+        return sum(self.counts[b % size] for b in range(self.last_bucket - buckets + 1, self.last_bucket + 1))
+
+
+def _poisson_tail(count: int, expected: float) -> float:
+    """P(X >= count) for X ~ Poisson(expected)."""
+    if expected <= 0:
+        return 0.0 if count > 0 else 1.0
+    term = math.exp(-expected)
+    below = 0.0
+    for i in range(count):
+        below += term
+        term *= expected / (i + 1)
+    return max(0.0, 1.0 - below)
+
+
+class _LatencyHistogram:
+    """Bucketed durations for one operation (core.metrics latency buckets)."""
+
+    __slots__ = ("counts", "total")
 
-class LogAnalyzer:
-    """Analyzes logs to detect anomalies and patterns."""
-    
     def __init__(self):
-        """Initialize log analyzer."""
-        self.error_counts = defaultdict(int)
-        self.error_last_seen = {}
-        self.performance_metrics = []
-        
-    def analyze_logs(self, log_lines: List[str]) -> List[LogAnomaly]:
-        """Analyze log lines and detect anomalies.
-        
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing quantile q, None if empty."""
+        if not self.total:
+            return None
+        rank, running = q * self.total, 0
+        for i, n in enumerate(self.counts):
+            running += n
+            if running >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+
+class _PatternState:
+    """Rolling state for one tracked pattern."""
+
+    __slots__ = ("counts", "samples", "latency", "last_alert")
+
+    def __init__(self, size: int, bucket: int):
+        self.counts = _RollingCounts(size, bucket)
+        self.samples: deque = deque(maxlen=5)
+        self.latency: Optional[_LatencyHistogram] = None
+        self.last_alert: Optional[float] = None
+
+
+class LogAnalyzer:
+    """Streaming log anomaly detector.
+
+    Consumes log lines one at a time (feed) and keeps, per pattern, rolling
+    counts in fixed time buckets. An anomaly is raised when a pattern's count
+    in the current window is improbable under its rate over the preceding
+    history (Poisson tail below rate_p_value), or reaches the minimum count
+    for a pattern with no history. A burst is reported on the line that
+    completes it rather than at the next poll.
+
+    Patterns tracked:
+    - error: ERROR/CRITICAL/❌ lines, grouped by fingerprint (variable parts stripped)
+    - performance: token truncation warnings; operations slower than slow_seconds
+      (durations are parsed into per-operation latency histograms)
+    - pattern: duplicate Slack event spikes
+
+    Line timestamps (asctime / ISO prefix) drive the clock when present, so
+    replaying a file detects the same bursts as watching it live.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 10,
+        window_buckets: int = 6,
+        history_buckets: int = 360,
+        rate_ratio: float = 3.0,
+        rate_p_value: float = 1e-5,
+        slow_seconds: float = 10.0,
+        alert_cooldown_seconds: float = 600.0,
+        max_patterns: int = 2000
+    ):
+        """Initialize log analyzer.
+
         Args:
-            log_lines: Recent log lines to analyze
-        
+            bucket_seconds: Width of one count bucket
+            window_buckets: Buckets in the current window (default 60s)
+            history_buckets: Buckets kept per pattern, including the window (default 1 hour)
+            rate_ratio: Window count must be at least rate_ratio x the historical rate...
+            rate_p_value: ...and have a Poisson tail probability below this
+            slow_seconds: Durations at/above this count as slow operations
+            alert_cooldown_seconds: Minimum time between alerts for one pattern
+            max_patterns: Tracked patterns (least recently seen are evicted)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.history_buckets = max(history_buckets, window_buckets + 1)
+        self.rate_ratio = rate_ratio
+        self.rate_p_value = rate_p_value
+        self.slow_seconds = slow_seconds
+        self.alert_cooldown_seconds = alert_cooldown_seconds
+        self.max_patterns = max_patterns
+
+        self._patterns: "OrderedDict[str, _PatternState]" = OrderedDict()
+        self._started_bucket: Optional[int] = None
+        self.lines_processed = 0
+
+    # ----- Input -----
+
+    def feed(self, line: str, now: Optional[float] = None) -> List[LogAnomaly]:
+        """Process one log line.
+
+        Args:
+            line: Raw log line
+            now: Event time (epoch seconds); defaults to the line's timestamp or wall clock
+
         Returns:
-            List of detected anomalies
+            Anomalies completed by this line (usually empty)
         """
+        line = line.rstrip("\n")
+        if not line:
+            return []
+        self.lines_processed += 1
+        if now is None:
+            now = self._line_time(line)
+        if self._started_bucket is None:
+            self._started_bucket = int(now // self.bucket_seconds)
+
         anomalies = []
-        
-        # Detect error patterns
-        anomalies.extend(self._detect_error_patterns(log_lines))
-        
-        # Detect performance issues
-        anomalies.extend(self._detect_performance_issues(log_lines))
-        
-        # Detect unusual patterns
-        anomalies.extend(self._detect_unusual_patterns(log_lines))
-        
+
+        if any(marker in line for marker in _ERROR_MARKERS):
+            key = "error:" + self._extract_error_pattern(line)
+            anomalies.extend(self._record(key, line, now, self._error_rule))
+
+        if "runcated" in line:
+            anomalies.extend(self._record("performance:token_truncation", line, now, self._truncation_rule))
+
+        if "Duplicate Slack event" in line:
+            anomalies.extend(self._record("pattern:duplicate_spike", line, now, self._duplicate_rule))
+
+        seconds = self._parse_duration(line)
+        if seconds is not None:
+            operation = self._extract_error_pattern(line)
+            self._latency(operation, now).observe(seconds)
+            if seconds >= self.slow_seconds:
+                anomalies.extend(self._record("slow:" + operation, line, now, self._slow_rule))
+
         return anomalies
-    
-    def _detect_error_patterns(self, log_lines: List[str]) -> List[LogAnomaly]:
-        """Detect error patterns in logs."""
+
+    def analyze_logs(self, log_lines: List[str]) -> List[LogAnomaly]:
+        """Feed a batch of log lines.
+
+        Args:
+            log_lines: New log lines, oldest first
+
+        Returns:
+            List of detected anomalies
+        """
         anomalies = []
-        error_patterns = defaultdict(list)
-        
-        # Group errors by pattern
         for line in log_lines:
-            if "ERROR" in line or "❌" in line or "CRITICAL" in line:
-                # Extract error pattern (remove timestamps, IDs, etc.)
-                pattern = self._extract_error_pattern(line)
-                error_patterns[pattern].append(line)
-        
-        # Check for repeated errors
-        for pattern, lines in error_patterns.items():
-            if len(lines) >= 3:  # 3+ occurrences = anomaly
-                anomalies.append(LogAnomaly(
-                    timestamp=datetime.utcnow(),
-                    severity="HIGH" if len(lines) >= 5 else "MEDIUM",
-                    category="error",
-                    description=f"Repeated error pattern detected ({len(lines)} occurrences)",
-                    log_lines=lines[:5],  # First 5 samples
-                    frequency=len(lines),
-                    context={"pattern": pattern}
-                ))
-        
-        return anomalies
-    
-    def _detect_performance_issues(self, log_lines: List[str]) -> List[LogAnomaly]:
-        """Detect performance degradation."""
-        anomalies = []
-        
-        # Look for truncation warnings (sign of inefficiency)
-        truncations = [line for line in log_lines if "truncated" in line.lower()]
-        if len(truncations) >= 2:
-            anomalies.append(LogAnomaly(
-                timestamp=datetime.utcnow(),
-                severity="MEDIUM",
-                category="performance",
-                description=f"Token truncation warnings ({len(truncations)} occurrences)",
-                log_lines=truncations[:3],
-                frequency=len(truncations),
-                context={"type": "token_truncation"}
-            ))
-        
-        # Look for slow operations (>10s)
-        # TODO: Parse timing from logs
-        
-        return anomalies
-    
-    def _detect_unusual_patterns(self, log_lines: List[str]) -> List[LogAnomaly]:
-        """Detect unusual patterns that might indicate issues."""
-        anomalies = []
-        
-        # Check for unusually high duplicate detection
-        duplicates = [line for line in log_lines if "Duplicate Slack event" in line]
-        if len(duplicates) >= 10:  # More than 10 duplicates = potential issue
-            anomalies.append(LogAnomaly(
-                timestamp=datetime.utcnow(),
-                severity="LOW",
-                category="pattern",
-                description=f"Unusually high duplicate event rate ({len(duplicates)} in logs)",
-                log_lines=duplicates[:5],
-                frequency=len(duplicates),
-                context={"type": "duplicate_spike"}
-            ))
-        
+            anomalies.extend(self.feed(line))
         return anomalies
-    
+
+    def latency_quantile(self, operation: str, q: float) -> Optional[float]:
+        """Approximate latency quantile (seconds) for an operation fingerprint."""
+        state = self._patterns.get("latency:" + operation)
+        return state.latency.quantile(q) if state and state.latency else None
+
+    # ----- Rules: (category, min_count, severity, description, context) -----
+
+    def _error_rule(self, key: str, count: int):
+        severity = "HIGH" if count >= 5 else "MEDIUM"
+        return "error", 3, severity, f"Error pattern spike ({count} in {self._window_label()})", {
+            "pattern": key[len("error:"):]
+        }
+
+    def _truncation_rule(self, key: str, count: int):
+        return "performance", 2, "MEDIUM", f"Token truncation warnings ({count} in {self._window_label()})", {
+            "type": "token_truncation"
+        }
+
+    def _duplicate_rule(self, key: str, count: int):
+        return "pattern", 10, "LOW", f"Unusually high duplicate event rate ({count} in {self._window_label()})", {
+            "type": "duplicate_spike"
+        }
+
+    def _slow_rule(self, key: str, count: int):
+        operation = key[len("slow:"):]
+        p50 = self.latency_quantile(operation, 0.5)
+        p95 = self.latency_quantile(operation, 0.95)
+        severity = "HIGH" if p95 is not None and p95 >= 3 * self.slow_seconds else "MEDIUM"
+        return "performance", 3, severity, (
+            f"Slow operations ≥{self.slow_seconds:.0f}s ({count} in {self._window_label()})"
+        ), {"type": "slow_operation", "pattern": operation, "p50_seconds": p50, "p95_seconds": p95}
+
+    # ----- Rolling state -----
+
+    def _state(self, key: str, bucket: int) -> _PatternState:
+        state = self._patterns.get(key)
+        if state is None:
+            state = _PatternState(self.history_buckets, bucket)
+            self._patterns[key] = state
+            if len(self._patterns) > self.max_patterns:
+                self._patterns.popitem(last=False)
+        else:
+            self._patterns.move_to_end(key)
+        return state
+
+    def _latency(self, operation: str, now: float) -> _LatencyHistogram:
+        state = self._state("latency:" + operation, int(now // self.bucket_seconds))
+        if state.latency is None:
+            state.latency = _LatencyHistogram()
+        return state.latency
+
+    def _record(self, key: str, line: str, now: float, rule) -> List[LogAnomaly]:
+        bucket = int(now // self.bucket_seconds)
+        state = self._state(key, bucket)
+        state.counts.add(bucket)
+        state.samples.append(line)
+
+        count = state.counts.window(self.window_buckets)
+        category, min_count, severity, description, context = rule(key, count)
+        if count < min_count:
+            return []
+        if state.last_alert is not None and now - state.last_alert < self.alert_cooldown_seconds:
+            return []
+
+        # Rate over the history preceding the window, scaled to one window
+        history_span = min(
+            self.history_buckets - self.window_buckets,
+            max(0, state.counts.last_bucket - state.counts.first_bucket + 1 - self.window_buckets)
+        )
+        # Everything looks new in the analyzer's first window; wait for a window of history
+        if history_span < self.window_buckets and \
+                state.counts.first_bucket < self._started_bucket + self.window_buckets:
+            return []
+        expected = 0.0
+        if history_span:
+            expected = (state.counts.total - count) * self.window_buckets / history_span
+        if count < self.rate_ratio * expected or _poisson_tail(count, expected) >= self.rate_p_value:
+            return []
+
+        state.last_alert = now
+        context = dict(context, window_count=count, expected_count=round(expected, 2))
+        return [LogAnomaly(
+            timestamp=datetime.utcfromtimestamp(now),
+            severity=severity,
+            category=category,
+            description=description,
+            log_lines=list(state.samples),
+            frequency=count,
+            context=context
+        )]
+
+    # ----- Parsing -----
+
+    def _window_label(self) -> str:
+        return f"{self.window_buckets * self.bucket_seconds}s"
+
+    def _parse_duration(self, line: str) -> Optional[float]:
+        """Seconds reported by a latency line, None if the line has no latency."""
+        seconds = None
+        for match in _DURATION.finditer(line):
+            if _DURATION_CONTEXT.search(line, max(0, match.start() - 12), match.start()):
+                seconds = float(match.group(1)) / (1000.0 if match.group(2) == "ms" else 1.0)
+                break
+        if seconds is None and "_ms" in line:
+            match = _DURATION_MS_FIELD.search(line)
+            if match:
+                seconds = float(match.group(1)) / 1000.0
+        if seconds is None or _NOT_LATENCY.search(line):
+            return None
+        return seconds
+
+    def _line_time(self, line: str) -> float:
+        """Epoch time from an asctime/ISO prefix, else the wall clock."""
+        if len(line) >= 19 and line[4] == "-" and line[10] in " T":
+            try:
+                return datetime.fromisoformat(line[:23].replace(",", ".")).timestamp()
+            except ValueError:
+                pass
+        return time.time()
+
     def _extract_error_pattern(self, log_line: str) -> str:
         """Extract error pattern by removing variable parts."""
-        # Remove timestamps
-        pattern = re.sub(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}', '', log_line)
-        # Remove event IDs
-        pattern = re.sub(r'\d{10,}\.\d+_[A-Z0-9_]+', '[EVENT_ID]', pattern)
-        # Remove UUIDs
-        pattern = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', '[UUID]', pattern)
-        # Remove numbers
-        pattern = re.sub(r'\b\d+\b', '[NUM]', pattern)
-        
-        return pattern.strip()
+        return _VARIABLE_PARTS.sub(lambda m: _PLACEHOLDERS[m.lastgroup], log_line).strip()
+
+
+# ===== Log Sources =====
+
+async def tail_file(path: str, from_end: bool = True, poll_interval: float = 0.5) -> AsyncIterator[str]:
+    """Yield lines appended to a file, following truncation and rotation.
+
+    Args:
+        path: Log file path
+        from_end: Start at the current end of file (False: replay it first)
+        poll_interval: Seconds to wait when no new data is available
+    """
+    handle = None
+    inode = None
+    partial = ""
+    try:
+        while True:
+            if handle is None:
+                try:
+                    handle = open(path, "r", encoding="utf-8", errors="replace")
+                except FileNotFoundError:
+                    await asyncio.sleep(poll_interval)
+                    continue
+                inode = os.fstat(handle.fileno()).st_ino
+                if from_end:
+                    handle.seek(0, os.SEEK_END)
+                from_end = False  # Files that appear after a rotation are read from the start
+
+            chunk = await asyncio.to_thread(handle.readlines, 1 << 16)
+            if chunk:
+                for line in chunk:
+                    if line.endswith("\n"):
+                        yield partial + line
+                        partial = ""
+                    else:
+                        partial += line
+                continue
+
+            await asyncio.sleep(poll_interval)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_ino != inode or stat.st_size < handle.tell():
+                handle.close()
+                handle = None
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+async def read_stream(stream: Optional[TextIO] = None) -> AsyncIterator[str]:
+    """Yield lines from a text stream (default stdin) until EOF."""
+    stream = stream or sys.stdin
+    while True:
+        line = await asyncio.to_thread(stream.readline)
+        if not line:
+            return
+        yield line
+
+
+def lines_after_overlap(previous: List[str], current: List[str]) -> List[str]:
+    """Lines of `current` past its overlap with the end of `previous`.
+
+    Consecutive `railway logs --lines N` polls return overlapping windows; the
+    overlap is the longest tail of the previous window that starts the new
+    one, so a line repeated in the log is still fed once per occurrence.
+    """
+    for overlap in range(min(len(previous), len(current)), 0, -1):
+        if previous[-overlap:] == current[:overlap]:
+            return current[overlap:]
+    return current
 
 
 # ===== Proactive Monitor =====
@@ -234,6 +538,7 @@ class ProactiveMonitor:
         self.log_analyzer = LogAnalyzer()
         self.active_anomalies: Dict[str, LogAnomaly] = {}
         self.proposed_fixes: Dict[str, ProposedFix] = {}
+        self._last_poll: List[str] = []  # Previous Railway log window
         
         # DSPy modules
         self.anomaly_analyzer = dspy.ChainOfThought(AnalyzeAnomaly)
@@ -284,10 +589,16 @@ class ProactiveMonitor:
             logger.warning("No logs fetched")
             return []
         
-        logger.debug(f"📊 Analyzing {len(log_lines)} log lines...")
-        anomalies = self.log_analyzer.analyze_logs(log_lines)
-        
-        # Filter out anomalies we've already seen recently
+        # Polls overlap; the stateful analyzer must see each line once
+        log_lines = [line for line in log_lines if line.strip()]
+        new_lines = lines_after_overlap(self._last_poll, log_lines)
+        self._last_poll = log_lines
+
+        logger.debug(f"📊 Analyzing {len(new_lines)} new log lines...")
+        return self._filter_active(self.log_analyzer.analyze_logs(new_lines))
+
+    def _filter_active(self, anomalies: List[LogAnomaly]) -> List[LogAnomaly]:
+        """Drop anomalies already reported within the last hour."""
         new_anomalies = []
         for anomaly in anomalies:
             anomaly_key = f"{anomaly.category}:{anomaly.context.get('pattern', '')[:50]}"
@@ -469,6 +780,35 @@ _This is an automatically generated fix proposal from Phase 0.6 Proactive Monito
             logger.error(f"Error posting to Slack: {e}")
             return False
     
+    async def handle_anomaly(self, anomaly: LogAnomaly):
+        """Analyze, generate a fix for, and propose a MEDIUM+ anomaly."""
+        logger.info(f"🚨 Processing {anomaly.severity} anomaly: {anomaly.description}")
+
+        # Only auto-generate fixes for MEDIUM+ severity
+        if anomaly.severity not in ["MEDIUM", "HIGH", "CRITICAL"]:
+            logger.info(f"Skipping auto-fix for LOW severity anomaly")
+            return
+
+        root_cause, severity, components = await self.analyze_root_cause(anomaly)
+        fix = await self.generate_fix(anomaly, root_cause, components)
+        if fix:
+            await self.post_to_slack(fix)
+
+    async def stream_anomalies(self, lines: AsyncIterator[str]) -> AsyncIterator[LogAnomaly]:
+        """Feed a line stream through the analyzer, yielding anomalies as they complete."""
+        async for line in lines:
+            for anomaly in self._filter_active(self.log_analyzer.feed(line)):
+                yield anomaly
+
+    async def streaming_loop(self, lines: AsyncIterator[str]):
+        """Monitoring loop over a continuous log stream (see tail_file / read_stream)."""
+        logger.info("🔄 Starting streaming log monitoring")
+        async for anomaly in self.stream_anomalies(lines):
+            try:
+                await self.handle_anomaly(anomaly)
+            except Exception as e:
+                logger.error(f"Error handling anomaly: {e}")
+
     async def monitoring_loop(self, interval_seconds: int = 300):
         """Main monitoring loop - runs continuously.
         
@@ -484,21 +824,7 @@ _This is an automatically generated fix proposal from Phase 0.6 Proactive Monito
                 
                 # Process each new anomaly
                 for anomaly in anomalies:
-                    logger.info(f"🚨 Processing {anomaly.severity} anomaly: {anomaly.description}")
-                    
-                    # Only auto-generate fixes for MEDIUM+ severity
-                    if anomaly.severity in ["MEDIUM", "HIGH", "CRITICAL"]:
-                        # Analyze root cause
-                        root_cause, severity, components = await self.analyze_root_cause(anomaly)
-                        
-                        # Generate fix
-                        fix = await self.generate_fix(anomaly, root_cause, components)
-                        
-                        if fix:
-                            # Post to Slack for approval
-                            await self.post_to_slack(fix)
-                    else:
-                        logger.info(f"Skipping auto-fix for LOW severity anomaly")
+                    await self.handle_anomaly(anomaly)
                 
                 # Wait before next check
                 await asyncio.sleep(interval_seconds)
@@ -520,11 +846,48 @@ def get_proactive_monitor() -> ProactiveMonitor:
     return _monitor_instance
 
 
-async def start_monitoring(interval_seconds: int = 300):
+def open_log_source(source: str, from_end: bool = True) -> AsyncIterator[str]:
+    """Line stream for a log source: "-" for stdin, otherwise a file path to tail."""
+    if source == "-":
+        return read_stream()
+    return tail_file(source, from_end=from_end)
+
+
+async def start_monitoring(interval_seconds: int = 300, log_source: Optional[str] = None):
     """Start the proactive monitoring system.
     
     Args:
-        interval_seconds: Check interval (default: 5 minutes)
+        interval_seconds: Check interval when polling Railway (default: 5 minutes)
+        log_source: File path or "-" (stdin) to stream instead of polling
+            (default: PROACTIVE_MONITOR_LOG_SOURCE)
     """
     monitor = get_proactive_monitor()
-    await monitor.monitoring_loop(interval_seconds)
+    log_source = log_source or os.getenv("PROACTIVE_MONITOR_LOG_SOURCE")
+    if log_source:
+        await monitor.streaming_loop(open_log_source(log_source))
+    else:
+        await monitor.monitoring_loop(interval_seconds)
+
+
+# ===== CLI =====
+
+async def _detect_only(source: str, from_start: bool):
+    analyzer = LogAnalyzer()
+    async for line in open_log_source(source, from_end=not from_start):
+        for anomaly in analyzer.feed(line):
+            print(f"{anomaly.timestamp.isoformat()} {anomaly.severity:<8} {anomaly.category:<12} "
+                  f"{anomaly.description} | {anomaly.context.get('pattern', anomaly.context.get('type', ''))}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a log and print detected anomalies")
+    parser.add_argument("source", nargs="?", default="-", help="Log file to tail, or - for stdin")
+    parser.add_argument("--from-start", action="store_true", help="Replay the file before following it")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_detect_only(args.source, args.from_start))
+    except KeyboardInterrupt:
+        pass
@@ -13,6 +13,7 @@ Features:
 - Natural language feedback (not just 0/1 scores)
 - Pareto-optimal selection
 - Reflective prompt evolution
+- Results stored in the optimized-program registry (baseline scores cached)
 """
 
 import dspy
@@ -21,6 +22,13 @@ from typing import List, Dict, Any, Callable, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from optimization.program_registry import (
+    ProgramRegistry,
+    get_program_registry,
+    program_hash,
+    trainset_hash
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,11 +65,13 @@ class GEPAOptimizer:
         self,
         max_metric_calls: int = 500,
         reflection_model: str = "openrouter/anthropic/claude-sonnet-4.5",
-        use_wandb: bool = False
+        use_wandb: bool = False,
+        registry: Optional[ProgramRegistry] = None
     ):
         self.max_metric_calls = max_metric_calls
         self.reflection_model = reflection_model
         self.use_wandb = use_wandb
+        self.registry = registry or get_program_registry()
         
         logger.info(f"✅ GEPA optimizer initialized (max_calls={max_metric_calls})")
     
@@ -99,14 +109,22 @@ class GEPAOptimizer:
                 num_threads=4
             )
             
-            # Evaluate baseline
-            logger.info(f"📊 Evaluating baseline performance...")
+            # Evaluate baseline (cached per program + devset hash)
+            devset = trainset[:20]  # Use subset for baseline
             evaluator = dspy.Evaluate(
-                devset=trainset[:20],  # Use subset for baseline
+                devset=devset,
                 metric=metric,
                 num_threads=4
             )
-            baseline_score = evaluator(agent)
+            baseline_program_hash = program_hash(agent)
+            devset_hash = trainset_hash(devset)
+            baseline_score = self.registry.get_baseline_score(agent_name, baseline_program_hash, devset_hash)
+            if baseline_score is None:
+                logger.info(f"📊 Evaluating baseline performance...")
+                baseline_score = evaluator(agent)
+                self.registry.record_baseline_score(agent_name, baseline_program_hash, devset_hash, baseline_score)
+            else:
+                logger.info(f"📊 Using cached baseline score")
             logger.info(f"📊 Baseline score: {baseline_score:.2%}")
             
             # Run GEPA optimization
@@ -125,9 +143,22 @@ class GEPAOptimizer:
             improvement = optimized_score - baseline_score
             logger.info(f"📈 Improvement: +{improvement:.2%}")
             
-            # Save optimized agent
-            save_path = f"optimized_{agent_name.lower()}_gepa.json"
-            optimized_agent.save(save_path)
+            # Register optimized agent (only promoted if it beats the baseline)
+            version = self.registry.register(
+                agent_name,
+                optimized_agent,
+                optimizer="gepa",
+                score=optimized_score,
+                baseline_score=baseline_score,
+                trainset_hash=trainset_hash(trainset),
+                promote=optimized_score >= baseline_score,
+                metadata={"max_metric_calls": self.max_metric_calls}
+            )
+            save_path = self.registry.get_path(version)
+            # Seed the cache: the promoted program is the next run's baseline
+            self.registry.record_baseline_score(
+                agent_name, version.content_hash, devset_hash, optimized_score
+            )
             logger.info(f"💾 Saved optimized agent to {save_path}")
             
             # Calculate duration and cost
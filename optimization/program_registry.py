@@ -0,0 +1,284 @@
+"""
+Optimized Program Registry
+
+Versioned store for compiled DSPy programs (GEPA / BootstrapFewShot output).
+
+Before this, optimizers wrote ad-hoc optimized_<agent>_*.json files into the
+working directory and nothing loaded them back, so every deploy threw the
+optimization away.
+
+Layout (root = OPTIMIZED_PROGRAMS_DIR, default data/optimized_programs):
+    <root>/<agent>/manifest.json          versions + active pointer + history
+    <root>/<agent>/v<N>-<hash12>.json     program state (dspy Module.save format)
+    <root>/<agent>/baselines.json         baseline scores per program+trainset hash
+
+Features:
+- Content hashes (identical programs are stored once)
+- Atomic promotion and rollback (manifest written via temp file + os.replace)
+- Agents load the active program at construction (see SelfOptimizingAgent)
+- Baseline evaluation scores cached per (program hash, trainset hash)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import dspy
+
+from utils.atomic_file import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_DIR = "data/optimized_programs"
+
+
+@dataclass
+class ProgramVersion:
+    """One registered compiled program."""
+    agent_name: str
+    version: int
+    content_hash: str
+    filename: str
+    optimizer: str
+    score: Optional[float] = None
+    baseline_score: Optional[float] = None
+    trainset_hash: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _canonical_json(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def program_hash(program: dspy.Module) -> str:
+    """Content hash of a program's learnable state (instructions + demos)."""
+    return hashlib.sha256(_canonical_json(program.dump_state()).encode()).hexdigest()
+
+
+def trainset_hash(trainset: List[Any]) -> str:
+    """Content hash of a list of dspy.Example (order-sensitive)."""
+    items = [ex.toDict() if hasattr(ex, "toDict") else ex for ex in trainset]
+    return hashlib.sha256(_canonical_json(items).encode()).hexdigest()
+
+
+class ProgramRegistry:
+    """Versioned, content-addressed registry of compiled DSPy programs."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        self.root_dir = root_dir or os.getenv("OPTIMIZED_PROGRAMS_DIR", DEFAULT_REGISTRY_DIR)
+        self._lock = threading.RLock()
+
+    # ===== Paths / manifest =====
+
+    def _agent_dir(self, agent_name: str) -> str:
+        slug = re.sub(r"[^a-z0-9_.-]+", "_", agent_name.lower())
+        return os.path.join(self.root_dir, slug)
+
+    def _read_json(self, path: str, default: Any) -> Any:
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Program registry: unreadable {path}: {e}")
+            return default
+
+    def _load_manifest(self, agent_name: str) -> Dict[str, Any]:
+        path = os.path.join(self._agent_dir(agent_name), "manifest.json")
+        return self._read_json(path, {"agent_name": agent_name, "active": None, "history": [], "versions": []})
+
+    def _save_manifest(self, agent_name: str, manifest: Dict[str, Any]):
+        atomic_write_json(os.path.join(self._agent_dir(agent_name), "manifest.json"), manifest, indent=2, default=str)
+
+    # ===== Registration / promotion =====
+
+    def register(
+        self,
+        agent_name: str,
+        program: dspy.Module,
+        optimizer: str,
+        score: Optional[float] = None,
+        baseline_score: Optional[float] = None,
+        trainset_hash: Optional[str] = None,
+        promote: bool = True,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> ProgramVersion:
+        """Store a compiled program as a new version (deduplicated by content hash).
+
+        Args:
+            agent_name: Agent the program belongs to
+            program: Compiled DSPy program
+            optimizer: "gepa", "bootstrap", ...
+            score: Evaluation score of the compiled program
+            baseline_score: Score of the program it was compiled from
+            trainset_hash: Hash of the trainset used (see trainset_hash())
+            promote: Make this the active version
+            metadata: Extra info stored with the version
+
+        Returns:
+            The new (or existing identical) ProgramVersion
+        """
+        content_hash = program_hash(program)
+        agent_dir = self._agent_dir(agent_name)
+
+        with self._lock:
+            os.makedirs(agent_dir, exist_ok=True)
+            manifest = self._load_manifest(agent_name)
+
+            existing = next((v for v in manifest["versions"] if v["content_hash"] == content_hash), None)
+            if existing:
+                version = ProgramVersion(**existing)
+                logger.info(f"♻️ {agent_name}: program v{version.version} already registered")
+            else:
+                number = max((v["version"] for v in manifest["versions"]), default=0) + 1
+                filename = f"v{number}-{content_hash[:12]}.json"
+                program_path = os.path.join(agent_dir, filename)
+
+                # dspy chooses the format from the suffix, so save to a temp .json then rename
+                tmp_path = os.path.join(agent_dir, f".tmp-{filename}")
+                program.save(tmp_path)
+                os.replace(tmp_path, program_path)
+
+                version = ProgramVersion(
+                    agent_name=agent_name,
+                    version=number,
+                    content_hash=content_hash,
+                    filename=filename,
+                    optimizer=optimizer,
+                    score=score,
+                    baseline_score=baseline_score,
+                    trainset_hash=trainset_hash,
+                    metadata=metadata or {}
+                )
+                manifest["versions"].append(asdict(version))
+                logger.info(f"💾 {agent_name}: registered program v{number} ({optimizer})")
+
+            if promote and manifest["active"] != version.version:
+                manifest["active"] = version.version
+                manifest["history"].append(version.version)
+                logger.info(f"🚀 {agent_name}: promoted program v{version.version}")
+
+            self._save_manifest(agent_name, manifest)
+            return version
+
+    def promote(self, agent_name: str, version: int) -> ProgramVersion:
+        """Make an existing version the active one.
+
+        Raises:
+            KeyError: If the version does not exist
+        """
+        with self._lock:
+            manifest = self._load_manifest(agent_name)
+            entry = next((v for v in manifest["versions"] if v["version"] == version), None)
+            if entry is None:
+                raise KeyError(f"{agent_name} has no program v{version}")
+
+            if manifest["active"] != version:
+                manifest["active"] = version
+                manifest["history"].append(version)
+                self._save_manifest(agent_name, manifest)
+                logger.info(f"🚀 {agent_name}: promoted program v{version}")
+            return ProgramVersion(**entry)
+
+    def rollback(self, agent_name: str) -> Optional[ProgramVersion]:
+        """Re-activate the previously promoted version.
+
+        Returns:
+            The now-active version, or None if the agent falls back to its
+            un-optimized program
+        """
+        with self._lock:
+            manifest = self._load_manifest(agent_name)
+            if not manifest["history"]:
+                return None
+
+            manifest["history"].pop()
+            manifest["active"] = manifest["history"][-1] if manifest["history"] else None
+            self._save_manifest(agent_name, manifest)
+
+        active = self.get_active(agent_name)
+        logger.info(
+            f"⏪ {agent_name}: rolled back to "
+            f"{f'program v{active.version}' if active else 'un-optimized program'}"
+        )
+        return active
+
+    # ===== Lookup / loading =====
+
+    def list_versions(self, agent_name: str) -> List[ProgramVersion]:
+        return [ProgramVersion(**v) for v in self._load_manifest(agent_name)["versions"]]
+
+    def get_active(self, agent_name: str) -> Optional[ProgramVersion]:
+        manifest = self._load_manifest(agent_name)
+        if manifest["active"] is None:
+            return None
+        entry = next((v for v in manifest["versions"] if v["version"] == manifest["active"]), None)
+        return ProgramVersion(**entry) if entry else None
+
+    def get_path(self, version: ProgramVersion) -> str:
+        return os.path.join(self._agent_dir(version.agent_name), version.filename)
+
+    def load_active(self, agent_name: str, program: dspy.Module) -> Optional[ProgramVersion]:
+        """Load the active compiled program's state into `program`.
+
+        Returns:
+            The loaded version, or None if there is none (program untouched)
+
+        Raises:
+            ValueError: If the stored program fails its content-hash check
+                (program untouched)
+        """
+        version = self.get_active(agent_name)
+        if version is None:
+            return None
+
+        with open(self.get_path(version), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        # Call dspy's implementation directly: SelfOptimizingAgent.load_state is
+        # the (unrelated) Supabase agent-state loader
+        previous = program.dump_state()
+        dspy.Module.load_state(program, state)
+        if program_hash(program) != version.content_hash:
+            dspy.Module.load_state(program, previous)  # Leave the live program as it was
+            raise ValueError(f"{agent_name} program v{version.version} failed content-hash check")
+        return version
+
+    # ===== Baseline score cache =====
+
+    def _baseline_key(self, program_hash_value: str, trainset_hash_value: str) -> str:
+        return f"{program_hash_value}:{trainset_hash_value}"
+
+    def get_baseline_score(self, agent_name: str, program_hash_value: str, trainset_hash_value: str) -> Optional[float]:
+        """Cached evaluation score of a program on a trainset, if any."""
+        path = os.path.join(self._agent_dir(agent_name), "baselines.json")
+        return self._read_json(path, {}).get(self._baseline_key(program_hash_value, trainset_hash_value))
+
+    def record_baseline_score(self, agent_name: str, program_hash_value: str, trainset_hash_value: str, score: float):
+        """Cache an evaluation score so the next run can skip re-evaluating."""
+        agent_dir = self._agent_dir(agent_name)
+        with self._lock:
+            os.makedirs(agent_dir, exist_ok=True)
+            path = os.path.join(agent_dir, "baselines.json")
+            scores = self._read_json(path, {})
+            scores[self._baseline_key(program_hash_value, trainset_hash_value)] = float(score)
+            atomic_write_json(path, scores, indent=2, default=str)
+
+
+# Global registry
+_program_registry: Optional[ProgramRegistry] = None
+
+
+def get_program_registry() -> ProgramRegistry:
+    """Get or create the global ProgramRegistry."""
+    global _program_registry
+    if _program_registry is None:
+        _program_registry = ProgramRegistry()
+    return _program_registry
@@ -1,10 +1,11 @@
 """Autonomous execution scheduler for lead follow-ups and monitoring."""
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-import httpx
+
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +24,14 @@ def get_scheduler():
 
 
 async def check_leads_needing_followup():
-    """Check for leads needing follow-up and trigger FollowUpAgent."""
+    """Check for leads needing follow-up and advance their journeys in one sweep."""
     try:
         logger.info("🔄 Checking leads needing follow-up...")
 
         # Import here to avoid circular dependencies
         from config.settings import settings
         from supabase import create_client
-
-        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+        from api.main import get_follow_up_agent
 
         # Query leads needing follow-up:
         # - tier in [WARM, COOL, HOT, SCORCHING]
@@ -39,9 +39,14 @@ async def check_leads_needing_followup():
         # - follow_up_count < 3
         cutoff_time = (datetime.utcnow() - timedelta(hours=24)).isoformat()
 
-        result = supabase.table('leads').select('id, email, company, qualification_tier, follow_up_count, last_follow_up_at').in_(
-            'qualification_tier', ['warm', 'cool', 'hot', 'scorching']
-        ).lt('follow_up_count', 3).execute()
+        def query_candidates():
+            supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+            return supabase.table('leads').select('id, email, company, qualification_tier, follow_up_count, last_follow_up_at').in_(
+                'qualification_tier', ['warm', 'cool', 'hot', 'scorching']
+            ).lt('follow_up_count', 3).execute()
+
+        # supabase-py and the agent's first build are blocking - keep them off the loop
+        result = await asyncio.to_thread(query_candidates)
 
         leads_to_followup = [
             lead for lead in result.data
@@ -49,27 +54,24 @@ async def check_leads_needing_followup():
         ]
 
         logger.info(f"📊 Found {len(leads_to_followup)} leads needing follow-up")
+        if not leads_to_followup:
+            return
 
-        # Trigger FollowUpAgent for each lead (max 10 per run to avoid overload)
-        for lead in leads_to_followup[:10]:
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        "http://localhost:8000/agents/followup/a2a",
-                        json={
-                            "message": f"Autonomous follow-up for lead {lead['email']} (tier: {lead['qualification_tier']})"
-                        },
-                        timeout=30.0
-                    )
+        follow_up_agent = await asyncio.to_thread(get_follow_up_agent)
+        if not follow_up_agent:
+            logger.warning("⚠️ Follow-up agent not initialized, skipping follow-up sweep")
+            return
 
-                    if response.status_code == 200:
-                        logger.info(f"✅ Triggered follow-up for {lead['email']}")
-                    else:
-                        logger.error(f"❌ Follow-up trigger failed for {lead['email']}: {response.status_code}")
-            except Exception as e:
-                logger.error(f"❌ Failed to trigger follow-up for {lead['email']}: {e}")
+        # Journeys whose cadence hasn't elapsed yet are skipped by the agent
+        summary = await follow_up_agent.advance_journeys([lead['id'] for lead in leads_to_followup])
 
-        logger.info(f"✅ Follow-up check complete - triggered {min(len(leads_to_followup), 10)} follow-ups")
+        for lead_id, error in summary['failed'].items():
+            logger.error(f"❌ Follow-up failed for lead {lead_id}: {error}")
+        logger.info(
+            f"✅ Follow-up check complete - {len(summary['advanced'])} advanced, "
+            f"{len(summary['skipped'])} not due, {len(summary['missing'])} without a journey, "
+            f"{len(summary['failed'])} failed"
+        )
 
     except Exception as e:
         logger.error(f"❌ Follow-up check failed: {e}")
@@ -77,6 +79,30 @@ async def check_leads_needing_followup():
         logger.error(traceback.format_exc())
 
 
+async def run_due_campaign_steps():
+    """Execute ABM campaign steps whose touchpoint is due.
+
+    Uses the orchestrator InboundAgent and FollowUpAgent create campaigns in,
+    so campaigns scheduled in this process are run from its due-time heap and
+    the rest (other instances, before a restart) are claimed from Supabase.
+    """
+    try:
+        from agents.account_orchestrator import get_account_orchestrator
+
+        orchestrator = await asyncio.to_thread(get_account_orchestrator)
+        summary = await orchestrator.run_due_steps()
+        if summary['executed'] or summary['paused'] or summary['failed']:
+            logger.info(
+                f"✅ Campaign sweep complete - {len(summary['executed'])} steps, "
+                f"{len(summary['paused'])} paused, {len(summary['failed'])} failed"
+            )
+
+    except Exception as e:
+        logger.error(f"❌ Campaign sweep failed: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+
+
 async def autonomous_monitoring():
     """Monitor pipeline health and alert on anomalies."""
     try:
@@ -150,6 +176,16 @@ def start_scheduler():
         replace_existing=True
     )
 
+    # Run due ABM campaign steps (only due campaigns are read)
+    campaign_sweep_minutes = int(os.getenv("CAMPAIGN_SWEEP_MINUTES", "5"))
+    scheduler.add_job(
+        run_due_campaign_steps,
+        trigger=IntervalTrigger(minutes=campaign_sweep_minutes),
+        id='campaign_steps',
+        name='Run due ABM campaign steps',
+        replace_existing=True
+    )
+
     # Schedule monitoring every hour
     scheduler.add_job(
         autonomous_monitoring,
@@ -162,6 +198,7 @@ def start_scheduler():
     scheduler.start()
     logger.info("✅ Scheduler started - autonomous execution enabled")
     logger.info("   - Follow-up checks: Every 1 hour")
+    logger.info(f"   - Campaign steps: Every {campaign_sweep_minutes} minutes")
     logger.info("   - Pipeline monitoring: Every 1 hour")
 
 
@@ -182,9 +219,12 @@ async def run_performance_monitoring():
         performance_agent = PerformanceAgent()
         
         # Run monitoring workflow
-        result = await performance_agent.monitor_system()
+        result = await performance_agent.run()
         
-        logger.info(f"✅ PerformanceAgent monitoring complete: {result.get('status')}")
+        logger.info(
+            f"✅ PerformanceAgent monitoring complete: {result.get('agents_analyzed')} agents, "
+            f"{result.get('anomalies_detected')} anomalies"
+        )
         
     except Exception as e:
         logger.error(f"❌ PerformanceAgent monitoring failed: {e}")
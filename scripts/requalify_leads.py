@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Re-score leads in bulk with InboundAgent (see core/batch_qualification.py).
+
+Run after an ICP or tier-threshold change, or to backfill leads that were
+never qualified. Progress is checkpointed, so an interrupted run picks up
+where it stopped when started again with the same source.
+
+Usage:
+    python scripts/requalify_leads.py                          # all leads in Supabase
+    python scripts/requalify_leads.py --since 2025-06-01 --concurrency 16
+    python scripts/requalify_leads.py --jsonl exports/leads.jsonl --output rescored.jsonl --no-write
+    QUALIFY_MODEL_RPM="openrouter/anthropic/claude-haiku-4.5=600" python scripts/requalify_leads.py
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch_qualification import (
+    BatchQualifier,
+    JsonlLeadSource,
+    ModelRateLimiter,
+    SupabaseLeadSource,
+    parse_model_rates,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = Path(__file__).parent.parent / "data" / "requalify_checkpoint.json"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jsonl", help="Read leads from this JSONL file instead of Supabase")
+    parser.add_argument("--since", help="Only Supabase leads created at/after this date")
+    parser.add_argument("--limit", type=int, help="Stop after this many leads")
+    parser.add_argument("--concurrency", type=int, help="Leads in flight (default QUALIFY_BATCH_CONCURRENCY or 8)")
+    parser.add_argument("--write-size", type=int, help="Rows per bulk upsert (default QUALIFY_BATCH_WRITE_SIZE or 200)")
+    parser.add_argument("--model-rpm", help="Per-model requests/minute, e.g. 'openai/gpt-4o=300' (default QUALIFY_MODEL_RPM)")
+    parser.add_argument("--output", help="Also append results to this JSONL file")
+    parser.add_argument("--no-write", action="store_true", help="Don't write results back to Supabase")
+    parser.add_argument("--checkpoint", default=str(DEFAULT_CHECKPOINT), help="Checkpoint file")
+    parser.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    from api.processors import configure_dspy
+    from core.metrics import install_dspy_metrics
+
+    if not configure_dspy():
+        sys.exit(1)
+    install_dspy_metrics()  # Tokens and cost for the report
+
+    supabase = None
+    if not args.jsonl or not args.no_write:
+        from supabase import create_client
+        from config.settings import settings
+        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+    source = JsonlLeadSource(args.jsonl) if args.jsonl else SupabaseLeadSource(supabase, since=args.since)
+    rate_limiter = None
+    if args.model_rpm:
+        rate_limiter = ModelRateLimiter(parse_model_rates(args.model_rpm))
+
+    qualifier = BatchQualifier(
+        supabase_client=None if args.no_write else supabase,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        write_size=args.write_size,
+        rate_limiter=rate_limiter,
+    )
+    report = await qualifier.run(source, limit=args.limit, resume=not args.fresh)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+"""Offline benchmarks for hume-dspy-agent (run as scripts, not collected by pytest)."""
@@ -0,0 +1,149 @@
+"""
+Benchmark: cold start of the API process.
+
+Imports api.main in a fresh interpreter with `python -X importtime` (dummy
+credentials from tests/benchmarks/standins.py, nothing is contacted), then
+serves one /health request in-process. Reports:
+- import time       wall-clock seconds for `import api.main`
+- first /health     seconds from interpreter start to the first 200 response
+- top modules       the slowest imports by cumulative time
+- heavy modules     subsystems that must be built lazily / by warm-up, not at
+                    import (StrategyAgent graph, FollowUpAgent, torch, ...)
+
+Exits with status 1 if a heavy module is imported eagerly or the import takes
+longer than --max-seconds. Railway fails the deploy if /health does not
+answer within railway.toml's healthcheckTimeout.
+
+Usage:
+    python -m tests.benchmarks.bench_cold_start
+    python -m tests.benchmarks.bench_cold_start --top 40 --max-seconds 5
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Must never be imported by `import api.main` (see api/main.py COLD START)
+HEAVY_MODULES = [
+    "agents.strategy_agent",
+    "agents.follow_up_agent",
+    "agents.inbound_agent",
+    "sentence_transformers",
+    "torch",
+    "faiss",
+    "langchain_core",
+    "langgraph",
+    "phoenix",
+]
+
+# Runs in the child interpreter; prints one JSON line on stdout
+CHILD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import api.main
+imported = time.perf_counter()
+
+import asyncio, httpx
+
+async def first_health():
+    transport = httpx.ASGITransport(app=api.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return (await client.get("/health")).status_code
+
+status = asyncio.run(first_health())
+print(json.dumps({
+    "import_seconds": imported - started,
+    "health_seconds": time.perf_counter() - started,
+    "health_status": status,
+    "heavy_loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            depth = len(match.group(3)) // 2
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+    return rows
+
+
+def self_time_by_package(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Sum self time per top-level package (where the time actually goes)."""
+    totals: Dict[str, int] = {}
+    for module, self_us, _, _ in rows:
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def run_child() -> Tuple[Dict, List[Tuple[str, int, int, int]]]:
+    from tests.benchmarks.standins import BENCHMARK_ENV
+
+    env = {**os.environ, **BENCHMARK_ENV, "STARTUP_WARMUP": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT % (HEAVY_MODULES,)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=600
+    )
+    result_line = next((l for l in reversed(proc.stdout.splitlines()) if l.startswith("{")), None)
+    if proc.returncode != 0 or result_line is None:
+        tail = "\n".join(l for l in proc.stderr.splitlines() if not l.startswith("import time:"))[-2000:]
+        raise RuntimeError(f"import api.main failed (exit {proc.returncode}):\n{tail}")
+    return json.loads(result_line), parse_importtime(proc.stderr)
+
+
+def print_report(result: Dict, rows: List[Tuple[str, int, int, int]], top: int):
+    print(f"\n{'cumulative':>11}{'self':>9}  module")
+    for module, self_us, cumulative_us, depth in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"{cumulative_us / 1000:>9.0f}ms{self_us / 1000:>7.0f}ms  {'  ' * (depth - 1)}{module}")
+
+    print(f"\n{'self total':>11}  package")
+    packages = sorted(self_time_by_package(rows).items(), key=lambda kv: -kv[1])[:15]
+    for package, self_us in packages:
+        print(f"{self_us / 1000:>9.0f}ms  {package}")
+
+    print(f"\nModules imported:  {len(rows)}")
+    print(f"import api.main:   {result['import_seconds']:.2f}s")
+    print(f"first /health:     {result['health_seconds']:.2f}s (HTTP {result['health_status']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25, help="Number of slowest imports to list")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Fail if importing api.main takes longer")
+    args = parser.parse_args()
+
+    result, rows = run_child()
+    print_report(result, rows, args.top)
+
+    failures = []
+    if result["heavy_loaded"]:
+        failures.append(f"heavy modules imported eagerly: {', '.join(result['heavy_loaded'])}")
+    if result["import_seconds"] > args.max_seconds:
+        failures.append(f"import took {result['import_seconds']:.2f}s > {args.max_seconds:.2f}s")
+    if result["health_status"] != 200:
+        failures.append(f"/health returned HTTP {result['health_status']}")
+
+    if failures:
+        print("\n❌ Cold start check failed:")
+        for message in failures:
+            print(f"   - {message}")
+        sys.exit(1)
+    print("\n✅ Cold start within budget, heavy subsystems deferred to warm-up")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark: columnar lead analytics vs per-row dictionary loops.
+
+Generates --leads synthetic lead rows (default 100k, mixed tier/source/score
+field names as found in production) and runs the analyses behind
+StrategyAgent.analyze_pipeline, AuditAgent._get_leads_from_supabase and
+supabase_pipeline_analytics (tier / source / date) three ways:
+
+1. Row loops      the previous per-row implementations, one pass per analysis
+2. Columnar cold  LeadFrame.from_rows (single normalization pass) + aggregations
+3. Columnar warm  aggregations on an already loaded frame (what a chat
+                  message costs while the LeadAnalytics cache is fresh)
+
+Checks that both paths agree and exits with status 1 on a mismatch.
+
+Usage:
+    python -m tests.benchmarks.bench_lead_analytics
+    python -m tests.benchmarks.bench_lead_analytics --leads 500000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from core.lead_analytics import TIERS, LeadFrame
+
+START = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def generate_leads(n: int, seed: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    tier_field = ["qualification_tier", "tier", "lead_tier"]
+    sources = ["typeform", "vapi", "slack", "referral", "webinar"]
+    industries = ["healthcare", "wellness", "fitness", "longevity", "medspa", None]
+    statuses = ["new", "contacted", "meeting_scheduled", "nurture", "closed_lost"]
+    rows = []
+    for i in range(n):
+        created = START + timedelta(seconds=rng.uniform(0, 150 * 86400))
+        row = {
+            "id": i,
+            "email": f"lead{i}@example.com",
+            "first_name": "Lead",
+            "last_name": str(i),
+            "company": f"Clinic {i % 5000}" if rng.random() < 0.9 else None,
+            rng.choice(tier_field): rng.choice(TIERS + ("warm", "bogus")),
+            rng.choice(["source", "lead_source"]): rng.choice(sources),
+            "industry": rng.choice(industries),
+            "qualification_score": rng.randint(1, 100) if rng.random() < 0.8 else None,
+            "status": rng.choice(statuses),
+            "meeting_booked": rng.random() < 0.05,
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(seconds=rng.uniform(-5, 600))).isoformat(),
+        }
+        rows.append(row)
+    return rows
+
+
+# ----- Previous per-row implementations (reference) -----
+
+def legacy_pipeline(leads):
+    tier_counts = {tier: 0 for tier in TIERS}
+    source_counts, industries = {}, {}
+    total_score, scored, qualified, meetings = 0, 0, 0, 0
+    for lead in leads:
+        tier = (lead.get('qualification_tier') or lead.get('tier') or lead.get('lead_tier') or 'UNQUALIFIED').upper()
+        if tier not in tier_counts:
+            tier = 'UNQUALIFIED'
+        tier_counts[tier] += 1
+        if tier != 'UNQUALIFIED':
+            qualified += 1
+        source = lead.get('source') or lead.get('lead_source') or 'unknown'
+        source_counts[source] = source_counts.get(source, 0) + 1
+        industry = lead.get('industry') or lead.get('company_industry')
+        if industry:
+            industries[industry] = industries.get(industry, 0) + 1
+        score = lead.get('qualification_score') or lead.get('score')
+        if score is not None:
+            total_score += float(score)
+            scored += 1
+        if (lead.get('meeting_booked') or lead.get('appointment_scheduled') or lead.get('demo_scheduled')
+                or lead.get('status') == 'meeting_scheduled'):
+            meetings += 1
+    return {
+        "by_tier": tier_counts, "by_source": source_counts,
+        "conversion_rate": meetings / qualified if qualified else 0.0,
+        "avg_score": total_score / scored if scored else 0.0,
+        "top_industries": [k for k, _ in sorted(industries.items(), key=lambda x: x[1], reverse=True)[:3]],
+    }
+
+
+def legacy_audit(leads):
+    times = []
+    for lead in leads:
+        created = datetime.fromisoformat(lead['created_at'].replace('Z', '+00:00'))
+        updated = datetime.fromisoformat(lead['updated_at'].replace('Z', '+00:00'))
+        diff = (updated - created).total_seconds()
+        if diff > 0:
+            times.append(diff)
+    return sum(times) / len(times) if times else 0
+
+
+def legacy_by_date(leads):
+    counts = {}
+    for lead in leads:
+        date = lead['created_at'].split('T')[0]
+        counts[date] = counts.get(date, 0) + 1
+    return counts
+
+
+def columnar(frame: LeadFrame):
+    tiers = frame.count_by('tier', include=TIERS)
+    qualified = len(frame) - tiers['UNQUALIFIED']
+    speed = frame['updated_at'] - frame['created_at']
+    speed = speed[speed > 0]
+    return {
+        "by_tier": tiers,
+        "by_source": frame.count_by('source'),
+        "conversion_rate": int(frame['meeting_booked'].sum()) / qualified if qualified else 0.0,
+        "avg_score": frame.mean('score'),
+        "top_industries": [k for k, _ in frame.top('industry', 3)],
+    }, float(speed.mean()) if len(speed) else 0.0, frame.bucket_counts('day')
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=100_000, help="Synthetic lead rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N timings")
+    args = parser.parse_args()
+
+    print(f"Generating {args.leads:,} synthetic leads...")
+    rows = generate_leads(args.leads)
+
+    legacy_ms, (pipeline, speed, by_date) = _timed(
+        lambda: (legacy_pipeline(rows), legacy_audit(rows), legacy_by_date(rows)), args.repeat)
+    build_ms, frame = _timed(lambda: LeadFrame.from_rows(rows), args.repeat)
+    warm_ms, (col_pipeline, col_speed, col_by_date) = _timed(lambda: columnar(frame), args.repeat)
+
+    print(f"\n{'path':<34}{'ms':>10}")
+    print(f"{'row loops (3 analyses)':<34}{legacy_ms:>10.1f}")
+    print(f"{'columnar cold (build + analyses)':<34}{build_ms + warm_ms:>10.1f}")
+    print(f"{'columnar warm (analyses only)':<34}{warm_ms:>10.1f}")
+    print(f"\nWarm speedup: {legacy_ms / warm_ms:,.0f}x   Cold speedup: {legacy_ms / (build_ms + warm_ms):.1f}x")
+
+    mismatches = []
+    for key in ("by_tier", "by_source", "top_industries"):
+        if pipeline[key] != col_pipeline[key]:
+            mismatches.append(key)
+    for key in ("conversion_rate", "avg_score"):
+        if not np.isclose(pipeline[key], col_pipeline[key]):
+            mismatches.append(key)
+    if not np.isclose(speed, col_speed):
+        mismatches.append("speed_to_lead")
+    if by_date != col_by_date:
+        mismatches.append("by_date")
+
+    if mismatches:
+        print(f"\n❌ Columnar results differ from row loops: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("\n✅ Columnar analytics match the row-loop results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: streaming log anomaly detection on a large synthetic log.
+
+Generates a deterministic log (default 500k lines over ~2 simulated hours) in
+the api.main logging format: steady INFO traffic with parsed durations, a
+background of recurring errors, and injected bursts (new error pattern, slow
+operations, token truncation, duplicate Slack events). Reports:
+- throughput        lines/second through LogAnalyzer.feed
+- burst recall      injected bursts alerted, and the delay from burst start
+- false positives   alerts outside any injected burst
+- polling recall    bursts the previous approach would have seen: one
+                    `railway logs --lines 200` snapshot every 5 minutes
+
+Exits with status 1 if a burst is missed, a false positive is raised, or
+throughput is below --min-lines-per-sec.
+
+Usage:
+    python -m tests.benchmarks.bench_log_stream
+    python -m tests.benchmarks.bench_log_stream --lines 2000000 --write-log /tmp/synthetic.log
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from monitoring.proactive_monitor import LogAnalyzer
+
+START = datetime(2025, 10, 20, 9, 0, 0)
+LEGACY_POLL_SECONDS = 300
+LEGACY_POLL_LINES = 200
+
+INFO_LINES = [
+    "api.main - INFO - 📥 Webhook received from typeform",
+    "api.main - INFO - ✅ Webhook acknowledged in {ms}ms",
+    "agents.inbound_agent - INFO - 🎯 Qualified lead {uuid}: tier=warm",
+    "api.slack_bot - INFO - 💬 Message from U0{num} in C0{num}",
+    "agents.strategy_agent - INFO - ⚡ {s:.2f}s | $0.0031",
+    "core.tool_bridge - INFO - 🔧 Tool call search_leads took {ms}ms",
+    "httpx - INFO - HTTP Request: POST https://api.openrouter.ai/v1/chat \"HTTP/1.1 200 OK\"",
+]
+BACKGROUND_ERRORS = [
+    "core.async_supabase_client - ERROR - ❌ Failed to save InboundAgent state for lead {uuid}: timeout",
+    "api.slack_bot - ERROR - ❌ Slack API error: ratelimited (retry after {num})",
+]
+
+# name -> (line template, lines in burst, burst duration seconds)
+BURSTS = {
+    "new_error": ("agents.follow_up_agent - ERROR - ❌ GMass send failed for {uuid}: 502 Bad Gateway", 25, 40),
+    "slow_operation": ("agents.research_agent - INFO - ✅ Research completed in {slow:.1f}s", 12, 50),
+    "token_truncation": ("dspy.adapters - WARNING - LM response truncated at max_tokens={num}", 8, 30),
+    "duplicate_spike": ("api.slack_bot - INFO - ⏭️ Duplicate Slack event 17{num}.{num}_ABC_{num} ignored", 40, 40),
+}
+
+
+def _render(template: str, rng: random.Random) -> str:
+    return template.format(
+        ms=rng.randint(20, 900), s=rng.uniform(0.5, 4.0), slow=rng.uniform(15.0, 45.0),
+        num=rng.randint(1000, 99999), uuid=uuid.UUID(int=rng.getrandbits(128))
+    )
+
+
+def generate_log(n_lines: int, seed: int = 7) -> Tuple[List[str], Dict[str, Tuple[float, float]]]:
+    """Synthetic log lines plus each burst's (start, end) epoch seconds."""
+    rng = random.Random(seed)
+    span_seconds = 7200.0
+    step = span_seconds / n_lines
+
+    events: List[Tuple[float, str]] = []
+    for i in range(n_lines):
+        t = i * step
+        template = rng.choice(BACKGROUND_ERRORS) if rng.random() < 0.002 else rng.choice(INFO_LINES)
+        events.append((t, _render(template, rng)))
+
+    bursts = {}
+    for k, (name, (template, count, duration)) in enumerate(BURSTS.items()):
+        burst_start = 1500.0 + k * 1200.0 + rng.uniform(0, 240)
+        for j in range(count):
+            events.append((burst_start + duration * j / count, _render(template, rng)))
+        bursts[name] = (START.timestamp() + burst_start, START.timestamp() + burst_start + duration)
+
+    events.sort(key=lambda e: e[0])
+    lines = []
+    for t, message in events:
+        stamp = START + timedelta(seconds=t)
+        lines.append(f"{stamp.strftime('%Y-%m-%d %H:%M:%S')},{stamp.microsecond // 1000:03d} - {message}")
+    return lines, bursts
+
+
+def classify(anomaly) -> str:
+    context = anomaly.context
+    if context.get("type") in ("token_truncation", "duplicate_spike", "slow_operation"):
+        return context["type"]
+    return "new_error" if "GMass" in context.get("pattern", "") else "background_error"
+
+
+def legacy_polling_recall(lines: List[str], bursts: Dict[str, Tuple[float, float]]) -> int:
+    """Bursts with 3+ lines inside some 200-line snapshot taken every 5 minutes."""
+    analyzer = LogAnalyzer()
+    times = [analyzer._line_time(line) for line in lines]
+    seen = set()
+    poll_at = times[0] + LEGACY_POLL_SECONDS
+    index = 0
+    while poll_at <= times[-1] + LEGACY_POLL_SECONDS:
+        while index < len(times) and times[index] <= poll_at:
+            index += 1
+        snapshot = times[max(0, index - LEGACY_POLL_LINES):index]
+        for name, (start, end) in bursts.items():
+            if sum(1 for t in snapshot if start <= t <= end) >= 3:
+                seen.add(name)
+        poll_at += LEGACY_POLL_SECONDS
+    return len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=500_000, help="Synthetic log size")
+    parser.add_argument("--min-lines-per-sec", type=float, default=30_000, help="Fail below this throughput")
+    parser.add_argument("--write-log", help="Also write the synthetic log to this path")
+    args = parser.parse_args()
+
+    print(f"Generating {args.lines:,} synthetic log lines...")
+    lines, bursts = generate_log(args.lines)
+    if args.write_log:
+        Path(args.write_log).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    analyzer = LogAnalyzer()
+    alerts = []
+    started = time.perf_counter()
+    for line in lines:
+        alerts.extend(analyzer.feed(line))
+    elapsed = time.perf_counter() - started
+    throughput = len(lines) / elapsed
+
+    detected: Dict[str, float] = {}
+    false_positives = []
+    for anomaly in alerts:
+        name = classify(anomaly)
+        alerted_at = anomaly.timestamp.timestamp()
+        if name in bursts and bursts[name][0] <= alerted_at <= bursts[name][1]:
+            detected.setdefault(name, alerted_at - bursts[name][0])
+        else:
+            false_positives.append(anomaly)
+
+    print(f"\nLines:             {len(lines):,}")
+    print(f"Feed time:         {elapsed:.2f}s")
+    print(f"Throughput:        {throughput:,.0f} lines/s")
+    print(f"Patterns tracked:  {len(analyzer._patterns)}")
+    print(f"\n{'burst':<18}{'detected':>10}{'delay':>9}")
+    for name in bursts:
+        delay = f"{detected[name]:.1f}s" if name in detected else "-"
+        print(f"{name:<18}{'yes' if name in detected else 'NO':>10}{delay:>9}")
+    print(f"\nStreaming recall:  {len(detected)}/{len(bursts)}")
+    print(f"Polling recall:    {legacy_polling_recall(lines, bursts)}/{len(bursts)} "
+          f"({LEGACY_POLL_LINES}-line snapshot every {LEGACY_POLL_SECONDS}s)")
+    print(f"False positives:   {len(false_positives)}")
+    for anomaly in false_positives[:5]:
+        print(f"   - {anomaly.severity} {anomaly.description}: {anomaly.context.get('pattern', '')[:80]}")
+
+    failures = []
+    if len(detected) < len(bursts):
+        failures.append(f"missed bursts: {', '.join(sorted(set(bursts) - set(detected)))}")
+    if false_positives:
+        failures.append(f"{len(false_positives)} false positives")
+    if throughput < args.min_lines_per_sec:
+        failures.append(f"throughput {throughput:,.0f} < {args.min_lines_per_sec:,.0f} lines/s")
+
+    if failures:
+        print("\n❌ Log stream benchmark failed:")
+        for message in failures:
+            print(f"   - {message}")
+        sys.exit(1)
+    print("\n✅ All bursts detected with no false positives")
+
+
+if __name__ == "__main__":
+    main()
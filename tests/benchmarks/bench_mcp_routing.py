@@ -0,0 +1,130 @@
+"""
+Benchmark: tiered MCP server routing vs LLM-only routing.
+
+Runs every labeled task in tests/fixtures/mcp_routing_tasks.py through:
+1. LLM-only path  (MCPOrchestrator(use_heuristics=False), cache cleared per task)
+2. Tiered path    (cache → keyword classifier → LLM for ambiguous tasks)
+3. Tiered path, second pass (warm decision cache)
+
+Offline by default: the LLM is a simulated selector that sleeps for
+--llm-latency seconds and answers with the gold label, so LLM-only accuracy
+is an upper bound and the comparison isolates latency/LLM-call savings.
+Pass --live to use the DSPy LM configured from OPENROUTER_API_KEY instead.
+
+Usage:
+    python -m tests.benchmarks.bench_mcp_routing
+    python -m tests.benchmarks.bench_mcp_routing --llm-latency 1.5
+    python -m tests.benchmarks.bench_mcp_routing --live
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import dspy
+
+from core.mcp_orchestrator import MCPOrchestrator, normalize_task
+from tests.fixtures.mcp_routing_tasks import LABELED_ROUTING_TASKS
+
+
+class SimulatedServerSelector:
+    """Stand-in for the ChainOfThought selector: fixed latency, gold answers."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.gold = {normalize_task(task): servers for task, servers in LABELED_ROUTING_TASKS}
+
+    def __call__(self, task_description: str, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        servers = self.gold.get(normalize_task(task_description), [])
+        return dspy.Prediction(
+            selected_servers=",".join(servers) or "none",
+            reasoning="simulated"
+        )
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run_pass(orchestrator: MCPOrchestrator, clear_cache: bool) -> Dict[str, float]:
+    latencies = []
+    correct = 0
+    for task, expected in LABELED_ROUTING_TASKS:
+        if clear_cache:
+            orchestrator.clear_routing_cache()
+        start = time.perf_counter()
+        servers = await orchestrator.select_servers_for_task(task)
+        latencies.append((time.perf_counter() - start) * 1000)
+        correct += sorted(servers) == sorted(expected)
+
+    return {
+        "accuracy": correct / len(LABELED_ROUTING_TASKS),
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "total_ms": sum(latencies),
+    }
+
+
+def _make_orchestrator(use_heuristics: bool, live: bool, latency: float) -> MCPOrchestrator:
+    orchestrator = MCPOrchestrator(use_heuristics=use_heuristics)
+    if not live:
+        orchestrator.server_selector = SimulatedServerSelector(latency)
+    return orchestrator
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP server routing tiers")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Simulated LLM latency (seconds)")
+    parser.add_argument("--live", action="store_true", help="Use the real DSPy LM (requires OPENROUTER_API_KEY)")
+    args = parser.parse_args()
+
+    if args.live:
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            print("❌ --live requires OPENROUTER_API_KEY")
+            return
+        dspy.configure(lm=dspy.LM(model="openrouter/anthropic/claude-haiku-4.5", api_key=api_key))
+
+    llm_only = _make_orchestrator(False, args.live, args.llm_latency)
+    tiered = _make_orchestrator(True, args.live, args.llm_latency)
+
+    results = {
+        "llm_only": await _run_pass(llm_only, clear_cache=True),
+        "tiered_cold": await _run_pass(tiered, clear_cache=False),
+    }
+    tiered_cold_stats = tiered.get_routing_stats()
+    results["tiered_warm"] = await _run_pass(tiered, clear_cache=False)
+
+    mode = "live LM" if args.live else f"simulated LM ({args.llm_latency:.2f}s/call)"
+    print("=" * 80)
+    print(f"MCP ROUTING BENCHMARK - {len(LABELED_ROUTING_TASKS)} labeled tasks, {mode}")
+    print("=" * 80)
+    print(f"{'path':<14}{'accuracy':>10}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}{'total ms':>12}")
+    for name, r in results.items():
+        print(
+            f"{name:<14}{r['accuracy']:>10.1%}{r['mean_ms']:>12.2f}"
+            f"{r['p50_ms']:>12.2f}{r['p95_ms']:>12.2f}{r['total_ms']:>12.1f}"
+        )
+    print("-" * 80)
+    print(
+        f"Tiered (cold): {tiered_cold_stats['heuristic']} heuristic, "
+        f"{tiered_cold_stats['llm']} LLM, {tiered_cold_stats['fallback']} fallback "
+        f"(LLM rate {tiered_cold_stats['llm_rate']:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Benchmark: knowledge-base retrieval quality and latency.
+
+Runs every labeled query in tests/fixtures/retrieval_corpus.py against the
+fixture corpus (padded with --distractors filler chunks) through:
+1. Vector only     the previous path: embed every query, match_documents RPC
+2. Hybrid          core.retrieval.HybridRetriever, vector + BM25 fused (RRF)
+3. Hybrid + rerank same, with the overlap reranker (or --cross-encoder)
+4. Warm pass       hybrid + rerank again, query embeddings served from cache
+
+Reports recall@k and MRR (overall and on exact-term/SKU queries), p50/p95
+query latency, and embedding API calls. Offline: embeddings come from
+SimulatedEmbeddings (fixed --embed-latency, identifiers blurred like real
+dense embeddings) and documents from InMemorySupabase.
+
+Exits with status 1 if hybrid recall@k is below vector-only recall@k or the
+warm pass calls the embeddings API.
+
+Usage:
+    python -m tests.benchmarks.bench_retrieval
+    python -m tests.benchmarks.bench_retrieval --distractors 5000 --k 3
+    python -m tests.benchmarks.bench_retrieval --cross-encoder
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.retrieval import CrossEncoderReranker, HybridRetriever, OverlapReranker
+from tests.benchmarks.standins import InMemorySupabase, SimulatedEmbeddings
+from tests.fixtures.retrieval_corpus import LABELED_QUERIES, build_corpus
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _is_exact_term(query: str) -> bool:
+    return any(c.isdigit() for c in query)
+
+
+async def _vector_only(db, embedder, query: str, k: int, threshold: float) -> List:
+    """The previous path: embed, then match_documents with a fixed threshold."""
+    response = await embedder.embeddings.create(model="text-embedding-3-small", input=query)
+    result = db.rpc("match_documents", {
+        "query_embedding": response.data[0].embedding,
+        "match_threshold": threshold,
+        "match_count": k
+    }).execute()
+    return [row["id"] for row in result.data]
+
+
+async def run_pass(name: str, search, k: int, embedder) -> Dict:
+    calls_before = embedder.calls
+    latencies, hits, reciprocal_ranks = [], [], []
+    exact_hits = []
+    for query, relevant in LABELED_QUERIES:
+        started = time.perf_counter()
+        ids = await search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        rank = next((i + 1 for i, doc_id in enumerate(ids[:k]) if doc_id in relevant), None)
+        hits.append(rank is not None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        if _is_exact_term(query):
+            exact_hits.append(rank is not None)
+    return {
+        "name": name,
+        "recall": sum(hits) / len(hits),
+        "exact_recall": sum(exact_hits) / len(exact_hits),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "embed_calls": embedder.calls - calls_before,
+    }
+
+
+async def main_async(args):
+    db = InMemorySupabase()
+    embedder = SimulatedEmbeddings(latency=args.embed_latency)
+    for chunk in build_corpus(distractors=args.distractors):
+        db.tables["documents"].append({**chunk, "embedding": embedder.embed(chunk["content"])})
+    print(f"Corpus: {len(db.tables['documents']):,} chunks, {len(LABELED_QUERIES)} labeled queries, k={args.k}")
+
+    reranker = OverlapReranker()
+    if args.cross_encoder:
+        try:
+            reranker = CrossEncoderReranker("cross-encoder/ms-marco-MiniLM-L-6-v2")
+        except Exception as e:
+            print(f"⚠️ Cross-encoder unavailable ({e}), using overlap reranker")
+
+    plain = HybridRetriever(reranker=None)
+    reranked = HybridRetriever(reranker=reranker)
+    started = time.perf_counter()
+    await plain.keyword_index(db)
+    await reranked.keyword_index(db)
+    print(f"Keyword index build: {(time.perf_counter() - started) * 1000 / 2:.0f}ms")
+
+    async def hybrid_ids(retriever, query):
+        chunks = await retriever.search(db, embedder, query, limit=args.k, match_threshold=args.match_threshold)
+        return [chunk.id for chunk in chunks]
+
+    results = [
+        await run_pass("vector only",
+                       lambda q: _vector_only(db, embedder, q, args.k, args.match_threshold), args.k, embedder),
+        await run_pass("hybrid", lambda q: hybrid_ids(plain, q), args.k, embedder),
+        await run_pass(f"hybrid + rerank ({type(reranker).__name__})",
+                       lambda q: hybrid_ids(reranked, q), args.k, embedder),
+        await run_pass("hybrid + rerank (warm)", lambda q: hybrid_ids(reranked, q), args.k, embedder),
+    ]
+
+    print(f"\n{'path':<40}{'recall@k':>10}{'exact':>8}{'MRR':>7}{'p50 ms':>9}{'p95 ms':>9}{'embeds':>8}")
+    for r in results:
+        print(f"{r['name']:<40}{r['recall']:>10.0%}{r['exact_recall']:>8.0%}{r['mrr']:>7.2f}"
+              f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['embed_calls']:>8}")
+
+    vector, hybrid, _, warm = results
+    failures = []
+    if hybrid["recall"] < vector["recall"]:
+        failures.append(f"hybrid recall {hybrid['recall']:.0%} < vector-only {vector['recall']:.0%}")
+    if warm["embed_calls"]:
+        failures.append(f"warm pass made {warm['embed_calls']} embedding calls")
+
+    if failures:
+        print("\n❌ Retrieval benchmark failed:")
+        for message in failures:
+            print(f"   - {message}")
+        sys.exit(1)
+    print("\n✅ Hybrid retrieval at or above vector-only recall; warm queries skip the embeddings API")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=5, help="Results per query (recall@k)")
+    parser.add_argument("--distractors", type=int, default=2000, help="Filler chunks added to the corpus")
+    parser.add_argument("--embed-latency", type=float, default=0.15, help="Simulated embeddings API latency (s)")
+    parser.add_argument("--match-threshold", type=float, default=0.0,
+                        help="Similarity threshold (0: compare ranking only; simulated similarities "
+                             "are not calibrated like text-embedding-3-small)")
+    parser.add_argument("--cross-encoder", action="store_true", help="Rerank with a local cross-encoder")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Benchmark: compiled Typeform extraction plans vs per-submission heuristics.
+
+Generates --submissions synthetic webhook payloads (default 20k) over three
+form layouts - semantic refs, UUID refs with a form definition, and UUID
+refs without one - and times, per submission:
+
+1. Transform   answer mapping in transform_typeform_webhook (extract_answers),
+               previous heuristics vs plan; Lead construction excluded
+2. Enrichment  Lead.extract_semantic_fields on the stored raw_answers, the
+               previous value heuristics vs the plan (re-qualifying
+               historical leads)
+
+Checks that both paths extract the same contact fields and exits with
+status 1 on a mismatch.
+
+Usage:
+    python -m tests.benchmarks.bench_typeform_extraction
+    python -m tests.benchmarks.bench_typeform_extraction --submissions 100000
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from models.lead import Lead
+from utils.form_schema import get_form_schema_registry
+from utils.typeform_transform import extract_answers
+
+logger = logging.getLogger("bench_typeform_extraction")
+
+USE_CASES = [
+    "We run a weight-loss program with about 240 patients a month and want remote body composition "
+    "tracking between visits so coaches can adjust plans.",
+    "Small gym, interested in reselling.",
+    "Our longevity clinic sees 80 members weekly; we need accurate body fat data for our programs "
+    "and a portal for clients to review progress.",
+]
+
+FIELDS = [
+    # (semantic ref, answer type, title, choices)
+    ("first_name", "text", "What's your first name?", None),
+    ("last_name", "text", "And your last name?", None),
+    ("email", "email", "Work email", None),
+    ("phone", "phone_number", "Best phone number", None),
+    ("company", "text", "Company name", None),
+    ("business_size", "choice", "How many employees?", ["1-5 employees", "6-20 employees", "20+ employees"]),
+    ("patient_volume", "choice", "How many patients per month?", ["1-50", "51-300", "300+"]),
+    ("use_case", "text", "Tell us about your use case", None),
+    ("calendly", "url", "Book a call", None),
+]
+
+
+def make_form(form_id: str, semantic_refs: bool, with_definition: bool) -> Dict[str, Any]:
+    fields = []
+    for ref, answer_type, title, choices in FIELDS:
+        field_id = uuid.uuid4().hex[:12]
+        fields.append({
+            "id": field_id,
+            "ref": ref if semantic_refs else str(uuid.uuid4()),
+            "answer_type": answer_type,
+            "type": {"text": "short_text", "choice": "multiple_choice"}.get(answer_type, answer_type),
+            "title": title,
+            "choices": [{"label": label} for label in choices] if choices else None,
+        })
+    definition = None
+    if with_definition:
+        definition = {"id": form_id, "fields": [
+            {k: v for k, v in f.items() if k != "answer_type" and v is not None} for f in fields
+        ]}
+    return {"form_id": form_id, "fields": fields, "definition": definition}
+
+
+def make_submission(form: Dict[str, Any], i: int, rng: random.Random) -> Dict[str, Any]:
+    values = {
+        "first_name": "Jordan", "last_name": f"Lead{i}", "email": f"lead{i}@clinic.example",
+        "phone": "+15555550100", "company": rng.choice([f"Clinic {i} LLC", f"Wellness Studio {i}"]),
+        "business_size": None, "patient_volume": None, "use_case": rng.choice(USE_CASES),
+        "calendly": f"https://calendly.com/hume/{i}",
+    }
+    answers = []
+    for form_field, (ref, answer_type, _, choices) in zip(form["fields"], FIELDS):
+        if ref == "calendly" and rng.random() < 0.7:
+            continue
+        field = {"id": form_field["id"], "type": form_field["type"], "ref": form_field["ref"]}
+        if answer_type == "choice":
+            answers.append({"type": "choice", "choice": {"label": rng.choice(choices)}, "field": field})
+        else:
+            answers.append({"type": answer_type, answer_type: values[ref], "field": field})
+    form_response = {"form_id": form["form_id"], "token": f"tok-{i}", "submitted_at": "2025-10-20T18:57:30Z",
+                     "answers": answers}
+    if form["definition"]:
+        form_response["definition"] = form["definition"]
+    return {"event_id": f"evt-{i}", "event_type": "form_response", "form_response": form_response}
+
+
+# ----- Previous per-submission heuristics (reference) -----
+
+def legacy_transform(webhook_data):
+    answers = webhook_data.get('form_response', {}).get('answers', [])
+    extracted = {'first_name': None, 'last_name': None, 'email': None, 'phone': None, 'company': None,
+                 'calendly_url': None}
+    raw_answers, text_fields = {}, []
+    for answer in answers:
+        field = answer.get('field', {})
+        field_type = answer.get('type')
+        field_ref = field.get('ref', '')
+        if field_type == 'email':
+            extracted['email'] = answer.get('email')
+            raw_answers[field_ref] = answer.get('email')
+        elif field_type == 'phone_number':
+            extracted['phone'] = answer.get('phone_number')
+            raw_answers[field_ref] = answer.get('phone_number')
+        elif field_type == 'url':
+            url = answer.get('url', '')
+            if 'calendly' in url.lower():
+                extracted['calendly_url'] = url
+            raw_answers[field_ref] = url
+        elif field_type == 'text':
+            text_value = answer.get('text')
+            text_fields.append(text_value)
+            raw_answers[field_ref] = text_value
+        elif field_type == 'choice':
+            label = answer.get('choice', {}).get('label')
+            raw_answers[field_ref] = label
+            if label:
+                label_lower = label.lower()
+                if 'employee' in label_lower or 'business' in label_lower:
+                    raw_answers['business_size'] = label
+                    logger.info(f"📊 Mapped business_size: {label}")
+                elif 'patient' in label_lower or any(num in label for num in ['1-50', '51-300', '300+']):
+                    raw_answers['patient_volume'] = label
+                    logger.info(f"📊 Mapped patient_volume: {label}")
+    for slot, index in (('first_name', 0), ('last_name', 1), ('company', 2)):
+        if len(text_fields) > index and text_fields[index]:
+            extracted[slot] = text_fields[index]
+    return extracted, raw_answers
+
+
+def legacy_semantic_fields(raw_answers):
+    extracted = {}
+    for field_id, value in raw_answers.items():
+        if not value or value == "null":
+            continue
+        value_str = str(value).lower()
+        if "calendly.com" in value_str:
+            extracted["calendly_url"] = value
+            extracted["has_calendly"] = True
+        elif "@" in value_str and "." in value_str:
+            extracted["email"] = value
+        elif isinstance(value, str) and any(x in value for x in ["LLC", "Inc", "Corp", "Company", "Tactical", "Clinic"]):
+            extracted["company"] = value
+        elif len(value_str) > 100:
+            extracted["use_case"] = value
+            extracted["business_goals"] = value
+            if "member" in value_str or "patient" in value_str:
+                numbers = re.findall(r'\d+', value_str)
+                if numbers:
+                    extracted["patient_volume_raw"] = max([int(n) for n in numbers])
+    return extracted
+
+
+def plan_transform(webhook_data):
+    return extract_answers(webhook_data['form_response'])
+
+
+def timed(fn: Callable, items: List[Any]) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submissions", type=int, default=20000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    forms = {
+        "semantic refs": make_form("form_semantic", semantic_refs=True, with_definition=False),
+        "uuid refs + definition": make_form("form_defined", semantic_refs=False, with_definition=True),
+        "uuid refs, no definition": make_form("form_opaque", semantic_refs=False, with_definition=False),
+    }
+
+    mismatches = 0
+    print(f"{'form layout':<26} {'transform legacy':>17} {'plan':>8} {'enrich legacy':>14} {'plan':>8}")
+    for name, form in forms.items():
+        submissions = [make_submission(form, i, rng) for i in range(args.submissions // len(forms))]
+        get_form_schema_registry().clear()
+
+        # Historical leads: raw_answers as stored, keyed by ref
+        leads = [Lead(typeform_id=f"t{i}", form_id=form["form_id"], raw_answers=legacy_transform(s)[1])
+                 for i, s in enumerate(submissions)]
+
+        for submission, lead in zip(submissions[:500], leads[:500]):
+            legacy, plan = legacy_transform(submission)[0], plan_transform(submission)[0]
+            for key in ("email", "phone", "first_name", "last_name", "calendly_url"):
+                if legacy[key] != plan[key]:
+                    mismatches += 1
+            if legacy_semantic_fields(lead.raw_answers).get("email") != lead.extract_semantic_fields().get("email"):
+                mismatches += 1
+
+        legacy_t = timed(legacy_transform, submissions)
+        plan_t = timed(plan_transform, submissions)
+        legacy_e = timed(lambda lead: legacy_semantic_fields(lead.raw_answers), leads)
+        plan_e = timed(Lead.extract_semantic_fields, leads)
+        per = 1e6 / len(submissions)
+        print(f"{name:<26} {legacy_t * per:>14.1f}µs {plan_t * per:>6.1f}µs {legacy_e * per:>12.1f}µs {plan_e * per:>6.1f}µs")
+
+    print("(per submission)")
+    if mismatches:
+        print(f"\n❌ {mismatches} extraction mismatch(es) between legacy and plan paths")
+        sys.exit(1)
+    print("\n✅ Plan and legacy extraction agree on contact fields")
+
+
+if __name__ == "__main__":
+    main()
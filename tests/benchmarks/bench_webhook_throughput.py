@@ -0,0 +1,463 @@
+"""
+Benchmark: end-to-end webhook throughput (offline).
+
+Drives /webhooks/typeform, /webhooks/vapi and /slack/events in-process
+through the real FastAPI app with every external dependency replaced by a
+deterministic stand-in (tests/benchmarks/standins.py): simulated DSPy LM,
+in-memory Supabase, stubbed Slack/GMass/Close HTTP.
+
+For each endpoint and concurrency level it reports:
+- ack latency     time until the HTTP response was sent (p50/p95/p99)
+- e2e latency     time until background processing finished (p50/p95/p99)
+- events/sec      completed events per wall-clock second
+- loop blocked    total event-loop stall time and worst single stall
+- errors          background failures (exceptions or no lead produced)
+
+Results are compared against tests/benchmarks/baselines/webhook_throughput.json;
+a regression beyond --tolerance exits with status 1. Record a new baseline
+with --update-baseline (only compare runs made with the same settings).
+
+Usage:
+    python -m tests.benchmarks.bench_webhook_throughput
+    python -m tests.benchmarks.bench_webhook_throughput --concurrency 1,8,32 --events 64
+    python -m tests.benchmarks.bench_webhook_throughput --endpoints typeform --lm-latency 0.8
+    python -m tests.benchmarks.bench_webhook_throughput --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.benchmarks.standins import EventLoopMonitor, install_standins
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "webhook_throughput.json"
+ENDPOINTS = {
+    "typeform": "/webhooks/typeform",
+    "vapi": "/webhooks/vapi",
+    "slack": "/slack/events",
+}
+
+
+# ============================================================================
+# Payloads
+# ============================================================================
+
+def typeform_payload(i: int) -> Dict[str, Any]:
+    now = "2025-10-20T18:57:30Z"
+    return {
+        "event_id": f"bench-{uuid.uuid4()}",
+        "event_type": "form_response",
+        "form_response": {
+            "form_id": "bench_form",
+            "token": f"token-{i}-{uuid.uuid4().hex[:8]}",
+            "landed_at": now,
+            "submitted_at": now,
+            "answers": [
+                {"type": "text", "text": "Jordan", "field": {"id": "f1", "type": "short_text", "ref": "first_name"}},
+                {"type": "text", "text": f"Lead{i}", "field": {"id": "f2", "type": "short_text", "ref": "last_name"}},
+                {"type": "email", "email": f"bench{i}@clinic.example", "field": {"id": "f3", "type": "email", "ref": "email"}},
+                {"type": "phone_number", "phone_number": "+15555550100", "field": {"id": "f4", "type": "phone_number", "ref": "phone"}},
+                {"type": "text", "text": f"Bench Clinic {i}", "field": {"id": "f5", "type": "short_text", "ref": "company"}},
+                {"type": "choice", "choice": {"label": "11-50 employees"}, "field": {"id": "f6", "type": "multiple_choice", "ref": "business_size"}},
+                {"type": "choice", "choice": {"label": "100-500 patients"}, "field": {"id": "f7", "type": "multiple_choice", "ref": "patient_volume"}},
+                {"type": "text", "text": "We want remote body composition tracking for our weight-loss patients.", "field": {"id": "f8", "type": "long_text", "ref": "body_comp_use_case"}},
+            ],
+        },
+    }
+
+
+def vapi_payload(i: int) -> Dict[str, Any]:
+    return {
+        "message": {
+            "type": "end-of-call-report",
+            "call": {"id": f"call-{i}-{uuid.uuid4().hex[:8]}"},
+            "transcript": "AI: Thanks for calling Hume Health.\nUser: I'd like to learn about the scale.",
+            "summary": "Prospect asked about body composition scales.",
+        }
+    }
+
+
+def slack_payload(i: int) -> Dict[str, Any]:
+    return {
+        "type": "event_callback",
+        "event": {
+            "type": "message",
+            "user": f"UBENCH{i}",
+            "channel": "D0BENCH",
+            "ts": f"{time.time():.6f}{i}",
+            "text": "How many hot leads came in today?",
+        },
+    }
+
+
+PAYLOADS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "typeform": typeform_payload,
+    "vapi": vapi_payload,
+    "slack": slack_payload,
+}
+
+
+# ============================================================================
+# In-process ASGI driver
+# ============================================================================
+
+@dataclass
+class EventTiming:
+    status: int
+    ack: float
+    e2e: float
+    error: Optional[str] = None
+
+
+@dataclass
+class LevelResult:
+    endpoint: str
+    concurrency: int
+    events: int
+    wall_seconds: float
+    ack: List[float] = field(default_factory=list)
+    e2e: List[float] = field(default_factory=list)
+    errors: int = 0
+    loop_blocked_seconds: float = 0.0
+    loop_max_stall: float = 0.0
+
+    @property
+    def events_per_sec(self) -> float:
+        return (self.events - self.errors) / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "ack_p50_ms": _percentile(self.ack, 50) * 1000,
+            "ack_p95_ms": _percentile(self.ack, 95) * 1000,
+            "ack_p99_ms": _percentile(self.ack, 99) * 1000,
+            "e2e_p50_ms": _percentile(self.e2e, 50) * 1000,
+            "e2e_p95_ms": _percentile(self.e2e, 95) * 1000,
+            "e2e_p99_ms": _percentile(self.e2e, 99) * 1000,
+            "events_per_sec": self.events_per_sec,
+            "error_rate": self.errors / self.events if self.events else 0.0,
+            "loop_blocked_pct": 100 * self.loop_blocked_seconds / self.wall_seconds if self.wall_seconds else 0.0,
+            "loop_max_stall_ms": self.loop_max_stall * 1000,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class CompletionTracker:
+    """Records when work that outlives the HTTP request finishes.
+
+    Slack events are processed with asyncio.create_task, and the typeform
+    background task swallows processing errors, so both are observed by
+    wrapping the module-level functions the app calls.
+    """
+
+    def __init__(self):
+        self.pending: Dict[str, asyncio.Future] = {}
+
+    def expect(self, key: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        return future
+
+    def finish(self, key: str, error: Optional[str] = None):
+        future = self.pending.pop(key, None)
+        if future and not future.done():
+            future.set_result((time.perf_counter(), error))
+
+    def install(self):
+        import api.processors as processors
+        import api.slack_bot as slack_bot
+
+        original_slack = slack_bot.handle_message_async
+        original_typeform = processors.process_typeform_submission
+        tracker = self
+
+        async def tracked_slack(event, event_id):
+            error = None
+            try:
+                await original_slack(event, event_id)
+            except Exception as e:
+                error = repr(e)
+            finally:
+                tracker.finish(f"slack:{event.get('ts')}", error)
+
+        async def tracked_typeform(raw_payload):
+            result, error = {}, None
+            try:
+                result = await original_typeform(raw_payload)
+                if not result.get("lead_id"):
+                    error = "no lead produced"
+                return result
+            except Exception as e:
+                error = repr(e)
+                raise
+            finally:
+                tracker.finish(f"typeform:{raw_payload.get('event_id')}", error)
+
+        slack_bot.handle_message_async = tracked_slack
+        processors.process_typeform_submission = tracked_typeform
+
+
+async def drive(app, path: str, payload: Dict[str, Any], completion: Optional[asyncio.Future]) -> EventTiming:
+    """Run one request through the ASGI app, timing ack and completion."""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"host", b"bench.local")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench.local", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    status = 0
+    ack_at = None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, ack_at
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            ack_at = time.perf_counter()
+
+    start = time.perf_counter()
+    error = None
+    try:
+        await app(scope, receive, send)
+    except Exception as e:
+        # BackgroundTasks exceptions surface after the response was sent
+        error = repr(e)
+    finally:
+        disconnected.set()
+    done_at = time.perf_counter()
+
+    if completion is not None:
+        done_at, completion_error = await completion
+        error = error or completion_error
+
+    if status >= 400:
+        error = error or f"HTTP {status}"
+    ack_at = ack_at or done_at
+    return EventTiming(status=status, ack=ack_at - start, e2e=done_at - start, error=error)
+
+
+async def run_level(app, tracker: CompletionTracker, endpoint: str, concurrency: int, events: int) -> LevelResult:
+    """Send `events` requests with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    monitor = EventLoopMonitor()
+    path = ENDPOINTS[endpoint]
+
+    async def one(i: int) -> EventTiming:
+        payload = PAYLOADS[endpoint](i)
+        completion = None
+        if endpoint == "slack":
+            completion = tracker.expect(f"slack:{payload['event']['ts']}")
+        elif endpoint == "typeform":
+            completion = tracker.expect(f"typeform:{payload['event_id']}")
+        async with semaphore:
+            return await drive(app, path, payload, completion)
+
+    monitor.start()
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(one(i) for i in range(events)))
+    wall = time.perf_counter() - start
+    await monitor.stop()
+
+    result = LevelResult(
+        endpoint=endpoint,
+        concurrency=concurrency,
+        events=events,
+        wall_seconds=wall,
+        loop_blocked_seconds=monitor.blocked_seconds,
+        loop_max_stall=monitor.max_lag,
+    )
+    for timing in timings:
+        result.ack.append(timing.ack)
+        result.e2e.append(timing.e2e)
+        if timing.error:
+            result.errors += 1
+    first_error = next((t.error for t in timings if t.error), None)
+    if first_error:
+        logging.getLogger(__name__).warning(f"{endpoint} x{concurrency}: first error: {first_error[:200]}")
+    return result
+
+
+# ============================================================================
+# Baselines
+# ============================================================================
+
+def compare_to_baseline(
+    results: List[LevelResult],
+    settings: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> Tuple[List[str], bool]:
+    """Return (regression messages, compared?)."""
+    if baseline.get("settings") != settings:
+        return [], False
+
+    regressions = []
+    for result in results:
+        base = baseline.get("results", {}).get(result.endpoint, {}).get(str(result.concurrency))
+        if not base:
+            continue
+        current = result.summary()
+        label = f"{result.endpoint} x{result.concurrency}"
+        if current["e2e_p95_ms"] > base["e2e_p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: e2e p95 {current['e2e_p95_ms']:.0f}ms > baseline {base['e2e_p95_ms']:.0f}ms")
+        if current["events_per_sec"] < base["events_per_sec"] * (1 - tolerance):
+            regressions.append(f"{label}: {current['events_per_sec']:.2f} ev/s < baseline {base['events_per_sec']:.2f} ev/s")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{label}: error rate {current['error_rate']:.0%} > baseline {base['error_rate']:.0%}")
+    return regressions, True
+
+
+def save_baseline(path: Path, results: List[LevelResult], settings: Dict[str, Any]):
+    data: Dict[str, Any] = {"settings": settings, "results": {}}
+    for result in results:
+        summary = {k: round(v, 3) for k, v in result.summary().items()}
+        data["results"].setdefault(result.endpoint, {})[str(result.concurrency)] = summary
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def print_report(results: List[LevelResult]):
+    print()
+    print(f"{'endpoint':<10}{'conc':>5}{'events':>7}{'ev/s':>8}"
+          f"{'ack p50':>9}{'p95':>7}{'p99':>7}"
+          f"{'e2e p50':>9}{'p95':>7}{'p99':>7}"
+          f"{'loop blk':>10}{'max stall':>11}{'errors':>8}")
+    for result in results:
+        s = result.summary()
+        print(f"{result.endpoint:<10}{result.concurrency:>5}{result.events:>7}{s['events_per_sec']:>8.2f}"
+              f"{s['ack_p50_ms']:>9.0f}{s['ack_p95_ms']:>7.0f}{s['ack_p99_ms']:>7.0f}"
+              f"{s['e2e_p50_ms']:>9.0f}{s['e2e_p95_ms']:>7.0f}{s['e2e_p99_ms']:>7.0f}"
+              f"{s['loop_blocked_pct']:>9.0f}%{s['loop_max_stall_ms']:>9.0f}ms{result.errors:>8}")
+    print("(latencies in ms; loop blk = share of wall time the event loop was stalled)")
+
+    typeform = [r for r in results if r.endpoint == "typeform" and r.errors == 0]
+    if typeform:
+        best = max(typeform, key=lambda r: r.events_per_sec)
+        print(f"\nSustained Typeform throughput (one instance): "
+              f"{best.events_per_sec * 60:.0f} forms/min at concurrency {best.concurrency}")
+
+
+async def run(args) -> int:
+    settings = {
+        "lm_latency": args.lm_latency,
+        "db_latency": args.db_latency,
+        "http_latency": args.http_latency,
+        "events": args.events,
+    }
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+    endpoints = [e.strip() for e in args.endpoints.split(",")]
+
+    with install_standins(args.lm_latency, args.db_latency, args.http_latency) as env:
+        # Values the generic answers would get wrong (QualificationResult.priority is 1-5;
+        # ReAct should finish rather than loop through tools)
+        env.lm.overrides.update({"priority": "2", "next_tool_name": "finish", "next_tool_args": "{}"})
+
+        from api.main import app
+
+        tracker = CompletionTracker()
+        tracker.install()
+
+        # Warm-up: first-request imports and agent construction are cold-start cost, not throughput
+        for endpoint in endpoints:
+            await run_level(app, tracker, endpoint, 1, 1)
+
+        results = []
+        for endpoint in endpoints:
+            for concurrency in concurrency_levels:
+                result = await run_level(app, tracker, endpoint, concurrency, args.events)
+                results.append(result)
+                print(f"  {endpoint} x{concurrency}: {result.events_per_sec:.2f} ev/s, {result.errors} errors", flush=True)
+
+        print(f"\nStand-in calls: LM={env.lm.calls}, DB={sum(env.db.ops.values())}, "
+              f"HTTP={sum(env.http.calls.values())}, Slack SDK={sum(env.slack_calls.values())}")
+
+    print_report(results)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        save_baseline(baseline_path, results, settings)
+        print(f"\n💾 Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nℹ️ No baseline at {baseline_path} (run with --update-baseline)")
+        return 0
+
+    regressions, compared = compare_to_baseline(
+        results, settings, json.loads(baseline_path.read_text()), args.tolerance
+    )
+    if not compared:
+        print("\nℹ️ Baseline was recorded with different settings - not compared")
+        return 0
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) vs baseline (tolerance {args.tolerance:.0%}):")
+        for message in regressions:
+            print(f"   - {message}")
+        return 1
+    print(f"\n✅ Within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default="typeform,vapi,slack", help="Comma-separated: typeform,vapi,slack")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated in-flight request levels")
+    parser.add_argument("--events", type=int, default=32, help="Events per endpoint per concurrency level")
+    parser.add_argument("--lm-latency", type=float, default=0.2, help="Seconds per simulated LM call")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="Seconds per Supabase query")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="Seconds per outbound HTTP call")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--verbose", action="store_true", help="Show application logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    if not args.verbose:
+        logging.getLogger("dspy").setLevel(logging.CRITICAL)
+        logging.getLogger(__name__).setLevel(logging.WARNING)
+        logging.getLogger(__name__).addHandler(logging.StreamHandler())
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
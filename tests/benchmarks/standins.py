@@ -0,0 +1,596 @@
+"""
+Deterministic stand-ins for offline benchmarks.
+
+Replaces every external dependency on the webhook → qualification path so
+benchmarks measure our own code (parsing, agent construction, event-loop
+usage) with controlled, repeatable latency:
+
+- SimulatedLM        DSPy LM that answers any signature after a fixed delay
+- InMemorySupabase   supabase-py compatible query builder over dicts
+- Stub HTTP          httpx (Slack, GMass, Close, A2A) and requests (GMass)
+- Stub Slack SDK     slack_sdk.WebClient.api_call
+- HashingEmbedder    sentence-transformers substitute (no model download)
+- SimulatedEmbeddings  OpenAI embeddings API substitute (fixed latency)
+- EventLoopMonitor   measures how long the event loop was blocked
+
+Latency defaults mirror production: DSPy and supabase-py calls are
+synchronous (time.sleep — they block whatever thread calls them), httpx calls
+are async (asyncio.sleep).
+
+Usage:
+    with install_standins(lm_latency=0.4, db_latency=0.01, http_latency=0.05) as env:
+        from api.main import app   # import AFTER installing
+        ...
+        env.lm.calls, env.db.rows("leads"), env.http.calls
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import dspy
+import httpx
+import numpy as np
+
+
+# ============================================================================
+# DSPy LM
+# ============================================================================
+
+_FIELD_PATTERN = re.compile(r"^\d+\. `(?P<name>\w+)` \((?P<type>[^)]*)\)", re.MULTILINE)
+_OUTPUT_SECTION = re.compile(r"Your output fields are:\n(?P<body>.*?)(?:\n\n|\Z)", re.DOTALL)
+
+
+def _value_for_type(name: str, type_name: str) -> str:
+    """Plausible, parseable value for a DSPy output field."""
+    type_name = type_name.strip()
+    literal = re.match(r"Literal\[(?P<options>.+)\]", type_name)
+    if literal:
+        return literal.group("options").split(",")[0].strip().strip("'\"")
+    lowered = type_name.lower()
+    if lowered.startswith("int"):
+        return "72"
+    if lowered.startswith("float"):
+        return "0.72"
+    if lowered.startswith("bool"):
+        return "True"
+    if lowered.startswith(("list", "sequence")):
+        return "[]"
+    if lowered.startswith("dict"):
+        return "{}"
+    return f"Simulated {name.replace('_', ' ')}."
+
+
+class SimulatedLM(dspy.BaseLM):
+    """DSPy LM with fixed latency that answers any ChatAdapter signature.
+
+    Output fields are read from the adapter's system prompt, so every
+    Predict/ChainOfThought in the repo gets a parseable answer without
+    per-signature scripting. Values can be pinned with `overrides`.
+
+    Usage is reported like a provider would (~4 characters per token), with
+    a response cost when `cost_per_1k_tokens` is set.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        overrides: Optional[Dict[str, str]] = None,
+        cost_per_1k_tokens: float = 0.0
+    ):
+        super().__init__(model="simulated/lm", model_type="chat", temperature=0.0, max_tokens=1000, cache=False)
+        self.latency = latency
+        self.overrides = overrides or {}
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, messages: List[Dict[str, Any]]) -> str:
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        section = _OUTPUT_SECTION.search(system)
+        fields = _FIELD_PATTERN.finditer(section.group("body")) if section else []
+
+        parts = []
+        for match in fields:
+            name = match.group("name")
+            value = self.overrides.get(name, _value_for_type(name, match.group("type")))
+            parts.append(f"[[ ## {name} ## ]]\n{value}")
+        parts.append("[[ ## completed ## ]]")
+        return "\n\n".join(parts)
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        messages = messages or [{"role": "user", "content": prompt or ""}]
+        content = self._answer(messages)
+        prompt_tokens = max(1, sum(len(str(m.get("content", ""))) for m in messages) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        total_tokens = prompt_tokens + completion_tokens
+        hidden = {"response_cost": total_tokens / 1000 * self.cost_per_1k_tokens} if self.cost_per_1k_tokens else {}
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=None), finish_reason="stop")],
+            usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": total_tokens},
+            model=self.model,
+            _hidden_params=hidden
+        )
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        return self.forward(prompt=prompt, messages=messages, **kwargs)
+
+
+# ============================================================================
+# Supabase / Postgres
+# ============================================================================
+
+class _Query:
+    """Chainable subset of the postgrest query builder."""
+
+    def __init__(self, db: "InMemorySupabase", table: str):
+        self.db = db
+        self.table_name = table
+        self.operation = "select"
+        self.payload: Any = None
+        self.filters: List[Any] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._order: List[tuple] = []
+        self._single = False
+        self.on_conflict = "id"
+
+    # Operations
+    def select(self, *columns, **kwargs):
+        self.operation = "select"
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict="id", **kwargs):
+        self.operation, self.payload, self.on_conflict = "upsert", payload, on_conflict or "id"
+        return self
+
+    def update(self, payload, **kwargs):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+
+    # Filters
+    def _filter(self, predicate):
+        self.filters.append(predicate)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda row: row.get(column) == value)
+
+    def neq(self, column, value):
+        return self._filter(lambda row: row.get(column) != value)
+
+    def gt(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) > value)
+
+    def gte(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) < value)
+
+    def lte(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) <= value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._filter(lambda row: row.get(column) in values)
+
+    def is_(self, column, value):
+        return self._filter(lambda row: row.get(column) is None if value in (None, "null") else row.get(column) == value)
+
+    def ilike(self, column, pattern):
+        regex = re.compile("^" + re.escape(pattern).replace("%", ".*") + "$", re.IGNORECASE)
+        return self._filter(lambda row: bool(regex.match(str(row.get(column, "")))))
+
+    def order(self, column, desc=False, **kwargs):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, count, **kwargs):
+        self._limit = count
+        return self
+
+    def range(self, start, end, **kwargs):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    maybe_single = single
+
+    def execute(self):
+        return self.db._execute(self)
+
+
+class _AsyncQuery(_Query):
+    """Query builder for the async client: execute() is awaitable and yields."""
+
+    async def execute(self):
+        if self.db.latency:
+            await asyncio.sleep(self.db.latency)
+        return self.db._execute(self, blocking=False)
+
+
+class _AsyncView:
+    """supabase AsyncClient facade over the same in-memory tables."""
+
+    def __init__(self, db: "InMemorySupabase"):
+        self.db = db
+
+    def table(self, name: str) -> _AsyncQuery:
+        return _AsyncQuery(self.db, name)
+
+    from_ = table
+
+
+class InMemorySupabase:
+    """Thread-safe in-memory substitute for supabase.Client.
+
+    Every execute() sleeps for `latency` seconds (blocking, like the sync
+    supabase-py client) and records the operation in `ops`.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.ops: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[Dict] = None):
+        query = _Query(self, f"rpc:{name}")
+        query.operation = "rpc"
+        query.payload = params or {}
+        return query
+
+    def async_client(self) -> _AsyncView:
+        return _AsyncView(self)
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.tables[table])
+
+    def _execute(self, query: _Query, blocking: bool = True):
+        if blocking and self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.ops[(query.table_name, query.operation)] += 1
+            rows = self.tables[query.table_name]
+            matches = [row for row in rows if all(f(row) for f in query.filters)]
+
+            if query.operation in ("insert", "upsert"):
+                payload = query.payload if isinstance(query.payload, list) else [query.payload]
+                data = []
+                for item in payload:
+                    key = query.on_conflict
+                    existing = next((r for r in rows if key in item and r.get(key) == item[key]), None)
+                    if query.operation == "upsert" and existing is not None:
+                        existing.update(item)  # ON CONFLICT DO UPDATE: other columns are kept
+                        data.append(dict(existing))
+                        continue
+                    row = {"id": str(uuid.uuid4()), **item}
+                    rows.append(row)
+                    data.append(dict(row))
+            elif query.operation == "update":
+                for row in matches:
+                    row.update(query.payload)
+                data = [dict(row) for row in matches]
+            elif query.operation == "delete":
+                rows[:] = [row for row in rows if row not in matches]
+                data = [dict(row) for row in matches]
+            elif query.operation == "rpc":
+                data = self._match_documents(query.payload) if query.table_name == "rpc:match_documents" else []
+            else:
+                # Stable sorts, last key first, give multi-column ordering
+                for column, desc in reversed(query._order):
+                    matches.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+                if query._limit is not None:
+                    matches = matches[query._offset:query._offset + query._limit]
+                data = [dict(row) for row in matches]
+
+        if query._single:
+            data = data[0] if data else None
+        return SimpleNamespace(data=data, count=len(data) if isinstance(data, list) else int(data is not None))
+
+    def _match_documents(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """match_documents RPC: cosine similarity over documents.embedding."""
+        rows = [row for row in self.tables["documents"] if row.get("embedding") is not None]
+        if not rows:
+            return []
+        query = np.asarray(params["query_embedding"], dtype="float32")
+        similarities = np.stack([row["embedding"] for row in rows]) @ query
+        order = np.argsort(-similarities)[:params.get("match_count", 10)]
+        return [
+            {"id": rows[i]["id"], "content": rows[i]["content"], "metadata": rows[i].get("metadata", {}),
+             "similarity": float(similarities[i])}
+            for i in order if similarities[i] > params.get("match_threshold", 0.0)
+        ]
+
+
+# ============================================================================
+# Outbound HTTP (Slack, GMass, Close, A2A)
+# ============================================================================
+
+class StubHTTP:
+    """Routes outbound HTTP to canned responses with fixed latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._ts = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def respond(self, method: str, url: str) -> tuple:
+        """(status, json body) for a request."""
+        host = httpx.URL(url).host
+        with self._lock:
+            self.calls[host] += 1
+            ts = f"{int(time.time())}.{next(self._ts):06d}"
+
+        if "slack.com" in host:
+            return 200, {"ok": True, "channel": "C0BENCH", "ts": ts, "message": {"ts": ts}}
+        if "gmass" in host:
+            return 200, {"campaignDraftId": ts, "campaignId": ts, "success": True}
+        if "close.com" in host:
+            return 200, {"id": f"lead_{ts}", "data": []}
+        return 200, {"ok": True}
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        status, body = self.respond(request.method, str(request.url))
+        return httpx.Response(status, json=body, request=request)
+
+    def handle_sync(self, method: str, url: str, **kwargs):
+        """requests.Session.request replacement."""
+        import requests
+
+        if self.latency:
+            time.sleep(self.latency)
+        status, body = self.respond(method, url)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url = url
+        return response
+
+
+# ============================================================================
+# Embeddings
+# ============================================================================
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embeddings with the MiniLM dimension."""
+
+    def __init__(self, *args, dimension: int = 384, **kwargs):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        vectors = np.zeros((1 if single else len(texts), self.dimension), dtype="float32")
+        for row, text in enumerate([texts] if single else texts):
+            for token in str(text).lower().split():
+                bucket = int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dimension
+                vectors[row, bucket] += 1.0
+            norm = np.linalg.norm(vectors[row])
+            if norm:
+                vectors[row] /= norm
+        return vectors[0] if single else vectors
+
+
+class SimulatedEmbeddings:
+    """AsyncOpenAI stand-in exposing `embeddings.create` with fixed latency.
+
+    Vectors are hashed bags of words. Tokens containing digits (SKUs, codes)
+    are heavily down-weighted, mimicking how dense embeddings blur exact
+    identifiers - the case keyword retrieval exists for.
+    """
+
+    _WORD = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+    def __init__(self, latency: float = 0.0, dimension: int = 256):
+        self.latency = latency
+        self.dimension = dimension
+        self.calls = 0
+        self.embeddings = self
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype="float32")
+        for token in self._WORD.findall(text.lower()):
+            if len(token) < 3:
+                continue
+            bucket = int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dimension
+            vector[bucket] += 0.1 if any(c.isdigit() for c in token) else 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def create(self, model: str, input: str, **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=self.embed(input).tolist())])
+
+
+# ============================================================================
+# Event loop blocking
+# ============================================================================
+
+class EventLoopMonitor:
+    """Measures event-loop blocking by scheduling a ticker every `interval`.
+
+    Any lateness beyond the interval means something ran on the loop without
+    yielding. `blocked_seconds` is the total lateness; `max_lag` the worst stall.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - expected
+            if lag > 0.001:
+                self.blocked_seconds += lag
+                self.max_lag = max(self.max_lag, lag)
+
+    def start(self):
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+# ============================================================================
+# Installation
+# ============================================================================
+
+@dataclass
+class StandinEnvironment:
+    lm: SimulatedLM
+    db: InMemorySupabase
+    http: StubHTTP
+    slack_calls: Counter = field(default_factory=Counter)
+
+
+BENCHMARK_ENV = {
+    "SUPABASE_URL": "https://bench.supabase.local",
+    "SUPABASE_SERVICE_KEY": "bench-key",
+    "SUPABASE_KEY": "bench-key",
+    "OPENROUTER_API_KEY": "bench-openrouter-key",
+    "OPENAI_API_KEY": "bench-openai-key",
+    "SLACK_BOT_TOKEN": "xoxb-bench",
+    "GMASS_API_KEY": "bench-gmass",
+    "CLOSE_API_KEY": "bench-close",
+    "USE_STRATEGY_AGENT_ENTRY": "false",
+    "PHOENIX_ENABLED": "false",
+    "LOAD_OPTIMIZED_PROGRAMS": "false",
+    "CONVERSATION_STORE_URL": "memory",
+    "WEBHOOK_DEDUPE_URL": "memory",
+    "SLACK_CHANNEL_RATE": "0",  # Stub Slack has no rate limits; measure the app, not Slack's pacing
+}
+
+
+@contextlib.contextmanager
+def install_standins(lm_latency: float = 0.0, db_latency: float = 0.0, http_latency: float = 0.0):
+    """Patch every external dependency; import api.main inside the block."""
+    import tempfile
+
+    import requests
+    import slack_sdk
+    import supabase
+    from slack_sdk.web import SlackResponse
+
+    import socket
+
+    import supabase._async.client as supabase_async
+
+    import memory.agent_memory as agent_memory
+
+    env = StandinEnvironment(
+        lm=SimulatedLM(lm_latency),
+        db=InMemorySupabase(db_latency),
+        http=StubHTTP(http_latency)
+    )
+
+    original_async_init = httpx.AsyncClient.__init__
+
+    def async_client_init(self, *args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(env.http.handle_async)
+        original_async_init(self, *args, **kwargs)
+
+    def slack_api_call(client, api_method, **kwargs):
+        env.slack_calls[api_method] += 1
+        if http_latency:
+            time.sleep(http_latency)
+        ts = f"{int(time.time())}.{sum(env.slack_calls.values()):06d}"
+        return SlackResponse(
+            client=client, http_verb="POST", api_url=f"https://slack.com/api/{api_method}",
+            req_args={}, data={"ok": True, "channel": "C0BENCH", "ts": ts, "channels": []},
+            headers={}, status_code=200
+        )
+
+    with contextlib.ExitStack() as stack:
+        # Agent memory writes FAISS indexes to ./memory/db - keep them out of the tree
+        memory_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-memory-"))
+        original_memory_init = agent_memory.AgentMemory.__init__
+
+        def memory_init(self, agent_name, memory_dir_arg=None, embedding_model="all-MiniLM-L6-v2"):
+            original_memory_init(self, agent_name, memory_dir=memory_dir, embedding_model=embedding_model)
+
+        stack.enter_context(patch.object(agent_memory, "SentenceTransformer", HashingEmbedder))
+        stack.enter_context(patch.object(agent_memory.AgentMemory, "__init__", memory_init))
+        stack.enter_context(patch.dict(agent_memory._memory_instances, clear=True))
+        stack.enter_context(patch.dict(os.environ, BENCHMARK_ENV))
+        stack.enter_context(patch.object(dspy, "LM", lambda *args, **kwargs: env.lm))
+        stack.enter_context(patch.object(supabase, "create_client", lambda *args, **kwargs: env.db))
+
+        async def create_async_client(*args, **kwargs):
+            return env.db.async_client()
+
+        stack.enter_context(patch.object(supabase_async, "create_client", create_async_client))
+        if hasattr(supabase, "acreate_client"):
+            stack.enter_context(patch.object(supabase, "acreate_client", create_async_client))
+
+        # Anything that slips past the stand-ins must fail loudly, not hit the network
+        original_connect = socket.socket.connect
+
+        def guarded_connect(sock, address):
+            host = address[0] if isinstance(address, tuple) else address
+            if isinstance(host, str) and host not in ("127.0.0.1", "::1", "localhost") and sock.family != socket.AF_UNIX:
+                raise ConnectionRefusedError(f"Benchmark stand-ins: outbound connection to {host} blocked")
+            return original_connect(sock, address)
+
+        stack.enter_context(patch.object(socket.socket, "connect", guarded_connect))
+        stack.enter_context(patch.object(httpx.AsyncClient, "__init__", async_client_init))
+        stack.enter_context(patch.object(
+            requests.Session, "request", lambda session, method, url, **kw: env.http.handle_sync(method, url, **kw)
+        ))
+        stack.enter_context(patch.object(slack_sdk.WebClient, "api_call", slack_api_call))
+        dspy.configure(lm=env.lm)
+        yield env
@@ -0,0 +1,47 @@
+"""
+Labeled MCP Routing Tasks
+
+Hand-labeled tasks with the MCP servers a reviewer expects
+MCPOrchestrator.select_servers_for_task to activate. Used by the routing
+unit tests and the heuristic-vs-LLM benchmark.
+
+Labels follow config/trusted_mcp_servers.md: internal tools are always
+available, so internal-only tasks expect an empty list.
+"""
+
+from typing import List, Tuple
+
+
+# (task, expected external servers)
+LABELED_ROUTING_TASKS: List[Tuple[str, List[str]]] = [
+    # Internal only - database / analytics
+    ("Show me pipeline stats for this week", []),
+    ("How many HOT leads came in yesterday?", []),
+    ("Audit the lead flow for the last 48 hours", []),
+    ("Query supabase for leads with tier WARM", []),
+    ("What is our conversion rate from qualified to booked calls?", []),
+    ("Give me metrics on lead qualification tiers", []),
+    ("Run an audit of the pipeline metrics", []),
+    # Zapier - CRM / email / calendar / Google Workspace
+    ("Create a lead in Close CRM for Dr. Smith at Wellness Clinic", ["zapier"]),
+    ("Update the Close CRM lead status to contacted", ["zapier"]),
+    ("Send an email sequence to the new HOT leads via GMass", ["zapier"]),
+    ("Schedule a meeting with the Precision Health team on my calendar", ["zapier"]),
+    ("Read the Q1 planning doc from Google Drive", ["zapier"]),
+    ("Get rows from the KPI tracker spreadsheet in Google Sheets", ["zapier"]),
+    ("Search my Gmail for replies from Acme", ["zapier"]),
+    ("Sync new qualified leads into Close", ["zapier"]),
+    # Perplexity - research / news / competitive intelligence
+    ("Research Precision Health Clinic and find their decision makers", ["perplexity"]),
+    ("What recent news is there about InBody funding?", ["perplexity"]),
+    ("Competitive intelligence on Withings pricing strategy", ["perplexity"]),
+    ("Investigate market trends in metabolic health clinics", ["perplexity"]),
+    ("Find recent acquisitions in the body composition market", ["perplexity"]),
+    # Apify - scraping at scale
+    ("Scrape these 50 clinic websites and extract contact info", ["apify"]),
+    ("Crawl competitor websites to build a lead list", ["apify"]),
+    ("Extract data from multiple URLs for our prospect list", ["apify"]),
+    # Multi-server
+    ("Research Acme Clinic and create a Close CRM lead for their CEO", ["perplexity", "zapier"]),
+    ("Scrape the clinic directory websites then add each clinic to Close CRM", ["apify", "zapier"]),
+]
@@ -0,0 +1,117 @@
+"""
+Knowledge-Base Retrieval Fixture
+
+A small `documents`-shaped corpus (id, content, metadata) with hand-labeled
+queries, used by the retrieval unit tests and the retrieval benchmark.
+
+Half of the queries are exact-term lookups (product SKUs, partner codes)
+that pure-vector search tends to miss; the rest are natural-language
+questions. `build_corpus(distractors=N)` pads the labeled chunks with
+deterministic filler chunks on the same topics so recall@k is measured
+against realistic competition.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+
+def _doc(doc_id: int, title: str, content: str) -> Dict:
+    slug = title.lower().replace(" ", "-")
+    return {
+        "id": doc_id,
+        "content": content,
+        "metadata": {"file_title": title, "file_id": slug, "file_url": f"https://drive.google.com/{slug}"},
+    }
+
+
+LABELED_CHUNKS: List[Dict] = [
+    _doc(1, "Product Catalog", "Hume Body Pod (SKU HM-BP200) is the clinic body composition scanner. "
+         "Wholesale price for clinics is $1,995 per unit with volume tiers above 10 units."),
+    _doc(2, "Product Catalog", "Hume Band (SKU HM-BD110) is the wearable for continuous recovery and "
+         "sleep tracking. Patients pair it with the Hume app during onboarding."),
+    _doc(3, "Product Catalog", "Clinic Starter Bundle (SKU HM-CSB-03) includes two Body Pods, ten Bands, "
+         "and onboarding for the clinic staff."),
+    _doc(4, "Product Catalog", "Replacement electrode plate kit (SKU HM-EP-7) for Body Pod units older "
+         "than 24 months. Ships in 3 business days."),
+    _doc(5, "Partner Program", "Partner code PRX-4471 is assigned to Precision Health. Their referral "
+         "discount is 12% on the first order."),
+    _doc(6, "Partner Program", "Partner code WLN-2208 belongs to Wellness Collective Clinics, onboarded in "
+         "March. Quarterly business reviews are owned by the partnerships team."),
+    _doc(7, "Q1 Strategy", "Q1 strategy: focus outbound on longevity clinics with more than 500 active "
+         "patients, and double the number of booked discovery calls."),
+    _doc(8, "Q1 Strategy", "Our main Q1 risk is slow follow-up: leads contacted after 24 hours convert "
+         "at half the rate of leads contacted within one hour."),
+    _doc(9, "Meeting Notes", "Julian's feedback on the pilot: clinics want the Body Pod results inside "
+         "their EMR, so the integration roadmap should prioritize an EMR export."),
+    _doc(10, "Meeting Notes", "Weekly sync: the sales team agreed that HOT leads get a same-day call and "
+          "WARM leads get an email sequence through GMass."),
+    _doc(11, "KPI Tracker", "October KPI summary: 142 qualified leads, 38 booked calls, and a 27% "
+          "qualified-to-booked conversion rate."),
+    _doc(12, "KPI Tracker", "Closer leaderboard: the top closer converted 9 of 14 demos in September, "
+          "the highest close rate on the team."),
+    _doc(13, "Operations Playbook", "Refund policy: clinics may return unopened hardware within 30 days. "
+          "Opened units are eligible for a service credit instead of a refund."),
+    _doc(14, "Operations Playbook", "Shipping to Canada requires the customs form CB-12 and adds five "
+          "business days to delivery estimates."),
+    _doc(15, "Operations Playbook", "Support escalation: hardware faults go to tier 2 within four hours; "
+          "tickets tagged ESC-HW are reviewed daily by operations."),
+    _doc(16, "Pricing Sheet", "Volume pricing: 10 to 24 Body Pods earn an 8% discount, 25 or more earn "
+          "a 15% discount, negotiated by the account executive."),
+    _doc(17, "Pricing Sheet", "Subscription pricing for the clinic analytics dashboard is $299 per month "
+          "per location, billed annually."),
+    _doc(18, "ICP Definition", "Ideal customer profile: longevity, functional medicine, and sports "
+          "performance clinics with in-house coaching and recurring memberships."),
+    _doc(19, "ICP Definition", "Poor fit: single-practitioner offices without a membership model and "
+          "hospital systems with procurement cycles longer than nine months."),
+    _doc(20, "Integration Guide", "The EMR export uses the HL7 FHIR Observation resource; error code "
+          "FHIR-409 means the patient record already has an observation for that timestamp."),
+]
+
+# (query, ids of relevant chunks)
+LABELED_QUERIES: List[Tuple[str, List[int]]] = [
+    # Exact-term lookups
+    ("HM-BP200 wholesale price", [1]),
+    ("HM-BD110", [2]),
+    ("what is in HM-CSB-03", [3]),
+    ("HM-EP-7 availability", [4]),
+    ("PRX-4471", [5]),
+    ("WLN-2208 partner", [6]),
+    ("customs form CB-12", [14]),
+    ("ESC-HW tickets", [15]),
+    ("FHIR-409 error", [20]),
+    # Natural-language questions
+    ("What is our Q1 strategy for outbound?", [7]),
+    ("What did Julian say about the pilot?", [9]),
+    ("How should we follow up with HOT leads?", [10]),
+    ("What was the conversion rate in October?", [11]),
+    ("What is the refund policy for clinics?", [13]),
+    ("Which clinics are a good fit for us?", [18]),
+    ("How much does the analytics dashboard cost?", [17]),
+    ("What discount do clinics get for volume orders?", [16]),
+    ("Why does slow follow-up hurt conversion?", [8]),
+]
+
+_FILLER_TITLES = ["Meeting Notes", "Operations Playbook", "Q1 Strategy", "KPI Tracker", "Sales Training"]
+_FILLER_SENTENCES = [
+    "The team reviewed pipeline health and clinic onboarding progress.",
+    "Leads from the webinar were routed to the sales team for follow-up.",
+    "Body Pod demos continue to be the strongest driver of booked calls.",
+    "Clinics asked for more detail on pricing, shipping, and support.",
+    "Operations will update the playbook after the next quarterly review.",
+    "Partner clinics requested co-marketing material for patient events.",
+    "Discovery calls should confirm patient volume and membership model.",
+    "The strategy for next quarter keeps longevity clinics as the focus.",
+    "Conversion improved after the email sequence was shortened.",
+    "Hardware questions are answered by the support team within a day.",
+]
+
+
+def build_corpus(distractors: int = 0, seed: int = 11) -> List[Dict]:
+    """Labeled chunks plus `distractors` deterministic filler chunks."""
+    rng = random.Random(seed)
+    corpus = [dict(chunk) for chunk in LABELED_CHUNKS]
+    for i in range(distractors):
+        title = rng.choice(_FILLER_TITLES)
+        content = " ".join(rng.sample(_FILLER_SENTENCES, 3))
+        corpus.append(_doc(1000 + i, title, content))
+    return corpus
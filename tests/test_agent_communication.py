@@ -0,0 +1,135 @@
+"""
+Tests for the bounded, indexed inter-agent message log.
+
+Covers:
+- Ring-buffer bounds on global and per-pair history
+- Indexed conversation / activity lookups
+- Append-only JSONL persistence and replay
+- Awaiting replies and inbox subscriptions
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from core.agent_communication import AgentMessage, CommunicationChannel, MessageStore
+
+
+def _msg(from_agent, to_agent, text, **metadata):
+    return AgentMessage(from_agent, to_agent, text, metadata=metadata)
+
+
+class TestMessageLog:
+
+    def test_global_history_is_bounded(self):
+        channel = CommunicationChannel(max_history=3)
+        for i in range(5):
+            channel.send(_msg("A", "B", f"m{i}"))
+
+        assert [m.message for m in channel.messages] == ["m2", "m3", "m4"]
+
+    def test_conversation_uses_pair_index(self):
+        channel = CommunicationChannel(max_history=10, max_pair_history=100)
+        channel.send(_msg("A", "B", "hi"))
+        channel.send(_msg("B", "A", "hello"))
+        # Busy unrelated traffic pushes A/B out of the global buffer
+        for i in range(20):
+            channel.send(_msg("C", "D", f"noise{i}"))
+
+        conversation = channel.get_conversation("B", "A", limit=10)
+        assert [m.message for m in conversation] == ["hi", "hello"]
+
+    def test_conversation_limit_returns_most_recent(self):
+        channel = CommunicationChannel()
+        for i in range(5):
+            channel.send(_msg("A", "B", f"m{i}"))
+
+        assert [m.message for m in channel.get_conversation("A", "B", limit=2)] == ["m3", "m4"]
+
+    def test_agent_activity(self):
+        channel = CommunicationChannel()
+        channel.send(_msg("A", "B", "one"))
+        channel.send(_msg("C", "A", "two"))
+        channel.send(_msg("C", "B", "three"))
+
+        assert [m.message for m in channel.get_agent_activity("A")] == ["one", "two"]
+        assert channel.get_agent_activity("nobody") == []
+
+    def test_message_ids_unique(self):
+        ids = {_msg("A", "B", "same").id for _ in range(100)}
+        assert len(ids) == 100
+
+
+class TestMessageStore:
+
+    def test_replays_recent_messages(self, tmp_path):
+        path = str(tmp_path / "logs" / "messages.jsonl")
+        channel = CommunicationChannel(store=MessageStore(path))
+        for i in range(5):
+            channel.send(_msg("A", "B", f"m{i}", lead_id=i))
+
+        restored = CommunicationChannel(max_history=3, store=MessageStore(path))
+
+        assert [m.message for m in restored.messages] == ["m2", "m3", "m4"]
+        assert restored.messages[-1].metadata == {"lead_id": 4}
+        assert restored.get_conversation("A", "B")[-1].id == channel.messages[-1].id
+
+    def test_skips_corrupt_lines(self, tmp_path):
+        path = tmp_path / "messages.jsonl"
+        store = MessageStore(str(path))
+        store.append(_msg("A", "B", "good"))
+        with open(path, "a") as f:
+            f.write("{not json\n")
+
+        assert [m.message for m in store.load_recent(10)] == ["good"]
+
+
+class TestAsyncDelivery:
+
+    @pytest.mark.asyncio
+    async def test_wait_for_reply(self):
+        channel = CommunicationChannel()
+        request = _msg("A", "B", "question")
+        channel.send(request)
+
+        async def reply_later():
+            await asyncio.sleep(0.01)
+            channel.send(_msg("B", "A", "answer", in_response_to=request.id))
+
+        asyncio.create_task(reply_later())
+        reply = await channel.wait_for_reply(request.id, timeout=1)
+
+        assert reply.message == "answer"
+        assert channel._reply_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_for_reply_already_arrived(self):
+        channel = CommunicationChannel()
+        channel.send(_msg("B", "A", "answer", in_response_to="req-1"))
+
+        reply = await channel.wait_for_reply("req-1", timeout=0.1)
+        assert reply.message == "answer"
+
+    @pytest.mark.asyncio
+    async def test_wait_for_reply_timeout(self):
+        channel = CommunicationChannel()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await channel.wait_for_reply("missing", timeout=0.01)
+        assert channel._reply_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_subscription_receives_from_other_threads(self):
+        channel = CommunicationChannel()
+
+        async with channel.subscribe("B") as inbox:
+            sender = threading.Thread(target=channel.send, args=(_msg("A", "B", "from thread"),))
+            sender.start()
+            channel.send(_msg("A", "C", "not for B"))
+            message = await inbox.get(timeout=1)
+            sender.join()
+
+        assert message.message == "from thread"
+        assert inbox.queue.empty()
+        assert channel._subscriptions["B"] == []
@@ -0,0 +1,168 @@
+"""
+Tests for subordinate pooling and parallel delegation in AgentDelegation.
+
+Covers:
+- LRU and idle-time eviction in SubordinatePool
+- Warm reuse within a superior; pools are not shared across superiors
+- Concurrent misses build a subordinate once
+- Parallel execution under the parallelism cap
+- Pre-warming of frequently used profiles
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import core.agent_delegation_enhanced as delegation_module
+from core.agent_delegation_enhanced import AgentDelegation, SubordinatePool
+
+
+class FakeSubordinate:
+    """Lightweight stand-in for SubordinateAgent (no DSPy/FAISS)."""
+
+    created = 0
+    active = 0
+    peak = 0
+
+    def __init__(self, profile, superior_agent, specialized_instructions):
+        FakeSubordinate.created += 1
+        self.profile = profile
+        self.superior = superior_agent
+        self.calls = []
+
+    async def process(self, message):
+        FakeSubordinate.active += 1
+        FakeSubordinate.peak = max(FakeSubordinate.peak, FakeSubordinate.active)
+        await asyncio.sleep(0.02)
+        FakeSubordinate.active -= 1
+        self.calls.append(message)
+        return f"{self.profile}:{message}"
+
+
+class FakeSuperior:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def fake_subordinates(monkeypatch):
+    FakeSubordinate.created = 0
+    FakeSubordinate.active = 0
+    FakeSubordinate.peak = 0
+    monkeypatch.setattr(delegation_module, "SubordinateAgent", FakeSubordinate)
+
+
+@pytest.fixture
+def pool():
+    return SubordinatePool(max_size=2, idle_ttl_seconds=60)
+
+
+class TestSubordinatePool:
+
+    def test_reuses_warm_subordinate(self, pool):
+        first = pool.get_or_create("S.a", lambda: FakeSubordinate("a", None, ""))
+        second = pool.get_or_create("S.a", lambda: FakeSubordinate("a", None, ""))
+
+        assert first is second
+        assert pool.get_stats()["hits"] == 1
+        assert FakeSubordinate.created == 1
+
+    def test_lru_eviction(self, pool):
+        for key in ["S.a", "S.b"]:
+            pool.get_or_create(key, lambda: FakeSubordinate(key, None, ""))
+        pool.get("S.a")  # a is now most recent
+        pool.get_or_create("S.c", lambda: FakeSubordinate("c", None, ""))
+
+        assert pool.keys() == ["S.a", "S.c"]
+        assert pool.get_stats()["evictions"] == 1
+
+    def test_idle_eviction(self, pool, monkeypatch):
+        pool.get_or_create("S.a", lambda: FakeSubordinate("a", None, ""))
+
+        later = time.monotonic() + 120
+        monkeypatch.setattr(delegation_module.time, "monotonic", lambda: later)
+
+        assert pool.evict_idle() == 1
+        assert pool.get("S.a") is None
+
+    def test_concurrent_misses_build_once(self, pool):
+        def slow_factory():
+            time.sleep(0.02)
+            return FakeSubordinate("a", None, "")
+
+        threads = [threading.Thread(target=pool.get_or_create, args=("S.a", slow_factory)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert FakeSubordinate.created == 1
+        assert pool.get_stats()["hits"] == 3
+
+    def test_reset_rebuilds(self, pool):
+        first = pool.get_or_create("S.a", lambda: FakeSubordinate("a", None, ""))
+        second = pool.get_or_create("S.a", lambda: FakeSubordinate("a", None, ""), reset=True)
+
+        assert first is not second
+
+
+class TestAgentDelegationPooling:
+
+    @pytest.mark.asyncio
+    async def test_reused_within_superior_isolated_across_superiors(self):
+        first_superior, second_superior = FakeSuperior(), FakeSuperior()
+        first = AgentDelegation(first_superior)
+        second = AgentDelegation(second_superior)
+
+        await first.call_subordinate("market_researcher", "size the market")
+        await first.call_subordinate("market_researcher", "list competitors")
+        await second.call_subordinate("market_researcher", "other superior")
+
+        assert FakeSubordinate.created == 2
+        assert first.get_subordinate("market_researcher").calls == ["size the market", "list competitors"]
+        assert second.get_subordinate("market_researcher").superior is second_superior
+        assert second.get_subordinate("market_researcher").calls == ["other superior"]
+
+    @pytest.mark.asyncio
+    async def test_call_subordinates_parallel_with_cap(self):
+        delegation = AgentDelegation(FakeSuperior(), pool=SubordinatePool(max_size=10), max_parallel=2)
+        assignments = [
+            ("competitor_analyst", "InBody"),
+            ("market_researcher", "clinics"),
+            ("account_researcher", "Acme"),
+            ("competitor_analyst", "Withings"),
+        ]
+
+        results = await delegation.call_subordinates(assignments)
+
+        assert results == [f"{p}:{t}" for p, t in assignments]
+        assert FakeSubordinate.peak == 2
+        # Same-profile tasks run in order on one subordinate
+        assert delegation.get_subordinate("competitor_analyst").calls == ["InBody", "Withings"]
+
+    @pytest.mark.asyncio
+    async def test_prewarm_most_used(self, pool):
+        delegation = AgentDelegation(FakeSuperior(), pool=pool)
+        for _ in range(3):
+            await delegation.call_subordinate("campaign_analyst", "check")
+        delegation.clear_all_subordinates()
+
+        warmed = await delegation.prewarm(top_n=1)
+
+        assert warmed == ["campaign_analyst"]
+        assert delegation.list_subordinates() == ["campaign_analyst"]
+
+    @pytest.mark.asyncio
+    async def test_prewarm_from_env(self, pool, monkeypatch):
+        monkeypatch.setenv("SUBORDINATE_PREWARM_PROFILES", "document_analyst, content_strategist")
+        delegation = AgentDelegation(FakeSuperior(), pool=pool)
+
+        warmed = await delegation.prewarm()
+
+        assert warmed == ["document_analyst", "content_strategist"]
+
+    def test_refine_unknown_profile(self, pool):
+        delegation = AgentDelegation(FakeSuperior(), pool=pool)
+        result = asyncio.run(delegation.refine_subordinate_work("nobody", "feedback"))
+        assert "not found" in result
@@ -0,0 +1,172 @@
+"""
+Tests for in-process agent dispatch.
+
+Covers:
+- Registered routes run in-process: models are passed as-is, context carries over
+- Local timeouts raise TimeoutException; the handler still runs to completion
+- Unregistered routes (or AGENT_DISPATCH_MODE=http) POST serialized JSON
+- api.main serves the same handlers over HTTP and in-process
+- The inbound qualify handler writes the InboundAgent agent_state row
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from core import persistence_writer
+from core.agent_dispatch import FOLLOWUP_A2A, INBOUND_QUALIFY, AgentDispatcher, get_agent_dispatcher
+from core.exceptions import TimeoutException
+from core.persistence_writer import PersistenceWriter
+from tests.benchmarks.standins import BENCHMARK_ENV, InMemorySupabase
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class Payload(BaseModel):
+    email: str
+    score: int
+
+
+@pytest.mark.asyncio
+async def test_local_dispatch_passes_models_and_context():
+    seen = {}
+
+    async def handler(payload):
+        seen["lead"] = payload["lead"]
+        seen["request_id"] = request_id.get()
+        return 200, {"status": "success"}
+
+    dispatcher = AgentDispatcher(base_url="http://unused")
+    dispatcher.register(INBOUND_QUALIFY, handler)
+    lead = Payload(email="a@example.com", score=80)
+
+    request_id.set("req-1")
+    response = await dispatcher.dispatch(INBOUND_QUALIFY, {"lead": lead})
+
+    assert response.via == "local" and response.ok
+    assert seen == {"lead": lead, "request_id": "req-1"}
+    assert seen["lead"] is lead
+
+
+@pytest.mark.asyncio
+async def test_local_timeout_raises():
+    async def slow(payload):
+        await asyncio.sleep(1)
+        return 200, {}
+
+    dispatcher = AgentDispatcher(base_url="http://unused")
+    dispatcher.register(FOLLOWUP_A2A, slow)
+
+    with pytest.raises(TimeoutException) as excinfo:
+        await dispatcher.dispatch(FOLLOWUP_A2A, {"message": "hi"}, timeout=0.05)
+    assert excinfo.value.timeout_seconds == 0.05
+
+
+@pytest.mark.asyncio
+async def test_local_handler_finishes_after_caller_times_out():
+    finished = asyncio.Event()
+
+    async def slow_write(payload):
+        await asyncio.sleep(0.1)
+        finished.set()  # e.g. the DB write after the LLM call
+        return 200, {}
+
+    dispatcher = AgentDispatcher(base_url="http://unused")
+    dispatcher.register(FOLLOWUP_A2A, slow_write)
+
+    with pytest.raises(TimeoutException):
+        await dispatcher.dispatch(FOLLOWUP_A2A, {"message": "hi"}, timeout=0.02)
+
+    await dispatcher.aclose()
+    assert finished.is_set()
+
+
+@pytest.mark.asyncio
+async def test_http_fallback_serializes_payload():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503, json={"status": "error", "error": "busy"})
+
+    dispatcher = AgentDispatcher(base_url="http://agents.internal", mode="http")
+    dispatcher.register(INBOUND_QUALIFY, lambda payload: None)  # Ignored in http mode
+    dispatcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    response = await dispatcher.dispatch(INBOUND_QUALIFY, {"lead": Payload(email="b@example.com", score=5)})
+
+    assert response.via == "http" and response.status_code == 503
+    assert response.json()["error"] == "busy"
+    assert str(requests[0].url) == "http://agents.internal/agents/inbound/qualify"
+    assert requests[0].read() == b'{"lead":{"email":"b@example.com","score":5}}'
+    await dispatcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_api_serves_same_handler_locally_and_over_http():
+    class FollowUp:
+        async def respond(self, message):
+            return f"ack: {message}"
+
+    with patch.dict(os.environ, BENCHMARK_ENV):
+        import api.main
+
+    api.main.app.state.followup_agent = FollowUp()
+    try:
+        assert get_agent_dispatcher().is_local(FOLLOWUP_A2A)
+        local = await get_agent_dispatcher().dispatch(FOLLOWUP_A2A, {"message": "start"})
+
+        transport = httpx.ASGITransport(app=api.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            remote = await client.post(FOLLOWUP_A2A, json={"message": "start"})
+            missing = await client.post(FOLLOWUP_A2A, json={})
+    finally:
+        del api.main.app.state.followup_agent
+
+    assert local.via == "local"
+    assert remote.status_code == local.status_code == 200
+    assert remote.json() == local.json() == {"status": "success", "response": "ack: start", "agent": "FollowUpAgent"}
+    assert missing.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_inbound_qualify_handler_saves_agent_state():
+    from agents.inbound_agent import InboundAgent
+    from models import Lead
+
+    with patch.dict(os.environ, BENCHMARK_ENV):
+        import api.main
+
+    qualified_in = []
+
+    def qualify(lead):
+        qualified_in.append(threading.current_thread())
+        return InboundAgent.qualify(agent, lead)  # Disposable domain: pre-qualifier, no LLM
+
+    agent = InboundAgent.__new__(InboundAgent)
+    agent.agent_name = "InboundAgent"
+    agent.qualify = qualify
+    agent.memory = Mock(save_lead_memory=AsyncMock(return_value="memory-1"))
+    db = InMemorySupabase()
+    loop = asyncio.get_running_loop()
+    persistence_writer._writers[loop] = PersistenceWriter(db.async_client(), flush_interval=0.01)
+    api.main.app.state.inbound_agent = agent
+    try:
+        lead = Lead(id="lead-41", email="sam@yopmail.com", typeform_id="tf-41", form_id="form1", raw_answers={})
+        response = await get_agent_dispatcher().dispatch(INBOUND_QUALIFY, {"lead": lead})
+    finally:
+        del api.main.app.state.inbound_agent
+        await persistence_writer.close_persistence_writer()
+
+    assert response.status_code == 200
+    assert qualified_in != [threading.current_thread()]  # LM work stays off the loop
+    agent.memory.save_lead_memory.assert_awaited_once()
+    [state] = db.rows("agent_state")
+    assert state["agent_name"] == "InboundAgent" and state["lead_id"] == "lead-41"
+    assert state["state_data"]["qualification_tier"] == "unqualified"
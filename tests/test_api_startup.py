@@ -0,0 +1,95 @@
+"""
+Tests for API cold start.
+
+Covers:
+- Importing api.main does not build heavy subsystems
+- warm_up() builds components through the lazy accessors and reports status
+- The shutdown hook drains the dispatcher, then flushes the Slack outbox and writer
+"""
+
+import os
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from tests.benchmarks.bench_cold_start import run_child
+from tests.benchmarks.standins import BENCHMARK_ENV
+
+
+@pytest.fixture
+def api_main():
+    with patch.dict(os.environ, BENCHMARK_ENV):
+        import api.main
+        status = dict(api.main.warmup_status, components={})
+        yield api.main
+        api.main.warmup_status.clear()
+        api.main.warmup_status.update(status)
+
+
+def test_import_defers_heavy_subsystems():
+    result, rows = run_child()
+
+    assert result["heavy_loaded"] == []
+    assert result["health_status"] == 200
+    assert rows, "expected -X importtime output"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_builds_components(api_main):
+    class Delegation:
+        prewarmed = False
+
+        async def prewarm(self):
+            Delegation.prewarmed = True
+
+    class Agent:
+        delegation = Delegation()
+
+    with patch.object(api_main, "setup_tracing", lambda: None), \
+            patch.object(api_main, "get_supabase", lambda: object()), \
+            patch.object(api_main, "get_idempotency_index", lambda: object()), \
+            patch.object(api_main, "get_follow_up_agent", lambda: object()), \
+            patch("api.slack_bot.get_strategy_agent", lambda: Agent()):
+        await api_main.warm_up()
+
+    assert api_main.warmup_status["state"] == "ready"
+    assert set(api_main.warmup_status["components"]) == {
+        "observability", "supabase", "idempotency_index", "follow_up_agent", "strategy_agent"
+    }
+    assert Delegation.prewarmed
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_failed_component(api_main):
+    def broken():
+        raise RuntimeError("postgres unreachable")
+
+    with patch.object(api_main, "setup_tracing", lambda: None), \
+            patch.object(api_main, "get_supabase", lambda: None), \
+            patch.object(api_main, "get_idempotency_index", lambda: object()), \
+            patch.object(api_main, "get_follow_up_agent", broken), \
+            patch("api.slack_bot.get_strategy_agent", lambda: object()):
+        await api_main.warm_up()
+
+    assert api_main.warmup_status["state"] == "degraded"
+    assert api_main.warmup_status["components"]["supabase"] == "failed"
+    assert api_main.warmup_status["components"]["follow_up_agent"] == "failed"
+    assert api_main.warmup_status["components"]["strategy_agent"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_slack_outbox_after_dispatcher(api_main):
+    calls = []
+    dispatcher = Mock(aclose=AsyncMock(side_effect=RuntimeError("handler crashed")))
+    outbox = Mock(aclose=AsyncMock(side_effect=lambda: calls.append("slack_outbox")))
+
+    async def close_writer():
+        calls.append("persistence_writer")
+
+    with patch.object(api_main, "get_agent_dispatcher", lambda: dispatcher), \
+            patch.object(api_main, "get_slack_outbox", lambda: outbox), \
+            patch("core.persistence_writer.close_persistence_writer", close_writer):
+        await api_main.flush_pending_writes()
+
+    dispatcher.aclose.assert_awaited_once()
+    assert calls == ["slack_outbox", "persistence_writer"]
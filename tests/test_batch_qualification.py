@@ -0,0 +1,182 @@
+"""
+Tests for batch lead qualification.
+
+Covers:
+- Supabase leads are re-scored with bounded concurrency and written back in bulk upserts
+- The report counts LM calls per model, tiers and tier changes
+- Checkpoints resume a JSONL run after the last written batch; failed leads are recorded
+- Per-model token buckets pace LM calls
+- Stored rows and Typeform payloads both become Leads
+- Re-scored Typeform payloads update the stored lead matched on typeform_id
+"""
+
+import json
+import threading
+import time
+
+import dspy
+import pytest
+from dspy.utils.dummies import DummyLM
+
+from core.batch_qualification import (
+    BatchQualifier,
+    JsonlLeadSource,
+    ModelRateLimiter,
+    SupabaseLeadSource,
+    lead_from_row,
+    parse_model_rates,
+)
+from models import QualificationCriteria, QualificationResult
+from tests.benchmarks.standins import InMemorySupabase
+
+
+def lead_row(n, tier="cold"):
+    return {
+        "id": f"lead-{n:04d}",
+        "typeform_id": f"tok{n}",
+        "form_id": "form1",
+        "email": f"owner{n}@clinic.example",
+        "qualification_tier": tier,
+        "status": "qualified",
+        "raw_answers": {"fit": 20 + 3 * n},
+    }
+
+
+class FakeQualifier:
+    """Scores from raw_answers['fit'] after two LM calls; tracks concurrency."""
+
+    def __init__(self, delay=0.0, fail_for=()):
+        self.lm = DummyLM([{"answer": "ok"}] * 1000)
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, lead):
+        with self._lock:
+            self.calls.append(lead.id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if lead.id in self.fail_for:
+                raise RuntimeError("LM unavailable")
+            with dspy.context(lm=self.lm):
+                predict = dspy.Predict("question -> answer")
+                predict(question="fit?")
+                predict(question="engagement?")
+            time.sleep(self.delay)
+            return QualificationResult.from_score(
+                min(lead.get_field("fit"), 100),
+                reasoning="fit",
+                criteria=QualificationCriteria(
+                    business_size_score=0, patient_volume_score=0, industry_fit_score=0,
+                    response_quality_score=0, calendly_booking_score=0,
+                    response_completeness_score=0, company_data_score=0,
+                ),
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_rescore_supabase_leads_in_bulk():
+    db = InMemorySupabase()
+    db.tables["leads"].extend(lead_row(n) for n in range(25))
+    qualify = FakeQualifier(delay=0.01)
+    qualifier = BatchQualifier(qualify, supabase_client=db, concurrency=4, write_size=10,
+                               rate_limiter=ModelRateLimiter())
+
+    report = await qualifier.run(SupabaseLeadSource(db, page_size=10))
+
+    assert report.processed == 25 and report.failed == 0 and report.written == 25
+    assert db.ops[("leads", "upsert")] == 3  # 10 + 10 + 5
+    assert 1 < qualify.max_in_flight <= 4
+    assert report.lm_calls == {"dummy": 50}
+
+    rows = {row["id"]: row for row in db.rows("leads")}
+    assert rows["lead-0000"]["qualification_tier"] == "unqualified"
+    assert rows["lead-0024"]["qualification_tier"] == "scorching"
+    assert rows["lead-0024"]["qualification_score"] == 92
+    assert report.tiers["scorching"] == 1
+    assert report.tier_changes["cold->unqualified"] == 4  # fit 20..29
+    assert "cold->cold" not in report.tier_changes
+    assert "25 leads" in report.summary()
+
+
+@pytest.mark.asyncio
+async def test_resume_jsonl_run_from_checkpoint(tmp_path):
+    source_path = tmp_path / "leads.jsonl"
+    source_path.write_text("\n".join(json.dumps(lead_row(n)) for n in range(20)) + "\n")
+    output = tmp_path / "rescored.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+
+    qualify = FakeQualifier(fail_for={"lead-0003"})
+    first = BatchQualifier(qualify, output_path=str(output), checkpoint_path=str(checkpoint),
+                           concurrency=3, write_size=5)
+    report = await first.run(JsonlLeadSource(str(source_path)), limit=12)
+    assert report.processed == 11 and report.failed_ids == ["lead-0003"]
+    assert json.loads(checkpoint.read_text())["cursor"] == 12
+
+    # A second run continues after line 12 and keeps the running totals
+    report = await BatchQualifier(qualify, output_path=str(output), checkpoint_path=str(checkpoint),
+                                  concurrency=3, write_size=5).run(JsonlLeadSource(str(source_path)))
+    assert report.processed == 19 and report.failed == 1
+    assert len(qualify.calls) == 20 == len(set(qualify.calls))
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r["id"] for r in results) == sorted(f"lead-{n:04d}" for n in range(20) if n != 3)
+    assert results[0]["previous_tier"] == "cold"
+
+
+@pytest.mark.asyncio
+async def test_typeform_payloads_update_stored_lead_by_typeform_id(tmp_path):
+    db = InMemorySupabase()
+    db.tables["leads"].append(lead_row(1))
+    source_path = tmp_path / "payloads.jsonl"
+    source_path.write_text(json.dumps({"form_id": "form1", "form_response": {
+        "token": "tok1",
+        "submitted_at": "2025-06-01T10:00:00Z",
+        "answers": [{"type": "number", "number": 90, "field": {"id": "f1", "type": "number", "ref": "fit"}}],
+    }}) + "\n")
+
+    report = await BatchQualifier(FakeQualifier(), supabase_client=db).run(JsonlLeadSource(str(source_path)))
+
+    assert report.processed == 1 and report.written == 1
+    [row] = db.rows("leads")
+    assert row["id"] == "lead-0001" and row["email"] == "owner1@clinic.example"
+    assert row["qualification_tier"] == "scorching"
+
+
+def test_model_rate_limiter_paces_each_model():
+    limiter = ModelRateLimiter(parse_model_rates("slow=600, other=60"), burst=1)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("slow",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - started >= 0.29  # 10/s, first call immediate
+    assert limiter.acquire("unlisted") == 0.0
+    assert limiter.acquire("other") == 0.0  # Its own bucket
+
+
+def test_lead_from_row_and_typeform_payload():
+    lead = lead_from_row({**lead_row(1, tier="HOT"), "id": 7, "submitted_at": "2025-06-01T10:00:00Z"})
+    assert lead.id == "7" and lead.is_complete() and lead.tier is None
+
+    payload = {
+        "form_id": "form1",
+        "form_response": {
+            "token": "tok-typeform",
+            "submitted_at": "2025-06-01T10:00:00Z",
+            "definition": {"fields": []},
+            "answers": [{"type": "email", "email": "jo@clinic.example", "field": {"id": "f1", "type": "email"}}],
+        },
+    }
+    lead = lead_from_row(payload)
+    assert lead.typeform_id == "tok-typeform" and lead.email == "jo@clinic.example"
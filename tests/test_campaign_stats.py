@@ -0,0 +1,109 @@
+"""
+Tests for the GMass campaign stats cache.
+
+Covers:
+- Window aggregates match a brute-force reference for arbitrary windows
+- Sync applies only new/changed/removed campaigns and persists a snapshot
+- ensure_fresh syncs a cold cache, then serves from cache within the TTL
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core.campaign_stats import STAT_FIELDS, CampaignStatsCache
+
+NOW = datetime(2025, 11, 3, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def make_campaigns(n, seed=3):
+    rng = random.Random(seed)
+    campaigns = []
+    for i in range(n):
+        created = datetime.fromtimestamp(NOW - rng.uniform(0, 30 * 86400), tz=timezone.utc)
+        campaigns.append({
+            "campaignId": 1000 + i,
+            "subject": f"Campaign {i}",
+            "creationTime": created.strftime("%Y-%m-%dT%H:%M:%SZ") if i % 25 else "",
+            "status": "sent",
+            "statistics": {
+                name: rng.randint(0, 10) if name in ("bounces", "blocks") else rng.randint(20, 200)
+                for name in STAT_FIELDS
+            }
+        })
+    return campaigns
+
+
+def reference(campaigns, hours):
+    cutoff = NOW - hours * 3600
+    selected = [
+        c for c in campaigns
+        if not c["creationTime"]
+        or datetime.fromisoformat(c["creationTime"].replace("Z", "+00:00")).timestamp() >= cutoff
+    ]
+    totals = {name: sum(c["statistics"][name] for c in selected) for name in STAT_FIELDS}
+    return len(selected), totals
+
+
+def test_window_matches_reference(tmp_path):
+    campaigns = make_campaigns(400)
+    cache = CampaignStatsCache("key", path=str(tmp_path / "stats.json"))
+    cache.apply(campaigns)
+
+    for hours in (1, 24, 72, 24 * 7, 24 * 45):
+        count, totals = reference(campaigns, hours)
+        result = cache.window(hours, now=NOW)
+        delivered = totals["recipients"] - totals["bounces"] - totals["blocks"]
+        assert result["total_campaigns"] == count
+        assert result["total_emails_sent"] == totals["recipients"]
+        assert result["open_rate"] == round(totals["opens"] / delivered * 100, 2)
+        assert sum(d["replies"] for d in result["campaigns_detail"]) == totals["replies"]
+
+
+def test_sync_applies_only_changes_and_persists(tmp_path):
+    path = str(tmp_path / "stats.json")
+    campaigns = make_campaigns(50)
+    cache = CampaignStatsCache("key", path=path)
+
+    assert cache.apply(campaigns) == 50
+    with patch.object(cache, "_save") as save:
+        assert cache.apply(campaigns) == 0
+    save.assert_not_called()  # Unchanged listing is not rewritten
+
+    campaigns[3]["statistics"]["opens"] += 5
+    removed = campaigns.pop()
+    assert cache.apply(campaigns) == 2
+
+    reloaded = CampaignStatsCache("key", path=path)
+    assert len(reloaded) == 49
+    assert reloaded.window(24 * 60, now=NOW) == cache.window(24 * 60, now=NOW)
+    assert str(removed["campaignId"]) not in {d["campaign_id"] for d in reloaded.window(24 * 60, now=NOW)["campaigns_detail"]}
+
+
+@pytest.mark.asyncio
+async def test_ensure_fresh_serves_from_cache_within_ttl(tmp_path):
+    campaigns = make_campaigns(20)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        assert request.headers["X-apikey"] == "key"
+        return httpx.Response(200, json=campaigns)
+
+    cache = CampaignStatsCache("key", path=str(tmp_path / "stats.json"), ttl_seconds=60)
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    await asyncio.gather(cache.ensure_fresh(), cache.ensure_fresh())
+    await cache.ensure_fresh()
+    assert len(requests) == 1
+
+    # Stale: answer immediately from cache, refresh in the background
+    cache._synced_at -= 120
+    await cache.ensure_fresh()
+    assert cache.window(24 * 60, now=NOW)["total_campaigns"] == 20
+    await cache._refresh_task
+    assert len(requests) == 2
@@ -0,0 +1,160 @@
+"""
+Tests for the ABM campaign store and due-touchpoint sweeps.
+
+Covers:
+- The due-time heap pops only due campaigns and skips superseded entries
+- save() writes only the touched fields
+- Due campaigns are claimed once across instances and survive a restart
+- run_due_steps runs due steps with bounded concurrency and batched response checks
+- Campaigns InboundAgent starts are run by the scheduler's sweep (one shared orchestrator)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from agents import account_orchestrator
+from agents.account_orchestrator import AccountOrchestrator, CampaignStatus
+from core.campaign_store import CampaignStore, SupabaseCampaignBackend
+from tests.benchmarks.standins import InMemorySupabase
+
+
+def lead(n):
+    return {
+        "account_id": f"acc_{n}",
+        "id": f"contact_{n}",
+        "email": f"owner{n}@clinic.example",
+        "name": f"Owner {n}",
+        "title": "Practice Manager",
+    }
+
+
+def campaign(campaign_id):
+    return {"campaign_id": campaign_id, "status": "active", "current_step": 0,
+            "contacts": [], "next_touchpoint_at": None}
+
+
+@pytest.mark.asyncio
+async def test_heap_pops_only_due_campaigns():
+    store = CampaignStore()
+    now = datetime.utcnow()
+    for campaign_id in ("due", "later", "moved", "paused"):
+        await store.create(campaign(campaign_id))
+        store.schedule(campaign_id, now - timedelta(minutes=5))
+    store.schedule("later", now + timedelta(days=2))
+    store.schedule("moved", now + timedelta(days=1))
+    store.schedule("moved", now - timedelta(minutes=1))  # Superseded twice, popped once
+    store.unschedule("paused")
+
+    popped = await store.pop_due(now)
+    assert [c["campaign_id"] for c in popped] == ["due", "moved"]
+    assert await store.pop_due(now) == []
+    assert store.depth() == 1 and store.next_due_at() == now + timedelta(days=2)
+
+
+@pytest.mark.asyncio
+async def test_save_writes_only_touched_fields():
+    db = InMemorySupabase()
+    store = CampaignStore(SupabaseCampaignBackend(db))
+    await store.create({**campaign("camp_1"), "metadata": {"company_name": "Clinic"}})
+
+    store.campaigns["camp_1"]["current_step"] = 1
+    store.campaigns["camp_1"]["metadata"] = {"untracked": True}
+    store.touch("camp_1", "current_step")
+    await store.save("camp_1")
+    await store.save("camp_1")  # Nothing touched since: no write
+
+    row = db.rows("campaigns")[0]
+    assert row["current_step"] == 1 and row["metadata"] == {"company_name": "Clinic"}
+    assert db.ops[("campaigns", "update")] == 1
+    assert store.stats["fields_written"] == 1
+
+
+@pytest.mark.asyncio
+async def test_due_campaigns_are_claimed_once_and_survive_restart():
+    db = InMemorySupabase()
+    first = AccountOrchestrator(supabase_client=db)
+    for n in range(3):
+        assert (await first.process_new_lead(lead(n)))["success"]
+
+    # Another instance and a restarted one see the same due rows; only one claims each
+    restarted = CampaignStore(SupabaseCampaignBackend(db))
+    now = datetime.utcnow() + timedelta(seconds=1)
+    claimed, lost = await asyncio.gather(restarted.pop_due(now), first.store.pop_due(now))
+
+    assert len(claimed) + len(lost) == 3
+    assert {c["campaign_id"] for c in claimed}.isdisjoint(c["campaign_id"] for c in lost)
+    assert restarted.stats["claims_lost"] + first.store.stats["claims_lost"] == 3
+    assert await restarted.pop_due(now) == [] and await first.store.pop_due(now) == []
+    assert all(row["next_touchpoint_at"] is None for row in db.rows("campaigns"))
+
+
+@pytest.mark.asyncio
+async def test_run_due_steps_bounded_and_batched():
+    db = InMemorySupabase()
+    orchestrator = AccountOrchestrator(supabase_client=db, config={"max_concurrent_steps": 2})
+    campaign_ids = [(await orchestrator.process_new_lead(lead(n)))["campaign_id"] for n in range(6)]
+    db.tables["responses"].append(
+        {"contact_id": "contact_0", "timestamp": datetime.utcnow().isoformat()}
+    )
+
+    in_flight, max_in_flight = 0, 0
+    execute = orchestrator._execute_touchpoint
+
+    async def tracked(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await execute(*args, **kwargs)
+
+    orchestrator._execute_touchpoint = tracked
+    db.ops.clear()
+    summary = await orchestrator.run_due_steps(now=datetime.utcnow() + timedelta(seconds=1))
+
+    assert summary["paused"] == [campaign_ids[0]]
+    assert sorted(summary["executed"]) == sorted(campaign_ids[1:])
+    assert summary["failed"] == {}
+    assert max_in_flight == 2
+    assert db.ops[("responses", "select")] == 1  # One query for every due campaign
+
+    # Executed campaigns are rescheduled at the next interval; the paused one is not
+    assert orchestrator.active_campaigns[campaign_ids[0]]["status"] == CampaignStatus.PAUSED.value
+    assert orchestrator.store.due_at(campaign_ids[0]) is None
+    assert all(orchestrator.store.due_at(c) > datetime.utcnow() + timedelta(days=1) for c in campaign_ids[1:])
+    assert (await orchestrator.run_due_steps())["executed"] == []
+
+
+def test_inbound_campaigns_are_run_by_the_scheduler_sweep(monkeypatch):
+    import agents.inbound_agent as inbound_agent
+    import scheduler
+    from config.settings import settings
+    from models import LeadTier, NextAction, QualificationCriteria, QualificationResult
+    from models.lead import Lead, ResponseType
+
+    db = InMemorySupabase()
+    monkeypatch.setattr(account_orchestrator, "_account_orchestrator", None)
+    monkeypatch.setattr(settings, "SUPABASE_KEY", "service-key")
+    monkeypatch.setattr("supabase.create_client", lambda url, key: db)
+    with patch.object(inbound_agent, "get_agent_memory", Mock()):
+        agent = inbound_agent.InboundAgent()
+    monkeypatch.setattr(agent, "qualify", lambda lead: QualificationResult(
+        is_qualified=True, score=85, tier=LeadTier.HOT, reasoning="Strong fit", criteria=QualificationCriteria(),
+        next_actions=[NextAction.SEND_EMAIL], priority=1, model_used="test", processing_time_ms=1))
+
+    lead = Lead(typeform_id="tok-abm", form_id="form1", response_type=ResponseType.COMPLETE,
+                email="dana@northside.example", first_name="Dana", last_name="Lynch", company="Northside Clinic")
+    result = agent.forward(lead)  # Worker-thread path: no running loop
+
+    assert result.campaign_id
+    assert db.rows("campaigns")[0]["next_touchpoint_at"] is not None
+
+    asyncio.run(scheduler.run_due_campaign_steps())
+
+    orchestrator = account_orchestrator.get_account_orchestrator()
+    assert orchestrator is agent.orchestrator
+    assert orchestrator.active_campaigns[result.campaign_id]["current_step"] == 1
+    assert db.rows("campaigns")[0]["current_step"] == 1
@@ -0,0 +1,84 @@
+"""
+Tests for the persistent conversation store.
+
+Covers:
+- Ring buffer bound per user, and backend trimming
+- Write-through persistence survives a new store (restart)
+- Token-budgeted rendering with cached windows
+- Batched summaries of evicted turns
+"""
+
+import sqlite3
+
+import pytest
+
+from core.conversation_store import (
+    EMPTY_HISTORY,
+    ConversationStore,
+    SQLiteConversationBackend,
+    estimate_tokens,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "conversations.db")
+
+
+def test_history_survives_restart(db_path):
+    store = ConversationStore(backend=SQLiteConversationBackend(db_path))
+    store.append_exchange("josh", "How many hot leads?", "There are 4 hot leads.")
+
+    restarted = ConversationStore(backend=SQLiteConversationBackend(db_path))
+
+    assert [t.role for t in restarted.turns("josh")] == ["user", "assistant"]
+    assert restarted.render("josh") == "Josh: How many hot leads?\nStrategy Agent: There are 4 hot leads."
+    assert restarted.render("someone-else") == EMPTY_HISTORY
+
+
+def test_ring_buffer_bounds_memory_and_rows(db_path):
+    store = ConversationStore(backend=SQLiteConversationBackend(db_path), max_turns=10)
+    for i in range(50):
+        store.append("josh", "user", f"message {i}")
+
+    turns = store.turns("josh")
+    assert len(turns) == 10
+    assert turns[0].content == "message 40"
+
+    rows = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM conversation_turns").fetchone()[0]
+    assert 10 <= rows < 20
+
+
+def test_render_respects_token_budget_and_caches():
+    store = ConversationStore(history_tokens=50, max_message_chars=1000)
+    for i in range(20):
+        store.append("josh", "user", f"{i:02d} " + "x" * 60)
+
+    rendered = store.render("josh")
+    assert sum(estimate_tokens(line) for line in rendered.split("\n")) <= 50
+    assert rendered.endswith("19 " + "x" * 60)
+    assert store.render("josh") is rendered
+
+    store.append("josh", "assistant", "ok")
+    assert store.render("josh").endswith("Strategy Agent: ok")
+
+
+def test_evicted_turns_are_summarized_in_batches(db_path):
+    batches = []
+
+    def summarizer(previous, turns):
+        batches.append([t.content for t in turns])
+        return f"{previous} +{len(turns)}".strip()
+
+    store = ConversationStore(backend=SQLiteConversationBackend(db_path), max_turns=4, summarizer=summarizer)
+    for i in range(9):
+        store.append("josh", "user", f"m{i}")
+    assert not store.needs_summary("josh")
+
+    store.append("josh", "user", "m9")
+    assert store.summarize_pending("josh")
+    assert batches == [["m0", "m1", "m2", "m3", "m4", "m5"]]
+    assert store.render("josh").startswith("Earlier in this conversation: +6\nJosh: m6")
+
+    restarted = ConversationStore(backend=SQLiteConversationBackend(db_path), max_turns=4)
+    assert restarted.summary("josh") == "+6"
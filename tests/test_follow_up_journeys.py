@@ -0,0 +1,172 @@
+"""
+Tests for async follow-up journeys and batch sweeps.
+
+Covers:
+- astart_lead_journey runs on the shared async checkpointer; sync and async paths share state
+- advance_journeys resumes only due journeys, with bounded concurrency
+- Responses escalate, max follow-ups go cold, finished and unknown journeys are skipped
+- Grouped checkpoint reads/writes against Postgres (set TEST_DATABASE_URL to run)
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.follow_up_agent import FollowUpAgent
+from core import journey_checkpoints
+from models import LeadStatus, LeadTier
+
+
+class RecordingEmailClient:
+    def __init__(self, delay=0.0):
+        self.sent = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def send_email(self, to_email, lead_id, template_type, tier, lead_data):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.sent.append((lead_id, template_type))
+        return True
+
+
+class RecordingSlack:
+    def __init__(self):
+        self.messages = []
+
+    def notify(self, channel, text, key, thread_ts=None):
+        self.messages.append((key, text))
+
+    def post(self, channel, text, thread_ts=None, kind=None):
+        self.messages.append((kind, text))
+
+
+class NoCampaign:
+    async def get_conversation_context(self, lead_id):
+        return None
+
+
+def make_agent(email_delay=0.0):
+    """FollowUpAgent with its graph, recording email/Slack clients and no LLM or Supabase."""
+    agent = FollowUpAgent.__new__(FollowUpAgent)
+    agent.email_client = RecordingEmailClient(email_delay)
+    agent.slack = RecordingSlack()
+    agent.company_graph = NoCampaign()
+    agent.orchestrator = None
+    agent.graph = agent._build_graph()
+    agent._async_graph = None
+    return agent
+
+
+def lead_ids(n):
+    return [f"lead-{uuid.uuid4().hex[:8]}" for _ in range(n)]
+
+
+async def start(agent, ids, tier=LeadTier.HOT):
+    for lead_id in ids:
+        await agent.astart_lead_journey(
+            lead_id=lead_id, email=f"{lead_id}@clinic.example", first_name="Jordan",
+            tier=tier, slack_thread_ts="1.000", slack_channel="C0LEADS01"
+        )
+
+
+@pytest.fixture(autouse=True)
+def memory_checkpoints(monkeypatch):
+    monkeypatch.setenv("FOLLOWUP_CHECKPOINT_URL", "memory")
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+
+
+@pytest.mark.asyncio
+async def test_sweep_advances_due_journeys_with_bounded_concurrency():
+    agent = make_agent(email_delay=0.02)
+    ids = lead_ids(12)
+    await start(agent, ids)
+    assert len(agent.email_client.sent) == 12
+
+    later = datetime.utcnow() + timedelta(hours=5)  # HOT cadence is 4h
+    summary = await agent.advance_journeys(ids, concurrency=3, now=later)
+
+    assert sorted(summary["advanced"]) == sorted(ids)
+    assert all(summary["states"][i]["follow_up_count"] == 1 for i in ids)
+    assert all(summary["states"][i]["status"] == LeadStatus.FOLLOWING_UP.value for i in ids)
+    assert sorted(t for _, t in agent.email_client.sent[12:]) == ["follow_up_1"] * 12
+    assert agent.email_client.max_in_flight <= 3
+
+    # Just followed up: not due until the cadence elapses again
+    summary = await agent.advance_journeys(ids)
+    assert summary["advanced"] == [] and sorted(summary["skipped"]) == sorted(ids)
+    assert len(agent.email_client.sent) == 24
+
+
+@pytest.mark.asyncio
+async def test_responses_escalate_and_finished_journeys_are_skipped():
+    agent = make_agent()
+    replied, quiet, unknown = lead_ids(1)[0], lead_ids(1)[0], "lead-never-started"
+    await start(agent, [replied])
+    await start(agent, [quiet], tier=LeadTier.COOL)  # 2 follow-ups max
+
+    later = datetime.utcnow() + timedelta(days=30)
+    summary = await agent.advance_journeys([replied, quiet, unknown], responded=[replied], now=later)
+    assert summary["states"][replied]["status"] == LeadStatus.RESPONDED.value
+    assert summary["states"][replied]["escalated"] is True
+    assert summary["missing"] == [unknown]
+
+    for _ in range(2):
+        await agent.advance_journeys([quiet], now=later + timedelta(days=30))
+    summary = await agent.advance_journeys([replied, quiet], due_only=False)
+    assert summary["states"][quiet]["status"] == LeadStatus.COLD.value
+    assert summary["states"][quiet]["follow_up_count"] == 2
+    assert summary["advanced"] == [] and sorted(summary["skipped"]) == sorted([replied, quiet])
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_paths_share_journey_state():
+    agent = make_agent()
+    lead_id = lead_ids(1)[0]
+
+    await asyncio.to_thread(
+        agent.start_lead_journey, lead_id=lead_id, email="sam@clinic.example", tier_value="warm",
+        slack_thread_ts="1.000", slack_channel="C0LEADS01"
+    )
+    state = await agent.acontinue_lead_journey(lead_id)
+
+    assert state["follow_up_count"] == 1
+    assert [t for _, t in agent.email_client.sent] == ["initial_outreach", "follow_up_1"]
+    assert await agent.acontinue_lead_journey("lead-never-started") == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+async def test_grouped_checkpoint_reads_and_writes_on_postgres(monkeypatch):
+    monkeypatch.setenv("FOLLOWUP_CHECKPOINT_URL", os.environ["TEST_DATABASE_URL"])
+    monkeypatch.setattr(journey_checkpoints, "_async_entry", None)
+    agent = make_agent()
+    checkpointer = await journey_checkpoints.aget_journey_checkpointer()
+    assert isinstance(checkpointer, journey_checkpoints.JourneyCheckpointer)
+
+    ids = lead_ids(20)
+    await start(agent, ids)
+    states = await journey_checkpoints.load_journey_states(checkpointer, ids)
+    assert set(states) == set(ids) and all(s["email_sent"] for s in states.values())
+
+    batches = journey_checkpoints.checkpoint_batch_size.count()
+    summary = await agent.advance_journeys(ids, concurrency=20, now=datetime.utcnow() + timedelta(hours=5))
+    assert sorted(summary["advanced"]) == sorted(ids)
+    assert 0 < journey_checkpoints.checkpoint_batch_size.count() - batches < len(ids)  # Grouped commits
+    assert checkpointer._prefetched == {}
+
+    states = await journey_checkpoints.load_journey_states(checkpointer, ids)
+    assert all(s["follow_up_count"] == 1 for s in states.values())
+    checkpointer.discard_prefetched(ids)
+    await checkpointer.pool.close()
@@ -0,0 +1,131 @@
+"""
+Tests for compiled Typeform extraction plans.
+
+Covers:
+- Semantic refs map fields regardless of answer order
+- Definition titles/choices map UUID refs and field IDs
+- Forms without a definition keep the positional text heuristic
+- Lead.extract_semantic_fields uses the plan for known keys, heuristics otherwise
+- Title-keyword email/phone fields only take answers shaped like an email/phone
+"""
+
+import uuid
+
+from models.lead import Lead
+from utils.form_schema import BUSINESS_SIZE, COMPANY, UNKNOWN, get_form_schema_registry
+from utils.typeform_transform import extract_answers, transform_typeform_webhook
+
+
+def text(ref, value, field_id=None):
+    return {"type": "text", "text": value, "field": {"id": field_id or ref, "type": "short_text", "ref": ref}}
+
+
+def choice(ref, label, field_id=None):
+    return {"type": "choice", "choice": {"label": label},
+            "field": {"id": field_id or ref, "type": "multiple_choice", "ref": ref}}
+
+
+def email(ref, value):
+    return {"type": "email", "email": value, "field": {"id": ref, "type": "email", "ref": ref}}
+
+
+def form_id():
+    return f"form-{uuid.uuid4().hex[:8]}"
+
+
+def test_semantic_refs_map_regardless_of_order():
+    form_response = {"form_id": form_id(), "answers": [
+        text("company", "Acme Wellness"),
+        text("body_comp_use_case", "Remote tracking for our members"),
+        text("first_name", "Jordan"),
+        email("email", "jordan@acme.example"),
+        text("last_name", "Lee"),
+        choice("business_size", "11-50 employees"),
+    ]}
+
+    extracted, raw_answers = extract_answers(form_response)
+
+    assert extracted["first_name"] == "Jordan" and extracted["last_name"] == "Lee"
+    assert extracted["company"] == "Acme Wellness"
+    assert extracted["email"] == "jordan@acme.example"
+    assert raw_answers["business_size"] == "11-50 employees"
+    assert raw_answers["body_comp_use_case"] == "Remote tracking for our members"
+
+
+def test_definition_maps_uuid_refs_and_field_ids():
+    fid = form_id()
+    definition = {"fields": [
+        {"id": "f1", "ref": "a1b2", "type": "short_text", "title": "Clinic name"},
+        {"id": "f2", "ref": "c3d4", "type": "short_text", "title": "Your first name"},
+        {"id": "f3", "ref": "e5f6", "type": "multiple_choice", "title": "Team?",
+         "properties": {"choices": [{"label": "1-5 employees"}, {"label": "6-20 employees"}]}},
+    ]}
+    lead = transform_typeform_webhook({"form_response": {
+        "form_id": fid, "token": "tok", "submitted_at": "2025-10-20T18:57:30Z", "definition": definition,
+        "answers": [text("a1b2", "Northside", "f1"), text("c3d4", "Sam", "f2"), choice("e5f6", "Just me", "f3")],
+    }})
+
+    assert lead.company == "Northside" and lead.first_name == "Sam" and lead.last_name is None
+    assert lead.raw_answers["business_size"] == "Just me"  # Label alone wouldn't say so
+
+    plan = get_form_schema_registry().plan_for(fid)
+    assert plan.from_definition
+    assert plan.rules["f1"] == plan.rules["a1b2"] == COMPANY
+    assert plan.rules["f3"] == BUSINESS_SIZE
+
+
+def test_forms_without_definition_keep_positional_heuristic():
+    form_response = {"form_id": form_id(), "answers": [
+        text("u1", "Jordan"), text("u2", "Lee"), text("u3", "Acme"), text("u4", "Long answer"),
+        choice("u5", "51-300"),
+        {"type": "url", "url": "https://calendly.com/acme/intro", "field": {"id": "u6", "type": "url", "ref": "u6"}},
+    ]}
+
+    extracted, raw_answers = extract_answers(form_response)
+
+    assert (extracted["first_name"], extracted["last_name"], extracted["company"]) == ("Jordan", "Lee", "Acme")
+    assert extracted["calendly_url"] == "https://calendly.com/acme/intro"
+    assert raw_answers["patient_volume"] == "51-300"
+    assert get_form_schema_registry().plan_for(form_response["form_id"]).rules["u1"] is UNKNOWN
+
+
+def test_semantic_fields_use_plan_for_known_keys():
+    fid = form_id()
+    get_form_schema_registry().register_definition(fid, {"fields": [
+        {"id": "old1", "ref": "r1", "type": "short_text", "title": "Practice name"},
+    ]})
+    lead = Lead(typeform_id="t", form_id=fid, raw_answers={
+        "old1": "Acme",                                  # Field ID from the definition
+        "first_name": "Clinic Jordan",                   # Known ref: not company, despite "Clinic"
+        "xyz": "https://calendly.com/acme/intro",        # Unknown: value heuristics
+        "abc": "We see about 120 patients a month and want body composition tracking between visits " * 2,
+    })
+
+    fields = lead.extract_semantic_fields()
+
+    assert fields["company"] == "Acme"
+    assert fields["has_calendly"] is True
+    assert fields["patient_volume_raw"] == 120 and fields["patient_volume_category"] == "high"
+
+
+def test_title_keyword_fields_check_the_value():
+    fid = form_id()
+    definition = {"fields": [
+        {"id": "f1", "ref": "q1", "type": "yes_no", "title": "Can we email you?"},
+        {"id": "f2", "ref": "q2", "type": "short_text", "title": "Best phone number?"},
+        {"id": "f3", "ref": "q3", "type": "short_text", "title": "Work email"},
+        {"id": "f4", "ref": "q4", "type": "short_text", "title": "Phone (optional)"},
+    ]}
+    form_response = {"form_id": fid, "definition": definition, "answers": [
+        {"type": "boolean", "boolean": True, "field": {"id": "f1", "type": "yes_no", "ref": "q1"}},
+        text("q2", "call my assistant", "f2"),
+        text("q3", "sam@northside.example", "f3"),
+        text("q4", "+1 555 0100", "f4"),
+    ]}
+
+    extracted, raw_answers = extract_answers(form_response)
+    fields = Lead(typeform_id="t", form_id=fid, raw_answers={"q1": True}).extract_semantic_fields()
+
+    assert extracted["email"] == "sam@northside.example"
+    assert extracted["phone"] == "+1 555 0100"
+    assert "email" not in fields
@@ -0,0 +1,125 @@
+"""
+Tests for webhook idempotency.
+
+Covers:
+- Provider event keys (Typeform event_id/token, Slack event_id, VAPI call ID)
+- Repeats inside the memory window are dropped; concurrent retries can't both pass
+- Claims survive a restart through the persistent index; release re-opens a key
+- Whole buckets expire as the window moves
+- /webhooks/typeform queues one pipeline run per delivery ID
+- The async accessor builds the receipt backend off the event loop
+"""
+
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core import idempotency
+from core.idempotency import (
+    IdempotencyIndex,
+    SQLiteReceiptBackend,
+    get_idempotency_index_async,
+    slack_event_key,
+    typeform_event_key,
+    vapi_event_key,
+)
+from tests.benchmarks.standins import BENCHMARK_ENV
+
+
+def test_provider_event_keys():
+    assert typeform_event_key({"event_id": "01H", "form_response": {"token": "t"}}) == "01H"
+    assert typeform_event_key({"form_response": {"token": "t"}}) == "t"
+    assert slack_event_key({"event_id": "Ev1", "event": {"ts": "1.0"}}) == "Ev1"
+    assert slack_event_key({"event": {"ts": "1.0", "user": "U1", "channel": "D1"}}) == "1.0_U1_D1"
+    assert vapi_event_key({"message": {"type": "end-of-call-report", "call": {"id": "c1"}}}) == "c1:end-of-call-report"
+    assert vapi_event_key({"message": {"type": "status-update", "status": "ended", "call": {"id": "c1"}}}) == \
+        "c1:status-update:ended"
+    assert vapi_event_key({"message": {"type": "transcript", "call": {"id": "c1"}}}) is None
+
+
+@pytest.mark.asyncio
+async def test_repeats_and_concurrent_retries_are_dropped():
+    index = IdempotencyIndex()
+
+    results = await asyncio.gather(*(index.claim("typeform", "evt-1") for _ in range(5)))
+    assert results == [True, False, False, False, False]
+    assert await index.claim("slack", "evt-1") is True  # Keys are per source
+    assert await index.claim("typeform", None) is True
+    assert index.stats == {"claimed": 2, "duplicates": 4, "backend_errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_claims_survive_restart_and_release(tmp_path):
+    path = str(tmp_path / "receipts.db")
+    assert await IdempotencyIndex(SQLiteReceiptBackend(path)).claim("vapi", "c1:end-of-call-report")
+
+    restarted = IdempotencyIndex(SQLiteReceiptBackend(path))
+    assert await restarted.claim("vapi", "c1:end-of-call-report") is False
+
+    await restarted.release("vapi", "c1:end-of-call-report")
+    assert await IdempotencyIndex(SQLiteReceiptBackend(path)).claim("vapi", "c1:end-of-call-report") is True
+
+
+@pytest.mark.asyncio
+async def test_buckets_expire_with_the_window():
+    index = IdempotencyIndex(window_seconds=60)
+    clock = [1_000_000.0]
+
+    with patch.object(idempotency.time, "time", lambda: clock[0]):
+        for i in range(100):
+            assert await index.claim("slack", f"ev-{i}")
+        clock[0] += 30
+        assert await index.claim("slack", "ev-late")
+        assert await index.claim("slack", "ev-0") is False
+        assert len(index) == 101
+
+        clock[0] += 31  # First bucket left the window, the late one hasn't
+        assert await index.claim("slack", "ev-new")
+        assert len(index) == 2
+        assert await index.claim("slack", "ev-late") is False
+        assert await index.claim("slack", "ev-0") is True
+
+
+@pytest.mark.asyncio
+async def test_typeform_retry_runs_pipeline_once(monkeypatch):
+    with patch.dict(os.environ, BENCHMARK_ENV):
+        import api.main
+
+    runs = []
+
+    async def process(raw_payload, processor):
+        runs.append(raw_payload["event_id"])
+
+    monkeypatch.setattr(api.main, "_process_webhook_background", process)
+    monkeypatch.setattr(idempotency, "_idempotency_index", IdempotencyIndex())
+    payload = {"event_id": "01HTYPEFORM", "form_response": {"token": "tok-1", "answers": []}}
+
+    transport = httpx.ASGITransport(app=api.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/webhooks/typeform", json=payload)
+        retry = await client.post("/webhooks/typeform", json=payload)
+
+    assert first.json()["status"] == "accepted"
+    assert retry.status_code == 200 and retry.json()["status"] == "duplicate"
+    assert runs == ["01HTYPEFORM"]
+
+
+@pytest.mark.asyncio
+async def test_async_accessor_builds_backend_off_the_loop(monkeypatch):
+    built_on = []
+
+    def create_backend(url):
+        built_on.append(threading.current_thread())  # e.g. Postgres pool open + CREATE TABLE
+        return None
+
+    monkeypatch.setattr(idempotency, "_idempotency_index", None)
+    monkeypatch.setattr(idempotency, "_create_backend", create_backend)
+
+    index = await get_idempotency_index_async()
+
+    assert built_on and built_on[0] is not threading.main_thread()
+    assert await get_idempotency_index_async() is index and len(built_on) == 1
@@ -0,0 +1,122 @@
+"""
+Tests for columnar lead analytics.
+
+Covers:
+- LeadFrame aggregates match a per-row reference (tier/source/score fallbacks)
+- filter() keeps the exploded metadata.tech_stack aligned with the rows
+- bucket_counts and timestamp parsing across UTC offsets
+- LeadAnalytics paginates past 1000 rows and serves narrower windows from cache
+- load_lead_rows pages are stable when created_at ties span a page boundary
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.lead_analytics import TIERS, LeadAnalytics, LeadFrame, load_lead_rows, parse_timestamps
+from tests.benchmarks.bench_lead_analytics import generate_leads, legacy_pipeline
+from tests.benchmarks.standins import InMemorySupabase
+
+
+def test_aggregates_match_row_reference():
+    rows = generate_leads(2000)
+    frame = LeadFrame.from_rows(rows)
+    reference = legacy_pipeline(rows)
+
+    tiers = frame.count_by("tier", include=TIERS)
+    assert tiers == reference["by_tier"]
+    assert frame.count_by("source") == reference["by_source"]
+    assert frame.mean("score") == pytest.approx(reference["avg_score"])
+    assert [k for k, _ in frame.top("industry", 3)] == reference["top_industries"]
+
+    scored = frame.group_mean("tier", "score")
+    hot = [
+        float(r.get("qualification_score")) for r in rows
+        if (r.get("qualification_tier") or r.get("tier") or r.get("lead_tier")) == "HOT"
+        and r.get("qualification_score") is not None
+    ]
+    assert scored["HOT"] == pytest.approx(sum(hot) / len(hot))
+
+
+def test_filter_keeps_tech_stack_aligned():
+    rows = [
+        {"id": 1, "tier": "HOT", "metadata": {"tech_stack": ["hubspot", "stripe"]}},
+        {"id": 2, "tier": "COLD", "metadata": {"tech_stack": ["salesforce"]}},
+        {"id": 3, "tier": "HOT", "metadata": {"tech_stack": ["stripe", ""]}},
+        {"id": 4, "tier": "hot", "metadata": "not a dict"},
+    ]
+    frame = LeadFrame.from_rows(rows)
+    assert frame.count_by("tech_stack") == {"hubspot": 1, "stripe": 2, "salesforce": 1}
+
+    hot = frame.filter(frame.isin("tier", ["HOT"]))
+    assert [row["id"] for row in hot.rows] == [1, 3, 4]
+    assert hot.count_by("tech_stack") == {"hubspot": 1, "stripe": 2}
+    assert list(hot.tech_rows) == [0, 0, 1]
+
+
+def test_bucket_counts_and_timestamp_offsets():
+    values = [
+        "2025-06-02T23:30:00+00:00",
+        "2025-06-03T01:30:00Z",
+        "2025-06-03T01:30:00.250",
+        "2025-06-03T03:30:00+02:00",  # 01:30 UTC
+        None,
+        "not a date",
+    ]
+    parsed = parse_timestamps(values)
+    assert parsed[1] == datetime(2025, 6, 3, 1, 30, tzinfo=timezone.utc).timestamp()
+    assert parsed[3] == parsed[1]
+    assert parsed[2] == pytest.approx(parsed[1] + 0.25)
+    assert np.isnan(parsed[4]) and np.isnan(parsed[5])
+
+    frame = LeadFrame.from_rows([{"created_at": value} for value in values])
+    assert frame.bucket_counts("day") == {"2025-06-02": 1, "2025-06-03": 3}
+    assert frame.bucket_counts("hour") == {"2025-06-02T23:00": 1, "2025-06-03T01:00": 3}
+    # 2025-06-02 is a Monday
+    assert frame.bucket_counts("week") == {"2025-06-02": 4}
+
+
+@pytest.mark.asyncio
+async def test_window_paginates_and_serves_narrower_windows_from_cache():
+    db = InMemorySupabase()
+    now = datetime.utcnow()
+    db.tables["leads"] = [
+        {
+            "id": i,
+            "tier": "WARM",
+            "created_at": (now - timedelta(minutes=i * 3)).replace(tzinfo=timezone.utc).isoformat(),
+        }
+        for i in range(2500)  # ~5.2 days
+    ]
+    analytics = LeadAnalytics(ttl_seconds=60)
+
+    week = await analytics.window(db, days=7)
+    assert len(week) == 2500
+    assert db.ops[("leads", "select")] == 3
+
+    day = await analytics.window(db, days=1)
+    assert len(day) == 480
+    assert db.ops[("leads", "select")] == 3
+
+    analytics.invalidate()
+    await analytics.window(db, hours=1)
+    assert db.ops[("leads", "select")] == 4
+
+
+class _UnstableTiesSupabase(InMemorySupabase):
+    """Reverses physical row order between queries, as Postgres may for ties."""
+
+    def _execute(self, query, blocking=True):
+        self.tables["leads"].reverse()
+        return super()._execute(query, blocking)
+
+
+def test_load_lead_rows_breaks_created_at_ties_across_pages():
+    db = _UnstableTiesSupabase()
+    batch = "2025-10-20T12:00:00+00:00"
+    db.tables["leads"] = [{"id": i, "created_at": batch} for i in range(5)]
+    db.tables["leads"].append({"id": 5, "created_at": "2025-10-20T12:05:00+00:00"})
+
+    rows = load_lead_rows(db, page_size=2)
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4, 5]
@@ -0,0 +1,140 @@
+"""
+Tests for tiered MCP server routing in MCPOrchestrator.
+
+Covers:
+- Keyword classifier accuracy on the labeled routing fixture
+- Decision cache keyed by normalized task and context; callers get copies
+- LLM tier only used for ambiguous tasks
+- Fallback when the LLM call fails
+"""
+
+import pytest
+from unittest.mock import Mock
+
+import dspy
+
+from core.mcp_orchestrator import MCPOrchestrator, normalize_task
+from tests.fixtures.mcp_routing_tasks import LABELED_ROUTING_TASKS
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator with a mocked LLM selector."""
+    orch = MCPOrchestrator()
+    orch.server_selector = Mock(
+        return_value=dspy.Prediction(selected_servers="none", reasoning="mock")
+    )
+    return orch
+
+
+class TestHeuristicClassifier:
+    """Keyword tier over MCPServerConfig.when_to_use."""
+
+    def test_confident_decisions_match_labels(self, orchestrator):
+        decided = 0
+        for task, expected in LABELED_ROUTING_TASKS:
+            servers, confidence, _ = orchestrator.classifier.classify(
+                task, orchestrator.trusted_servers
+            )
+            if servers is None:
+                continue
+            decided += 1
+            assert sorted(servers) == sorted(expected), task
+            assert 0.0 < confidence <= 1.0
+
+        # The keyword tier should answer the large majority locally
+        assert decided / len(LABELED_ROUTING_TASKS) >= 0.8
+
+    def test_internal_servers_never_selected(self, orchestrator):
+        servers, _, _ = orchestrator.classifier.classify(
+            "Show me pipeline stats for this week", orchestrator.trusted_servers
+        )
+        assert servers == []
+
+    def test_no_evidence_is_ambiguous(self, orchestrator):
+        servers, confidence, _ = orchestrator.classifier.classify(
+            "hello there", orchestrator.trusted_servers
+        )
+        assert servers is None
+        assert confidence == 0.0
+
+
+class TestTieredSelection:
+    """cache → heuristic → LLM routing."""
+
+    @pytest.mark.asyncio
+    async def test_confident_task_skips_llm(self, orchestrator):
+        servers = await orchestrator.select_servers_for_task(
+            "Create a lead in Close CRM for Dr. Smith"
+        )
+
+        assert servers == ["zapier"]
+        orchestrator.server_selector.assert_not_called()
+        assert orchestrator.get_routing_stats()["heuristic"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_task_uses_llm(self, orchestrator):
+        orchestrator.server_selector.return_value = dspy.Prediction(
+            selected_servers="perplexity", reasoning="needs research"
+        )
+
+        selection = await orchestrator.route_task("hello there")
+
+        assert selection.source == "llm"
+        assert selection.servers == ["perplexity"]
+        orchestrator.server_selector.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_decisions_cached_per_normalized_task(self, orchestrator):
+        await orchestrator.route_task("hello there")
+        selection = await orchestrator.route_task("  Hello, THERE!  ")
+
+        assert selection.source == "cache"
+        assert orchestrator.server_selector.call_count == 1
+        assert normalize_task("  Hello, THERE!  ") == "hello there"
+
+    @pytest.mark.asyncio
+    async def test_cache_keyed_by_context_and_isolated_from_callers(self, orchestrator):
+        orchestrator.server_selector.return_value = dspy.Prediction(
+            selected_servers="perplexity", reasoning="needs research"
+        )
+        first = await orchestrator.route_task("hello there", {"user": "sales"})
+        first.servers.append("zapier")  # Caller mutates its copy
+
+        cached = await orchestrator.route_task("hello there", {"user": "sales"})
+        other = await orchestrator.route_task("hello there", {"user": "ops"})
+
+        assert cached.source == "cache" and cached.servers == ["perplexity"]
+        assert other.source == "llm"
+        assert orchestrator.server_selector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self):
+        orch = MCPOrchestrator(cache_size=2)
+        for task in ["audit pipeline stats", "scrape websites urls", "research competitor funding"]:
+            await orch.route_task(task)
+
+        assert orch.get_routing_stats()["cache_size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_falls_back_and_is_not_cached(self, orchestrator):
+        orchestrator.server_selector.side_effect = RuntimeError("LLM down")
+
+        first = await orchestrator.route_task("hello there")
+        second = await orchestrator.route_task("hello there")
+
+        assert first.source == "fallback"
+        assert first.servers == []
+        assert second.source == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_heuristics_can_be_disabled(self):
+        orch = MCPOrchestrator(use_heuristics=False)
+        orch.server_selector = Mock(
+            return_value=dspy.Prediction(selected_servers="zapier", reasoning="mock")
+        )
+
+        selection = await orch.route_task("Create a lead in Close CRM")
+
+        assert selection.source == "llm"
+        orch.server_selector.assert_called_once()
@@ -0,0 +1,126 @@
+"""
+Tests for the metrics layer.
+
+Covers:
+- Prometheus text rendering (counters, gauges, cumulative histogram buckets)
+- agent_call latency/error recording and nested usage attribution
+- DSPy callback: per-signature latency, real token counts and cost
+- Queue depth tracking
+"""
+
+import asyncio
+
+import dspy
+import pytest
+
+from core import metrics
+from core.metrics import MetricsRegistry, agent_call, install_dspy_metrics, queued, track_usage
+from tests.benchmarks.standins import SimulatedLM
+
+
+@pytest.fixture
+def lm():
+    install_dspy_metrics()
+    simulated = SimulatedLM(cost_per_1k_tokens=0.5)
+    with dspy.context(lm=simulated):
+        yield simulated
+
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry(namespace="test")
+    requests = registry.counter("requests", "Requests", ("path",))
+    depth = registry.gauge("depth", "Depth", ("queue",))
+    latency = registry.histogram("latency_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    depth.set_function(lambda: 7, queue="q")
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, op="x")
+
+    text = registry.render_prometheus()
+    assert "# TYPE test_requests counter" in text
+    assert 'test_requests_total{path="/a\\"b"} 3' in text
+    assert 'test_depth{queue="q"} 7' in text
+    assert 'test_latency_seconds_bucket{op="x",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{op="x",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{op="x",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{op="x"} 3' in text
+    assert latency.quantile(0.5, op="x") == 1.0
+
+
+def test_unknown_label_rejected():
+    counter = MetricsRegistry().counter("c", "C", ("a",))
+    with pytest.raises(ValueError):
+        counter.inc(b="x")
+
+
+def test_agent_call_records_latency_and_errors():
+    before = metrics.agent_call_seconds.count(agent="TestAgent", operation="boom", status="error")
+
+    with pytest.raises(RuntimeError):
+        with agent_call("TestAgent", "boom"):
+            raise RuntimeError("nope")
+
+    assert metrics.agent_call_seconds.count(agent="TestAgent", operation="boom", status="error") == before + 1
+    assert metrics.errors.get(component="TestAgent", error="RuntimeError") >= 1
+
+
+def test_dspy_calls_attributed_to_agent(lm):
+    predict = dspy.Predict("question -> answer")
+    tokens_before = metrics.lm_tokens.get(agent="QAAgent", model=lm.model, type="prompt")
+
+    with agent_call("QAAgent", "answer") as call:
+        predict(question="What is 2+2?")
+
+    assert call.usage.lm_calls == 1
+    assert call.usage.prompt_tokens > 0 and call.usage.completion_tokens > 0
+    assert call.usage.cost == pytest.approx(call.usage.total_tokens / 1000 * 0.5)
+    assert metrics.lm_tokens.get(agent="QAAgent", model=lm.model, type="prompt") == \
+        tokens_before + call.usage.prompt_tokens
+    assert metrics.module_call_seconds.count(
+        agent="QAAgent", module="Predict", signature="question -> answer", status="ok"
+    ) >= 1
+
+
+class Summarize(dspy.Signature):
+    """Summarize the text in one sentence."""
+    text: str = dspy.InputField()
+    summary: str = dspy.OutputField()
+
+
+def test_chain_of_thought_keeps_signature_name(lm):
+    summarize = dspy.ChainOfThought(Summarize)
+
+    with agent_call("QAAgent", "summarize"):
+        summarize.forward(text="A long text.")
+
+    assert metrics.module_call_seconds.count(
+        agent="QAAgent", module="Predict", signature="Summarize", status="ok"
+    ) == 1
+
+
+@pytest.mark.asyncio
+async def test_usage_follows_worker_threads(lm):
+    predict = dspy.Predict("question -> answer")
+
+    with track_usage() as usage:
+        await asyncio.to_thread(predict, question="hi")
+        await asyncio.to_thread(predict, question="there")
+
+    assert usage.lm_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_tracks_depth():
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    run = queued("test_queue", work)
+    assert metrics.queue_depth.get(queue="test_queue") == 1
+    task = asyncio.create_task(run())
+    release.set()
+    await task
+    assert metrics.queue_depth.get(queue="test_queue") == 0
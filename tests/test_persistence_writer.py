@@ -0,0 +1,178 @@
+"""
+Tests for the buffered leads/agent_state writer.
+
+Covers:
+- Concurrent writes become one bulk request per table
+- Same-lead upserts are merged in call order; leads are written before agent_state
+- A failed bulk request is retried per row and only the bad row's caller gets the error
+- max_pending bounds queued rows (write() waits for room)
+- flush()/aclose() write out everything queued, including wait=False rows
+- One writer per event loop; close_persistence_writer() flushes all of them
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from core import persistence_writer
+from core.persistence_writer import PersistenceWriter, close_persistence_writer, get_persistence_writer
+from tests.benchmarks.standins import InMemorySupabase
+
+
+class RejectingClient:
+    """Async client view whose requests fail when any row has a rejected id."""
+
+    def __init__(self, db, reject):
+        self.view = db.async_client()
+        self.reject = reject
+
+    def table(self, name):
+        query = self.view.table(name)
+        execute = query.execute
+
+        async def checked():
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            if any(row.get("id") in self.reject for row in payload):
+                raise RuntimeError("violates foreign key constraint")
+            return await execute()
+
+        query.execute = checked
+        return query
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_bulk_requests():
+    db = InMemorySupabase()
+    writer = PersistenceWriter(db.async_client(), batch_size=100, flush_interval=0.01)
+
+    saved = await asyncio.gather(
+        *(writer.upsert_lead({"id": f"lead-{n}", "email": f"{n}@clinic.example"}) for n in range(20)),
+        *(writer.insert_agent_state("InboundAgent", f"lead-{n}", {"n": n}) for n in range(20)),
+    )
+
+    assert db.ops[("leads", "upsert")] == 1
+    assert db.ops[("agent_state", "insert")] == 1
+    assert len(db.rows("leads")) == 20 and len(db.rows("agent_state")) == 20
+    assert saved[0] == {"id": "lead-0", "email": "0@clinic.example"}
+    assert saved[20]["agent_name"] == "InboundAgent" and saved[20]["status"] == "completed"
+    assert writer.stats == {"rows": 40, "requests": 2, "failed": 0}
+    assert writer.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_same_lead_merged_in_order_and_leads_first():
+    db = InMemorySupabase()
+    writer = PersistenceWriter(db.async_client(), flush_interval=0.01)
+    order = []
+    original = db._execute
+
+    def record(query, blocking=True):
+        order.append(query.table_name)
+        return original(query, blocking)
+
+    db._execute = record
+
+    # Queued before the lead on purpose: agent_state still goes second
+    first_state = asyncio.create_task(writer.insert_agent_state("StrategyAgent", "lead-1", {"step": 1}))
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        first_state,
+        writer.upsert_lead({"id": "lead-1", "email": "a@clinic.example", "status": "new"}),
+        writer.upsert_lead({"id": "lead-1", "status": "qualified"}),
+        writer.insert_agent_state("StrategyAgent", "lead-1", {"step": 2}),
+    )
+
+    assert order == ["leads", "agent_state"]
+    assert db.rows("leads") == [{"id": "lead-1", "email": "a@clinic.example", "status": "qualified"}]
+    states = db.rows("agent_state")
+    assert [s["state_data"]["step"] for s in sorted(states, key=lambda s: s["created_at"])] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_request_retries_per_row():
+    db = InMemorySupabase()
+    writer = PersistenceWriter(RejectingClient(db, {"bad"}), flush_interval=0.01)
+
+    results = await asyncio.gather(
+        *(writer.upsert_lead({"id": lead_id}) for lead_id in ("a", "bad", "b")),
+        return_exceptions=True,
+    )
+
+    assert results[0] == {"id": "a"} and results[2] == {"id": "b"}
+    assert isinstance(results[1], RuntimeError)
+    assert sorted(row["id"] for row in db.rows("leads")) == ["a", "b"]
+    assert writer.stats["failed"] == 1 and writer.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_max_pending_applies_backpressure():
+    db = InMemorySupabase(latency=0.05)
+    writer = PersistenceWriter(db.async_client(), batch_size=2, flush_interval=0.01, max_pending=4)
+
+    for n in range(4):
+        await writer.upsert_lead({"id": f"lead-{n}"}, wait=False)
+    assert writer.depth() == 4
+
+    blocked = asyncio.create_task(writer.upsert_lead({"id": "lead-4"}, wait=False))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()  # No room until a batch commits
+
+    await asyncio.wait_for(blocked, 1)
+    await writer.flush()
+    assert len(db.rows("leads")) == 5 and writer.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_aclose_drains_queue():
+    db = InMemorySupabase()
+    writer = PersistenceWriter(db.async_client(), batch_size=100, flush_interval=60)
+
+    for n in range(3):
+        await writer.insert_agent_state("ResearchAgent", None, {"n": n}, wait=False)
+    assert db.rows("agent_state") == []
+
+    await writer.aclose()
+
+    assert len(db.rows("agent_state")) == 3
+    with pytest.raises(RuntimeError):
+        await writer.upsert_lead({"id": "late"})
+
+
+@pytest.mark.asyncio
+async def test_one_writer_per_loop_and_close_flushes_all(monkeypatch):
+    db = InMemorySupabase()
+
+    async def client():
+        return db.async_client()
+
+    monkeypatch.setattr("core.async_supabase_client.get_async_supabase_client", client)
+    monkeypatch.setattr(persistence_writer, "_writers", {})
+    monkeypatch.setenv("PERSIST_FLUSH_INTERVAL_MS", "60000")  # Rows stay queued until close
+
+    # A second loop, e.g. the tool bridge's, running in its own thread
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+
+    async def queue_on_other_loop():
+        writer = get_persistence_writer()
+        await writer.upsert_lead({"id": "lead-other"}, wait=False)
+        return writer
+
+    try:
+        other_writer = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(queue_on_other_loop(), other))
+        main_writer = get_persistence_writer()
+        await main_writer.upsert_lead({"id": "lead-main"}, wait=False)
+
+        assert main_writer is not other_writer and get_persistence_writer() is main_writer
+        assert db.rows("leads") == []
+
+        await close_persistence_writer()
+
+        assert sorted(row["id"] for row in db.rows("leads")) == ["lead-main", "lead-other"]
+        assert persistence_writer._writers == {}
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
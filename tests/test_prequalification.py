@@ -0,0 +1,107 @@
+"""
+Tests for lead pre-qualification.
+
+Covers:
+- Rules reject leads without contact info, empty partials, test entries, disposable emails and spam
+- The classifier rejects low-signal leads above the threshold and names the features
+- Detailed prospects, weak-but-real leads, named partials and Calendly bookings go to the LLM
+- Rejected leads get an UNQUALIFIED result that records why
+- InboundAgent.qualify returns that result without calling any LLM module
+"""
+
+import pytest
+
+from core.prequalification import PreQualifier
+from models import LeadTier, NextAction
+from models.lead import Lead, ResponseType
+
+
+def make_lead(complete=True, **fields):
+    contact = {k: fields.pop(k) for k in ("email", "phone", "first_name", "last_name", "company",
+                                          "calendly_url") if k in fields}
+    return Lead(
+        typeform_id="tok",
+        form_id="form1",
+        response_type=ResponseType.COMPLETE if complete else ResponseType.PARTIAL,
+        raw_answers={**contact, **fields},
+        **contact,
+    )
+
+
+PROSPECT = dict(
+    email="dr.lynch@northside.example", first_name="Dana", last_name="Lynch",
+    company="Northside Chiropractic LLC", business_size="6-20 employees", patient_volume="51-300",
+    use_case="We see about 200 patients a month and want body composition tracking between visits.",
+)
+
+
+@pytest.mark.parametrize("lead, reason", [
+    (make_lead(first_name="Sam"), "no_contact_info"),
+    (make_lead(complete=False, email="sam@gmail.com"), "empty_partial"),
+    (make_lead(email="test@test.com", company="Test"), "test_submission"),
+    (make_lead(email="dana@northside.example", first_name="asdf"), "test_submission"),
+    (make_lead(email="x1@mailinator.com", company="Vital Longevity"), "disposable_email"),
+    (make_lead(email="sales@agency.example", company="Best SEO services"), "spam_content"),
+    (make_lead(email="sales@agency.example", company="www.cheap-links.example"), "spam_content"),
+])
+def test_rules_reject_obvious_junk(lead, reason):
+    decision = PreQualifier(reject_threshold=0.9, enabled=True).evaluate(lead)
+    assert decision.rejected and decision.reasons == [reason]
+
+
+def test_classifier_rejects_low_signal_leads():
+    prequalifier = PreQualifier(reject_threshold=0.9, enabled=True)
+
+    decision = prequalifier.evaluate(make_lead(email="zxcv12@gmail.com", first_name="Jjjjj", last_name="Xkcdfg"))
+    assert decision.rejected and decision.reasons[0] == "low_fit_signals"
+    assert "gibberish name/company" in decision.reasons
+    assert decision.junk_probability >= 0.9
+
+    # Same lead below a stricter threshold goes to the LLM
+    assert not PreQualifier(reject_threshold=0.999, enabled=True).evaluate(
+        make_lead(email="zxcv12@gmail.com", first_name="Jjjjj", last_name="Xkcdfg")).rejected
+
+
+@pytest.mark.parametrize("lead", [
+    make_lead(**PROSPECT),
+    make_lead(email="priya7@gmail.com", first_name="Priya", last_name="Ng", use_case="Just curious about pricing."),
+    make_lead(complete=False, email="wei@clinic.example", company="Core Wellness Studio"),
+    make_lead(complete=False, email="maria.lopez@clinic.example", first_name="Maria", last_name="Lopez"),
+    make_lead(complete=False, calendly_url="https://calendly.com/hume/1"),
+    make_lead(email="kim.patel@email.com", first_name="Kim", last_name="Patel", company="Summit Physical Therapy"),
+])
+def test_ambiguous_and_good_leads_go_to_llm(lead):
+    decision = PreQualifier(reject_threshold=0.9, enabled=True).evaluate(lead)
+    assert not decision.rejected and decision.reasons == []
+
+
+def test_disabled_sends_everything_to_llm():
+    assert not PreQualifier(enabled=False).evaluate(make_lead(first_name="Sam")).rejected
+
+
+def test_rejected_result_records_reasons():
+    decision = PreQualifier(enabled=True).evaluate(make_lead(complete=False, email="sam@gmail.com"))
+    result = decision.to_result()
+
+    assert result.tier == LeadTier.UNQUALIFIED and not result.is_qualified
+    assert result.score < 30 and result.model_used == "prequalifier"
+    assert result.next_actions == [NextAction.NO_ACTION]
+    assert result.concerns == ["Partial submission without business information"]
+    assert "without LLM analysis" in result.reasoning
+
+
+def test_inbound_agent_skips_llm_for_rejected_leads():
+    from agents.inbound_agent import InboundAgent
+
+    class NoLLM:
+        def __getattr__(self, name):
+            raise AssertionError(f"LLM module used: {name}")
+
+    agent = InboundAgent.__new__(InboundAgent)
+    agent.analyze_business = agent.analyze_engagement = agent.determine_actions = NoLLM()
+    agent.inbound_lm = NoLLM()
+
+    result = InboundAgent.qualify(agent, make_lead(email="x1@yopmail.com"))
+
+    assert result.tier == LeadTier.UNQUALIFIED
+    assert result.concerns == ["Disposable email domain"]
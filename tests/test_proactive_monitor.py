@@ -0,0 +1,122 @@
+"""
+Tests for the streaming log analyzer in monitoring/proactive_monitor.
+
+Covers:
+- Error bursts alert on the line that completes them; steady rates do not
+- Patterns seen while the analyzer warms up wait for a window of history
+- Duration parsing into per-operation latency histograms and slow-operation alerts
+- tail_file follows appends and rotation
+- Overlapping Railway polls feed each line to the analyzer once
+"""
+
+import asyncio
+
+import pytest
+
+from monitoring.proactive_monitor import LogAnalyzer, ProactiveMonitor, lines_after_overlap, tail_file
+
+T0 = 1_760_000_000.0
+
+
+def feed_steady(analyzer, line, start, seconds, every):
+    anomalies = []
+    t = start
+    while t < start + seconds:
+        anomalies.extend(analyzer.feed(line, now=t))
+        t += every
+    return anomalies
+
+
+def test_new_error_burst_alerts_once():
+    analyzer = LogAnalyzer()
+    feed_steady(analyzer, "api.main - INFO - 📥 Webhook received", T0, 300, 1.0)
+
+    anomalies = []
+    for i in range(10):
+        anomalies.extend(analyzer.feed(f"core.x - ERROR - ❌ Save failed for lead {i}: timeout", now=T0 + 300 + i))
+
+    assert len(anomalies) == 1
+    assert anomalies[0].category == "error"
+    assert anomalies[0].frequency == 3
+    assert anomalies[0].context["pattern"] == "core.x - ERROR - ❌ Save failed for lead [NUM]: timeout"
+
+
+def test_steady_error_rate_is_not_anomalous():
+    analyzer = LogAnalyzer()
+    anomalies = feed_steady(analyzer, "core.x - ERROR - ❌ Slack ratelimited", T0, 1800, 15.0)
+    assert anomalies == []
+
+    # Rate jumps well above its history
+    burst = feed_steady(analyzer, "core.x - ERROR - ❌ Slack ratelimited", T0 + 1800, 30, 1.0)
+    assert [a.category for a in burst] == ["error"]
+    assert burst[0].context["expected_count"] == pytest.approx(4.0, abs=0.5)
+
+
+def test_latency_histogram_and_slow_operations():
+    analyzer = LogAnalyzer(slow_seconds=10.0)
+    feed_steady(analyzer, "api.main - INFO - ✅ Webhook acknowledged in 45ms", T0, 120, 1.0)
+    assert analyzer.feed("api.main - WARNING - Retrying in 30s...", now=T0 + 120) == []
+
+    operation = "api.main - INFO - ✅ Webhook acknowledged in [NUM]ms"
+    assert analyzer.latency_quantile(operation, 0.95) == 0.05
+
+    anomalies = []
+    for i in range(3):
+        anomalies.extend(analyzer.feed(f"agents.research - INFO - Research completed in {20 + i}.5s", now=T0 + 121 + i))
+    assert len(anomalies) == 1
+    assert anomalies[0].category == "performance"
+    assert anomalies[0].context["type"] == "slow_operation"
+    assert anomalies[0].context["p95_seconds"] == 30.0
+
+
+def test_line_timestamps_drive_the_clock():
+    analyzer = LogAnalyzer()
+    lines = [f"2025-10-20 09:{m:02d}:00,000 - app - INFO - tick" for m in range(10)]
+    lines += [f"2025-10-20 09:10:0{s},000 - app - ERROR - ❌ boom" for s in range(3)]
+
+    anomalies = analyzer.analyze_logs(lines)
+
+    assert len(anomalies) == 1
+    assert anomalies[0].timestamp.strftime("%H:%M:%S") == "09:10:02"
+
+
+@pytest.mark.asyncio
+async def test_tail_file_follows_appends_and_rotation(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("old line\n")
+    lines = tail_file(str(path), poll_interval=0.01)
+
+    async def next_line():
+        return await asyncio.wait_for(lines.__anext__(), timeout=2)
+
+    reader = asyncio.create_task(next_line())
+    await asyncio.sleep(0.05)
+    with open(path, "a") as f:
+        f.write("first\n")
+    assert await reader == "first\n"
+
+    path.rename(tmp_path / "app.log.1")
+    path.write_text("after rotation\n")
+    assert await next_line() == "after rotation\n"
+    await lines.aclose()
+
+
+@pytest.mark.asyncio
+async def test_repeated_poll_of_same_window_is_not_anomalous():
+    window = [f"2025-10-20T18:57:{i:02d}Z core.x - ERROR - ❌ Save failed for lead {i}: timeout" for i in range(2)]
+    window += [f"2025-10-20T18:57:{i:02d}Z api.main - INFO - 📥 Webhook received" for i in range(2, 8)]
+    monitor = ProactiveMonitor(slack_bot_token="xoxb-test")
+
+    async def fetch(lines=100):
+        return window + [""]
+
+    monitor.fetch_recent_logs = fetch
+    for _ in range(4):
+        assert await monitor.analyze_and_detect() == []
+
+
+def test_lines_after_overlap_keeps_repeated_lines():
+    previous = ["a", "b", "err", "err"]
+    assert lines_after_overlap(previous, ["err", "err", "err", "c"]) == ["err", "c"]
+    assert lines_after_overlap(previous, previous) == []
+    assert lines_after_overlap(previous, ["x", "y"]) == ["x", "y"]
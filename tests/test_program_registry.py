@@ -0,0 +1,136 @@
+"""
+Tests for the optimized-program registry.
+
+Covers:
+- Content-hash deduplication and versioning
+- Atomic promotion and rollback
+- Loading the active program into a fresh agent at construction
+- Baseline score cache keyed by program + trainset hash
+"""
+
+import dspy
+import pytest
+
+import optimization.program_registry as registry_module
+from agents.base_agent import AgentRules, SelfOptimizingAgent
+from optimization.program_registry import ProgramRegistry, program_hash, trainset_hash
+
+
+class QAProgram(dspy.Module):
+    def __init__(self):
+        super().__init__()
+        self.answer = dspy.Predict("question -> answer")
+
+
+class QAAgent(SelfOptimizingAgent):
+    def __init__(self):
+        super().__init__(
+            agent_name="QAAgent",
+            rules=AgentRules(allowed_models=["test"], default_model="test")
+        )
+        self.answer = dspy.Predict("question -> answer")
+
+
+def _compiled(instructions: str) -> QAProgram:
+    program = QAProgram()
+    program.answer.signature = program.answer.signature.with_instructions(instructions)
+    program.answer.demos = [dspy.Example(question="2+2?", answer="4")]
+    return program
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = ProgramRegistry(root_dir=str(tmp_path))
+    monkeypatch.setattr(registry_module, "_program_registry", registry)
+    return registry
+
+
+class TestRegistration:
+
+    def test_versions_and_dedup(self, registry):
+        first = registry.register("QAAgent", _compiled("Answer briefly."), optimizer="bootstrap")
+        same = registry.register("QAAgent", _compiled("Answer briefly."), optimizer="bootstrap")
+        second = registry.register("QAAgent", _compiled("Answer in detail."), optimizer="gepa", score=0.8)
+
+        assert first.version == same.version == 1
+        assert second.version == 2
+        assert [v.version for v in registry.list_versions("QAAgent")] == [1, 2]
+        assert registry.get_active("QAAgent").version == 2
+
+    def test_register_without_promote(self, registry):
+        registry.register("QAAgent", _compiled("A"), optimizer="gepa")
+        registry.register("QAAgent", _compiled("B"), optimizer="gepa", promote=False)
+
+        assert registry.get_active("QAAgent").version == 1
+
+    def test_promote_and_rollback(self, registry):
+        registry.register("QAAgent", _compiled("A"), optimizer="gepa")
+        registry.register("QAAgent", _compiled("B"), optimizer="gepa")
+
+        assert registry.rollback("QAAgent").version == 1
+        assert registry.promote("QAAgent", 2).version == 2
+        assert registry.get_active("QAAgent").version == 2
+        registry.rollback("QAAgent")
+        assert registry.rollback("QAAgent") is None
+        assert registry.get_active("QAAgent") is None
+
+        with pytest.raises(KeyError):
+            registry.promote("QAAgent", 99)
+
+
+class TestLoading:
+
+    def test_agent_loads_active_program_at_construction(self, registry):
+        compiled = _compiled("Answer like a pirate.")
+        registry.register("QAAgent", compiled, optimizer="gepa")
+
+        agent = QAAgent()
+
+        assert agent.optimized_version.version == 1
+        assert agent.answer.signature.instructions == "Answer like a pirate."
+        assert len(agent.answer.demos) == 1
+        assert program_hash(agent) == program_hash(compiled)
+
+    def test_agent_without_program_is_untouched(self, registry):
+        agent = QAAgent()
+        assert agent.optimized_version is None
+
+    def test_loading_can_be_disabled(self, registry, monkeypatch):
+        registry.register("QAAgent", _compiled("Answer like a pirate."), optimizer="gepa")
+        monkeypatch.setenv("LOAD_OPTIMIZED_PROGRAMS", "false")
+
+        assert QAAgent().optimized_version is None
+
+    def test_tampered_program_is_rejected(self, registry):
+        version = registry.register("QAAgent", _compiled("Original"), optimizer="gepa")
+        path = registry.get_path(version)
+        with open(path) as f:
+            content = f.read()
+        with open(path, "w") as f:
+            f.write(content.replace("Original", "Tampered"))
+
+        program = QAProgram()
+        before = program_hash(program)
+        with pytest.raises(ValueError):
+            registry.load_active("QAAgent", program)
+        assert program_hash(program) == before  # Rejected state was not applied
+        assert "Tampered" not in program.answer.signature.instructions
+        # Agents log and keep the un-optimized program
+        agent = QAAgent()
+        assert agent.optimized_version is None
+        assert "Tampered" not in agent.answer.signature.instructions
+
+
+class TestBaselineCache:
+
+    def test_baseline_cached_per_program_and_trainset(self, registry):
+        program = QAProgram()
+        trainset = [dspy.Example(question="q", answer="a").with_inputs("question")]
+        p_hash, t_hash = program_hash(program), trainset_hash(trainset)
+
+        assert registry.get_baseline_score("QAAgent", p_hash, t_hash) is None
+        registry.record_baseline_score("QAAgent", p_hash, t_hash, 0.42)
+
+        assert registry.get_baseline_score("QAAgent", p_hash, t_hash) == 0.42
+        other = trainset_hash(trainset + [dspy.Example(question="q2", answer="b")])
+        assert registry.get_baseline_score("QAAgent", p_hash, other) is None
@@ -0,0 +1,119 @@
+"""
+Tests for hybrid knowledge-base retrieval.
+
+Covers:
+- Tokenizer keeps compound identifiers (SKUs) and their parts
+- Exact-term queries are found through the keyword index
+- Query embeddings are cached (LRU) and keyword results survive embedding failures
+- Vector-only hits below the threshold are dropped
+- Weak keyword-only hits below the BM25 cutoff are dropped
+- search_knowledge_base formats sources from chunk metadata
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from core.retrieval import EmbeddingCache, HybridRetriever, OverlapReranker, tokenize
+from tests.benchmarks.standins import InMemorySupabase, SimulatedEmbeddings
+from tests.fixtures.retrieval_corpus import build_corpus
+
+
+@pytest.fixture
+def knowledge_base():
+    db = InMemorySupabase()
+    embedder = SimulatedEmbeddings()
+    for chunk in build_corpus(distractors=200):
+        db.tables["documents"].append({**chunk, "embedding": embedder.embed(chunk["content"])})
+    return db, embedder
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    tokens = tokenize("What is the price of HM-BP200?")
+    assert "hm-bp200" in tokens
+    assert {"hm", "bp200", "price"} <= set(tokens)
+    assert "the" not in tokens
+
+
+@pytest.mark.asyncio
+async def test_exact_term_query_found(knowledge_base):
+    db, embedder = knowledge_base
+    retriever = HybridRetriever(reranker=OverlapReranker())
+
+    chunks = await retriever.search(db, embedder, "PRX-4471", limit=3, match_threshold=0.0)
+
+    assert chunks[0].id == 5
+    assert chunks[0].keyword_score is not None
+    assert chunks[0].file_title == "Partner Program"
+
+
+@pytest.mark.asyncio
+async def test_query_embeddings_are_cached(knowledge_base):
+    db, embedder = knowledge_base
+    retriever = HybridRetriever(reranker=None)
+
+    await retriever.search(db, embedder, "What is our Q1 strategy?")
+    await retriever.search(db, embedder, "  what is our q1 STRATEGY? ")
+
+    assert embedder.calls == 1
+    assert retriever.embeddings.hits == 1
+
+    cache = EmbeddingCache(max_size=2)
+    for query in ("a", "b", "c"):
+        cache.put("model", query, [0.0])
+    assert cache.get("model", "a") is None
+    assert cache.get("model", "c") == [0.0]
+
+
+@pytest.mark.asyncio
+async def test_keyword_results_survive_embedding_failure(knowledge_base):
+    db, _ = knowledge_base
+
+    class FailingEmbeddings:
+        embeddings = None
+
+        async def create(self, **kwargs):
+            raise RuntimeError("embeddings API down")
+
+    failing = FailingEmbeddings()
+    failing.embeddings = failing
+
+    chunks = await HybridRetriever(reranker=None).search(db, failing, "customs form CB-12", limit=3)
+
+    assert chunks[0].id == 14
+    assert chunks[0].similarity is None
+
+
+@pytest.mark.asyncio
+async def test_vector_only_hits_below_threshold_dropped(knowledge_base):
+    db, embedder = knowledge_base
+    retriever = HybridRetriever(reranker=None)
+
+    chunks = await retriever.search(db, embedder, "zzzz qqqq", limit=5, match_threshold=0.99)
+
+    assert chunks == []
+
+
+@pytest.mark.asyncio
+async def test_weak_keyword_hits_below_cutoff_dropped(knowledge_base):
+    db, embedder = knowledge_base
+    retriever = HybridRetriever(reranker=None)
+
+    # Chunk 5 only shares "form" with the query, far below the CB-12 chunk's BM25 score
+    chunks = await retriever.search(db, embedder, "customs form CB-12", limit=5, match_threshold=0.99)
+
+    assert [chunk.id for chunk in chunks] == [14]
+
+
+@pytest.mark.asyncio
+async def test_search_knowledge_base_formats_metadata(knowledge_base):
+    db, embedder = knowledge_base
+    import tools.strategy_tools as strategy_tools
+
+    with patch.object(strategy_tools, "get_supabase", lambda: db), \
+            patch.object(strategy_tools, "get_openai", lambda: embedder), \
+            patch.object(strategy_tools, "get_retriever", lambda: HybridRetriever(reranker=None)):
+        output = await strategy_tools.search_knowledge_base("HM-EP-7 availability", limit=2)
+
+    assert "Product Catalog" in output
+    assert "https://drive.google.com/product-catalog" in output
@@ -0,0 +1,107 @@
+"""
+Tests for the cached Slack channel directory.
+
+Covers:
+- Sync follows conversations.list cursors past the first page; name_for keeps real names
+- Concurrent misses share one sync; repeated misses are throttled
+- Stale entries are served while one background sync refreshes them
+- Rate-limited pages are retried after Retry-After
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from utils import slack_helpers
+from utils.slack_helpers import SlackChannelDirectory, get_channel_id
+
+
+def workspace(n, page_size=200):
+    channels = [{"id": f"C{i:08d}", "name": f"channel-{i}"} for i in range(n)]
+    return [channels[i:i + page_size] for i in range(0, n, page_size)]
+
+
+def slack_api(pages, requests, rate_limit_first=False):
+    def handler(request):
+        requests.append(request)
+        assert request.headers["Authorization"] == "Bearer xoxb-test"
+        if rate_limit_first and len(requests) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        cursor = request.url.params.get("cursor")
+        index = int(cursor) if cursor else 0
+        next_cursor = str(index + 1) if index + 1 < len(pages) else ""
+        return httpx.Response(200, json={
+            "ok": True,
+            "channels": pages[index],
+            "response_metadata": {"next_cursor": next_cursor}
+        })
+    return handler
+
+
+def make_directory(pages, requests, **kwargs):
+    directory = SlackChannelDirectory("xoxb-test", **kwargs)
+    directory._client = httpx.AsyncClient(transport=httpx.MockTransport(slack_api(pages, requests)))
+    return directory
+
+
+@pytest.mark.asyncio
+async def test_resolves_channels_beyond_first_page():
+    requests = []
+    pages = workspace(950)
+    pages[0][7]["name"] = "General-Ops"
+    directory = make_directory(pages, requests)
+
+    assert await directory.resolve("channel-940") == "C00000940"
+    assert await directory.resolve("#general-ops") == "C00000007"
+    assert directory.name_for("C00000007") == "General-Ops"  # Original name, not the lookup key
+    assert await directory.resolve("#Channel-3") == "C00000003"
+    assert directory.name_for("C00000940") == "channel-940"
+    assert len(requests) == 5
+    assert await directory.resolve("C09FZT6T1A5") == "C09FZT6T1A5"
+    assert len(requests) == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_sync_and_misses_are_throttled():
+    requests = []
+    directory = make_directory(workspace(10), requests, miss_refresh_seconds=60)
+
+    results = await asyncio.gather(*(directory.resolve(f"channel-{i % 10}") for i in range(20)))
+    assert results == [f"C{i % 10:08d}" for i in range(20)]
+    assert len(requests) == 1
+
+    assert await directory.resolve("no-such-channel") is None
+    assert await directory.resolve("no-such-channel") is None
+    assert len(requests) == 1
+
+    directory.invalidate()
+    assert await directory.resolve("channel-1") == "C00000001"
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_is_served_while_refreshing():
+    requests = []
+    pages = workspace(10)
+    directory = make_directory(pages, requests, ttl_seconds=60)
+    await directory.sync()
+
+    pages[0][0] = {"id": "C99999999", "name": "channel-0"}  # Renamed/recreated
+    directory._synced_at -= 120
+    assert await directory.resolve("channel-0") == "C00000000"
+    await directory._refresh_task
+    assert await directory.resolve("channel-0") == "C99999999"
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_page_is_retried(monkeypatch):
+    requests = []
+    directory = SlackChannelDirectory("xoxb-test")
+    directory._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(slack_api(workspace(5), requests, rate_limit_first=True)))
+    monkeypatch.setitem(slack_helpers._directories, "xoxb-test", directory)
+
+    assert await get_channel_id("channel-4", "xoxb-test") == "C00000004"
+    assert len(requests) == 2
@@ -0,0 +1,134 @@
+"""
+Tests for the outbound Slack queue.
+
+Covers:
+- notify() coalesces a burst for the same key into one message per window
+- Per-channel FIFO order and token-bucket pacing; channels don't block each other
+- 429 responses pause delivery for Retry-After and the message is retried
+- send() returns Slack's response and works from worker threads
+- Delivery latency and retry metrics
+- Unexpected errors while posting resolve send() instead of killing the worker
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from core.slack_outbox import SlackOutbox, slack_delivery_seconds, slack_retries
+
+
+def slack_api(posts, rate_limit_first=0):
+    def handler(request):
+        body = json.loads(request.read())
+        posts.append((time.monotonic(), body))
+        assert request.headers["Authorization"] == "Bearer xoxb-test"
+        if len(posts) <= rate_limit_first:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json={"ok": True, "channel": body["channel"], "ts": f"{len(posts)}.000"})
+    return handler
+
+
+def make_outbox(posts, rate_limit_first=0, **kwargs):
+    kwargs.setdefault("rate", 0)
+    outbox = SlackOutbox("xoxb-test", **kwargs)
+    outbox._client = httpx.AsyncClient(transport=httpx.MockTransport(slack_api(posts, rate_limit_first)))
+    return outbox
+
+
+@pytest.mark.asyncio
+async def test_notify_coalesces_bursts_per_key():
+    posts = []
+    outbox = make_outbox(posts, coalesce_window=0.05)
+
+    for i in range(5):
+        outbox.notify("C0STATE001", f"state {i}", key="strategy_state")
+    outbox.notify("C0STATE001", "something else", key="webhook_errors")
+    outbox.notify("C0STATE001", "in a thread", key="strategy_state", thread_ts="1.000")
+    assert posts == []
+
+    await asyncio.sleep(0.1)
+    await outbox.flush()
+
+    texts = sorted(body["text"] for _, body in posts)
+    assert len(posts) == 3
+    assert texts[0].startswith("_5 updates") and "state 0" in texts[0] and "state 4" in texts[0]
+    assert texts[1:] == ["in a thread", "something else"]
+    assert [body.get("thread_ts") for _, body in posts if body["text"] == "in a thread"] == ["1.000"]
+    assert outbox.stats["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_channels_are_paced_in_order_and_independent():
+    posts = []
+    outbox = make_outbox(posts, rate=20, burst=1)
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(outbox.send("C0PACED001", f"a{i}") for i in range(4)),
+        outbox.send("C0OTHER001", "b0"),
+    )
+
+    assert all(result["ok"] for result in results)
+    paced = [(at, body["text"]) for at, body in posts if body["channel"] == "C0PACED001"]
+    assert [text for _, text in paced] == ["a0", "a1", "a2", "a3"]
+    assert paced[-1][0] - started >= 0.14  # 3 more tokens at 20/s
+    other = next(at for at, body in posts if body["channel"] == "C0OTHER001")
+    assert other - started < 0.05
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_message_is_retried_after_retry_after():
+    posts = []
+    outbox = make_outbox(posts, rate_limit_first=1)
+    retries_before = slack_retries.get(reason="rate_limited")
+
+    result = await outbox.send("C0LIMITED1", "hello", thread_ts="9.000")
+
+    assert result == {"ok": True, "channel": "C0LIMITED1", "ts": "2.000"}
+    assert len(posts) == 2 and posts[1][0] - posts[0][0] >= 0.19
+    assert posts[1][1] == {"channel": "C0LIMITED1", "text": "hello", "thread_ts": "9.000"}
+    assert outbox.stats["rate_limited"] == 1
+    assert slack_retries.get(reason="rate_limited") == retries_before + 1
+
+
+@pytest.mark.asyncio
+async def test_worker_thread_posts_and_latency_metrics():
+    posts = []
+    outbox = make_outbox(posts, coalesce_window=0.01)
+    outbox.attach_loop(asyncio.get_running_loop())
+    delivered_before = slack_delivery_seconds.count(kind="journey_progress", status="ok")
+
+    # LangGraph nodes run in worker threads
+    await asyncio.to_thread(outbox.notify, "C0JOURNEY1", "email sent", "journey_progress", "5.000")
+    await asyncio.sleep(0.05)
+    await outbox.flush()
+    rejected = make_outbox([], coalesce_window=0.01)
+    rejected._client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"ok": False, "error": "channel_not_found"})))
+    result = await rejected.send("C0MISSING1", "lost")
+
+    assert [body for _, body in posts] == [{"channel": "C0JOURNEY1", "text": "email sent", "thread_ts": "5.000"}]
+    assert slack_delivery_seconds.count(kind="journey_progress", status="ok") == delivered_before + 1
+    assert result == {"ok": False, "error": "channel_not_found"}
+    assert rejected.stats == {"sent": 0, "failed": 1, "coalesced": 0, "rate_limited": 0}
+    assert outbox.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_unexpected_post_error_resolves_send():
+    calls = []
+
+    def broken(request):
+        calls.append(request)
+        raise RuntimeError("transport bug")
+
+    outbox = make_outbox([])
+    outbox._client = httpx.AsyncClient(transport=httpx.MockTransport(broken))
+
+    result = await asyncio.wait_for(outbox.send("C0BROKEN01", "hello"), timeout=1)
+
+    assert result == {"ok": False, "error": "transport bug"}
+    assert outbox.stats["failed"] == 1 and outbox.depth() == 0
@@ -43,7 +43,7 @@ class TestAnalyzePipelineFixes:
         agent.supabase = mock_supabase_client
 
         # Configure mock to return test data
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -99,8 +99,10 @@ class TestAnalyzePipelineFixes:
 
         # Mock the Supabase query chain
         mock_execute = Mock(data=mock_leads_data)
+        mock_range = Mock()
+        mock_range.execute.return_value = mock_execute
         mock_gte = Mock()
-        mock_gte.execute.return_value = mock_execute
+        mock_gte.order.return_value.range.return_value = mock_range
         mock_select = Mock()
         mock_select.gte.return_value = mock_gte
         mock_table = Mock()
@@ -126,8 +128,8 @@ class TestAnalyzePipelineFixes:
         # Check date is within 1 second (account for test execution time)
         assert abs((datetime.fromisoformat(date_arg) - datetime.fromisoformat(expected_date)).total_seconds()) < 1
 
-        # Verify: Execute was called
-        mock_gte.execute.assert_called_once()
+        # Verify: Execute was called (one page)
+        mock_range.execute.assert_called_once()
 
         print("✅ analyze_pipeline queries Supabase correctly")
 
@@ -143,7 +145,7 @@ class TestAnalyzePipelineFixes:
         agent.supabase = mock_supabase_client
 
         # Mock empty results
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=[]
         )
 
@@ -171,7 +173,7 @@ class TestAnalyzePipelineFixes:
         agent = StrategyAgent()
         agent.supabase = mock_supabase_client
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -220,7 +222,7 @@ class TestRecommendTargetsFixes:
         agent = StrategyAgent()
         agent.supabase = mock_supabase_client
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -281,7 +283,7 @@ class TestRecommendTargetsFixes:
             {"tier": "WARM", "company": "Other Business", "industry": "other", "patient_volume": 50},
         ]
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=patterned_leads
         )
 
@@ -329,7 +331,7 @@ class TestRecommendTargetsFixes:
         agent = StrategyAgent()
         agent.supabase = mock_supabase_client
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -366,7 +368,7 @@ class TestRecommendTargetsFixes:
             {"tier": "COLD", "company": "Random Co", "industry": "unknown", "patient_volume": 10}
         ]
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=limited_data
         )
 
@@ -400,7 +402,7 @@ class TestIntegrationEnd2End:
         agent = StrategyAgent()
         agent.supabase = mock_supabase_client
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -443,7 +445,7 @@ class TestRegressionPrevention:
         agent = StrategyAgent()
         agent.supabase = mock_supabase_client
 
-        mock_supabase_client.table.return_value.select.return_value.gte.return_value.execute.return_value = Mock(
+        mock_supabase_client.table.return_value.select.return_value.gte.return_value.order.return_value.range.return_value.execute.return_value = Mock(
             data=mock_leads_data
         )
 
@@ -0,0 +1,119 @@
+"""
+Tests for the async tool bridge used by ReAct agents.
+
+Covers:
+- Running coroutines from sync code on the shared background loop
+- Loop reuse across calls
+- Main loop dispatch from worker threads
+- Timeouts and concurrency cap
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.tool_bridge import AsyncToolBridge
+
+
+@pytest.fixture
+def bridge():
+    """Create an isolated bridge per test."""
+    b = AsyncToolBridge(max_concurrency=2, default_timeout=5)
+    yield b
+    b.shutdown()
+
+
+class TestAsyncToolBridge:
+    """Test suite for AsyncToolBridge."""
+
+    def test_run_returns_result(self, bridge):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert bridge.run(add(2, 3)) == 5
+
+    def test_reuses_single_background_loop(self, bridge):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = bridge.run(current_loop())
+        second = bridge.run(current_loop())
+
+        assert first is second
+        assert bridge.get_stats()["total_calls"] == 2
+
+    def test_propagates_exceptions(self, bridge):
+        async def boom():
+            raise ValueError("tool failed")
+
+        with pytest.raises(ValueError, match="tool failed"):
+            bridge.run(boom())
+
+        assert bridge.get_stats()["errors"] == 1
+
+    def test_timeout_raises_and_counts(self, bridge):
+        async def slow():
+            await asyncio.sleep(5)
+
+        with pytest.raises(TimeoutError):
+            bridge.run(slow(), timeout=0.05)
+
+        assert bridge.get_stats()["timeouts"] == 1
+
+    def test_concurrency_cap(self, bridge):
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        async def tracked():
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+
+        threads = [threading.Thread(target=bridge.run, args=(tracked(),)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert active["peak"] <= 2
+
+    def test_wrap_preserves_tool_metadata(self, bridge):
+        async def search_docs(query: str) -> str:
+            """Search the knowledge base."""
+            return f"results for {query}"
+
+        tool = bridge.wrap(search_docs)
+
+        assert tool.__name__ == "search_docs"
+        assert tool.__doc__ == "Search the knowledge base."
+        assert tool("pricing") == "results for pricing"
+
+    @pytest.mark.asyncio
+    async def test_dispatches_to_main_loop_from_worker_thread(self, bridge):
+        main_loop = asyncio.get_running_loop()
+        bridge.attach_loop(main_loop)
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        used = await asyncio.to_thread(bridge.run, current_loop())
+
+        assert used is main_loop
+
+    @pytest.mark.asyncio
+    async def test_does_not_deadlock_when_called_on_main_loop(self, bridge):
+        bridge.attach_loop(asyncio.get_running_loop())
+
+        async def value():
+            return 42
+
+        # Sync call from the loop thread must fall back to the background loop
+        start = time.monotonic()
+        assert bridge.run(value()) == 42
+        assert time.monotonic() - start < 1
@@ -0,0 +1,97 @@
+"""
+Tests for the tool discovery index.
+
+Covers:
+- Incremental add/remove keeps postings and prefix vocabulary consistent
+- Field weighting ranks name matches above description matches
+- Tool embeddings are computed once (batched) and query embeddings cached
+- ToolRegistry.search_tools and InstrumentManager.discover_instruments use the index
+"""
+
+from types import SimpleNamespace
+
+from core.tool_index import ToolIndex
+from instruments.instrument_manager import InstrumentManager
+from tests.benchmarks.standins import SimulatedEmbeddings
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.embedder = SimulatedEmbeddings()
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(len(texts))
+        return [self.embedder.embed(text) for text in texts]
+
+
+def test_incremental_updates_and_prefix_match():
+    index = ToolIndex()
+    index.add("supabase_lead_query", {"name": "supabase_lead_query", "description": "Query leads in Supabase"})
+    index.add("gmass_send", {"name": "gmass_send", "description": "Send an email campaign"})
+
+    assert [key for key, _ in index.search("supa")] == ["supabase_lead_query"]
+    assert [key for key, _ in index.search("email")] == ["gmass_send"]
+
+    assert index.remove("supabase_lead_query")
+    assert not index.remove("supabase_lead_query")
+    assert index.search("supa") == []
+    assert not any(term.startswith("supabase") for term in index._vocabulary)
+
+    index.add("gmass_send", {"name": "gmass_send", "description": "Send a newsletter"})
+    assert index.search("email") == []
+    assert len(index) == 1
+
+
+def test_name_match_outranks_description_match():
+    index = ToolIndex()
+    index.add("calendar_lookup", {"name": "calendar_lookup", "description": "Find free slots for a meeting"})
+    index.add("meeting_notes", {"name": "meeting_notes", "description": "Summarize notes"})
+
+    assert index.search("meeting")[0][0] == "meeting_notes"
+
+
+def test_embeddings_are_batched_and_cached():
+    embedder = CountingEmbedder()
+    index = ToolIndex(embedder=embedder)
+    for i in range(50):
+        index.add(f"tool_{i}", {"name": f"tool_{i}", "description": f"Zapier action number {i} for CRM records"})
+
+    index.search("update a CRM record")
+    index.search("update a CRM record")
+    assert embedder.batches == [50, 1]
+
+    # Re-registering an unchanged tool does not re-embed it
+    index.add("tool_3", {"name": "tool_3", "description": "Zapier action number 3 for CRM records"})
+    index.search("update a CRM record")
+    assert embedder.batches == [50, 1]
+
+
+def test_registry_search_follows_register_and_unregister():
+    from tests.test_tool_registry import MockDataTool, MockSimpleTool
+    from tools.registry import get_global_registry
+
+    registry = get_global_registry()
+    registry.clear()
+    registry.register_tool(MockSimpleTool())
+    registry.register_tool(MockDataTool())
+
+    assert registry.search_tools("data")[0].metadata.name == "mock_data_tool"
+    assert len(registry.search_tools("mock", limit=1)) == 1
+
+    registry.unregister_tool("mock_data_tool")
+    assert registry.search_tools("data") == []
+    registry.clear()
+
+
+def test_instrument_discovery_filters_before_truncating():
+    memory = SimpleNamespace(embeddings=SimpleNamespace(embed_documents=CountingEmbedder()))
+    manager = InstrumentManager(memory=memory)
+    for i in range(6):
+        manager.register_instrument(f"lead_report_{i}", "Build a lead pipeline report", print, category="reports")
+    manager.register_instrument("lead_export", "Export lead pipeline to CSV", print, category="export")
+
+    found = manager.discover_instruments("lead pipeline", k=2, category="export")
+
+    assert [inst.name for inst in found] == ["lead_export"]
+    assert manager.get_stats()["semantic_search"]
@@ -10,6 +10,8 @@ from typing import List, Dict, Any
 from supabase import Client
 from openai import AsyncOpenAI
 
+from core.retrieval import get_retriever
+
 async def retrieve_relevant_documents(
     supabase: Client,
     openai_client: AsyncOpenAI,
@@ -20,14 +22,14 @@ async def retrieve_relevant_documents(
     """
     Search knowledge base for documents relevant to the query.
     
-    Uses semantic search with embeddings to find the most relevant
-    chunks of text from your business documents.
+    Uses hybrid search (cached query embeddings + BM25 keyword index,
+    fused and reranked) so exact terms like product SKUs are found too.
     
     Args:
         supabase: Supabase client
         openai_client: OpenAI client for embeddings
         query: User's search query
-        match_threshold: Minimum similarity threshold (0-1)
+        match_threshold: Minimum similarity for vector-only matches (0-1)
         match_count: Maximum number of results to return
         
     Returns:
@@ -38,37 +40,25 @@ async def retrieve_relevant_documents(
         results = await retrieve_relevant_documents(supabase, openai, query)
     """
     try:
-        # Create embedding for the query
-        response = await openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=query
+        chunks = await get_retriever().search(
+            supabase, openai_client, query, limit=match_count, match_threshold=match_threshold
         )
-        query_embedding = response.data[0].embedding
-        
-        # Search Supabase using the match_documents function
-        result = supabase.rpc('match_documents', {
-            'query_embedding': query_embedding,
-            'match_threshold': match_threshold,
-            'match_count': match_count
-        }).execute()
         
-        if not result.data:
+        if not chunks:
             return "No relevant documents found in the knowledge base for this query."
         
         # Format results
-        output = f"Found {len(result.data)} relevant document chunks:\n\n"
-        
-        for i, doc in enumerate(result.data, 1):
-            file_title = doc['metadata'].get('file_title', 'Unknown')
-            file_url = doc['metadata'].get('file_url', '')
-            similarity = doc['similarity']
-            content = doc['content']
-            
-            output += f"**Result {i}** (Similarity: {similarity:.2%})\n"
-            output += f"Source: {file_title}\n"
-            if file_url:
-                output += f"URL: {file_url}\n"
-            output += f"Content:\n{content}\n\n"
+        output = f"Found {len(chunks)} relevant document chunks:\n\n"
+        
+        for i, chunk in enumerate(chunks, 1):
+            if chunk.similarity is not None:
+                output += f"**Result {i}** (Similarity: {chunk.similarity:.2%})\n"
+            else:
+                output += f"**Result {i}** (Keyword match)\n"
+            output += f"Source: {chunk.file_title}\n"
+            if chunk.file_url:
+                output += f"URL: {chunk.file_url}\n"
+            output += f"Content:\n{chunk.content}\n\n"
             output += "-" * 80 + "\n\n"
         
         return output
@@ -234,7 +224,7 @@ async def execute_sql_query(supabase: Client, sql_query: str) -> str:
 RAG_TOOLS = {
     "retrieve_relevant_documents": {
         "function": retrieve_relevant_documents,
-        "description": "Search knowledge base for documents relevant to a query using semantic search",
+        "description": "Search knowledge base for documents relevant to a query using hybrid semantic + keyword search",
         "parameters": ["query", "match_threshold", "match_count"]
     },
     "list_documents": {
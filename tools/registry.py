@@ -9,6 +9,7 @@ Features:
 - Singleton pattern for global registry
 - Dynamic tool discovery via directory scanning
 - Query tools by name, category, or tag
+- Ranked search over an inverted index maintained on register/unregister
 - Integration with DSPy ReAct via tool metadata
 - Type-safe tool execution
 
@@ -29,6 +30,8 @@ import sys
 import inspect
 import logging
 
+from core.tool_index import ToolIndex
+
 from .base import BaseTool, ToolMetadata, ToolCategory
 
 logger = logging.getLogger(__name__)
@@ -41,6 +44,7 @@ class ToolRegistry:
     Features:
     - Register tools manually or via auto-discovery
     - Query tools by name, category, or tag
+    - Ranked search over an inverted index maintained on register/unregister
     - Generate DSPy-compatible tool lists
     - Thread-safe singleton pattern
 
@@ -53,12 +57,14 @@ class ToolRegistry:
 
     _instance = None
     _tools: Dict[str, BaseTool] = {}
+    _index: ToolIndex
 
     def __new__(cls):
         """Singleton pattern."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._tools = {}
+            cls._instance._index = ToolIndex()
         return cls._instance
 
     def register_tool(
@@ -90,6 +96,12 @@ class ToolRegistry:
 
         # Register
         self._tools[tool_name] = tool
+        self._index.add(tool_name, {
+            "name": tool_name,
+            "description": tool.metadata.description,
+            "tags": tool.metadata.tags,
+            "category": getattr(tool.metadata.category, "value", tool.metadata.category)
+        })
         logger.info(f"Registered tool: {tool_name} (v{tool.metadata.version})")
 
     def unregister_tool(self, name: str) -> bool:
@@ -104,6 +116,7 @@ class ToolRegistry:
         """
         if name in self._tools:
             del self._tools[name]
+            self._index.remove(name)
             logger.info(f"Unregistered tool: {name}")
             return True
         return False
@@ -149,36 +162,21 @@ class ToolRegistry:
 
         return list(tools)
 
-    def search_tools(self, query: str) -> List[BaseTool]:
+    def search_tools(self, query: str, limit: Optional[int] = None) -> List[BaseTool]:
         """
         Search tools by name, description, or tags.
 
+        Uses the inverted index built at registration time, so a lookup only
+        touches tools sharing a term (or term prefix) with the query.
+
         Args:
             query: Search query (case-insensitive)
+            limit: Maximum number of results (default: all matches)
 
         Returns:
-            List of matching BaseTool instances
+            List of matching BaseTool instances, best match first
         """
-        query_lower = query.lower()
-        results = []
-
-        for tool in self._tools.values():
-            # Search in name
-            if query_lower in tool.metadata.name.lower():
-                results.append(tool)
-                continue
-
-            # Search in description
-            if query_lower in tool.metadata.description.lower():
-                results.append(tool)
-                continue
-
-            # Search in tags
-            if any(query_lower in tag.lower() for tag in tool.metadata.tags):
-                results.append(tool)
-                continue
-
-        return results
+        return [self._tools[name] for name, _ in self._index.search(query, k=limit)]
 
     def list_tool_names(self) -> List[str]:
         """Get list of all tool names."""
@@ -191,6 +189,7 @@ class ToolRegistry:
     def clear(self) -> None:
         """Clear all registered tools (useful for testing)."""
         self._tools.clear()
+        self._index.clear()
         logger.info("Cleared all tools from registry")
 
     def _validate_tool(self, tool: BaseTool) -> None:
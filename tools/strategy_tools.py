@@ -17,6 +17,8 @@ from supabase import create_client, Client
 from openai import AsyncOpenAI
 import logging
 
+from core.retrieval import get_retriever
+
 logger = logging.getLogger(__name__)
 
 # Initialize clients (lazy load)
@@ -49,7 +51,7 @@ async def search_knowledge_base(query: str, limit: int = 5) -> str:
     """
     Search the knowledge base (87 indexed Google Drive files) for relevant information.
     
-    Uses semantic search across 11,325 text chunks from business documents including:
+    Uses hybrid semantic + keyword search across 11,325 text chunks from business documents including:
     - Strategy documents
     - Meeting notes
     - KPI trackers
@@ -73,32 +75,21 @@ async def search_knowledge_base(query: str, limit: int = 5) -> str:
         if not supabase or not openai:
             return "❌ Knowledge base not configured (missing Supabase or OpenAI credentials)"
         
-        # Create embedding for query
-        response = await openai.embeddings.create(
-            model="text-embedding-3-small",
-            input=query
-        )
-        query_embedding = response.data[0].embedding
-        
-        # Search knowledge base
-        result = supabase.rpc('match_documents', {
-            'query_embedding': query_embedding,
-            'match_threshold': 0.7,
-            'match_count': limit
-        }).execute()
+        chunks = await get_retriever().search(supabase, openai, query, limit=limit)
         
-        if not result.data:
+        if not chunks:
             return f"📭 No relevant documents found for: '{query}'\n\nTry:\n- Broader search terms\n- Different phrasing\n- Check if document was indexed"
         
         # Format results
         output = f"🔍 **Knowledge Base Search**: '{query}'\n\n"
-        output += f"**Found {len(result.data)} relevant documents:**\n\n"
-        
-        for i, doc in enumerate(result.data, 1):
-            output += f"**{i}. {doc.get('file_title', 'Untitled')}**\n"
-            output += f"   Relevance: {doc.get('similarity', 0):.0%}\n"
-            output += f"   Content: {doc.get('content', 'No content')[:300]}...\n"
-            output += f"   Source: {doc.get('file_url', 'No URL')}\n\n"
+        output += f"**Found {len(chunks)} relevant documents:**\n\n"
+        
+        for i, chunk in enumerate(chunks, 1):
+            relevance = f"{chunk.similarity:.0%}" if chunk.similarity is not None else "keyword match"
+            output += f"**{i}. {chunk.metadata.get('file_title', 'Untitled')}**\n"
+            output += f"   Relevance: {relevance}\n"
+            output += f"   Content: {(chunk.content or 'No content')[:300]}...\n"
+            output += f"   Source: {chunk.metadata.get('file_url', 'No URL')}\n\n"
         
         return output
         
@@ -10,11 +10,13 @@ Version: 1.0
 """
 
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime, timedelta
 import logging
 
+from core.lead_analytics import LeadFrame, get_lead_analytics
+
 from .base import BaseTool, ToolMetadata, ToolCategory, ToolResult, ToolError
 
 logger = logging.getLogger(__name__)
@@ -251,14 +253,8 @@ class SupabasePipelineAnalytics(BaseTool):
             )
 
         try:
-            # Query leads for time period
-            start_date = (datetime.utcnow() - timedelta(days=params.days)).isoformat()
-            result = self.supabase.table('leads') \
-                .select('*') \
-                .gte('created_at', start_date) \
-                .execute()
-
-            leads = result.data
+            # Load leads for time period (columnar, shared cache)
+            leads = await get_lead_analytics().window(self.supabase, days=params.days)
 
             # Calculate analytics based on group_by
             if params.group_by == "tier":
@@ -281,7 +277,6 @@ class SupabasePipelineAnalytics(BaseTool):
                 },
                 execution_time=0,
                 metadata={
-                    "start_date": start_date,
                     "end_date": datetime.utcnow().isoformat()
                 }
             )
@@ -297,38 +292,30 @@ class SupabasePipelineAnalytics(BaseTool):
                 execution_time=0
             )
 
-    def _analyze_by_tier(self, leads: List[Dict]) -> Dict[str, Any]:
+    def _analyze_by_tier(self, leads: LeadFrame) -> Dict[str, Any]:
         """Analyze leads by tier."""
-        tier_counts = {}
-        for lead in leads:
-            tier = lead.get('qualification_tier', 'UNKNOWN')
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+        tier_counts = leads.count_by('tier')
 
         return {
             "by_tier": tier_counts,
             "total": len(leads),
-            "hot_percentage": (tier_counts.get('HOT', 0) + tier_counts.get('SCORCHING', 0)) / len(leads) * 100 if leads else 0
+            "hot_percentage": (tier_counts.get('HOT', 0) + tier_counts.get('SCORCHING', 0)) / len(leads) * 100 if len(leads) else 0,
+            "avg_score_by_tier": leads.group_mean('tier', 'score')
         }
 
-    def _analyze_by_source(self, leads: List[Dict]) -> Dict[str, Any]:
+    def _analyze_by_source(self, leads: LeadFrame) -> Dict[str, Any]:
         """Analyze leads by source."""
-        source_counts = {}
-        for lead in leads:
-            source = lead.get('source', 'unknown')
-            source_counts[source] = source_counts.get(source, 0) + 1
-
         return {
-            "by_source": source_counts,
+            "by_source": leads.count_by('source'),
             "total": len(leads)
         }
 
-    def _analyze_by_date(self, leads: List[Dict]) -> Dict[str, Any]:
+    def _analyze_by_date(self, leads: LeadFrame) -> Dict[str, Any]:
         """Analyze leads by date."""
-        date_counts = {}
-        for lead in leads:
-            created_at = lead.get('created_at', '')
-            date = created_at.split('T')[0] if 'T' in created_at else 'unknown'
-            date_counts[date] = date_counts.get(date, 0) + 1
+        date_counts = leads.bucket_counts('day')
+        undated = len(leads) - sum(date_counts.values())
+        if undated:
+            date_counts['unknown'] = undated
 
         return {
             "by_date": date_counts,
@@ -0,0 +1,31 @@
+"""Crash-safe file writes for local JSON state (baselines, caches, checkpoints)."""
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs):
+    """Write `data` as JSON so readers only ever see the old or the new file.
+
+    The JSON goes to a temp file in the same directory, is fsynced, then
+    replaces `path` with os.replace. Missing parent directories are created.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        **dump_kwargs: Passed to json.dump (indent, default, ...)
+    """
+    directory = os.path.dirname(os.fspath(path)) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
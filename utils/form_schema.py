@@ -0,0 +1,270 @@
+"""Compiled Typeform extraction plans.
+
+Field meaning used to be re-derived from every submission: type checks and
+substring heuristics over every answer in transform_typeform_webhook, and
+regexes plus lowercasing over every raw_answers value in
+Lead.extract_semantic_fields on every qualification.
+
+FormSchemaRegistry compiles, once per form_id, an ExtractionPlan mapping
+each field (by ref and by field ID) to a semantic field:
+
+1. Known refs ("email", "first_name", "business_size", ...).
+2. Answer/field type (email, phone_number).
+3. The definition's field title and choice labels, when the webhook
+   carries form_response.definition (Typeform includes it by default).
+
+Rules are memoized per ref / field ID, so a form without a definition
+still compiles field by field as answers arrive. Only fields none of these
+identify (unknown refs, text fields on forms without titles) fall back to
+the per-value heuristics.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Semantic fields a plan can map to
+FIRST_NAME = "first_name"
+LAST_NAME = "last_name"
+EMAIL = "email"
+PHONE = "phone"
+COMPANY = "company"
+CALENDLY_URL = "calendly_url"
+BUSINESS_SIZE = "business_size"
+PATIENT_VOLUME = "patient_volume"
+USE_CASE = "use_case"
+
+KNOWN_REFS = {
+    "first_name": FIRST_NAME, "firstname": FIRST_NAME, "fname": FIRST_NAME,
+    "last_name": LAST_NAME, "lastname": LAST_NAME, "lname": LAST_NAME, "surname": LAST_NAME,
+    "email": EMAIL, "email_address": EMAIL, "work_email": EMAIL,
+    "phone": PHONE, "phone_number": PHONE, "mobile": PHONE,
+    "company": COMPANY, "company_name": COMPANY, "business_name": COMPANY, "practice_name": COMPANY,
+    "clinic_name": COMPANY, "organization": COMPANY,
+    "calendly": CALENDLY_URL, "calendly_url": CALENDLY_URL, "calendly_link": CALENDLY_URL,
+    "business_size": BUSINESS_SIZE, "company_size": BUSINESS_SIZE, "employees": BUSINESS_SIZE,
+    "patient_volume": PATIENT_VOLUME, "patients": PATIENT_VOLUME,
+    "use_case": USE_CASE, "body_comp_use_case": USE_CASE, "business_goals": USE_CASE,
+    "business_description": USE_CASE,
+}
+
+# (title keyword, semantic field), first match wins; email/phone values are
+# still checked with value_fits ("Can we email you?" is a yes/no question)
+TITLE_KEYWORDS: Tuple[Tuple[str, str], ...] = (
+    ("first name", FIRST_NAME),
+    ("last name", LAST_NAME),
+    ("email", EMAIL),
+    ("phone", PHONE),
+    ("calendly", CALENDLY_URL),
+    ("company name", COMPANY),
+    ("business name", COMPANY),
+    ("practice name", COMPANY),
+    ("clinic name", COMPANY),
+    ("how many patients", PATIENT_VOLUME),
+    ("patient volume", PATIENT_VOLUME),
+    ("how many employees", BUSINESS_SIZE),
+    ("business size", BUSINESS_SIZE),
+)
+
+ANSWER_TYPES = {"email": EMAIL, "phone_number": PHONE}
+VOLUME_RANGES = ("1-50", "51-300", "300+")
+COMPANY_MARKERS = ("LLC", "Inc", "Corp", "Company", "Tactical", "Clinic")
+NUMBER_PATTERN = re.compile(r"\d+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+UNKNOWN = None  # Rule value for fields left to the per-value heuristics
+_MISSING = object()
+
+
+def _normalize_ref(ref: str) -> str:
+    return _NON_ALNUM.sub("_", ref.lower()).strip("_")
+
+
+def classify_choice_labels(labels: Iterable[str]) -> Optional[str]:
+    """business_size / patient_volume from choice labels (the transform's label heuristic)."""
+    for label in labels:
+        if not label:
+            continue
+        label_lower = label.lower()
+        if "employee" in label_lower or "business" in label_lower:
+            return BUSINESS_SIZE
+        if "patient" in label_lower or any(num in label for num in VOLUME_RANGES):
+            return PATIENT_VOLUME
+    return None
+
+
+def value_fits(semantic: Optional[str], value: Any) -> bool:
+    """Whether an answer can fill a semantic field: emails need an "@", phones need digits."""
+    if semantic == EMAIL:
+        return isinstance(value, str) and "@" in value
+    if semantic == PHONE:
+        return isinstance(value, str) and any(char.isdigit() for char in value)
+    return True
+
+
+def infer_field(ref: Optional[str], field_type: Optional[str], title: str = "",
+                choices: Iterable[str] = ()) -> Optional[str]:
+    """Semantic field for one form field, or UNKNOWN."""
+    if ref:
+        known = KNOWN_REFS.get(_normalize_ref(ref))
+        if known:
+            return known
+    if field_type in ANSWER_TYPES:
+        return ANSWER_TYPES[field_type]
+    title_lower = (title or "").lower()
+    for keyword, semantic in TITLE_KEYWORDS:
+        if keyword in title_lower:
+            return semantic
+    return classify_choice_labels(choices) if choices else UNKNOWN
+
+
+@dataclass
+class ExtractionPlan:
+    """ref / field ID -> semantic field for one form."""
+    form_id: str
+    rules: Dict[str, Optional[str]] = field(default_factory=dict)
+    from_definition: bool = False
+
+    def rule_for(self, key: str, field_type: Optional[str] = None) -> Optional[str]:
+        """Compiled rule for a ref/field ID; compiles it from ref + type on first sight."""
+        rule = self.rules.get(key, _MISSING)
+        if rule is _MISSING:
+            rule = self.rules[key] = infer_field(key, field_type)
+        return rule
+
+
+class FormSchemaRegistry:
+    """Process-wide cache of compiled extraction plans, keyed by form_id."""
+
+    def __init__(self):
+        self._plans: Dict[str, ExtractionPlan] = {}
+        self._lock = threading.Lock()
+
+    def plan_for(self, form_id: Optional[str], definition: Optional[Dict[str, Any]] = None) -> ExtractionPlan:
+        """Plan for a form, compiling the definition's fields the first time one is seen."""
+        form_id = form_id or ""
+        plan = self._plans.get(form_id)
+        if plan is not None and (plan.from_definition or not definition):
+            return plan
+        with self._lock:
+            plan = self._plans.get(form_id)
+            if plan is None:
+                plan = self._plans[form_id] = ExtractionPlan(form_id)
+            if definition and not plan.from_definition:
+                self._compile_definition(plan, definition)
+        return plan
+
+    def register_definition(self, form_id: str, definition: Dict[str, Any]) -> ExtractionPlan:
+        """Compile a form definition (e.g. from the Typeform Forms API) ahead of traffic."""
+        return self.plan_for(form_id, definition)
+
+    def _compile_definition(self, plan: ExtractionPlan, definition: Dict[str, Any]):
+        fields = definition.get("fields") or []
+        for form_field in fields:
+            choices = [
+                choice.get("label") for choice in
+                (form_field.get("choices") or (form_field.get("properties") or {}).get("choices") or [])
+            ]
+            rule = infer_field(form_field.get("ref"), form_field.get("type"), form_field.get("title", ""), choices)
+            for key in (form_field.get("ref"), form_field.get("id")):
+                if key:
+                    plan.rules[key] = rule
+        plan.from_definition = True
+        mapped = sum(1 for f in fields if plan.rules.get(f.get("ref") or f.get("id")))
+        logger.info(f"📋 Compiled extraction plan for form {plan.form_id}: {mapped}/{len(fields)} fields mapped")
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+
+# ============================================================================
+# Semantic enrichment (Lead.extract_semantic_fields)
+# ============================================================================
+
+def _extract_use_case(extracted: Dict[str, Any], value: Any, value_str: str):
+    extracted["use_case"] = value
+    extracted["business_goals"] = value
+
+    # Extract patient volume mentions
+    if "member" in value_str or "patient" in value_str:
+        numbers = NUMBER_PATTERN.findall(value_str)
+        if numbers:
+            volume = max([int(n) for n in numbers])
+            extracted["patient_volume_raw"] = volume
+
+            # Categorize
+            if volume >= 300:
+                extracted["patient_volume_category"] = "very_high"
+            elif volume >= 100:
+                extracted["patient_volume_category"] = "high"
+            elif volume >= 50:
+                extracted["patient_volume_category"] = "medium"
+            else:
+                extracted["patient_volume_category"] = "low"
+
+
+def extract_semantic_fields(form_id: Optional[str], raw_answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Semantic enrichment for stored raw_answers (keyed by ref or, on old records, field ID).
+
+    Keys the form's plan identifies are mapped directly; names, phone and
+    size/volume labels are not part of the enrichment and are skipped.
+    Unknown keys go through the value heuristics (Calendly URL, email,
+    company markers, long text as use case).
+    """
+    plan = get_form_schema_registry().plan_for(form_id)
+    rules = plan.rules
+    extracted: Dict[str, Any] = {}
+
+    for key, value in raw_answers.items():
+        if not value or value == "null":
+            continue
+
+        rule = rules.get(key, _MISSING)
+        if rule is _MISSING:
+            rule = plan.rule_for(key)
+        if rule is not UNKNOWN:
+            if rule == CALENDLY_URL:
+                extracted["calendly_url"] = value
+                extracted["has_calendly"] = True
+            elif rule == EMAIL or rule == COMPANY:
+                if value_fits(rule, value):
+                    extracted[rule] = value
+            elif rule == USE_CASE:
+                _extract_use_case(extracted, value, str(value).lower())
+            continue
+
+        value_str = str(value).lower()
+        if "calendly.com" in value_str:
+            extracted["calendly_url"] = value
+            extracted["has_calendly"] = True
+        elif "@" in value_str and "." in value_str:
+            extracted["email"] = value
+        elif isinstance(value, str) and any(marker in value for marker in COMPANY_MARKERS):
+            extracted["company"] = value
+        elif len(value_str) > 100:
+            _extract_use_case(extracted, value, value_str)
+
+    return extracted
+
+
+# ============================================================================
+# Global registry
+# ============================================================================
+
+_registry: Optional[FormSchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_form_schema_registry() -> FormSchemaRegistry:
+    """Get or create the process-wide form schema registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = FormSchemaRegistry()
+    return _registry
@@ -1,11 +1,186 @@
+"""Slack helper utilities.
 
-"""Slack helper utilities."""
-import httpx
+Channel names are resolved through SlackChannelDirectory, a per-token cache
+of the workspace's channels:
+
+- Sync pages through conversations.list with cursors (every page, not just
+  the first 100 channels), honouring Retry-After on rate limits.
+- name -> ID and ID -> name maps are served from memory. Once older than
+  SLACK_CHANNEL_CACHE_TTL_SECONDS (default 3600) they are still answered
+  immediately while one background sync refreshes them.
+- A name that is not cached triggers one sync (single-flight: concurrent
+  misses share it), at most once per SLACK_CHANNEL_MISS_REFRESH_SECONDS
+  (default 60) so an unknown name cannot make every lead re-list the
+  workspace.
+"""
+import asyncio
 import logging
-from typing import Optional, Tuple
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
+CONVERSATIONS_LIST_URL = "https://slack.com/api/conversations.list"
+PAGE_LIMIT = 1000  # Slack's maximum page size for conversations.list
+MAX_RATE_LIMIT_WAIT = 30.0
+
+
+def is_channel_id(channel_name_or_id: str) -> bool:
+    """True if this already looks like a Slack channel, user or DM ID."""
+    # IDs start with C, U, or D, are alphanumeric and typically 9-15 characters
+    return bool(channel_name_or_id) and channel_name_or_id.startswith(('C', 'U', 'D')) and (
+        len(channel_name_or_id) >= 9 and channel_name_or_id.replace('_', '').replace('-', '').isalnum()
+    )
+
+
+def _normalize(name: str) -> str:
+    return name.lstrip('#').strip().lower()
+
+
+class SlackChannelDirectory:
+    """Cached, paginated channel name <-> ID directory for one bot token."""
+
+    def __init__(
+        self,
+        slack_token: str,
+        ttl_seconds: Optional[float] = None,
+        miss_refresh_seconds: Optional[float] = None,
+        timeout: float = 10.0
+    ):
+        self.slack_token = slack_token
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else float(os.getenv("SLACK_CHANNEL_CACHE_TTL_SECONDS", "3600"))
+        )
+        self.miss_refresh_seconds = (
+            miss_refresh_seconds if miss_refresh_seconds is not None
+            else float(os.getenv("SLACK_CHANNEL_MISS_REFRESH_SECONDS", "60"))
+        )
+        self.timeout = timeout
+
+        self._by_name: Dict[str, str] = {}
+        self._by_id: Dict[str, str] = {}
+        self._synced_at = 0.0  # monotonic; 0 = never synced
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    # ----- Sync -----
+
+    async def _fetch_page(self, cursor: Optional[str]) -> Dict[str, Any]:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        params = {"types": "public_channel,private_channel", "exclude_archived": "true", "limit": PAGE_LIMIT}
+        if cursor:
+            params["cursor"] = cursor
+
+        for attempt in range(3):
+            response = await self._client.get(
+                CONVERSATIONS_LIST_URL,
+                headers={"Authorization": f"Bearer {self.slack_token}"},
+                params=params
+            )
+            if response.status_code == 429 and attempt < 2:
+                wait = min(float(response.headers.get("Retry-After", "1")), MAX_RATE_LIMIT_WAIT)
+                logger.warning(f"⚠️ Slack conversations.list rate limited, retrying in {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+            if response.status_code != 200:
+                raise Exception(f"Slack API returned {response.status_code}")
+            data = response.json()
+            if not data.get('ok'):
+                raise Exception(f"Slack API error: {data.get('error')}")
+            return data
+        raise Exception("Slack API rate limit retries exhausted")
+
+    async def _fetch_all(self) -> List[Dict[str, Any]]:
+        channels: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            data = await self._fetch_page(cursor)
+            channels.extend(data.get('channels', []))
+            cursor = (data.get('response_metadata') or {}).get('next_cursor')
+            if not cursor:
+                return channels
+
+    async def sync(self) -> int:
+        """Reload every channel page (single-flight). Returns the channel count."""
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        synced_before = self._synced_at
+        async with self._sync_lock:
+            if self._synced_at != synced_before:
+                return len(self._by_id)  # Another caller synced while we waited
+            started = time.perf_counter()
+            channels = await self._fetch_all()
+            named = [c for c in channels if c.get('name') and c.get('id')]
+            self._by_name = {_normalize(c['name']): c['id'] for c in named}
+            self._by_id = {c['id']: c['name'] for c in named}  # Real names for display
+            self._synced_at = time.monotonic()
+            logger.info(
+                f"✅ Slack channel directory synced: {len(self._by_id)} channels "
+                f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
+            return len(self._by_id)
+
+    def _refresh_in_background(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        async def refresh():
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"❌ Slack channel directory refresh failed: {e}")
+
+        self._refresh_task = asyncio.create_task(refresh())
+
+    # ----- Lookups -----
+
+    async def resolve(self, channel_name_or_id: str) -> Optional[str]:
+        """Channel ID for a name ('ai-test' or '#ai-test'); IDs pass through."""
+        if is_channel_id(channel_name_or_id):
+            return channel_name_or_id
+        name = _normalize(channel_name_or_id or "")
+        if not name:
+            return None
+
+        age = time.monotonic() - self._synced_at
+        if self._synced_at and age > self.ttl_seconds:
+            self._refresh_in_background()
+
+        channel_id = self._by_name.get(name)
+        if channel_id is None and (not self._synced_at or age > self.miss_refresh_seconds):
+            await self.sync()
+            channel_id = self._by_name.get(name)
+        return channel_id
+
+    def name_for(self, channel_id: str) -> Optional[str]:
+        """Cached channel name for an ID (None if unknown)."""
+        return self._by_id.get(channel_id)
+
+    def invalidate(self):
+        """Drop the cache; the next lookup re-syncs (e.g. after creating a channel)."""
+        self._by_name, self._by_id = {}, {}
+        self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+_directories: Dict[str, SlackChannelDirectory] = {}
+
+
+def get_channel_directory(slack_token: str) -> SlackChannelDirectory:
+    """Get or create the channel directory for a bot token."""
+    directory = _directories.get(slack_token)
+    if directory is None:
+        directory = _directories[slack_token] = SlackChannelDirectory(slack_token)
+    return directory
+
 
 async def get_channel_id(channel_name_or_id: str, slack_token: str) -> Optional[str]:
     """Convert channel name to ID, or return ID if already an ID.
@@ -17,36 +192,17 @@ async def get_channel_id(channel_name_or_id: str, slack_token: str) -> Optional[
     Returns:
         Channel ID or None if not found
     """
-    # If it starts with C, U, or D (channel, user, or DM IDs), it's already an ID
-    # Slack IDs are typically 9-11 characters, but can vary
-    if channel_name_or_id and channel_name_or_id.startswith(('C', 'U', 'D')):
-        # Additional check: IDs are alphanumeric and typically 9-15 characters
-        if len(channel_name_or_id) >= 9 and channel_name_or_id.replace('_', '').replace('-', '').isalnum():
-            return channel_name_or_id
+    if is_channel_id(channel_name_or_id):
+        return channel_name_or_id
 
-    # Otherwise, look up the channel by name
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://slack.com/api/conversations.list",
-                headers={"Authorization": f"Bearer {slack_token}"},
-                params={"types": "public_channel,private_channel"},
-                timeout=10.0
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('ok'):
-                    for channel in data.get('channels', []):
-                        if channel.get('name') == channel_name_or_id:
-                            logger.info(f"✅ Resolved channel '{channel_name_or_id}' to ID: {channel['id']}")
-                            return channel['id']
-
-                    logger.warning(f"⚠️ Channel '{channel_name_or_id}' not found")
-                    return None
-                else:
-                    logger.error(f"❌ Slack API error: {data.get('error')}")
-                    return None
+        channel_id = await get_channel_directory(slack_token).resolve(channel_name_or_id)
     except Exception as e:
         logger.error(f"❌ Failed to resolve channel: {e}")
         return None
+
+    if channel_id:
+        logger.debug(f"✅ Resolved channel '{channel_name_or_id}' to ID: {channel_id}")
+    else:
+        logger.warning(f"⚠️ Channel '{channel_name_or_id}' not found")
+    return channel_id
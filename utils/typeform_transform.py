@@ -4,13 +4,90 @@ Problem: Field refs are UUIDs, not semantic names!
 Solution: Use field.type to identify email/phone fields.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from models.lead import Lead, ResponseType
+from utils.form_schema import (
+    BUSINESS_SIZE,
+    CALENDLY_URL,
+    PATIENT_VOLUME,
+    UNKNOWN,
+    _MISSING,
+    classify_choice_labels,
+    get_form_schema_registry,
+    value_fits,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Answer type -> key holding the value (stored in raw_answers even when empty)
+VALUE_KEYS = {'email': 'email', 'phone_number': 'phone_number', 'url': 'url', 'text': 'text',
+              'transcript': 'transcript'}
+SEMANTIC_CHOICES = (BUSINESS_SIZE, PATIENT_VOLUME)
+
+def extract_answers(form_response: Dict[str, Any], form_id: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Map a form response's answers in one pass: (contact fields, raw_answers by ref).
+
+    Fields are mapped through the form's compiled extraction plan
+    (utils/form_schema.py); text fields the plan can't identify fill the
+    name/company slots in order.
+    """
+    plan = get_form_schema_registry().plan_for(
+        form_id or form_response.get('form_id'), form_response.get('definition'))
+    
+    extracted = {
+        'first_name': None,
+        'last_name': None,
+        'email': None,
+        'phone': None,
+        'company': None,
+        'calendly_url': None
+    }
+    
+    rules = plan.rules
+    raw_answers = {}
+    text_fields = []  # Unmapped text fields, for first/last name and company
+    
+    for answer in form_response.get('answers', []):
+        field = answer.get('field', {})
+        field_type = answer.get('type')
+        field_ref = field.get('ref', '')
+        rule = rules.get(field_ref, _MISSING) if field_ref else _MISSING
+        if rule is _MISSING:
+            rule = plan.rule_for(field_ref or field.get('id', ''), field_type)
+        
+        if field_type == 'choice':
+            label = (answer.get('choice') or {}).get('label')
+            raw_answers[field_ref] = label
+            if label:
+                semantic = rule if rule in SEMANTIC_CHOICES else classify_choice_labels((label,))
+                if semantic:
+                    raw_answers[semantic] = label
+            continue
+        
+        value_key = VALUE_KEYS.get(field_type)
+        value = answer.get(value_key or field_type)
+        if value_key or value:  # Other types are stored only when answered
+            raw_answers[field_ref] = value
+        
+        if rule in extracted and field_type != 'url':
+            if value and not extracted[rule] and value_fits(rule, value):
+                extracted[rule] = value
+        elif field_type == 'text' and rule is UNKNOWN:
+            text_fields.append(value)
+        elif field_type == 'url' and (rule == CALENDLY_URL or 'calendly' in (value or '').lower()):
+            extracted['calendly_url'] = value
+    
+    # Heuristic: unmapped text fields are usually first_name, last_name, company in order
+    unfilled = (slot for slot in ('first_name', 'last_name', 'company') if not extracted[slot])
+    for slot, text_value in zip(unfilled, text_fields):
+        if text_value:
+            extracted[slot] = text_value
+    
+    return extracted, raw_answers
+
+
 def transform_typeform_webhook(webhook_data: Dict[str, Any]) -> Lead:
     """Transform Typeform webhook into Lead - FIXED VERSION."""
     try:
@@ -18,83 +95,7 @@ def transform_typeform_webhook(webhook_data: Dict[str, Any]) -> Lead:
         if not form_response:
             raise ValueError("Missing form_response")
         
-        answers = form_response.get('answers', [])
-        
-        # Extract fields by TYPE (not by ref pattern matching!)
-        extracted = {
-            'first_name': None,
-            'last_name': None,
-            'email': None,
-            'phone': None,
-            'company': None,
-            'calendly_url': None
-        }
-        
-        raw_answers = {}
-        text_fields = []  # Collect text fields for first/last name
-        
-        for answer in answers:
-            field = answer.get('field', {})
-            field_type = answer.get('type')
-            field_ref = field.get('ref', '')
-            
-            # Extract by TYPE (reliable!)
-            if field_type == 'email':
-                extracted['email'] = answer.get('email')
-                raw_answers[field_ref] = answer.get('email')
-                
-            elif field_type == 'phone_number':
-                extracted['phone'] = answer.get('phone_number')
-                raw_answers[field_ref] = answer.get('phone_number')
-                
-            elif field_type == 'url':
-                url = answer.get('url', '')
-                if 'calendly' in url.lower():
-                    extracted['calendly_url'] = url
-                raw_answers[field_ref] = url
-                
-            elif field_type == 'text':
-                text_value = answer.get('text')
-                text_fields.append(text_value)
-                raw_answers[field_ref] = text_value
-                
-            elif field_type == 'choice':
-                choice = answer.get('choice', {})
-                label = choice.get('label')
-                raw_answers[field_ref] = label
-
-                # SEMANTIC MAPPING: Detect business size and patient volume
-                if label:
-                    label_lower = label.lower()
-
-                    # Business size detection
-                    if 'employee' in label_lower or 'business' in label_lower:
-                        raw_answers['business_size'] = label
-                        logger.info(f"📊 Mapped business_size: {label}")
-
-                    # Patient volume detection
-                    elif 'patient' in label_lower or any(num in label for num in ['1-50', '51-300', '300+']):
-                        raw_answers['patient_volume'] = label
-                        logger.info(f"📊 Mapped patient_volume: {label}")
-                
-            elif field_type == 'transcript':
-                transcript = answer.get('transcript', {})
-                raw_answers[field_ref] = transcript
-                
-            else:
-                # Store other types
-                value = answer.get(field_type)
-                if value:
-                    raw_answers[field_ref] = value
-        
-        # Heuristic: First two text fields are usually first_name, last_name
-        if len(text_fields) >= 1 and text_fields[0]:
-            extracted['first_name'] = text_fields[0]
-        if len(text_fields) >= 2 and text_fields[1]:
-            extracted['last_name'] = text_fields[1]
-        if len(text_fields) >= 3 and text_fields[2]:
-            # Third text field might be company
-            extracted['company'] = text_fields[2]
+        extracted, raw_answers = extract_answers(form_response, webhook_data.get('form_id'))
         
         # Determine response type
         submitted_at = form_response.get('submitted_at')